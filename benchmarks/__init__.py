@@ -0,0 +1,10 @@
+"""
+Benchmarks for the cs-videos framework.
+
+Run individual benchmarks as modules from the repository root, e.g.:
+
+    python -m benchmarks.memory
+    python -m benchmarks.conflicts --compare baseline.json
+
+Synthetic timelines come from benchmarks.generators.
+"""
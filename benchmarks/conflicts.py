@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Conflict detection and timeline query benchmark.
+
+Runs ConflictDetector, SpatialHashGrid and Timeline time queries over
+the synthetic scenarios in benchmarks.generators and reports throughput,
+peak traced memory and the conflict count for each scenario and size.
+
+Results can be saved as a JSON baseline and later compared against it;
+comparison exits non-zero when throughput drops or peak memory grows by
+more than the threshold, or when a conflict count changes.
+
+Usage:
+    python -m benchmarks.conflicts [--sizes 100,1000,10000] [--full]
+    python -m benchmarks.conflicts --save baseline.json
+    python -m benchmarks.conflicts --compare baseline.json [--threshold 0.25]
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from core.spacetime import ConflictDetector, Timeline
+from core.spacetime.conflict_detection import create_spatial_grid
+
+from .generators import GENERATORS
+
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+FULL_SIZES = DEFAULT_SIZES + [1_000_000]
+QUERY_COUNT = 1_000
+GRID_CHUNK = 256
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """
+    Run a function several times and keep the fastest run.
+
+    Args:
+        func: Function to time
+        repeat: Number of runs
+
+    Returns:
+        (best seconds, result of the last run)
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Peak traced bytes allocated while running a function."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - before
+
+
+def grid_pass(timeline: Timeline) -> int:
+    """
+    Insert, query and remove objects in chunks of GRID_CHUNK.
+
+    Keeps the live population bounded, like the detector's sweep does,
+    so the cost per operation stays comparable across sizes. The grid
+    is tuned to the timeline's object sizes, as the detector's is.
+    """
+    objects = timeline.objects
+    grid = create_spatial_grid([obj.space for obj in objects])
+    candidates = 0
+    for lo in range(0, len(objects), GRID_CHUNK):
+        chunk = objects[lo:lo + GRID_CHUNK]
+        for obj in chunk:
+            grid.insert(obj.id, obj.space)
+        for obj in chunk:
+            candidates += len(grid.get_potential_collisions(obj.id, obj.space))
+        for obj in chunk:
+            grid.remove(obj.id, obj.space)
+    return candidates
+
+
+def query_pass(timeline: Timeline) -> int:
+    """Run evenly spaced point queries, starting from a cold index."""
+    timeline.invalidate_index()
+    duration = timeline.duration
+    return sum(len(timeline.get_objects_at_time(duration * k / QUERY_COUNT))
+               for k in range(QUERY_COUNT))
+
+
+def run_case(scenario: str, size: int, repeat: int, memory: bool) -> Dict[str, Any]:
+    """
+    Benchmark one scenario at one size.
+
+    Args:
+        scenario: Generator name
+        size: Number of objects
+        repeat: Timed runs per measurement (best is kept)
+        memory: Whether to trace peak memory of conflict detection
+
+    Returns:
+        Result record
+    """
+    timeline = GENERATORS[scenario](size, seed=0)
+    detector = ConflictDetector()
+
+    detect_seconds, report = best_time(lambda: detector.detect_conflicts(timeline), repeat)
+    grid_seconds, _ = best_time(lambda: grid_pass(timeline), repeat)
+    query_seconds, _ = best_time(lambda: query_pass(timeline), repeat)
+
+    record = {
+        'scenario': scenario,
+        'objects': size,
+        'conflicts': report.total_conflicts,
+        'detect_seconds': detect_seconds,
+        'detect_throughput': size / detect_seconds,
+        'grid_throughput': size / grid_seconds,
+        'query_throughput': QUERY_COUNT / query_seconds,
+    }
+    if memory:
+        record['detect_peak_bytes'] = peak_memory(lambda: detector.detect_conflicts(timeline))
+    return record
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float
+) -> List[str]:
+    """
+    Compare results against a baseline.
+
+    Args:
+        results: Current results keyed by "scenario/size"
+        baseline: Baseline results with the same keys
+        threshold: Allowed relative slowdown or memory growth
+
+    Returns:
+        Human-readable regressions (empty if none)
+    """
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if current['conflicts'] != base['conflicts']:
+            regressions.append(
+                f"{key}: conflict count {base['conflicts']} -> {current['conflicts']}"
+            )
+        for metric in ('detect_throughput', 'grid_throughput', 'query_throughput'):
+            if current[metric] < base[metric] * (1 - threshold):
+                regressions.append(
+                    f"{key}: {metric} {base[metric]:,.0f} -> {current[metric]:,.0f}/s"
+                )
+        if 'detect_peak_bytes' in current and 'detect_peak_bytes' in base:
+            if current['detect_peak_bytes'] > base['detect_peak_bytes'] * (1 + threshold):
+                regressions.append(
+                    f"{key}: detect_peak_bytes {base['detect_peak_bytes']:,} -> "
+                    f"{current['detect_peak_bytes']:,}"
+                )
+    return regressions
+
+
+def print_record(record: Dict[str, Any]) -> None:
+    """Print one result row."""
+    peak = record.get('detect_peak_bytes')
+    peak_text = f"{peak / 1e6:>8.1f} MB" if peak is not None else f"{'-':>11}"
+    print(f"{record['scenario']:<12} {record['objects']:>9,} "
+          f"{record['conflicts']:>9,} "
+          f"{record['detect_throughput']:>12,.0f} "
+          f"{record['grid_throughput']:>12,.0f} "
+          f"{record['query_throughput']:>10,.0f} "
+          f"{peak_text}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=lambda s: [int(float(v)) for v in s.split(',')],
+                        default=None, help='comma-separated object counts')
+    parser.add_argument('--full', action='store_true',
+                        help='run every size from 1e2 to 1e6')
+    parser.add_argument('--scenarios', type=lambda s: s.split(','),
+                        default=list(GENERATORS), help='comma-separated scenario names')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per measurement (best is kept)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the traced peak memory run')
+    parser.add_argument('--save', metavar='FILE', help='write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare against a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed relative regression in compare mode')
+    args = parser.parse_args()
+
+    sizes = args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)
+    for scenario in args.scenarios:
+        if scenario not in GENERATORS:
+            parser.error(f"unknown scenario '{scenario}' (choose from {', '.join(GENERATORS)})")
+
+    print("=" * 80)
+    print("CONFLICT DETECTION BENCHMARK")
+    print("=" * 80)
+    print(f"{'scenario':<12} {'objects':>9} {'conflicts':>9} "
+          f"{'detect/s':>12} {'grid/s':>12} {'query/s':>10} {'peak':>11}")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for scenario in args.scenarios:
+        for size in sizes:
+            record = run_case(scenario, size, args.repeat, not args.no_memory)
+            results[f"{scenario}/{size}"] = record
+            print_record(record)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'results': results}, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\n✓ No regressions beyond {args.threshold:.0%}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Deterministic synthetic timelines for benchmarks.
+
+Each generator builds a timeline of a given size from a seed, with
+object density kept constant as the size grows (the timeline gets
+longer, not more crowded), so results at different sizes are comparable.
+
+Scenarios:
+    code_panes: Code panes with overlapping line highlights
+    memory_grid: Memory cells from LayoutTemplate.memory_layout
+    backgrounds: Long-lived backgrounds under short foreground objects
+"""
+import random
+from typing import Callable, Dict, List
+
+from core.spacetime import Timeline, LayoutTemplate, Zone
+from core.spacetime.objects import SpaceRegion, TimeWindow, SpacetimeObject
+
+
+def code_panes(count: int, seed: int = 0) -> Timeline:
+    """
+    Code panes with line highlights, as in a code walkthrough.
+
+    Every pane fills the code zone and is followed by several thin line
+    highlights on the layer above. Consecutive panes cross-fade, so
+    neighbouring panes and highlights on the same line conflict.
+
+    Args:
+        count: Number of objects
+        seed: Random seed
+
+    Returns:
+        Timeline with `count` objects
+    """
+    rng = random.Random(seed)
+    layout = LayoutTemplate.code_with_explanation()
+    code = layout.get_zone("code")
+    explanation = layout.get_zone("explanation")
+    line_height = 0.4
+    lines = int(code.region.height / line_height)
+
+    objects: List[SpacetimeObject] = []
+    cursor = 0.0
+    while len(objects) < count:
+        pane_duration = rng.uniform(4.0, 10.0)
+        objects.append(code.create_object(
+            id=f"pane_{len(objects)}",
+            start_time=cursor,
+            duration=pane_duration,
+            type='code'
+        ))
+        if len(objects) < count:
+            objects.append(explanation.create_object(
+                id=f"text_{len(objects)}",
+                start_time=cursor + rng.uniform(0.0, 1.0),
+                duration=pane_duration * 0.8,
+                type='text'
+            ))
+
+        t = cursor
+        for _ in range(rng.randint(2, 6)):
+            if len(objects) >= count:
+                break
+            line = rng.randrange(lines)
+            width = rng.uniform(2.0, code.region.width * 0.8)
+            objects.append(SpacetimeObject(
+                id=f"highlight_{len(objects)}",
+                space=SpaceRegion(
+                    x=code.region.x + rng.uniform(0.0, code.region.width - width),
+                    y=code.region.y + line * line_height,
+                    width=width,
+                    height=line_height
+                ),
+                time=TimeWindow(start=t, end=t + rng.uniform(0.5, 2.0)),
+                layer=1,
+                metadata={'type': 'highlight'}
+            ))
+            t += rng.uniform(0.3, 1.5)
+
+        cursor += pane_duration * rng.uniform(0.85, 1.0)
+
+    return Timeline(name=f"code_panes_{count}", objects=objects)
+
+
+def memory_grid(count: int, seed: int = 0) -> Timeline:
+    """
+    Memory cells, registers and annotations from the memory layout.
+
+    The memory zone is split into an 8 x 4 grid of cells that are
+    written and rewritten over time; registers and annotations update
+    alongside them.
+
+    Args:
+        count: Number of objects
+        seed: Random seed
+
+    Returns:
+        Timeline with `count` objects
+    """
+    rng = random.Random(seed)
+    layout = LayoutTemplate.memory_layout()
+    memory = layout.get_zone("memory")
+    rows, cols = 8, 4
+    cell_w = memory.region.width / cols
+    cell_h = memory.region.height / rows
+    cells = [
+        Zone(
+            name=f"memory_{r}_{c}",
+            region=SpaceRegion(x=memory.region.x + c * cell_w,
+                               y=memory.region.y + r * cell_h,
+                               width=cell_w, height=cell_h),
+            default_layer=memory.default_layer
+        )
+        for r in range(rows) for c in range(cols)
+    ]
+    side_zones = [layout.get_zone("registers"), layout.get_zone("annotations")]
+
+    objects: List[SpacetimeObject] = []
+    cursor = 0.0
+    for i in range(count):
+        if rng.random() < 0.8:
+            zone = rng.choice(cells)
+            kind = 'memory_cell'
+        else:
+            zone = rng.choice(side_zones)
+            kind = 'register' if zone.name == 'registers' else 'annotation'
+        objects.append(zone.create_object(
+            id=f"{kind}_{i}",
+            start_time=cursor,
+            duration=rng.uniform(1.0, 6.0),
+            type=kind
+        ))
+        cursor += rng.uniform(0.05, 0.3)
+
+    return Timeline(name=f"memory_grid_{count}", objects=objects)
+
+
+def backgrounds(count: int, seed: int = 0) -> Timeline:
+    """
+    Long-lived backgrounds under many short foreground objects.
+
+    One full-frame background starts every 200 objects and lasts for
+    roughly the next 400, so backgrounds cross-fade into each other
+    while short objects come and go across three foreground layers.
+
+    Args:
+        count: Number of objects
+        seed: Random seed
+
+    Returns:
+        Timeline with `count` objects
+    """
+    rng = random.Random(seed)
+    fullscreen = LayoutTemplate.fullscreen()
+    frame = next(iter(fullscreen.zones.values()))
+
+    objects: List[SpacetimeObject] = []
+    cursor = 0.0
+    step = 0.25
+    for i in range(count):
+        if i % 200 == 0:
+            objects.append(frame.create_object(
+                id=f"background_{i}",
+                start_time=cursor,
+                duration=400 * step * rng.uniform(0.9, 1.1),
+                layer=-1,
+                type='background'
+            ))
+            continue
+        width = rng.uniform(0.5, 3.0)
+        height = rng.uniform(0.5, 2.0)
+        objects.append(SpacetimeObject(
+            id=f"item_{i}",
+            space=SpaceRegion(
+                x=frame.region.x + rng.uniform(0.0, frame.region.width - width),
+                y=frame.region.y + rng.uniform(0.0, frame.region.height - height),
+                width=width,
+                height=height
+            ),
+            time=TimeWindow(start=cursor, end=cursor + rng.uniform(0.5, 4.0)),
+            layer=rng.randint(0, 2),
+            metadata={'type': 'item'}
+        ))
+        cursor += rng.uniform(0.0, 2 * step)
+
+    return Timeline(name=f"backgrounds_{count}", objects=objects)
+
+
+GENERATORS: Dict[str, Callable[[int, int], Timeline]] = {
+    'code_panes': code_panes,
+    'memory_grid': memory_grid,
+    'backgrounds': backgrounds,
+}
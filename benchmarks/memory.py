@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for spacetime objects.
+
+Builds a large timeline from LayoutTemplate zones and reports how many
+bytes each object costs, with private values and with interned regions
+and shared metadata.
+
+Usage:
+    python -m benchmarks.memory [--objects 100000]
+"""
+import argparse
+import sys
+import tracemalloc
+from typing import Dict
+
+from core.spacetime import Timeline, LayoutTemplate
+from core.spacetime.objects import SpaceRegion, TimeWindow, SpacetimeObject, clear_intern_pools
+
+
+def build_timeline(count: int, shared: bool) -> Timeline:
+    """
+    Build a timeline of zone objects cycling through a memory layout.
+
+    Args:
+        count: Number of objects
+        shared: Whether zones intern regions and share metadata
+
+    Returns:
+        Timeline with `count` objects
+    """
+    layout = LayoutTemplate.memory_layout()
+    zones = list(layout.zones.values())
+    timeline = Timeline(name=f"memory_bench_{count}")
+
+    objects = []
+    for i in range(count):
+        zone = zones[i % len(zones)]
+        create = zone.create_shared_object if shared else zone.create_object
+        objects.append(create(
+            id=f"obj_{i}",
+            start_time=i * 0.1,
+            duration=2.0,
+            type='memory_display'
+        ))
+    timeline.add_many(objects)
+    return timeline
+
+
+def measure(count: int, shared: bool) -> Dict[str, float]:
+    """
+    Measure traced memory for one timeline build.
+
+    Args:
+        count: Number of objects
+        shared: Whether to intern regions and share metadata
+
+    Returns:
+        Dictionary with total and per-object bytes
+    """
+    clear_intern_pools()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    timeline = build_timeline(count, shared)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = after - before
+    result = {
+        'objects': len(timeline),
+        'total_bytes': total,
+        'peak_bytes': peak - before,
+        'bytes_per_object': total / count,
+    }
+    del timeline
+    return result
+
+
+def instance_sizes() -> Dict[str, int]:
+    """Shallow sizes of single instances of the value types."""
+    obj = SpacetimeObject(
+        id="x",
+        space=SpaceRegion(x=0, y=0, width=1, height=1),
+        time=TimeWindow(start=0, end=1)
+    )
+    return {
+        'SpaceRegion': sys.getsizeof(obj.space),
+        'TimeWindow': sys.getsizeof(obj.time),
+        'SpacetimeObject': sys.getsizeof(obj),
+        'slotted': not hasattr(obj, '__dict__'),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--objects', type=int, default=100_000,
+                        help='number of objects in the timeline')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"SPACETIME MEMORY BENCHMARK ({args.objects} objects)")
+    print("=" * 60)
+
+    sizes = instance_sizes()
+    print(f"Slotted value types: {sizes['slotted']}")
+    for name in ('SpaceRegion', 'TimeWindow', 'SpacetimeObject'):
+        print(f"  {name:<16} {sizes[name]:>5} bytes (shallow)")
+    print()
+
+    for label, shared in (("private values", False), ("interned/shared", True)):
+        result = measure(args.objects, shared)
+        print(f"{label:<16} {result['bytes_per_object']:>8.1f} bytes/object  "
+              f"(total {result['total_bytes'] / 1e6:.1f} MB, "
+              f"peak {result['peak_bytes'] / 1e6:.1f} MB)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,8 +9,8 @@ This layer is responsible for:
 - Business entities (Process, Memory, etc.)
 """
 
-from .story import Story, Chapter, SceneNarrative, NarrativeAction
-from .narrative import ShowCodeAction, TransformAction, HighlightAction, VoiceoverAction
+from .story import Story, Chapter, SceneNarrative
+from .narrative import NarrativeAction, ShowCodeAction, TransformAction, HighlightAction, VoiceoverAction
 
 __all__ = [
     'Story',
@@ -244,6 +244,39 @@ class MoveAction(NarrativeAction):
     def to_spacetime_object(self, start_time: float):
         return None
 
+    def apply_to(self, obj, start_time: float):
+        """
+        Give a spacetime object the motion of this move.
+
+        The target position is the object's new center, as with Manim's
+        move_to. Earlier motion is kept up to start_time.
+
+        Args:
+            obj: SpacetimeObject being moved
+            start_time: Start time of the move
+
+        Returns:
+            New moving SpacetimeObject
+        """
+        from ..spacetime.objects import SpacetimeObject, MotionPath
+
+        end_time = start_time + self.get_duration()
+        region = obj.region_at(start_time)
+        to_x = self.to_x - region.width / 2
+        to_y = self.to_y - region.height / 2
+        if obj.motion is None:
+            motion = MotionPath.linear(region, start_time, end_time, to_x, to_y)
+        else:
+            motion = obj.motion.then_move(start_time, end_time, to_x, to_y)
+
+        return SpacetimeObject.moving(
+            id=obj.id,
+            motion=motion,
+            time=obj.time,
+            layer=obj.layer,
+            metadata=obj.metadata
+        )
+
 
 @dataclass
 class MemoryDisplayAction(NarrativeAction):
@@ -150,13 +150,15 @@ class Story:
         Convert this story to a spacetime timeline.
 
         This is the bridge between the business layer and spacetime layer.
-        Each narrative action is converted to appropriate spacetime objects.
+        Each narrative action is converted to appropriate spacetime objects;
+        MoveActions give their target object a motion path.
 
         Returns:
             Timeline representing this story
         """
         from ..spacetime.objects import SpacetimeObject, SpaceRegion, TimeWindow
         from ..spacetime.timelines import Timeline, TimelineSegment, TimelineSequence
+        from .narrative import MoveAction
 
         sequence = TimelineSequence(name=self.title)
         current_time = 0.0
@@ -174,6 +176,13 @@ class Story:
                     if obj:
                         timeline.add(obj)
 
+                # Moves turn their target into a moving object
+                for action in scene.actions:
+                    if isinstance(action, MoveAction):
+                        target = timeline.get(action.target_id)
+                        if target is not None:
+                            timeline.replace(action.apply_to(target, scene_start))
+
                 current_time += scene.duration
 
             segment = TimelineSegment(
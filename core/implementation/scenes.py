@@ -4,7 +4,7 @@ Scene base classes that integrate the 4-layer architecture with Manim.
 Provides LayeredScene which uses spacetime timelines and the director
 to render animations with automatic conflict detection.
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
 try:
@@ -20,7 +20,9 @@ except ImportError:
         pass
 
 from ..spacetime.timelines import Timeline
-from ..spacetime.conflict_detection import ConflictDetector, ConflictReport
+from ..spacetime.conflict_detection import (
+    ConflictReport, IncrementalConflictDetector
+)
 from ..scheduler.director import Director, ManimDirector
 from ..business.story import Story
 
@@ -46,12 +48,14 @@ class LayeredScene(VoiceoverScene if MANIM_AVAILABLE else Scene):
             ...
     """
 
-    def __init__(self, story: Optional[Story] = None, **kwargs):
+    def __init__(self, story: Optional[Story] = None, concurrent: bool = False, **kwargs):
         """
         Initialize the layered scene.
 
         Args:
             story: Optional story to render
+            concurrent: Play overlapping animations together in one
+                group per time slice instead of one after another
             **kwargs: Additional arguments passed to Manim Scene
         """
         if MANIM_AVAILABLE:
@@ -61,10 +65,12 @@ class LayeredScene(VoiceoverScene if MANIM_AVAILABLE else Scene):
             pass
 
         self.story = story
+        self.concurrent = concurrent
         self.timeline: Optional[Timeline] = None
         self.director: Optional[ManimDirector] = None
-        self.conflict_detector: Optional[ConflictDetector] = None
+        self.conflict_detector: Optional[IncrementalConflictDetector] = None
         self.mobjects_map: Dict[str, Any] = {}  # Map object IDs to Manim mobjects
+        self._timeline_story: Optional[Story] = None
 
     def check_conflicts(
         self, timeline: Optional[Timeline] = None
@@ -72,11 +78,15 @@ class LayeredScene(VoiceoverScene if MANIM_AVAILABLE else Scene):
         """
         Check for spacetime conflicts in the timeline.
 
+        The detector is an IncrementalConflictDetector subscribed to the
+        timeline, so checking the same timeline again only pays for the
+        objects changed since. Checking another timeline replaces it.
+
         Args:
             timeline: Timeline to check (defaults to self.timeline)
 
         Returns:
-            ConflictReport with detected conflicts
+            Live ConflictReport of the timeline
         """
         if timeline is None:
             timeline = self.timeline
@@ -84,11 +94,12 @@ class LayeredScene(VoiceoverScene if MANIM_AVAILABLE else Scene):
         if timeline is None:
             raise ValueError("No timeline to check")
 
-        if self.conflict_detector is None:
-            self.conflict_detector = ConflictDetector()
-
-        report = self.conflict_detector.detect_conflicts(timeline)
-        return report
+        detector = self.conflict_detector
+        if detector is None or detector.timeline is not timeline:
+            if detector is not None:
+                detector.close()
+            self.conflict_detector = detector = IncrementalConflictDetector(timeline)
+        return detector.report
 
     def render_story(self, story: Optional[Story] = None) -> None:
         """
@@ -96,6 +107,10 @@ class LayeredScene(VoiceoverScene if MANIM_AVAILABLE else Scene):
 
         This is the main entry point for rendering.
 
+        Rendering the same story again reuses self.timeline, so objects
+        nudged on it since the last render are rechecked incrementally.
+        Set self.timeline to None to rebuild it from an edited story.
+
         Args:
             story: Story to render (defaults to self.story)
 
@@ -109,9 +124,9 @@ class LayeredScene(VoiceoverScene if MANIM_AVAILABLE else Scene):
             raise ValueError("No story to render")
 
         # Convert story to spacetime timeline
-        sequence = story.to_spacetime()
-        merged_timeline = sequence.merge_all()
-        self.timeline = merged_timeline
+        if self.timeline is None or story is not self._timeline_story:
+            self.timeline = story.to_spacetime().merge_all()
+            self._timeline_story = story
 
         # Check for conflicts
         report = self.check_conflicts()
@@ -121,7 +136,7 @@ class LayeredScene(VoiceoverScene if MANIM_AVAILABLE else Scene):
             raise ValueError("Cannot render with conflicts detected")
 
         # Create director and execute
-        self.director = ManimDirector(timeline=self.timeline)
+        self.director = ManimDirector(timeline=self.timeline, concurrent=self.concurrent)
         self.director.execute(self)
 
     def render_timeline(self, timeline: Timeline) -> None:
@@ -135,6 +150,7 @@ class LayeredScene(VoiceoverScene if MANIM_AVAILABLE else Scene):
             ValueError: If conflicts are detected
         """
         self.timeline = timeline
+        self._timeline_story = None
 
         # Check for conflicts
         report = self.check_conflicts()
@@ -144,97 +160,137 @@ class LayeredScene(VoiceoverScene if MANIM_AVAILABLE else Scene):
             raise ValueError("Cannot render with conflicts detected")
 
         # Create director and execute
-        self.director = ManimDirector(timeline=self.timeline)
+        self.director = ManimDirector(timeline=self.timeline, concurrent=self.concurrent)
         self.director.execute(self)
 
-    # Animation handlers - these will be called by the director
+    # Animation builders - return the animation for an instruction
+    # without playing it, so concurrent execution can group them
 
-    def _handle_show(self, instruction) -> None:
-        """Handle a 'show' animation instruction."""
-        obj_id = instruction.object_id
+    def _place(self, mobject: Any, instruction) -> None:
+        """Position, layer and register a mobject for an instruction."""
+        space = instruction.parameters.get('space')
+        if space:
+            mobject.move_to([space.center[0], space.center[1], 0])
+        # Concurrent groups start objects out of layer order, so there the
+        # layer must drive drawing order; serial mode keeps insertion order
+        if self.concurrent:
+            mobject.set_z_index(instruction.parameters.get('layer', 0))
+
+        self.mobjects_map[instruction.object_id] = mobject
+        if self.director:
+            self.director.register_mobject(instruction.object_id, mobject)
+
+    def _build_show(self, instruction) -> Optional[Any]:
+        """Build the animation for a 'show' instruction."""
         params = instruction.parameters
         obj_type = params.get('type', 'unknown')
-        space = params.get('space')
-        layer = params.get('layer', 0)
 
         # Create appropriate mobject based on type
         mobject = self._create_mobject(obj_type, params)
 
         if mobject is None:
-            return
+            return None
 
-        # Position the mobject
-        if space:
-            mobject.move_to([space.center[0], space.center[1], 0])
-
-        # Add to scene
-        self.play(FadeIn(mobject), run_time=instruction.duration)
-
-        # Register mobject
-        self.mobjects_map[obj_id] = mobject
-        if self.director:
-            self.director.register_mobject(obj_id, mobject)
+        self._place(mobject, instruction)
+        return FadeIn(mobject, run_time=instruction.duration)
 
-    def _handle_show_code(self, instruction) -> None:
-        """Handle a 'show_code' animation instruction."""
+    def _build_show_code(self, instruction) -> Optional[Any]:
+        """Build the animation for a 'show_code' instruction."""
         from .mobjects.code import CodeDisplay
 
         code = instruction.parameters.get('code', '')
         language = instruction.parameters.get('language', 'C')
-        space = instruction.parameters.get('space')
 
         mobject = CodeDisplay(code=code, language=language)
+        self._place(mobject, instruction)
+        return FadeIn(mobject, run_time=instruction.duration)
 
-        if space:
-            mobject.move_to([space.center[0], space.center[1], 0])
-
-        self.play(FadeIn(mobject), run_time=instruction.duration)
-
-        self.mobjects_map[instruction.object_id] = mobject
-        if self.director:
-            self.director.register_mobject(instruction.object_id, mobject)
-
-    def _handle_show_memory(self, instruction) -> None:
-        """Handle a 'show_memory' animation instruction."""
+    def _build_show_memory(self, instruction) -> Optional[Any]:
+        """Build the animation for a 'show_memory' instruction."""
         from .mobjects.memory import MemoryViz
 
         cells = instruction.parameters.get('cells', 16)
         rows = instruction.parameters.get('rows', 1)
         values = instruction.parameters.get('values')
         highlight_cells = instruction.parameters.get('highlight_cells', [])
-        space = instruction.parameters.get('space')
 
         mobject = MemoryViz(cells=cells, rows=rows, values=values,
                           highlight_cells=highlight_cells)
+        self._place(mobject, instruction)
+        return FadeIn(mobject, run_time=instruction.duration)
 
-        if space:
-            mobject.move_to([space.center[0], space.center[1], 0])
-
-        self.play(FadeIn(mobject), run_time=instruction.duration)
-
-        self.mobjects_map[instruction.object_id] = mobject
-        if self.director:
-            self.director.register_mobject(instruction.object_id, mobject)
-
-    def _handle_show_register(self, instruction) -> None:
-        """Handle a 'show_register' animation instruction."""
+    def _build_show_register(self, instruction) -> Optional[Any]:
+        """Build the animation for a 'show_register' instruction."""
         from .mobjects.registers import RegisterDisplay
 
         name = instruction.parameters.get('name', 'REG')
         value = instruction.parameters.get('value', 0)
         bits = instruction.parameters.get('bits', 32)
-        space = instruction.parameters.get('space')
 
         mobject = RegisterDisplay(name=name, value=value, bits=bits)
+        self._place(mobject, instruction)
+        return FadeIn(mobject, run_time=instruction.duration)
 
-        if space:
-            mobject.move_to([space.center[0], space.center[1], 0])
+    def _build_move(self, instruction) -> Optional[Any]:
+        """Build the animation for a 'move' instruction."""
+        mobject = self.mobjects_map.get(instruction.object_id)
+        if mobject is None:
+            return None
 
-        self.play(FadeIn(mobject), run_time=instruction.duration)
+        to = instruction.parameters.get('to', {})
+        return (mobject.animate(run_time=instruction.duration)
+                .move_to([to.get('x', 0), to.get('y', 0), 0])
+                .build())
 
-        self.mobjects_map[instruction.object_id] = mobject
-        if self.director:
-            self.director.register_mobject(instruction.object_id, mobject)
+    def play_concurrent(self, entries: List[Tuple[float, Any]], run_time: float) -> None:
+        """
+        Play animations together, each from its own offset.
+
+        Every animation is started inside one AnimationGroup after a
+        Wait of its offset, so the group runs for exactly run_time and
+        begins each animation only when it is reached.
+
+        Args:
+            entries: (offset into the slice, animation) pairs
+            run_time: Length of the slice
+        """
+        if run_time <= 0:
+            # Zero-length slice: nothing to animate, just show the results
+            self.add(*(animation.mobject for _, animation in entries))
+            return
+
+        group = [
+            Succession(Wait(run_time=offset), animation) if offset > 0 else animation
+            for offset, animation in entries
+        ]
+        self.play(AnimationGroup(*group))
+
+    # Animation handlers - these will be called by the director
+
+    def _play_built(self, animation: Optional[Any]) -> None:
+        """Play an animation returned by a builder, if any."""
+        if animation is not None:
+            self.play(animation)
+
+    def _handle_show(self, instruction) -> None:
+        """Handle a 'show' animation instruction."""
+        self._play_built(self._build_show(instruction))
+
+    def _handle_show_code(self, instruction) -> None:
+        """Handle a 'show_code' animation instruction."""
+        self._play_built(self._build_show_code(instruction))
+
+    def _handle_show_memory(self, instruction) -> None:
+        """Handle a 'show_memory' animation instruction."""
+        self._play_built(self._build_show_memory(instruction))
+
+    def _handle_show_register(self, instruction) -> None:
+        """Handle a 'show_register' animation instruction."""
+        self._play_built(self._build_show_register(instruction))
+
+    def _handle_move(self, instruction) -> None:
+        """Handle a 'move' animation instruction."""
+        self._play_built(self._build_move(instruction))
 
     def _handle_default(self, instruction) -> None:
         """Default handler for unknown animation types."""
@@ -273,6 +329,7 @@ class SceneBuilder:
         self.scene_class = scene_class
         self.story: Optional[Story] = None
         self.timeline: Optional[Timeline] = None
+        self._live_detector: Optional[IncrementalConflictDetector] = None
 
     def with_story(self, story: Story) -> 'SceneBuilder':
         """Set the story to render."""
@@ -281,16 +338,25 @@ class SceneBuilder:
 
     def with_timeline(self, timeline: Timeline) -> 'SceneBuilder':
         """Set the timeline to render."""
+        if self._live_detector is not None:
+            self._live_detector.close()
+            self._live_detector = None
         self.timeline = timeline
         return self
 
     def check_conflicts(self) -> ConflictReport:
-        """Check the timeline for conflicts."""
+        """
+        Check the timeline for conflicts.
+
+        The first call builds an incremental detector that follows the
+        timeline's edits, so later calls only pay for what changed.
+        """
         if self.timeline is None:
             raise ValueError("No timeline set")
 
-        detector = ConflictDetector()
-        return detector.detect_conflicts(self.timeline)
+        if self._live_detector is None:
+            self._live_detector = IncrementalConflictDetector(self.timeline)
+        return self._live_detector.report
 
     def build(self) -> LayeredScene:
         """Build and return the scene instance."""
@@ -11,13 +11,20 @@ This layer is responsible for:
 """
 
 from .director import Director, AnimationPlan
+from .plan_cache import PlanCache
+from .registry import InstructionRegistry, default_registry
 from .voiceover_sync import VoiceoverSyncer, Transcript, Bookmark
 from .bookmarks import BookmarkManager
 from .animation_plans import AnimationSequence, ParallelAnimation, SerialAnimation
+from .optimizer import PlanOptimizer, OptimizationPass, OptimizationReport
+from .schedule import CompiledSchedule, ScheduleEntry, BranchSlack
 
 __all__ = [
     'Director',
     'AnimationPlan',
+    'PlanCache',
+    'InstructionRegistry',
+    'default_registry',
     'VoiceoverSyncer',
     'Transcript',
     'Bookmark',
@@ -25,4 +32,10 @@ __all__ = [
     'AnimationSequence',
     'ParallelAnimation',
     'SerialAnimation',
+    'PlanOptimizer',
+    'OptimizationPass',
+    'OptimizationReport',
+    'CompiledSchedule',
+    'ScheduleEntry',
+    'BranchSlack',
 ]
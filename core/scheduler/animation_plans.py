@@ -5,10 +5,76 @@ Provides abstractions for composing complex animation sequences
 from simpler building blocks.
 """
 from dataclasses import dataclass, field
-from typing import List, Any, Optional, Union
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Union
 from abc import ABC, abstractmethod
 from enum import Enum
 
+from ..spacetime.objects import SpaceRegion, MotionPath
+
+# Bumped on every attribute write to any sequence and every change to a
+# composite's sequences list. Composites cache their duration against
+# it, so an edit anywhere below them (shared subtrees included)
+# invalidates the cache without parent links.
+_revision = 0
+
+
+def _bump() -> None:
+    global _revision
+    _revision += 1
+
+
+class _SequenceList(list):
+    """List of child sequences that reports every change."""
+
+    def __setitem__(self, index, value):
+        _bump()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        _bump()
+        super().__delitem__(index)
+
+    def __iadd__(self, other):
+        _bump()
+        return super().__iadd__(other)
+
+    def __imul__(self, count):
+        _bump()
+        return super().__imul__(count)
+
+    def append(self, value):
+        _bump()
+        super().append(value)
+
+    def extend(self, values):
+        _bump()
+        super().extend(values)
+
+    def insert(self, index, value):
+        _bump()
+        super().insert(index, value)
+
+    def pop(self, index=-1):
+        _bump()
+        return super().pop(index)
+
+    def remove(self, value):
+        _bump()
+        super().remove(value)
+
+    def clear(self):
+        _bump()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        _bump()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        _bump()
+        super().reverse()
+
 
 class AnimationType(Enum):
     """Types of animation compositions."""
@@ -26,6 +92,16 @@ class AnimationSequence(ABC):
     creating complex animations.
     """
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        _bump()
+        if name == 'sequences' and type(value) is not _SequenceList:
+            # Composites' children are kept in a list that reports edits
+            value = _SequenceList(value)
+        object.__setattr__(self, name, value)
+
+    # Leaf animations declare `duration` as a dataclass field;
+    # composites compute it
+    @property
     @abstractmethod
     def duration(self) -> float:
         """Get the total duration of this sequence."""
@@ -72,6 +148,16 @@ class AnimationSequence(ABC):
         """
         return SerialAnimation([DelayAnimation(delay), self])
 
+    def compile(self) -> 'CompiledSchedule':
+        """
+        Compile this sequence into a flat, indexed schedule.
+
+        Returns:
+            Immutable CompiledSchedule of the leaf animations
+        """
+        from .schedule import compile_sequence
+        return compile_sequence(self)
+
 
 @dataclass
 class DelayAnimation(AnimationSequence):
@@ -84,6 +170,7 @@ class DelayAnimation(AnimationSequence):
 
     delay: float
 
+    @property
     def duration(self) -> float:
         return self.delay
 
@@ -102,13 +189,22 @@ class SerialAnimation(AnimationSequence):
 
     sequences: List[AnimationSequence] = field(default_factory=list)
 
+    @property
     def duration(self) -> float:
-        return sum(seq.duration() for seq in self.sequences)
+        return _composite_duration(self)
 
     def to_list(self) -> List[Any]:
+        # Walk nested serials with a stack: then() chains nest one level per call
         result = []
-        for seq in self.sequences:
-            result.extend(seq.to_list())
+        stack = [iter(self.sequences)]
+        while stack:
+            for seq in stack[-1]:
+                if isinstance(seq, SerialAnimation):
+                    stack.append(iter(seq.sequences))
+                    break
+                result.extend(seq.to_list())
+            else:
+                stack.pop()
         return result
 
     def add(self, sequence: AnimationSequence) -> None:
@@ -127,15 +223,42 @@ class ParallelAnimation(AnimationSequence):
 
     sequences: List[AnimationSequence] = field(default_factory=list)
 
+    @property
     def duration(self) -> float:
-        if not self.sequences:
-            return 0.0
-        return max(seq.duration() for seq in self.sequences)
+        return _composite_duration(self)
 
     def to_list(self) -> List[Any]:
-        # Flatten parallel animations into a single entry
-        flat = [seq.to_list() for seq in self.sequences]
-        return [{'type': 'parallel', 'animations': flat}]
+        # Flatten parallel animations into a single entry. Nested
+        # composites are walked with a stack: and_() chains nest one
+        # level per call. Each frame is (children, output list, is_serial).
+        root: List[Any] = []
+        stack = [(iter(self.sequences), root, False)]
+        while stack:
+            children, out, is_serial = stack[-1]
+            for seq in children:
+                if isinstance(seq, SerialAnimation):
+                    # A serial child's entries are spliced into its parent's list
+                    target = out if is_serial else []
+                    if not is_serial:
+                        out.append(target)
+                    stack.append((iter(seq.sequences), target, True))
+                    break
+                if isinstance(seq, ParallelAnimation):
+                    flat: List[Any] = []
+                    entry = [{'type': 'parallel', 'animations': flat}]
+                    if is_serial:
+                        out.extend(entry)
+                    else:
+                        out.append(entry)
+                    stack.append((iter(seq.sequences), flat, False))
+                    break
+                if is_serial:
+                    out.extend(seq.to_list())
+                else:
+                    out.append(seq.to_list())
+            else:
+                stack.pop()
+        return [{'type': 'parallel', 'animations': root}]
 
     def add(self, sequence: AnimationSequence) -> None:
         """Add a sequence to execute in parallel."""
@@ -159,9 +282,6 @@ class ShowAnimation(AnimationSequence):
     parameters: dict = field(default_factory=dict)
     duration: float = 1.0
 
-    def duration(self) -> float:
-        return self.duration
-
     def to_list(self) -> List[Any]:
         return [{
             'type': 'show',
@@ -187,9 +307,6 @@ class TransformAnimation(AnimationSequence):
     to_id: str
     duration: float = 1.0
 
-    def duration(self) -> float:
-        return self.duration
-
     def to_list(self) -> List[Any]:
         return [{
             'type': 'transform',
@@ -214,9 +331,6 @@ class FadeAnimation(AnimationSequence):
     fade_in: bool = True
     duration: float = 0.5
 
-    def duration(self) -> float:
-        return self.duration
-
     def to_list(self) -> List[Any]:
         return [{
             'type': 'fade_in' if self.fade_in else 'fade_out',
@@ -242,8 +356,26 @@ class MoveAnimation(AnimationSequence):
     to_y: float
     duration: float = 1.0
 
-    def duration(self) -> float:
-        return self.duration
+    def to_motion(self, region: SpaceRegion, start_time: float) -> MotionPath:
+        """
+        Get the spacetime motion path of this move.
+
+        The target position is the object's new center.
+
+        Args:
+            region: SpaceRegion of the object when the move starts
+            start_time: Start time of the move
+
+        Returns:
+            MotionPath from the region to the target
+        """
+        return MotionPath.linear(
+            region,
+            start_time,
+            start_time + self.duration,
+            self.to_x - region.width / 2,
+            self.to_y - region.height / 2
+        )
 
     def to_list(self) -> List[Any]:
         return [{
@@ -269,9 +401,6 @@ class ScaleAnimation(AnimationSequence):
     scale_factor: float = 1.0
     duration: float = 0.5
 
-    def duration(self) -> float:
-        return self.duration
-
     def to_list(self) -> List[Any]:
         return [{
             'type': 'scale',
@@ -298,9 +427,6 @@ class HighlightAnimation(AnimationSequence):
     scale: float = 1.2
     duration: float = 0.5
 
-    def duration(self) -> float:
-        return self.duration
-
     def to_list(self) -> List[Any]:
         return [{
             'type': 'highlight',
@@ -324,9 +450,6 @@ class RemoveAnimation(AnimationSequence):
     object_id: str
     duration: float = 0.0
 
-    def duration(self) -> float:
-        return self.duration
-
     def to_list(self) -> List[Any]:
         return [{
             'type': 'remove',
@@ -346,13 +469,65 @@ class WaitAnimation(AnimationSequence):
 
     duration: float = 1.0
 
-    def duration(self) -> float:
-        return self.duration
-
     def to_list(self) -> List[Any]:
         return [{'type': 'wait', 'duration': self.duration}]
 
 
+@lru_cache(maxsize=None)
+def is_composite(cls: type) -> bool:
+    """Whether a sequence class is a Serial/ParallelAnimation (cached per class)."""
+    return issubclass(cls, (SerialAnimation, ParallelAnimation))
+
+
+def _composite_duration(node: AnimationSequence) -> float:
+    """Duration of a composite, cached until the next edit to any sequence."""
+    cached = node.__dict__.get('_duration')
+    if cached is not None and cached[0] == _revision:
+        return cached[1]
+    return composite_durations(node)[id(node)]
+
+
+def composite_durations(root: AnimationSequence) -> Dict[int, float]:
+    """
+    Compute the duration of every composite in a tree, bottom-up.
+
+    Uses an explicit stack, so deeply nested trees (long then() chains)
+    cannot hit the recursion limit, and subtrees shared by several
+    parents are measured once. Each composite also keeps its duration
+    for later `duration` reads, until a sequence is edited.
+
+    Args:
+        root: Root of the tree
+
+    Returns:
+        id() of each SerialAnimation/ParallelAnimation -> its duration
+    """
+    durations: Dict[int, float] = {}
+    if not is_composite(type(root)):
+        return durations
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in durations:
+            continue
+        if not expanded:
+            stack.append((node, True))
+            for seq in node.sequences:
+                if is_composite(type(seq)) and id(seq) not in durations:
+                    stack.append((seq, False))
+            continue
+        values = [durations[id(seq)] if is_composite(type(seq)) else seq.duration
+                  for seq in node.sequences]
+        if isinstance(node, SerialAnimation):
+            value = sum(values)
+        else:
+            value = max(values) if values else 0.0
+        durations[id(node)] = value
+        # Written around __setattr__, which would bump the revision
+        node.__dict__['_duration'] = (_revision, value)
+    return durations
+
+
 # Convenience functions for creating animations
 
 def show(object_id: str, object_type: str, **params) -> ShowAnimation:
@@ -5,7 +5,7 @@ The Director is responsible for converting spacetime timelines
 into actual Manim animations and executing them in the correct order.
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Iterable, Callable
 from abc import ABC, abstractmethod
 
 from ..spacetime.objects import SpacetimeObject, TimeWindow
@@ -77,22 +77,44 @@ class Director:
         timeline: Spacetime timeline to execute
         voiceover_syncer: Optional voiceover synchronization
         bookmark_manager: Optional bookmark manager
+        concurrent: Play overlapping instructions together (see execute)
+        plan_cache: Optional PlanCache reusing compiled plans
+        registry: InstructionRegistry of compilers and handlers
+        optimizer: Optional PlanOptimizer run on every plan created
+        last_optimization: OptimizationReport of the latest optimized plan, or None
     """
 
     def __init__(
         self,
         timeline: Optional[Timeline] = None,
         voiceover_syncer: Optional['VoiceoverSyncer'] = None,
-        bookmark_manager: Optional['BookmarkManager'] = None
+        bookmark_manager: Optional['BookmarkManager'] = None,
+        concurrent: bool = False,
+        plan_cache: Optional['PlanCache'] = None,
+        registry: Optional['InstructionRegistry'] = None,
+        optimizer: Optional['PlanOptimizer'] = None
     ):
         self.timeline = timeline
         self.voiceover_syncer = voiceover_syncer
         self.bookmark_manager = bookmark_manager
+        self.concurrent = concurrent
+        self.plan_cache = plan_cache
+        if registry is None:
+            from .registry import default_registry
+            registry = default_registry
+        self.registry = registry
+        self.optimizer = optimizer
+        self.last_optimization: Optional['OptimizationReport'] = None
 
     def create_animation_plan(self, timeline: Optional[Timeline] = None) -> AnimationPlan:
         """
         Create an animation plan from a timeline.
 
+        With a plan cache, unchanged timelines reuse their compiled plan
+        and only changed objects are recompiled. With an optimizer, the
+        plan is optimized here, so execute() and get_timing_breakdown()
+        see the same plan; the report is kept in last_optimization.
+
         Args:
             timeline: Timeline to create plan from (uses self.timeline if None)
 
@@ -105,11 +127,47 @@ class Director:
         if timeline is None:
             raise ValueError("No timeline provided")
 
+        if self.plan_cache is not None:
+            plan = self.plan_cache.get_plan(self, timeline)
+        else:
+            plan = self.assemble_plan(self.compile_object(obj) for obj in timeline.objects)
+
+        if self.optimizer is not None:
+            plan, self.last_optimization = self.optimizer.optimize_plan(plan)
+        return plan
+
+    def compile_object(self, obj: SpacetimeObject) -> List[AnimationInstruction]:
+        """
+        Convert one spacetime object to all of its instructions.
+
+        Args:
+            obj: SpacetimeObject to convert
+
+        Returns:
+            List of AnimationInstruction objects
+        """
+        instructions = self._object_to_instructions(obj)
+        if obj.motion is not None:
+            instructions.extend(self._motion_to_instructions(obj))
+        return instructions
+
+    def assemble_plan(
+        self, instruction_lists: Iterable[List[AnimationInstruction]]
+    ) -> AnimationPlan:
+        """
+        Build a sorted, voiceover-synced plan from compiled instructions.
+
+        The voiceover syncer may edit the instructions in place.
+
+        Args:
+            instruction_lists: Instructions of each object, in timeline order
+
+        Returns:
+            AnimationPlan with sorted animation instructions
+        """
         plan = AnimationPlan()
 
-        # Convert each spacetime object to animation instructions
-        for obj in timeline.objects:
-            instructions = self._object_to_instructions(obj)
+        for instructions in instruction_lists:
             for instr in instructions:
                 plan.add_animation(instr)
 
@@ -128,76 +186,56 @@ class Director:
         """
         Convert a spacetime object to animation instructions.
 
+        Uses the compiler registered for the object's type.
+
         Args:
             obj: SpacetimeObject to convert
 
         Returns:
             List of AnimationInstruction objects
         """
-        instructions = []
+        # Moving objects appear where their path starts
+        space = obj.region_at(obj.time.start)
+        return self.registry.compiler_for(obj.object_type)(obj, space)
 
-        obj_type = obj.object_type
+    def _motion_to_instructions(
+        self, obj: SpacetimeObject
+    ) -> List[AnimationInstruction]:
+        """
+        Convert a moving object's path to 'move' instructions.
 
-        # Create instruction based on object type
-        if obj_type == 'code_display':
-            instructions.append(AnimationInstruction(
-                object_id=obj.id,
-                action_type='show_code',
-                start_time=obj.time.start,
-                duration=obj.time.duration,
-                parameters={
-                    'code': obj.metadata.get('code', ''),
-                    'language': obj.metadata.get('language', 'C'),
-                    'space': obj.space,
-                    'layer': obj.layer
-                }
-            ))
+        Each keyframe segment inside the object's time window that
+        changes position becomes one move to the segment's end position
+        (given as the center, like MoveAnimation).
 
-        elif obj_type == 'memory_display':
-            instructions.append(AnimationInstruction(
-                object_id=obj.id,
-                action_type='show_memory',
-                start_time=obj.time.start,
-                duration=obj.time.duration,
-                parameters={
-                    'cells': obj.metadata.get('cells', 16),
-                    'rows': obj.metadata.get('rows', 1),
-                    'values': obj.metadata.get('values'),
-                    'highlight_cells': obj.metadata.get('highlight_cells', []),
-                    'space': obj.space,
-                    'layer': obj.layer
-                }
-            ))
+        Args:
+            obj: SpacetimeObject with a motion path
 
-        elif obj_type == 'register_display':
+        Returns:
+            List of AnimationInstruction objects
+        """
+        instructions = []
+        motion = obj.motion
+        times = [obj.time.start, *motion.breakpoints(obj.time.start, obj.time.end),
+                 obj.time.end]
+
+        for t0, t1 in zip(times, times[1:]):
+            start = motion.position_at(t0)
+            end = motion.position_at(t1)
+            if t1 <= t0 or start == end:
+                continue
             instructions.append(AnimationInstruction(
                 object_id=obj.id,
-                action_type='show_register',
-                start_time=obj.time.start,
-                duration=obj.time.duration,
+                action_type='move',
+                start_time=t0,
+                duration=t1 - t0,
                 parameters={
-                    'name': obj.metadata.get('name', 'REG'),
-                    'value': obj.metadata.get('value', 0),
-                    'bits': obj.metadata.get('bits', 32),
-                    'space': obj.space,
+                    'to': {'x': end[0] + motion.width / 2,
+                           'y': end[1] + motion.height / 2},
                     'layer': obj.layer
                 }
             ))
 
-        else:
-            # Generic show instruction
-            instructions.append(AnimationInstruction(
-                object_id=obj.id,
-                action_type='show',
-                start_time=obj.time.start,
-                duration=obj.time.duration,
-                parameters={
-                    'space': obj.space,
-                    'layer': obj.layer,
-                    'metadata': obj.metadata
-                }
-            ))
-
         return instructions
 
     def execute(self, scene, timeline: Optional[Timeline] = None) -> None:
@@ -206,18 +244,124 @@ class Director:
 
         This is the main entry point for rendering.
 
+        In serial mode every instruction plays on its own and each layer
+        of a time group waits for its longest animation. In concurrent
+        mode overlapping instructions are played as one group per time
+        slice, each starting at its own offset, so the scene runs for
+        exactly the plan's total duration.
+
         Args:
             scene: Manim scene object
             timeline: Timeline to execute (uses self.timeline if None)
         """
         plan = self.create_animation_plan(timeline)
 
+        # Resolve every action type to its scene callable once
+        action_types = {a.action_type for a in plan.animations}
+        handlers = self.registry.bind_handlers(scene, action_types)
+
+        if self.concurrent:
+            builders = self.registry.bind_builders(scene, action_types)
+            self._execute_concurrent(scene, plan, handlers, builders)
+            return
+
         # Group animations by time for efficient execution
         time_groups = self._group_by_time(plan)
 
         # Execute each time group
         for time, animations in time_groups:
-            self._execute_at_time(scene, time, animations)
+            self._execute_at_time(scene, time, animations, handlers)
+
+    def _time_slices(
+        self, plan: AnimationPlan
+    ) -> List[Tuple[float, float, List[AnimationInstruction]]]:
+        """
+        Split a sorted plan into runs of overlapping instructions.
+
+        A slice extends while the next instruction starts before every
+        instruction so far has ended, so slices never overlap and the
+        gaps between them contain no animation.
+
+        Args:
+            plan: Animation plan sorted by start time
+
+        Returns:
+            List of (start, end, instructions) tuples sorted by time
+        """
+        slices = []
+        current: List[AnimationInstruction] = []
+        start = end = 0.0
+
+        for anim in plan.animations:
+            if current and anim.start_time >= end:
+                slices.append((start, end, current))
+                current = []
+            if not current:
+                start = end = anim.start_time
+            current.append(anim)
+            end = max(end, anim.end_time)
+
+        if current:
+            slices.append((start, end, current))
+
+        return slices
+
+    def _execute_concurrent(
+        self,
+        scene,
+        plan: AnimationPlan,
+        handlers: Dict[str, Optional[Callable]],
+        builders: Dict[str, Optional[Callable]]
+    ) -> None:
+        """
+        Play each time slice of a plan as one concurrent group.
+
+        Instructions are turned into animations by their builders
+        (registered, or the scene's `_build_<action_type>` methods) and
+        handed to scene.play_concurrent() with their offsets into the
+        slice. Instructions without a builder fall back to their handler
+        and play on their own. Gaps between slices become waits.
+
+        Args:
+            scene: Scene providing builders and play_concurrent()
+            plan: Animation plan sorted by start time
+            handlers: Bound handlers by action type
+            builders: Bound builders by action type
+
+        Raises:
+            ValueError: If the scene cannot play concurrent groups
+        """
+        play_concurrent = getattr(scene, 'play_concurrent', None)
+        if play_concurrent is None:
+            raise ValueError(
+                f"{type(scene).__name__} does not support concurrent execution"
+            )
+
+        clock = 0.0
+        for start, end, instructions in self._time_slices(plan):
+            if start > clock:
+                scene.wait(start - clock)
+
+            # Build bottom layers first so they register before the
+            # objects drawn over them
+            entries = []
+            for instruction in sorted(instructions,
+                                      key=lambda a: a.parameters.get('layer', 0)):
+                builder = builders[instruction.action_type]
+                if builder is None:
+                    handler = handlers[instruction.action_type]
+                    if handler is not None:
+                        handler(instruction)
+                    continue
+                animation = builder(instruction)
+                if animation is not None:
+                    entries.append((instruction.start_time - start, animation))
+
+            if entries:
+                play_concurrent(entries, end - start)
+            elif end > start:
+                scene.wait(end - start)
+            clock = max(clock, end)
 
     def _group_by_time(
         self, plan: AnimationPlan
@@ -252,7 +396,8 @@ class Director:
         self,
         scene,
         time: float,
-        animations: List[AnimationInstruction]
+        animations: List[AnimationInstruction],
+        handlers: Optional[Dict[str, Optional[Callable]]] = None
     ) -> None:
         """
         Execute a group of animations at a specific time.
@@ -261,7 +406,12 @@ class Director:
             scene: Manim scene
             time: Current time
             animations: Animations to execute
+            handlers: Bound handlers by action type (resolved if None)
         """
+        if handlers is None:
+            handlers = self.registry.bind_handlers(
+                scene, {a.action_type for a in animations})
+
         # Group by layer for proper z-ordering
         by_layer: Dict[int, List[AnimationInstruction]] = {}
         for anim in animations:
@@ -274,7 +424,9 @@ class Director:
         for layer in sorted(by_layer.keys()):
             layer_animations = by_layer[layer]
             for anim in layer_animations:
-                self._execute_instruction(scene, anim)
+                handler = handlers[anim.action_type]
+                if handler is not None:
+                    handler(anim)
 
             # Wait for all animations in this layer to complete
             if layer_animations:
@@ -285,27 +437,17 @@ class Director:
         """
         Execute a single animation instruction.
 
-        This is a bridge method that will be implemented by the
-        concrete scene class in the implementation layer.
+        Resolves the handler through the registry on every call; plans
+        are executed with handlers bound once instead.
 
         Args:
             scene: Manim scene
             instruction: Animation instruction to execute
         """
-        # The actual implementation will be in LayeredScene
-        # This method serves as documentation of the interface
-        handler_name = f"_handle_{instruction.action_type}"
-        handler = getattr(scene, handler_name, None)
-
-        if handler is None:
-            # Default handler
-            handler = getattr(scene, '_handle_default', None)
-
-        if handler:
+        handler = self.registry.bind_handlers(
+            scene, [instruction.action_type])[instruction.action_type]
+        if handler is not None:
             handler(instruction)
-        else:
-            # No handler found, skip
-            pass
 
     def get_timing_breakdown(
         self, timeline: Optional[Timeline] = None
@@ -349,6 +491,7 @@ class Director:
         return {
             'total_duration': plan.total_duration,
             'total_animations': len(plan.animations),
+            'time_slices': len(self._time_slices(plan)),
             'by_type': type_stats,
             'layers': len(set(a.parameters.get('layer', 0) for a in plan.animations))
         }
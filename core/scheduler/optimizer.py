@@ -0,0 +1,613 @@
+"""
+Optimizing passes over animation plans and sequence trees.
+
+A PlanOptimizer runs a pipeline of passes over an AnimationPlan before
+the Director executes it, or over an AnimationSequence tree. Passes
+remove work that cannot be seen (animations shorter than a frame) and
+merge work that can be done in one step. Each pass reports how many
+frames it saved.
+"""
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Callable, Tuple, Any
+from abc import ABC
+
+from .director import AnimationPlan, AnimationInstruction
+from .animation_plans import (
+    AnimationSequence, SerialAnimation, ParallelAnimation, DelayAnimation,
+    WaitAnimation, ShowAnimation, RemoveAnimation, FadeAnimation,
+    TransformAnimation, ScaleAnimation
+)
+
+
+# Times closer than this are treated as equal
+EPSILON = 1e-9
+
+
+def _animation_frames(duration: float, fps: float) -> int:
+    """Frames rendered by one play call (at least one if it animates)."""
+    if duration <= 0:
+        return 0
+    return max(1, round(duration * fps))
+
+
+def plan_frames(plan: AnimationPlan, fps: float = 60.0) -> int:
+    """
+    Frames rendered for a plan's instructions.
+
+    Counts every instruction as its own play call, as in serial
+    execution, so sub-frame instructions still cost a frame each.
+
+    Args:
+        plan: Animation plan
+        fps: Frame rate
+
+    Returns:
+        Frame count
+    """
+    return sum(_animation_frames(a.duration, fps) for a in plan.animations)
+
+
+def sequence_frames(sequence: AnimationSequence, fps: float = 60.0) -> int:
+    """
+    Frames rendered for a sequence tree.
+
+    Serial children add up, parallel children cost their longest
+    branch, and every animated leaf costs at least one frame.
+
+    Args:
+        sequence: Sequence tree
+        fps: Frame rate
+
+    Returns:
+        Frame count
+    """
+    def leaf(seq: AnimationSequence) -> int:
+        if isinstance(seq, (WaitAnimation, DelayAnimation)):
+            return round(seq.duration * fps)
+        return _animation_frames(seq.duration, fps)
+
+    return _fold(sequence, leaf, sum, lambda frames: max(frames, default=0))
+
+
+def _children(node: AnimationSequence) -> List[AnimationSequence]:
+    """Children of a composite, with nested serials of a serial inlined."""
+    if not isinstance(node, SerialAnimation):
+        return node.sequences
+    flat = []
+    stack = [iter(node.sequences)]
+    while stack:
+        for seq in stack[-1]:
+            if isinstance(seq, SerialAnimation):
+                stack.append(iter(seq.sequences))
+                break
+            flat.append(seq)
+        else:
+            stack.pop()
+    return flat
+
+
+def _fold(
+    sequence: AnimationSequence,
+    leaf: Callable[[AnimationSequence], Any],
+    serial_node: Callable[[List[Any]], Any],
+    parallel_node: Callable[[List[Any]], Any]
+) -> Any:
+    """
+    Combine a tree bottom-up with an explicit stack.
+
+    then() and and_() chains nest one level per call, so deep trees
+    must not recurse. Nested serials are inlined into their parent
+    serial first, so a then() chain is a single serial node.
+
+    Args:
+        sequence: Root of the tree
+        leaf: Value of a leaf animation
+        serial_node: Value of a serial node from its children's values
+        parallel_node: Value of a parallel node from its children's values
+
+    Returns:
+        Value of the root
+    """
+    if not isinstance(sequence, (SerialAnimation, ParallelAnimation)):
+        return leaf(sequence)
+    result: List[Any] = []
+    # (node, remaining children, values of the children done so far)
+    stack = [(sequence, iter(_children(sequence)), [])]
+    while stack:
+        node, children, values = stack[-1]
+        for seq in children:
+            if isinstance(seq, (SerialAnimation, ParallelAnimation)):
+                stack.append((seq, iter(_children(seq)), []))
+                break
+            values.append(leaf(seq))
+        else:
+            stack.pop()
+            combine = serial_node if isinstance(node, SerialAnimation) else parallel_node
+            (stack[-1][2] if stack else result).append(combine(values))
+    return result[0]
+
+
+@dataclass
+class PassStats:
+    """
+    What one pass changed.
+
+    Attributes:
+        name: Pass name
+        removed: Instructions or animations dropped
+        merged: Instructions or animations folded into others
+        frames_saved: Frames saved by the pass
+    """
+
+    name: str
+    removed: int = 0
+    merged: int = 0
+    frames_saved: int = 0
+
+
+@dataclass
+class OptimizationReport:
+    """
+    Statistics of an optimizer run.
+
+    Attributes:
+        passes: Statistics of each pass, in pipeline order
+        frames_before: Frames before the first pass
+        frames_after: Frames after the last pass
+    """
+
+    passes: List[PassStats] = field(default_factory=list)
+    frames_before: int = 0
+    frames_after: int = 0
+
+    @property
+    def frames_saved(self) -> int:
+        """Frames saved by the whole pipeline."""
+        return self.frames_before - self.frames_after
+
+    def by_pass(self) -> Dict[str, int]:
+        """Frames saved per pass name."""
+        return {stats.name: stats.frames_saved for stats in self.passes}
+
+    def print_report(self) -> None:
+        """Print a per-pass summary."""
+        print(f"Optimization: {self.frames_before} -> {self.frames_after} frames "
+              f"({self.frames_saved} saved)")
+        for stats in self.passes:
+            print(f"  {stats.name:20s} removed={stats.removed:<5d} "
+                  f"merged={stats.merged:<5d} frames_saved={stats.frames_saved}")
+
+
+class OptimizationPass(ABC):
+    """
+    One rewrite of the pipeline.
+
+    Subclasses override run_plan(), run_serial() or both. Passes must not
+    modify their input: they return new lists and new instructions or
+    animations where something changes. The default implementations
+    leave their input unchanged.
+
+    Attributes:
+        name: Name used in reports
+    """
+
+    name = 'pass'
+
+    def run_plan(
+        self, animations: List[AnimationInstruction], fps: float, stats: PassStats
+    ) -> List[AnimationInstruction]:
+        """
+        Rewrite the instructions of a plan.
+
+        Args:
+            animations: Instructions sorted by start time
+            fps: Frame rate
+            stats: Counters to update
+
+        Returns:
+            New instruction list (need not be sorted)
+        """
+        return animations
+
+    def run_serial(
+        self, sequences: List[AnimationSequence], fps: float, stats: PassStats
+    ) -> List[AnimationSequence]:
+        """
+        Rewrite the children of one SerialAnimation.
+
+        Called bottom-up for every serial node of a tree, with nested
+        serial children already flattened into the list.
+
+        Args:
+            sequences: Children in execution order
+            fps: Frame rate
+            stats: Counters to update
+
+        Returns:
+            New child list
+        """
+        return sequences
+
+
+def _is_wait(instruction: AnimationInstruction) -> bool:
+    return instruction.action_type in ('wait', 'delay')
+
+
+def _is_show(instruction: AnimationInstruction) -> bool:
+    return instruction.action_type.startswith('show') or instruction.action_type == 'fade_in'
+
+
+def _is_remove(instruction: AnimationInstruction) -> bool:
+    return instruction.action_type in ('remove', 'fade_out')
+
+
+def _with_timing(
+    instruction: AnimationInstruction,
+    duration: float,
+    parameters: Optional[Dict] = None
+) -> AnimationInstruction:
+    """Copy of an instruction with a new duration (and parameters)."""
+    return AnimationInstruction(
+        object_id=instruction.object_id,
+        action_type=instruction.action_type,
+        start_time=instruction.start_time,
+        duration=duration,
+        parameters=dict(instruction.parameters) if parameters is None else parameters
+    )
+
+
+class CoalesceWaits(OptimizationPass):
+    """
+    Merge adjacent waits into one.
+
+    In plans, 'wait'/'delay' instructions of a layer that touch or
+    overlap become one wait over their union. In trees, runs of
+    WaitAnimation/DelayAnimation become one WaitAnimation.
+    """
+
+    name = 'coalesce_waits'
+
+    def run_plan(self, animations, fps, stats):
+        result = []
+        # Layer -> index of its latest wait in result
+        open_waits: Dict[int, int] = {}
+        for anim in animations:
+            if not _is_wait(anim):
+                result.append(anim)
+                continue
+            layer = anim.parameters.get('layer', 0)
+            k = open_waits.get(layer)
+            if k is not None and anim.start_time <= result[k].end_time + EPSILON:
+                end = max(result[k].end_time, anim.end_time)
+                result[k] = _with_timing(result[k], end - result[k].start_time)
+                stats.merged += 1
+            else:
+                open_waits[layer] = len(result)
+                result.append(anim)
+        return result
+
+    def run_serial(self, sequences, fps, stats):
+        result = []
+        for seq in sequences:
+            if (isinstance(seq, (WaitAnimation, DelayAnimation)) and result
+                    and isinstance(result[-1], (WaitAnimation, DelayAnimation))):
+                result[-1] = WaitAnimation(duration=result[-1].duration + seq.duration)
+                stats.merged += 1
+            else:
+                result.append(seq)
+        return result
+
+
+class DropInvisible(OptimizationPass):
+    """
+    Drop objects that are never visible for a full frame.
+
+    In plans, every instruction of an object is dropped when a removal
+    (or fade out) of it follows its first show within less than a frame
+    and nothing else of the object runs past that frame. Objects that are
+    never removed stay on screen after their instructions end, so they
+    are always kept. In trees, a show (or fade in) immediately followed,
+    within less than a frame, by the removal (or fade out) of the same
+    object is dropped together with that removal.
+    """
+
+    name = 'drop_invisible'
+
+    def run_plan(self, animations, fps, stats):
+        frame = 1.0 / fps
+        first_show: Dict[str, float] = {}
+        last_end: Dict[str, float] = {}
+        removals: Dict[str, List[float]] = {}
+        for anim in animations:
+            if _is_show(anim) and anim.object_id not in first_show:
+                first_show[anim.object_id] = anim.start_time
+            # A removal ends visibility when it starts
+            if _is_remove(anim):
+                removals.setdefault(anim.object_id, []).append(anim.start_time)
+                end = anim.start_time
+            else:
+                end = anim.end_time
+            last_end[anim.object_id] = max(last_end.get(anim.object_id, end), end)
+
+        invisible = {obj_id for obj_id, start in first_show.items()
+                     if last_end[obj_id] - start < frame - EPSILON
+                     and any(t >= start - EPSILON for t in removals.get(obj_id, ()))}
+        if not invisible:
+            return animations
+
+        result = [a for a in animations if a.object_id not in invisible]
+        stats.removed += len(animations) - len(result)
+        return result
+
+    def run_serial(self, sequences, fps, stats):
+        frame = 1.0 / fps
+        drop = set()
+        for i, seq in enumerate(sequences):
+            if not self._shows(seq):
+                continue
+            elapsed = 0.0
+            for j in range(i, len(sequences)):
+                other = sequences[j]
+                if j > i and self._removes(other, seq.object_id):
+                    if elapsed < frame - EPSILON:
+                        drop.update((i, j))
+                    break
+                # Anything else touching the object keeps it
+                if j > i and getattr(other, 'object_id', None) == seq.object_id:
+                    break
+                elapsed += other.duration
+                if elapsed >= frame - EPSILON:
+                    break
+
+        if not drop:
+            return sequences
+        stats.removed += len(drop)
+        return [seq for k, seq in enumerate(sequences) if k not in drop]
+
+    @staticmethod
+    def _shows(seq: AnimationSequence) -> bool:
+        return isinstance(seq, ShowAnimation) or (isinstance(seq, FadeAnimation) and seq.fade_in)
+
+    @staticmethod
+    def _removes(seq: AnimationSequence, object_id: str) -> bool:
+        return ((isinstance(seq, RemoveAnimation)
+                 or (isinstance(seq, FadeAnimation) and not seq.fade_in))
+                and seq.object_id == object_id)
+
+
+class MergeTransforms(OptimizationPass):
+    """
+    Fold back-to-back transforms of one object into one.
+
+    In plans, a 'transform' instruction starting where the previous
+    transform of the same object ends is merged into it, keeping the
+    last target; 'move' instructions are merged only when they continue
+    in the same direction at the same speed, so the path is unchanged.
+    In trees, adjacent TransformAnimations chaining a -> b -> c become
+    a -> c, and adjacent ScaleAnimations of one object multiply.
+    """
+
+    name = 'merge_transforms'
+
+    def run_plan(self, animations, fps, stats):
+        result = []
+        # (object, action type) -> index of its latest instruction
+        last: Dict[Tuple[str, str], int] = {}
+        # Current center of each object, and where each kept move starts
+        position: Dict[str, Tuple[float, float]] = {}
+        move_start: Dict[int, Tuple[float, float]] = {}
+
+        for anim in animations:
+            key = (anim.object_id, anim.action_type)
+            k = last.get(key)
+            adjacent = k is not None and abs(anim.start_time - result[k].end_time) <= EPSILON
+
+            if anim.action_type == 'move':
+                to = anim.parameters.get('to', {})
+                target = (to.get('x', 0.0), to.get('y', 0.0))
+                origin = position.get(anim.object_id)
+                if (adjacent and origin is not None and k in move_start
+                        and self._continues(move_start[k], origin, target,
+                                            result[k].duration, anim.duration)):
+                    parameters = dict(result[k].parameters)
+                    parameters['to'] = dict(to)
+                    result[k] = _with_timing(result[k], result[k].duration + anim.duration,
+                                             parameters)
+                    stats.merged += 1
+                else:
+                    if origin is not None:
+                        move_start[len(result)] = origin
+                    last[key] = len(result)
+                    result.append(anim)
+                position[anim.object_id] = target
+                continue
+
+            if anim.action_type == 'transform' and adjacent:
+                parameters = dict(result[k].parameters)
+                parameters.update(anim.parameters)
+                result[k] = _with_timing(result[k], result[k].duration + anim.duration,
+                                         parameters)
+                stats.merged += 1
+                continue
+
+            space = anim.parameters.get('space')
+            if _is_show(anim) and space is not None:
+                position[anim.object_id] = space.center
+            last[key] = len(result)
+            result.append(anim)
+
+        return result
+
+    @staticmethod
+    def _continues(
+        start: Tuple[float, float],
+        origin: Tuple[float, float],
+        target: Tuple[float, float],
+        d0: float,
+        d1: float
+    ) -> bool:
+        """Whether start -> origin over d0 and origin -> target over d1 share a velocity."""
+        if d0 <= 0 or d1 <= 0:
+            return False
+        return (abs((origin[0] - start[0]) / d0 - (target[0] - origin[0]) / d1) <= 1e-6
+                and abs((origin[1] - start[1]) / d0 - (target[1] - origin[1]) / d1) <= 1e-6)
+
+    def run_serial(self, sequences, fps, stats):
+        result = []
+        for seq in sequences:
+            previous = result[-1] if result else None
+            if (isinstance(seq, TransformAnimation) and isinstance(previous, TransformAnimation)
+                    and previous.to_id == seq.from_id):
+                result[-1] = TransformAnimation(from_id=previous.from_id, to_id=seq.to_id,
+                                                duration=previous.duration + seq.duration)
+                stats.merged += 1
+            elif (isinstance(seq, ScaleAnimation) and isinstance(previous, ScaleAnimation)
+                    and previous.object_id == seq.object_id):
+                result[-1] = ScaleAnimation(object_id=seq.object_id,
+                                            scale_factor=previous.scale_factor * seq.scale_factor,
+                                            duration=previous.duration + seq.duration)
+                stats.merged += 1
+            else:
+                result.append(seq)
+        return result
+
+
+class BatchFades(OptimizationPass):
+    """
+    Play runs of consecutive fades as one parallel group.
+
+    Applies to trees: adjacent FadeAnimations of distinct objects in a
+    serial run become a ParallelAnimation lasting as long as the longest
+    fade. Plans need no rewrite, since concurrent execution already plays
+    instructions of a time slice together.
+    """
+
+    name = 'batch_fades'
+
+    def run_serial(self, sequences, fps, stats):
+        result: List[AnimationSequence] = []
+        run: List[FadeAnimation] = []
+
+        def flush():
+            if len(run) > 1:
+                result.append(ParallelAnimation(list(run)))
+                stats.merged += len(run) - 1
+            else:
+                result.extend(run)
+            run.clear()
+
+        for seq in sequences:
+            if isinstance(seq, FadeAnimation):
+                if any(f.object_id == seq.object_id for f in run):
+                    flush()
+                run.append(seq)
+            else:
+                flush()
+                result.append(seq)
+        flush()
+        return result
+
+
+DEFAULT_PASSES: Tuple[Callable[[], OptimizationPass], ...] = (
+    DropInvisible, CoalesceWaits, MergeTransforms, BatchFades
+)
+
+
+class PlanOptimizer:
+    """
+    Pipeline of optimization passes.
+
+    Give it to a Director to optimize every plan it creates, or
+    call optimize_plan() / optimize_sequence() directly.
+
+    Attributes:
+        passes: Passes in the order they run
+        fps: Frame rate used for frame thresholds and statistics
+        last_report: Report of the most recent run, or None
+    """
+
+    def __init__(self, passes: Optional[List[OptimizationPass]] = None, fps: float = 60.0):
+        """
+        Initialize the optimizer.
+
+        Args:
+            passes: Passes to run (defaults to all built-in passes)
+            fps: Frame rate
+        """
+        self.passes = list(passes) if passes is not None else [make() for make in DEFAULT_PASSES]
+        self.fps = fps
+        self.last_report: Optional[OptimizationReport] = None
+
+    def add_pass(self, optimization_pass: OptimizationPass) -> 'PlanOptimizer':
+        """Append a pass to the pipeline."""
+        self.passes.append(optimization_pass)
+        return self
+
+    def optimize_plan(self, plan: AnimationPlan) -> Tuple[AnimationPlan, OptimizationReport]:
+        """
+        Run the passes over a plan.
+
+        Args:
+            plan: Plan to optimize (left unchanged)
+
+        Returns:
+            (optimized plan, report)
+        """
+        report = OptimizationReport(frames_before=plan_frames(plan, self.fps))
+        animations = list(plan.animations)
+        frames = report.frames_before
+
+        for optimization_pass in self.passes:
+            stats = PassStats(optimization_pass.name)
+            animations = optimization_pass.run_plan(animations, self.fps, stats)
+            animations.sort(key=lambda a: a.start_time)
+            after = sum(_animation_frames(a.duration, self.fps) for a in animations)
+            stats.frames_saved = frames - after
+            frames = after
+            report.passes.append(stats)
+
+        result = AnimationPlan()
+        for anim in animations:
+            result.add_animation(anim)
+        report.frames_after = frames
+        self.last_report = report
+        return result, report
+
+    def optimize_sequence(
+        self, sequence: AnimationSequence
+    ) -> Tuple[AnimationSequence, OptimizationReport]:
+        """
+        Run the passes over a sequence tree.
+
+        Args:
+            sequence: Tree to optimize (left unchanged)
+
+        Returns:
+            (optimized tree, report)
+        """
+        report = OptimizationReport(frames_before=sequence_frames(sequence, self.fps))
+        frames = report.frames_before
+
+        for optimization_pass in self.passes:
+            stats = PassStats(optimization_pass.name)
+            sequence = self._rewrite(sequence, optimization_pass, stats)
+            after = sequence_frames(sequence, self.fps)
+            stats.frames_saved = frames - after
+            frames = after
+            report.passes.append(stats)
+
+        report.frames_after = frames
+        self.last_report = report
+        return sequence, report
+
+    def _rewrite(
+        self, sequence: AnimationSequence, optimization_pass: OptimizationPass, stats: PassStats
+    ) -> AnimationSequence:
+        """Apply a pass to every serial node of a tree, bottom-up."""
+        return _fold(
+            sequence,
+            lambda seq: seq,
+            lambda children: SerialAnimation(
+                optimization_pass.run_serial(children, self.fps, stats)),
+            ParallelAnimation
+        )
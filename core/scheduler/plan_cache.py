@@ -0,0 +1,339 @@
+"""
+Content-addressed cache of compiled animation plans.
+
+Plans are keyed by a hash of the timeline's object contents, the
+compiling Director class and compilers, and the voiceover transcript.
+Instructions are also memoized per object, so after editing one scene
+only the changed objects are recompiled. The cache lives in memory and can optionally
+be mirrored to a directory of pickle files to survive between runs.
+"""
+from collections import ChainMap, OrderedDict
+from dataclasses import fields
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple
+import copyreg
+import hashlib
+import os
+import pickle
+import struct
+import weakref
+
+from ..spacetime.objects import SpacetimeObject, intern_metadata
+from ..spacetime.timelines import Timeline
+from .director import AnimationPlan, AnimationInstruction
+from .registry import describe_callable
+
+
+# Bump when cached plans or instructions change shape in a way the
+# code hashes below cannot see
+PLAN_FORMAT = 2
+
+# Numeric fields of an object, hashed as raw bytes
+_NUMBERS = struct.Struct('<7dq')
+
+# Director methods whose code decides the compiled instructions
+_COMPILING_METHODS = ('compile_object', '_object_to_instructions',
+                      '_motion_to_instructions', 'assemble_plan')
+
+
+def _reduce_metadata(mapping: MappingProxyType) -> Tuple:
+    """Pickle interned metadata by content; loading re-interns it."""
+    return intern_metadata, (dict(mapping),)
+
+
+def _copy_instruction(instruction: AnimationInstruction) -> AnimationInstruction:
+    """Copy an instruction so edits to it cannot reach the cache."""
+    return AnimationInstruction(
+        object_id=instruction.object_id,
+        action_type=instruction.action_type,
+        start_time=instruction.start_time,
+        duration=instruction.duration,
+        parameters=dict(instruction.parameters)
+    )
+
+
+def _metadata_repr(metadata: Any, memo: Dict[int, str]) -> str:
+    """
+    repr() of metadata, memoized by identity.
+
+    Interned metadata is shared by many objects, and segment views wrap
+    their source's metadata in a ChainMap, so the maps of a chain are
+    memoized one by one.
+    """
+    if isinstance(metadata, ChainMap):
+        return '|'.join(_metadata_repr(m, memo) for m in metadata.maps)
+    text = memo.get(id(metadata))
+    if text is None:
+        text = memo[id(metadata)] = repr(metadata)
+    return text
+
+
+def _copy_plan(plan: AnimationPlan) -> AnimationPlan:
+    """Copy a plan and its instructions."""
+    return AnimationPlan(
+        animations=[_copy_instruction(a) for a in plan.animations],
+        total_duration=plan.total_duration
+    )
+
+
+class PlanCache:
+    """
+    Cache of compiled animation plans for a Director.
+
+    A Director with a plan cache answers create_animation_plan() from
+    the cache when the timeline's contents, the Director class, its
+    registered compilers and the transcript are unchanged. Otherwise it rebuilds the plan from
+    per-object instructions, compiling only objects whose content hash
+    is new. Plans handed out are private copies, so callers (and the
+    voiceover syncer) may edit them freely.
+
+    Objects are hashed by value: id, region, window, layer, the repr()
+    of their metadata, and motion. Metadata values without a stable
+    repr() (plain objects, sets across runs) simply miss the cache. As
+    elsewhere, objects edited in place must be reported with
+    Timeline.touch().
+
+    Attributes:
+        directory: Directory mirroring the cache on disk, or None
+        max_plans: Number of whole plans kept in memory
+        hits: Plans served from the cache
+        misses: Plans that had to be assembled
+        compiled: Objects compiled on misses
+        reused: Objects whose instructions came from the memo
+    """
+
+    INSTRUCTIONS_FILE = 'instructions.pkl'
+
+    def __init__(self, directory: Optional[str] = None, max_plans: int = 16):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Optional directory for pickle files (created on demand)
+            max_plans: Number of whole plans kept in memory
+        """
+        self.directory = Path(directory) if directory is not None else None
+        self.max_plans = max_plans
+        self.hits = 0
+        self.misses = 0
+        self.compiled = 0
+        self.reused = 0
+        self._plans: 'OrderedDict[bytes, AnimationPlan]' = OrderedDict()
+        self._instructions: Dict[bytes, List[AnimationInstruction]] = {}
+        self._disk_loaded = False
+        # Timeline (weakly), its version, salt and transcript key -> plan key
+        self._last: Optional[Tuple[Any, int, bytes, bytes, bytes]] = None
+
+    def get_plan(self, director: 'Director', timeline: Timeline) -> AnimationPlan:
+        """
+        Get the plan a Director would build for a timeline.
+
+        Args:
+            director: Director compiling the plan
+            timeline: Timeline to plan
+
+        Returns:
+            Private copy of the cached or newly assembled plan
+        """
+        objects = timeline.objects
+        salt = self._salt(director)
+        transcript = self._transcript_key(director)
+
+        # Same timeline object at the same version: skip hashing
+        plan_key = None
+        if self._last is not None:
+            ref, version, last_salt, last_transcript, last_key = self._last
+            if (ref() is timeline and version == timeline._version
+                    and last_salt == salt and last_transcript == transcript):
+                plan_key = last_key
+
+        digests = None
+        if plan_key is None:
+            digests = self._object_digests(objects, salt)
+            plan_hash = hashlib.blake2b(salt + transcript, digest_size=16)
+            for digest in digests:
+                plan_hash.update(digest)
+            plan_key = plan_hash.digest()
+
+        plan = self._lookup(plan_key)
+        if plan is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            if digests is None:
+                digests = self._object_digests(objects, salt)
+            plan = self._assemble(director, objects, digests)
+            self._store(plan_key, plan)
+
+        self._last = (weakref.ref(timeline), timeline._version, salt, transcript, plan_key)
+        return _copy_plan(plan)
+
+    def clear(self) -> None:
+        """Drop everything cached in memory (files on disk are kept)."""
+        self._plans.clear()
+        self._instructions.clear()
+        self._last = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with plans, objects, hits, misses, compiled, reused
+        """
+        return {
+            'plans': len(self._plans),
+            'objects': len(self._instructions),
+            'hits': self.hits,
+            'misses': self.misses,
+            'compiled': self.compiled,
+            'reused': self.reused,
+        }
+
+    def _salt(self, director: 'Director') -> bytes:
+        """
+        Hash of everything besides the objects that shapes a plan.
+
+        Covers the plan format, the Director class and the code of its
+        compiling methods, the AnimationInstruction fields and the
+        registered compilers, so plans cached on disk by an earlier
+        version of any of them are not served.
+        """
+        cls = type(director)
+        methods = [describe_callable(getattr(cls, name)) for name in _COMPILING_METHODS]
+        instruction = [(f.name, str(f.type)) for f in fields(AnimationInstruction)]
+        data = repr((PLAN_FORMAT, f"{cls.__module__}.{cls.__qualname__}", methods,
+                     instruction, director.registry.fingerprint()))
+        return hashlib.blake2b(data.encode(), digest_size=16).digest()
+
+    def _transcript_key(self, director: 'Director') -> bytes:
+        """Hash of the syncer class and transcript the plan is synced to."""
+        syncer = director.voiceover_syncer
+        if syncer is None:
+            return b''
+        transcript = getattr(syncer, 'transcript', None)
+        data = repr((type(syncer).__qualname__,
+                     [(s.start, s.end, s.text) for s in transcript.segments]
+                     if transcript is not None else None))
+        return hashlib.blake2b(data.encode(), digest_size=16).digest()
+
+    def _object_digests(self, objects: List[SpacetimeObject], salt: bytes) -> List[bytes]:
+        """Content hash of every object, salted with the compiler setup."""
+        # Metadata maps stay alive during the pass, so ids are stable
+        memo: Dict[int, str] = {}
+        digests = []
+        for obj in objects:
+            metadata = _metadata_repr(obj.metadata, memo)
+            space = obj.space
+            time = obj.time
+            digest = hashlib.blake2b(salt, digest_size=16)
+            digest.update(_NUMBERS.pack(space.x, space.y, space.width, space.height,
+                                        time.start, time.end, time.padding, obj.layer))
+            digest.update(f"{obj.id}\0{metadata}".encode())
+            if obj.motion is not None:
+                motion = obj.motion
+                digest.update(repr((motion.width, motion.height, motion.keyframes)).encode())
+            digests.append(digest.digest())
+        return digests
+
+    def _assemble(
+        self,
+        director: 'Director',
+        objects: List[SpacetimeObject],
+        digests: List[bytes]
+    ) -> AnimationPlan:
+        """Assemble a plan, compiling only objects missing from the memo."""
+        self._load_instructions()
+        previous = self._instructions
+        current: Dict[bytes, List[AnimationInstruction]] = {}
+        lists = []
+        compiled = 0
+        for obj, digest in zip(objects, digests):
+            instructions = previous.get(digest)
+            if instructions is None:
+                instructions = director.compile_object(obj)
+                compiled += 1
+            current[digest] = instructions
+            lists.append(instructions)
+
+        if director.voiceover_syncer is not None:
+            # The syncer edits plan instructions in place; keep the memo clean
+            lists = [[_copy_instruction(i) for i in instructions] for instructions in lists]
+
+        self.compiled += compiled
+        self.reused += len(objects) - compiled
+        # Keep the memo to the latest timeline so it cannot grow unbounded
+        self._instructions = current
+        if compiled and self.directory is not None:
+            self._write(self.directory / self.INSTRUCTIONS_FILE, current)
+
+        return director.assemble_plan(lists)
+
+    def _lookup(self, key: bytes) -> Optional[AnimationPlan]:
+        """Find a plan in memory, then on disk."""
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+            return plan
+        if self.directory is None:
+            return None
+        plan = self._read(self.directory / f"plan-{key.hex()}.pkl")
+        if plan is not None:
+            self._remember(key, plan)
+        return plan
+
+    def _store(self, key: bytes, plan: AnimationPlan) -> None:
+        """Keep a plan in memory and, if configured, on disk."""
+        self._remember(key, plan)
+        if self.directory is not None:
+            self._write(self.directory / f"plan-{key.hex()}.pkl", plan)
+
+    def _remember(self, key: bytes, plan: AnimationPlan) -> None:
+        self._plans[key] = plan
+        self._plans.move_to_end(key)
+        while len(self._plans) > self.max_plans:
+            self._plans.popitem(last=False)
+
+    def _load_instructions(self) -> None:
+        """Seed the instruction memo from disk once."""
+        if self._disk_loaded or self.directory is None:
+            return
+        self._disk_loaded = True
+        stored = self._read(self.directory / self.INSTRUCTIONS_FILE)
+        if stored:
+            stored.update(self._instructions)
+            self._instructions = stored
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Any]:
+        """Unpickle a cache file; unreadable files count as misses."""
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    @staticmethod
+    def _write(path: Path, value: Any) -> None:
+        """
+        Pickle a value atomically.
+
+        Values that cannot be pickled (arbitrary metadata objects) are
+        kept in memory only.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(temp, 'wb') as f:
+                pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+                pickler.dispatch_table = copyreg.dispatch_table.copy()
+                pickler.dispatch_table[MappingProxyType] = _reduce_metadata
+                pickler.dump(value)
+            os.replace(temp, path)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            temp.unlink(missing_ok=True)
+
+    def __repr__(self) -> str:
+        return (f"PlanCache(plans={len(self._plans)}, objects={len(self._instructions)}, "
+                f"hits={self.hits}, misses={self.misses})")
@@ -0,0 +1,299 @@
+"""
+Registry of instruction compilers and handlers.
+
+Maps object types to compilers that turn spacetime objects into
+animation instructions, and action types to the scene callables that
+execute them. Components register new types here instead of editing the
+Director; the Director resolves the tables once per plan so dispatch
+is a dictionary lookup per object or instruction.
+"""
+from functools import partial
+from types import CodeType
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
+import hashlib
+
+from ..spacetime.objects import SpacetimeObject, SpaceRegion
+from .director import AnimationInstruction
+
+
+# (object, region at start) -> instructions
+Compiler = Callable[[SpacetimeObject, SpaceRegion], List[AnimationInstruction]]
+# (scene, instruction) -> None, or the animation for builders
+Handler = Callable[[Any, AnimationInstruction], Any]
+
+
+def _code_key(code: CodeType) -> Tuple:
+    """Bytecode, names and constants of a code object, nested code included."""
+    return (code.co_code, code.co_names,
+            tuple(_code_key(c) if isinstance(c, CodeType) else repr(c) for c in code.co_consts))
+
+
+def describe_callable(fn: Callable, _depth: int = 0) -> str:
+    """
+    Stable description of a compiler or handler, for fingerprints.
+
+    Made of the qualified name, a hash of the bytecode and constants,
+    and the values the function closes over, is partially applied to or
+    has as defaults. Two closures from one factory with different
+    arguments, or a function edited between runs, describe differently.
+
+    Args:
+        fn: Function, bound method, partial or callable object
+
+    Returns:
+        Description text
+    """
+    if isinstance(fn, partial):
+        return (f"partial({describe_callable(fn.func, _depth + 1)}, "
+                f"{fn.args!r}, {sorted(fn.keywords.items())!r})")
+    func = getattr(fn, '__func__', fn)
+    name = (f"{getattr(func, '__module__', '')}."
+            f"{getattr(func, '__qualname__', type(func).__qualname__)}")
+    code = getattr(func, '__code__', None)
+    if code is None:
+        # Callable object: its state is all we can see
+        return f"{name}:{fn!r}"
+
+    def value(v: Any) -> str:
+        if callable(v) and _depth < 3:
+            return describe_callable(v, _depth + 1)
+        return repr(v)
+
+    captured = [value(cell.cell_contents) for cell in func.__closure__ or ()]
+    defaults = [value(v) for v in func.__defaults__ or ()]
+    digest = hashlib.blake2b(
+        repr((_code_key(code), captured, defaults, func.__kwdefaults__)).encode(),
+        digest_size=8
+    ).hexdigest()
+    return f"{name}:{digest}"
+
+
+def field_compiler(action_type: str, fields: Iterable[Tuple[str, Any]]) -> Compiler:
+    """
+    Make a compiler emitting one instruction with metadata fields copied.
+
+    Args:
+        action_type: Action type of the instruction
+        fields: (metadata key, default) pairs copied into the parameters
+
+    Returns:
+        Compiler producing a single instruction over the object's window
+    """
+    fields = tuple(fields)
+
+    def compile_object(obj: SpacetimeObject, space: SpaceRegion) -> List[AnimationInstruction]:
+        metadata = obj.metadata
+        parameters = {}
+        for key, default in fields:
+            value = metadata.get(key, default)
+            # Never hand out the shared default list
+            parameters[key] = list(value) if value is default and isinstance(value, list) else value
+        parameters['space'] = space
+        parameters['layer'] = obj.layer
+        return [AnimationInstruction(
+            object_id=obj.id,
+            action_type=action_type,
+            start_time=obj.time.start,
+            duration=obj.time.duration,
+            parameters=parameters
+        )]
+
+    compile_object.__qualname__ = f"field_compiler.<{action_type}>"
+    return compile_object
+
+
+def compile_show(obj: SpacetimeObject, space: SpaceRegion) -> List[AnimationInstruction]:
+    """Generic compiler: a 'show' instruction carrying the object's metadata."""
+    return [AnimationInstruction(
+        object_id=obj.id,
+        action_type='show',
+        start_time=obj.time.start,
+        duration=obj.time.duration,
+        parameters={
+            'space': space,
+            'layer': obj.layer,
+            'metadata': obj.metadata
+        }
+    )]
+
+
+class InstructionRegistry:
+    """
+    Tables of compilers by object type and handlers by action type.
+
+    Action types without a registered handler fall back to the scene's
+    `_handle_<action_type>` / `_build_<action_type>` methods, then to
+    `_handle_default`. A registry created with a parent inherits its
+    entries and may override them.
+
+    Attributes:
+        parent: Registry consulted for entries missing here, or None
+        default_compiler: Compiler for object types without an entry
+    """
+
+    def __init__(
+        self,
+        parent: Optional['InstructionRegistry'] = None,
+        default_compiler: Optional[Compiler] = None
+    ):
+        self.parent = parent
+        self.default_compiler = default_compiler
+        self._compilers: Dict[str, Compiler] = {}
+        self._handlers: Dict[str, Handler] = {}
+        self._builders: Dict[str, Handler] = {}
+
+    def register_compiler(self, object_type: str, compiler: Optional[Compiler] = None):
+        """
+        Register the compiler for an object type.
+
+        Usable directly or as a decorator:
+
+            @registry.register_compiler('chart')
+            def compile_chart(obj, space):
+                ...
+
+        Args:
+            object_type: Object type (metadata 'type')
+            compiler: Callable (obj, space) -> instructions
+
+        Returns:
+            The compiler, or a decorator when compiler is omitted
+        """
+        if compiler is None:
+            return lambda fn: self.register_compiler(object_type, fn)
+        self._compilers[object_type] = compiler
+        return compiler
+
+    def register_handler(
+        self,
+        action_type: str,
+        handler: Optional[Handler] = None,
+        builder: Optional[Handler] = None
+    ) -> None:
+        """
+        Register how an action type is executed on a scene.
+
+        Args:
+            action_type: Instruction action type
+            handler: Callable (scene, instruction) that plays it
+            builder: Callable (scene, instruction) returning the animation
+                without playing it, for concurrent execution
+        """
+        if handler is not None:
+            self._handlers[action_type] = handler
+        if builder is not None:
+            self._builders[action_type] = builder
+
+    def compilers(self) -> Dict[str, Compiler]:
+        """Get the merged compiler table, own entries over the parent's."""
+        table = self.parent.compilers() if self.parent is not None else {}
+        table.update(self._compilers)
+        return table
+
+    def compiler_for(self, object_type: str) -> Compiler:
+        """
+        Get the compiler for an object type.
+
+        Args:
+            object_type: Object type
+
+        Returns:
+            Registered compiler, or the default compiler
+        """
+        return self._find_compiler(object_type) or self._default()
+
+    def _find_compiler(self, object_type: str) -> Optional[Compiler]:
+        compiler = self._compilers.get(object_type)
+        if compiler is None and self.parent is not None:
+            return self.parent._find_compiler(object_type)
+        return compiler
+
+    def _default(self) -> Compiler:
+        if self.default_compiler is not None:
+            return self.default_compiler
+        if self.parent is not None:
+            return self.parent._default()
+        return compile_show
+
+    def _lookup(self, table: str, action_type: str) -> Optional[Handler]:
+        entry = getattr(self, table).get(action_type)
+        if entry is None and self.parent is not None:
+            return self.parent._lookup(table, action_type)
+        return entry
+
+    def bind_handlers(
+        self, scene, action_types: Iterable[str]
+    ) -> Dict[str, Optional[Callable[[AnimationInstruction], Any]]]:
+        """
+        Resolve the handler of each action type against a scene.
+
+        Args:
+            scene: Scene the instructions run on
+            action_types: Action types occurring in the plan
+
+        Returns:
+            Action type -> callable(instruction), or None when the scene
+            has no handler at all (the instruction is skipped)
+        """
+        default = getattr(scene, '_handle_default', None)
+        bound = {}
+        for action_type in set(action_types):
+            handler = self._lookup('_handlers', action_type)
+            if handler is not None:
+                bound[action_type] = partial(handler, scene)
+            else:
+                bound[action_type] = getattr(scene, f"_handle_{action_type}", default)
+        return bound
+
+    def bind_builders(
+        self, scene, action_types: Iterable[str]
+    ) -> Dict[str, Optional[Callable[[AnimationInstruction], Any]]]:
+        """
+        Resolve the animation builder of each action type against a scene.
+
+        Args:
+            scene: Scene the instructions run on
+            action_types: Action types occurring in the plan
+
+        Returns:
+            Action type -> callable(instruction) returning an animation,
+            or None when the action type can only be played by a handler
+        """
+        bound = {}
+        for action_type in set(action_types):
+            builder = self._lookup('_builders', action_type)
+            if builder is not None:
+                bound[action_type] = partial(builder, scene)
+            elif self._lookup('_handlers', action_type) is not None:
+                # A registered handler overrides the scene's methods
+                bound[action_type] = None
+            else:
+                bound[action_type] = getattr(scene, f"_build_{action_type}", None)
+        return bound
+
+    def fingerprint(self) -> str:
+        """
+        Stable description of the compiler table.
+
+        Used by PlanCache, so plans compiled with different compilers
+        are never mixed up. Compilers are described by name, code and
+        captured values (see describe_callable).
+        """
+        entries = sorted((object_type, describe_callable(fn))
+                         for object_type, fn in self.compilers().items())
+        return repr((entries, describe_callable(self._default())))
+
+    def __repr__(self) -> str:
+        return (f"InstructionRegistry(compilers={len(self.compilers())}, "
+                f"handlers={len(self._handlers)}, builders={len(self._builders)})")
+
+
+# Registry used by every Director unless given its own; components
+# register their object types here
+default_registry = InstructionRegistry()
+default_registry.register_compiler('code_display', field_compiler(
+    'show_code', [('code', ''), ('language', 'C')]))
+default_registry.register_compiler('memory_display', field_compiler(
+    'show_memory', [('cells', 16), ('rows', 1), ('values', None), ('highlight_cells', [])]))
+default_registry.register_compiler('register_display', field_compiler(
+    'show_register', [('name', 'REG'), ('value', 0), ('bits', 32)]))
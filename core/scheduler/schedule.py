@@ -0,0 +1,333 @@
+"""
+Flat, indexed schedules compiled from animation sequence trees.
+
+AnimationSequence trees are convenient to compose but costly to query:
+then(), and_() and with_delay() nest one composite per call, and
+composite durations are derived from the whole subtree. A compiled
+schedule walks the tree once, without recursion, and keeps the leaf
+animations as immutable columns of (start, end, object_id, kind) sorted
+by start time, with the total duration and the slack of every parallel
+branch computed up front.
+"""
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Optional, Tuple, NamedTuple, Iterator, Union, Callable
+
+from .animation_plans import (
+    AnimationSequence, SerialAnimation, ParallelAnimation, composite_durations, is_composite
+)
+
+
+# Slack below this counts as none (float error of summed durations)
+_EPSILON = 1e-9
+
+
+class ScheduleEntry(NamedTuple):
+    """
+    A leaf animation placed on the schedule.
+
+    Attributes:
+        start: Start time in seconds from the start of the sequence
+        end: End time in seconds
+        object_id: Animated object, or None (waits, delays)
+        kind: Animation type, as in to_list() ('show', 'move', 'wait', ...)
+        slack: Seconds the animation can grow without delaying the end
+        animation: The leaf AnimationSequence
+    """
+    start: float
+    end: float
+    object_id: Optional[str]
+    kind: str
+    slack: float
+    animation: AnimationSequence
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class BranchSlack(NamedTuple):
+    """
+    Timing of one branch of a ParallelAnimation.
+
+    Attributes:
+        path: Child indices leading from the root to the branch
+        start: Start time of the branch
+        duration: Duration of the branch
+        slack: Idle time before the parallel group ends
+    """
+    path: Tuple[int, ...]
+    start: float
+    duration: float
+    slack: float
+
+    @property
+    def critical(self) -> bool:
+        return self.slack <= _EPSILON
+
+
+def _describe(leaf: AnimationSequence) -> Tuple[str, Optional[str]]:
+    """Kind and object ID of a leaf animation."""
+    items = leaf.to_list()
+    first = items[0] if items and isinstance(items[0], dict) else {}
+    kind = first.get('type', type(leaf).__name__)
+    object_id = first.get('object_id', first.get('from_id'))
+    return kind, object_id
+
+
+def _unlink_all(cells: List[tuple]) -> List[Tuple[int, ...]]:
+    """
+    Turn linked (index, parent) paths into tuples of indices.
+
+    Each cell is materialized once, from its parent's tuple, so the
+    Python work is linear in the number of cells however deep they are.
+    """
+    paths: Dict[int, Tuple[int, ...]] = {}
+    result = []
+    for cell in cells:
+        # Climb to the nearest materialized ancestor, then build downwards
+        pending = []
+        while cell is not None and id(cell) not in paths:
+            pending.append(cell)
+            cell = cell[1]
+        prefix = paths[id(cell)] if cell is not None else ()
+        for link in reversed(pending):
+            prefix = paths[id(link)] = prefix + (link[0],)
+        result.append(prefix)
+    return result
+
+
+class CompiledSchedule:
+    """
+    Immutable flat schedule of an animation sequence.
+
+    Entries are sorted by start time (ties keep execution order) and
+    exposed both as ScheduleEntry tuples and as parallel columns.
+    Queries by time use binary search on the start column: an entry
+    active at t started within the longest entry duration before t.
+
+    Attributes:
+        duration: Total duration of the sequence
+        starts: Start time of each entry
+        ends: End time of each entry
+        object_ids: Object ID of each entry
+        kinds: Animation type of each entry
+        branches: Slack of every parallel branch, in tree order
+    """
+
+    __slots__ = ('_entries', '_starts', '_ends', '_object_ids', '_kinds',
+                 '_branches', '_duration', '_max_duration')
+
+    def __init__(
+        self,
+        entries: List[ScheduleEntry],
+        duration: float,
+        branches: Union[List[BranchSlack], Callable[[], List[BranchSlack]]]
+    ):
+        """
+        Initialize the schedule.
+
+        Args:
+            entries: Leaf entries (sorted here by start time)
+            duration: Total duration of the sequence
+            branches: Slack of the parallel branches, or a function
+                building them on first access (their paths take
+                O(depth^2) space in deep and_() chains)
+        """
+        ordered = sorted(entries, key=lambda entry: entry.start)
+        self._entries: Tuple[ScheduleEntry, ...] = tuple(ordered)
+        self._starts = tuple(entry.start for entry in ordered)
+        self._ends = tuple(entry.end for entry in ordered)
+        self._object_ids = tuple(entry.object_id for entry in ordered)
+        self._kinds = tuple(entry.kind for entry in ordered)
+        self._branches = branches if callable(branches) else tuple(branches)
+        self._duration = duration
+        self._max_duration = max((entry.end - entry.start for entry in ordered), default=0.0)
+
+    @property
+    def duration(self) -> float:
+        return self._duration
+
+    @property
+    def starts(self) -> Tuple[float, ...]:
+        return self._starts
+
+    @property
+    def ends(self) -> Tuple[float, ...]:
+        return self._ends
+
+    @property
+    def object_ids(self) -> Tuple[Optional[str], ...]:
+        return self._object_ids
+
+    @property
+    def kinds(self) -> Tuple[str, ...]:
+        return self._kinds
+
+    @property
+    def branches(self) -> Tuple[BranchSlack, ...]:
+        if callable(self._branches):
+            self._branches = tuple(self._branches())
+        return self._branches
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[ScheduleEntry]:
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> ScheduleEntry:
+        return self._entries[index]
+
+    def at_time(self, time: float) -> List[ScheduleEntry]:
+        """
+        Get entries running at a time.
+
+        Args:
+            time: Time in seconds
+
+        Returns:
+            Entries with start <= time < end, in start order
+        """
+        lo = bisect_left(self._starts, time - self._max_duration)
+        hi = bisect_right(self._starts, time)
+        ends = self._ends
+        return [self._entries[i] for i in range(lo, hi) if ends[i] > time]
+
+    def in_range(self, start: float, end: float) -> List[ScheduleEntry]:
+        """
+        Get entries overlapping a time range.
+
+        Args:
+            start: Range start
+            end: Range end
+
+        Returns:
+            Entries overlapping [start, end), in start order; zero-length
+            entries count when they fall inside the range
+        """
+        lo = bisect_left(self._starts, start - self._max_duration)
+        hi = bisect_left(self._starts, end)
+        ends = self._ends
+        starts = self._starts
+        return [self._entries[i] for i in range(lo, hi)
+                if ends[i] > start or (ends[i] == starts[i] >= start)]
+
+    def starting_in(self, start: float, end: float) -> List[ScheduleEntry]:
+        """
+        Get entries starting within a time range.
+
+        Args:
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+
+        Returns:
+            Entries with start <= entry.start < end
+        """
+        lo = bisect_left(self._starts, start)
+        hi = bisect_left(self._starts, end)
+        return list(self._entries[lo:hi])
+
+    def for_object(self, object_id: str) -> List[ScheduleEntry]:
+        """Get the entries animating an object, in start order."""
+        return [entry for entry in self._entries if entry.object_id == object_id]
+
+    def critical_path(self) -> List[ScheduleEntry]:
+        """
+        Get the entries that determine the total duration.
+
+        An entry is critical when it has no slack: lengthening it
+        lengthens the whole sequence. With tied parallel branches every
+        tied branch is critical.
+
+        Returns:
+            Critical entries in start order
+        """
+        return [entry for entry in self._entries if entry.slack <= _EPSILON]
+
+    def slack_report(self) -> str:
+        """
+        Format the slack of every parallel branch.
+
+        Returns:
+            One line per branch: path, start, duration and slack
+        """
+        lines = [f"Schedule: {len(self._entries)} animations, {self._duration:.2f}s, "
+                 f"{len(self.critical_path())} critical"]
+        for branch in self.branches:
+            path = '.'.join(str(i) for i in branch.path) or '-'
+            marker = '  *critical*' if branch.critical else ''
+            lines.append(f"  branch {path:<12} start {branch.start:7.2f}s  "
+                         f"duration {branch.duration:6.2f}s  slack {branch.slack:6.2f}s{marker}")
+        return '\n'.join(lines)
+
+    def print_report(self) -> None:
+        """Print the slack report."""
+        print(self.slack_report())
+
+    def __repr__(self) -> str:
+        return (f"CompiledSchedule(entries={len(self._entries)}, "
+                f"duration={self._duration:.2f}s, branches={len(self.branches)})")
+
+
+def compile_sequence(root: AnimationSequence) -> CompiledSchedule:
+    """
+    Compile an animation sequence tree into a flat schedule.
+
+    Durations are computed bottom-up once, then start times, slack and
+    branch timings are assigned top-down. Both walks use explicit
+    stacks, so the depth of the tree is not limited by recursion.
+
+    The slack of a leaf is the sum of the slack of the parallel branches
+    enclosing it: it can grow by that much before the root ends later.
+    Branch paths are kept as linked cells and turned into tuples when
+    the schedule's branches are first read.
+
+    Args:
+        root: Sequence to compile
+
+    Returns:
+        CompiledSchedule of the leaf animations
+    """
+    durations = composite_durations(root)
+
+    def duration_of(seq: AnimationSequence) -> float:
+        if is_composite(type(seq)):
+            return durations[id(seq)]
+        return seq.duration
+
+    entries: List[ScheduleEntry] = []
+    # (path cell, start, duration, slack) per parallel branch
+    branches: List[Tuple[tuple, float, float, float]] = []
+    # (node, start, slack, path); paths are linked (index, parent) cells,
+    # so deep chains do not copy a growing tuple per level
+    stack: List[Tuple[AnimationSequence, float, float, Optional[tuple]]] = [(root, 0.0, 0.0, None)]
+    while stack:
+        node, start, slack, path = stack.pop()
+        if not is_composite(type(node)):
+            kind, object_id = _describe(node)
+            entries.append(ScheduleEntry(
+                start, start + node.duration, object_id, kind, slack, node))
+        elif isinstance(node, SerialAnimation):
+            placed = []
+            time = start
+            for i, seq in enumerate(node.sequences):
+                placed.append((seq, time, slack, (i, path)))
+                time += duration_of(seq)
+            # Reversed so children are placed in execution order
+            stack.extend(reversed(placed))
+        else:
+            total = durations[id(node)]
+            placed = []
+            for i, seq in enumerate(node.sequences):
+                length = duration_of(seq)
+                cell = (i, path)
+                branches.append((cell, start, length, total - length))
+                placed.append((seq, start, slack + total - length, cell))
+            stack.extend(reversed(placed))
+
+    def branch_slack() -> List[BranchSlack]:
+        paths = _unlink_all([cell for cell, _, _, _ in branches])
+        return [BranchSlack(path, start, length, slack)
+                for path, (_, start, length, slack) in zip(paths, branches)]
+
+    return CompiledSchedule(entries, duration_of(root), branch_slack)
@@ -11,19 +11,25 @@ This layer is responsible for:
 - Layout definitions
 """
 
-from .objects import SpaceRegion, TimeWindow, SpacetimeObject
+from .objects import SpaceRegion, TimeWindow, SpacetimeObject, MotionPath
 from .timelines import Timeline
+from .columnar import TimelineArray
+from .spatial_index import SpacetimeIndex
 from .layouts import Layout, Zone, LayoutTemplate
-from .conflict_detection import ConflictDetector, ConflictReport
+from .conflict_detection import ConflictDetector, ConflictReport, IncrementalConflictDetector
 
 __all__ = [
     'SpaceRegion',
     'TimeWindow',
     'SpacetimeObject',
+    'MotionPath',
     'Timeline',
+    'TimelineArray',
+    'SpacetimeIndex',
     'Layout',
     'Zone',
     'LayoutTemplate',
     'ConflictDetector',
     'ConflictReport',
+    'IncrementalConflictDetector',
 ]
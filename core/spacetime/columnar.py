@@ -0,0 +1,315 @@
+"""
+Columnar (struct-of-arrays) representation of a timeline.
+
+Stores the numeric fields of every object in NumPy arrays so bulk passes
+(conflict checks, durations, heatmaps, layer statistics) run as vectorized
+array operations instead of per-object attribute lookups.
+"""
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .objects import SpaceRegion, TimeWindow, SpacetimeObject
+
+
+class TimelineArray:
+    """
+    Struct-of-arrays view of a set of spacetime objects.
+
+    Columns are float64 arrays (int64 for layer) of equal length; row i
+    describes the i-th object. When built from a timeline the source
+    objects are kept by reference, so converting back is free as long as
+    the columns are not edited. Array-producing operations return new
+    arrays without source objects. Moving objects are stored by their
+    swept bounding box; motion paths are not columns.
+
+    Attributes:
+        ids: Object ids
+        x, y, width, height: Spatial columns
+        start, end, padding: Temporal columns
+        layer: Layer column
+        objects: Source objects, or None if the columns were derived
+        metadata: Source metadata dicts (shared, not copied), or None
+    """
+
+    COLUMNS = ('x', 'y', 'width', 'height', 'start', 'end', 'padding')
+
+    def __init__(
+        self,
+        ids: List[str],
+        x, y, width, height, start, end, padding, layer,
+        objects: Optional[List[SpacetimeObject]] = None,
+        metadata: Optional[List[Dict[str, Any]]] = None
+    ):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("TimelineArray requires numpy")
+
+        self.ids = ids
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.width = np.asarray(width, dtype=np.float64)
+        self.height = np.asarray(height, dtype=np.float64)
+        self.start = np.asarray(start, dtype=np.float64)
+        self.end = np.asarray(end, dtype=np.float64)
+        self.padding = np.asarray(padding, dtype=np.float64)
+        self.layer = np.asarray(layer, dtype=np.int64)
+        self.objects = objects
+        self.metadata = metadata
+
+    @classmethod
+    def from_objects(cls, objects: Sequence[SpacetimeObject]) -> 'TimelineArray':
+        """
+        Build columns from spacetime objects in one pass.
+
+        Args:
+            objects: Objects to convert (kept by reference)
+
+        Returns:
+            TimelineArray over the objects
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("TimelineArray requires numpy")
+
+        objects = list(objects)
+        n = len(objects)
+        rows = [(o.space.x, o.space.y, o.space.width, o.space.height,
+                 o.time.start, o.time.end, o.time.padding) for o in objects]
+        # One contiguous (7, n) block; each column is a view into it
+        block = np.array(rows, dtype=np.float64).reshape(n, 7).T.copy()
+        layer = np.fromiter((o.layer for o in objects), dtype=np.int64, count=n)
+
+        return cls(
+            ids=[o.id for o in objects],
+            x=block[0], y=block[1], width=block[2], height=block[3],
+            start=block[4], end=block[5], padding=block[6],
+            layer=layer,
+            objects=objects,
+            metadata=[o.metadata for o in objects]
+        )
+
+    @classmethod
+    def from_timeline(cls, timeline: 'Timeline') -> 'TimelineArray':
+        """Build columns from a timeline (see Timeline.to_array)."""
+        return cls.from_objects(timeline.objects)
+
+    @classmethod
+    def concatenate(
+        cls,
+        arrays: Sequence['TimelineArray'],
+        time_offsets: Optional[Sequence[float]] = None,
+        ids: Optional[List[str]] = None,
+        objects: Optional[List[SpacetimeObject]] = None
+    ) -> 'TimelineArray':
+        """
+        Stack several arrays, optionally shifting each one in time.
+
+        Args:
+            arrays: Arrays to stack in order
+            time_offsets: Per-array offset added to start and end
+            ids: Ids for the result (defaults to the concatenated ids)
+            objects: Objects for the result (defaults to None)
+
+        Returns:
+            New TimelineArray
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("TimelineArray requires numpy")
+        if not arrays:
+            return cls.from_objects([])
+        if time_offsets is None:
+            time_offsets = [0.0] * len(arrays)
+
+        def stack(column: str, shift: bool = False):
+            parts = [getattr(a, column) for a in arrays]
+            if shift:
+                parts = [part + offset for part, offset in zip(parts, time_offsets)]
+            return np.concatenate(parts)
+
+        if ids is None:
+            ids = [obj_id for a in arrays for obj_id in a.ids]
+        metadata = None
+        if all(a.metadata is not None for a in arrays):
+            metadata = [meta for a in arrays for meta in a.metadata]
+
+        return cls(
+            ids=ids,
+            x=stack('x'), y=stack('y'),
+            width=stack('width'), height=stack('height'),
+            start=stack('start', shift=True), end=stack('end', shift=True),
+            padding=stack('padding'), layer=stack('layer'),
+            objects=objects,
+            metadata=metadata
+        )
+
+    def to_objects(self) -> List[SpacetimeObject]:
+        """
+        Get spacetime objects for the rows.
+
+        Returns the source objects when available, otherwise builds new
+        objects from the columns.
+        """
+        if self.objects is not None:
+            return self.objects
+
+        metadata = self.metadata or [{} for _ in self.ids]
+        return [
+            SpacetimeObject(
+                id=obj_id,
+                space=SpaceRegion(x=x, y=y, width=w, height=h),
+                time=TimeWindow(start=s, end=e, padding=p),
+                layer=layer,
+                metadata=meta
+            )
+            for obj_id, x, y, w, h, s, e, p, layer, meta in zip(
+                self.ids,
+                self.x.tolist(), self.y.tolist(),
+                self.width.tolist(), self.height.tolist(),
+                self.start.tolist(), self.end.tolist(),
+                self.padding.tolist(), self.layer.tolist(),
+                metadata
+            )
+        ]
+
+    def to_timeline(self, name: Optional[str] = None) -> 'Timeline':
+        """
+        Convert back to a Timeline.
+
+        Args:
+            name: Name for the new timeline
+
+        Returns:
+            Timeline over the source objects, or over newly built ones
+            if the columns were derived
+        """
+        from .timelines import Timeline
+        return Timeline(name=name, objects=self.to_objects())
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # Derived columns
+
+    @property
+    def right(self):
+        """Right boundaries."""
+        return self.x + self.width
+
+    @property
+    def top(self):
+        """Top boundaries."""
+        return self.y + self.height
+
+    @property
+    def padded_end(self):
+        """End times with padding applied."""
+        return self.end + self.padding
+
+    @property
+    def duration(self) -> float:
+        """Latest end time, 0.0 when empty."""
+        if len(self.ids) == 0:
+            return 0.0
+        return float(self.end.max())
+
+    def area(self):
+        """Area of every region."""
+        return self.width * self.height
+
+    # Vectorized predicates against a single region, window or time
+
+    def intersects(self, region: SpaceRegion):
+        """
+        Vectorized SpaceRegion.intersects against one region.
+
+        Args:
+            region: Region to test every row against
+
+        Returns:
+            Boolean mask
+        """
+        return ~((self.right < region.left) | (region.right < self.x) |
+                 (self.top < region.bottom) | (region.top < self.y))
+
+    def overlaps(self, window: TimeWindow):
+        """
+        Vectorized TimeWindow.overlaps (row window first) against one window.
+
+        Args:
+            window: Window to test every row against
+
+        Returns:
+            Boolean mask
+        """
+        return ~((self.padded_end < window.start) |
+                 (window.padded_end < self.start))
+
+    def contains(self, time: float):
+        """
+        Vectorized TimeWindow.contains for a time point.
+
+        Args:
+            time: Time point
+
+        Returns:
+            Boolean mask of rows active at the time
+        """
+        return (self.start <= time) & (time <= self.end)
+
+    # Vectorized predicates between rows
+
+    def pair_intersects(self, i, j):
+        """Vectorized SpaceRegion.intersects for row index arrays i and j."""
+        right = self.right
+        top = self.top
+        return ~((right[i] < self.x[j]) | (right[j] < self.x[i]) |
+                 (top[i] < self.y[j]) | (top[j] < self.y[i]))
+
+    def pair_overlaps(self, i, j):
+        """Vectorized TimeWindow.overlaps for row index arrays i and j."""
+        padded_end = self.padded_end
+        return ~((padded_end[i] < self.start[j]) |
+                 (padded_end[j] < self.start[i]))
+
+    def pair_conflicts(self, i, j):
+        """Vectorized SpacetimeObject.conflicts_with for row index arrays."""
+        return (self.pair_overlaps(i, j) & self.pair_intersects(i, j) &
+                (self.layer[i] == self.layer[j]))
+
+    # Selection and statistics
+
+    def select(self, rows: Union[Sequence[int], 'np.ndarray']) -> 'TimelineArray':
+        """
+        Get a subset of rows.
+
+        Args:
+            rows: Boolean mask or integer index array
+
+        Returns:
+            New TimelineArray over the selected rows
+        """
+        index = np.asarray(rows)
+        if index.dtype == np.bool_:
+            index = np.flatnonzero(index)
+        picked = index.tolist()
+
+        return TimelineArray(
+            ids=[self.ids[k] for k in picked],
+            x=self.x[index], y=self.y[index],
+            width=self.width[index], height=self.height[index],
+            start=self.start[index], end=self.end[index],
+            padding=self.padding[index], layer=self.layer[index],
+            objects=[self.objects[k] for k in picked] if self.objects is not None else None,
+            metadata=[self.metadata[k] for k in picked] if self.metadata is not None else None
+        )
+
+    def layer_counts(self) -> Dict[int, int]:
+        """Number of objects per layer."""
+        layers, counts = np.unique(self.layer, return_counts=True)
+        return dict(zip(layers.tolist(), counts.tolist()))
+
+    def __repr__(self) -> str:
+        return f"TimelineArray(objects={len(self)}, duration={self.duration:.2f}s)"
@@ -1,14 +1,22 @@
 """
 Conflict detection for spacetime objects.
 
-Uses spatial hashing for efficient O(n) conflict detection instead of naive O(n²).
+Uses a start-time sweep combined with a spatial hash grid broad phase
+instead of naive O(n²) pairwise checking. Layers, and time shards of
+large layers, can be swept in a process pool.
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Set, Tuple, Optional, Hashable, Iterator, Sequence, Any
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+import math
+import os
 
-from .objects import SpacetimeObject, SpaceRegion, TimeWindow
-from .timelines import Timeline
+from .objects import (
+    SpacetimeObject, SpaceRegion, FrozenSpaceRegion, TimeWindow, MotionPath, first_contact
+)
+from .timelines import Timeline, TimelineSegment, TimelineSequence, SegmentObjectView
 
 
 @dataclass
@@ -37,6 +45,73 @@ class Conflict:
                 f"(layer={self.obj1.layer}, severity={self.severity:.2f})")
 
 
+class LazyConflict(Conflict):
+    """
+    A Conflict whose geometry, severity and suggestion are computed on
+    first access.
+
+    Detection only needs to know that two objects conflict; the details
+    are derived from the objects when first read and then cached.
+    Assigning a detail overrides it.
+    """
+
+    def __init__(
+        self, obj1: SpacetimeObject, obj2: SpacetimeObject, detector: 'ConflictDetector'
+    ):
+        self.obj1 = obj1
+        self.obj2 = obj2
+        self._detector = detector
+        self._details: Optional[Tuple[Optional[SpaceRegion], Optional[TimeWindow], float]] = None
+        self._suggestion: Optional[str] = None
+
+    def _measured(self) -> Tuple[Optional[SpaceRegion], Optional[TimeWindow], float]:
+        if self._details is None:
+            self._details = self._detector._measure(self.obj1, self.obj2)
+        return self._details
+
+    @property
+    def overlap_region(self) -> Optional[SpaceRegion]:
+        return self._measured()[0]
+
+    @overlap_region.setter
+    def overlap_region(self, value: Optional[SpaceRegion]) -> None:
+        _, time, severity = self._measured()
+        self._details = (value, time, severity)
+
+    @property
+    def overlap_time(self) -> Optional[TimeWindow]:
+        return self._measured()[1]
+
+    @overlap_time.setter
+    def overlap_time(self, value: Optional[TimeWindow]) -> None:
+        region, _, severity = self._measured()
+        self._details = (region, value, severity)
+
+    @property
+    def severity(self) -> float:
+        return self._measured()[2]
+
+    @severity.setter
+    def severity(self, value: float) -> None:
+        region, time, _ = self._measured()
+        self._details = (region, time, value)
+
+    @property
+    def suggestion(self) -> str:
+        if self._suggestion is None:
+            self._suggestion = self._detector._generate_suggestion(
+                self.obj1, self.obj2, self.severity
+            )
+        return self._suggestion
+
+    @suggestion.setter
+    def suggestion(self, value: str) -> None:
+        self._suggestion = value
+
+    def __repr__(self) -> str:
+        return f"LazyConflict(obj1={self.obj1.id!r}, obj2={self.obj2.id!r})"
+
+
 @dataclass
 class ConflictReport:
     """
@@ -96,6 +171,10 @@ class ConflictReport:
         return f"ConflictReport(conflicts={self.total_conflicts}, objects={self.total_objects})"
 
 
+# A grid footprint: (first column, last column, first row, last row)
+_Bounds = Tuple[int, int, int, int]
+
+
 class SpatialHashGrid:
     """
     Spatial hash grid for efficient collision detection.
@@ -103,9 +182,14 @@ class SpatialHashGrid:
     Divides space into cells and only checks collisions between
     objects in the same or adjacent cells.
 
+    Cells are stored as nested dicts (column -> row -> object ids) and
+    addressed by integer bounds, so walking a region's cells does not
+    allocate coordinate tuples or lists. Queries over regions wider or
+    taller than the occupied area only visit occupied columns and rows.
+
     Attributes:
         cell_size: Size of each grid cell
-        grid: Dictionary mapping cell coordinates to object sets
+        grid: Dictionary mapping column to row to object sets
     """
 
     def __init__(self, cell_size: float = 1.0):
@@ -115,9 +199,35 @@ class SpatialHashGrid:
         Args:
             cell_size: Size of each grid cell (should be larger than
                       typical object size for best performance)
+
+        Raises:
+            ValueError: If cell_size is not positive
         """
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
         self.cell_size = cell_size
-        self.grid: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        self.grid: Dict[int, Dict[int, Set[Hashable]]] = {}
+
+    def _bounds(self, region: SpaceRegion) -> _Bounds:
+        """Get the column and row range a region overlaps."""
+        size = self.cell_size
+        return (math.floor(region.left / size), math.floor(region.right / size),
+                math.floor(region.bottom / size), math.floor(region.top / size))
+
+    def iter_cells(self, region: SpaceRegion) -> Iterator[Tuple[int, int]]:
+        """
+        Iterate the (x, y) coordinates of the cells a region overlaps.
+
+        Args:
+            region: SpaceRegion to get cells for
+
+        Yields:
+            (x, y) cell coordinates
+        """
+        x0, x1, y0, y1 = self._bounds(region)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield x, y
 
     def _get_cell_coords(self, region: SpaceRegion) -> List[Tuple[int, int]]:
         """
@@ -129,19 +239,9 @@ class SpatialHashGrid:
         Returns:
             List of (x, y) cell coordinates
         """
-        cells = []
-        start_x = int(region.left / self.cell_size)
-        end_x = int(region.right / self.cell_size)
-        start_y = int(region.bottom / self.cell_size)
-        end_y = int(region.top / self.cell_size)
-
-        for x in range(start_x, end_x + 1):
-            for y in range(start_y, end_y + 1):
-                cells.append((x, y))
+        return list(self.iter_cells(region))
 
-        return cells
-
-    def insert(self, obj_id: str, region: SpaceRegion) -> None:
+    def insert(self, obj_id: Hashable, region: SpaceRegion) -> None:
         """
         Insert an object into the grid.
 
@@ -149,13 +249,23 @@ class SpatialHashGrid:
             obj_id: Unique object identifier
             region: Spatial region of the object
         """
-        cells = self._get_cell_coords(region)
-        for cell in cells:
-            self.grid[cell].add(obj_id)
+        self._insert_cells(obj_id, self._bounds(region))
+
+    def remove(self, obj_id: Hashable, region: SpaceRegion) -> None:
+        """
+        Remove an object from the grid.
+
+        Empty cells are dropped so the grid only holds live buckets.
+
+        Args:
+            obj_id: Identifier the object was inserted with
+            region: Spatial region the object was inserted with
+        """
+        self._remove_cells(obj_id, self._bounds(region))
 
     def get_potential_collisions(
-        self, obj_id: str, region: SpaceRegion
-    ) -> Set[str]:
+        self, obj_id: Hashable, region: SpaceRegion
+    ) -> Set[Hashable]:
         """
         Get objects that might collide with the given region.
 
@@ -166,36 +276,542 @@ class SpatialHashGrid:
         Returns:
             Set of object IDs that might collide
         """
-        potential: Set[str] = set()
-        cells = self._get_cell_coords(region)
-
-        for cell in cells:
-            potential.update(self.grid[cell])
-
+        potential = self._query_cells(self._bounds(region))
         potential.discard(obj_id)  # Remove self
         return potential
 
+    def _insert_cells(self, obj_id: Hashable, bounds: _Bounds) -> None:
+        """Insert an object into precomputed cell bounds."""
+        x0, x1, y0, y1 = bounds
+        grid = self.grid
+        for x in range(x0, x1 + 1):
+            column = grid.get(x)
+            if column is None:
+                column = grid[x] = {}
+            for y in range(y0, y1 + 1):
+                bucket = column.get(y)
+                if bucket is None:
+                    column[y] = {obj_id}
+                else:
+                    bucket.add(obj_id)
+
+    def _remove_cells(self, obj_id: Hashable, bounds: _Bounds) -> None:
+        """Remove an object from precomputed cell bounds."""
+        x0, x1, y0, y1 = bounds
+        grid = self.grid
+        for x in range(x0, x1 + 1):
+            column = grid.get(x)
+            if column is None:
+                continue
+            for y in range(y0, y1 + 1):
+                bucket = column.get(y)
+                if bucket is None:
+                    continue
+                bucket.discard(obj_id)
+                if not bucket:
+                    del column[y]
+            if not column:
+                del grid[x]
+
+    def _query_cells(self, bounds: _Bounds) -> Set[Hashable]:
+        """Collect the objects stored in precomputed cell bounds."""
+        x0, x1, y0, y1 = bounds
+        potential: Set[Hashable] = set()
+        grid = self.grid
+        if x1 - x0 + 1 <= len(grid):
+            columns = (grid.get(x) for x in range(x0, x1 + 1))
+        else:
+            columns = (column for x, column in grid.items() if x0 <= x <= x1)
+        for column in columns:
+            if not column:
+                continue
+            if y1 - y0 + 1 <= len(column):
+                for y in range(y0, y1 + 1):
+                    bucket = column.get(y)
+                    if bucket:
+                        potential.update(bucket)
+            else:
+                for y, bucket in column.items():
+                    if y0 <= y <= y1:
+                        potential.update(bucket)
+        return potential
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get occupancy statistics.
+
+        Returns:
+            Dictionary with cell_size, cells (occupied), entries (object
+            references over all cells), mean_bucket and max_bucket
+        """
+        sizes = [len(bucket) for column in self.grid.values()
+                 for bucket in column.values()]
+        return {
+            'cell_size': self.cell_size,
+            'cells': len(sizes),
+            'entries': sum(sizes),
+            'mean_bucket': sum(sizes) / len(sizes) if sizes else 0.0,
+            'max_bucket': max(sizes, default=0),
+        }
+
     def clear(self) -> None:
         """Clear the grid."""
         self.grid.clear()
 
 
+class HierarchicalSpatialHashGrid:
+    """
+    Stack of spatial hash grids whose cell size doubles per level.
+
+    Each object is stored once, in the finest level whose cells are at
+    least as large as the object, so it covers at most 2 x 2 cells no
+    matter how big it is. Queries visit every non-empty level. This keeps
+    full-screen backgrounds and tiny memory cells cheap in the same grid.
+
+    Provides the same interface as SpatialHashGrid.
+
+    Attributes:
+        cell_size: Cell size of the finest level
+        levels: Level number -> SpatialHashGrid
+    """
+
+    def __init__(self, cell_size: float = 1.0, max_levels: int = 16):
+        """
+        Initialize the hierarchical grid.
+
+        Args:
+            cell_size: Cell size of the finest level
+            max_levels: Number of levels; larger objects share the top one
+
+        Raises:
+            ValueError: If cell_size is not positive
+        """
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.cell_size = cell_size
+        self.max_levels = max_levels
+        self.levels: Dict[int, SpatialHashGrid] = {}
+
+    def _level(self, region: SpaceRegion) -> int:
+        """Finest level whose cells are at least as large as a region."""
+        extent = max(region.width, region.height)
+        if extent <= self.cell_size:
+            return 0
+        return min(math.ceil(math.log2(extent / self.cell_size)), self.max_levels - 1)
+
+    def _grid(self, level: int) -> SpatialHashGrid:
+        """Get or create the grid of a level."""
+        grid = self.levels.get(level)
+        if grid is None:
+            grid = self.levels[level] = SpatialHashGrid(self.cell_size * (1 << level))
+        return grid
+
+    def _bounds(self, region: SpaceRegion) -> Tuple[int, _Bounds, SpaceRegion]:
+        """Get (level, bounds on that level, region) for a region."""
+        level = self._level(region)
+        return level, self._grid(level)._bounds(region), region
+
+    def iter_cells(self, region: SpaceRegion) -> Iterator[Tuple[int, int, int]]:
+        """
+        Iterate the (level, x, y) cells a region is stored in.
+
+        Args:
+            region: SpaceRegion to get cells for
+
+        Yields:
+            (level, x, y) cell coordinates
+        """
+        level = self._level(region)
+        for x, y in self._grid(level).iter_cells(region):
+            yield level, x, y
+
+    def _get_cell_coords(self, region: SpaceRegion) -> List[Tuple[int, int, int]]:
+        """Get the (level, x, y) cells a region is stored in."""
+        return list(self.iter_cells(region))
+
+    def insert(self, obj_id: Hashable, region: SpaceRegion) -> None:
+        """Insert an object into its level."""
+        self._insert_cells(obj_id, self._bounds(region))
+
+    def remove(self, obj_id: Hashable, region: SpaceRegion) -> None:
+        """Remove an object inserted with the same region."""
+        self._remove_cells(obj_id, self._bounds(region))
+
+    def get_potential_collisions(
+        self, obj_id: Hashable, region: SpaceRegion
+    ) -> Set[Hashable]:
+        """Get objects on any level that might collide with a region."""
+        potential = self._query_cells(self._bounds(region))
+        potential.discard(obj_id)
+        return potential
+
+    def _insert_cells(self, obj_id: Hashable, key: Tuple[int, _Bounds, SpaceRegion]) -> None:
+        """Insert an object using a key from _bounds()."""
+        level, bounds, _ = key
+        self._grid(level)._insert_cells(obj_id, bounds)
+
+    def _remove_cells(self, obj_id: Hashable, key: Tuple[int, _Bounds, SpaceRegion]) -> None:
+        """Remove an object using a key from _bounds()."""
+        level, bounds, _ = key
+        grid = self.levels.get(level)
+        if grid is not None:
+            grid._remove_cells(obj_id, bounds)
+
+    def _query_cells(self, key: Tuple[int, _Bounds, SpaceRegion]) -> Set[Hashable]:
+        """Collect objects on every level overlapping a key's region."""
+        level, bounds, region = key
+        potential: Set[Hashable] = set()
+        for grid_level, grid in self.levels.items():
+            if not grid.grid:
+                continue
+            grid_bounds = bounds if grid_level == level else grid._bounds(region)
+            potential.update(grid._query_cells(grid_bounds))
+        return potential
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get occupancy statistics.
+
+        Returns:
+            Totals as in SpatialHashGrid.stats(), plus 'levels' mapping
+            each level to its own statistics
+        """
+        levels = {level: grid.stats() for level, grid in sorted(self.levels.items())
+                  if grid.grid}
+        cells = sum(level['cells'] for level in levels.values())
+        entries = sum(level['entries'] for level in levels.values())
+        return {
+            'cell_size': self.cell_size,
+            'cells': cells,
+            'entries': entries,
+            'mean_bucket': entries / cells if cells else 0.0,
+            'max_bucket': max((level['max_bucket'] for level in levels.values()), default=0),
+            'levels': levels,
+        }
+
+    def clear(self) -> None:
+        """Clear every level."""
+        self.levels.clear()
+
+
+def auto_cell_size(regions: Sequence[SpaceRegion], sample: int = 1024) -> float:
+    """
+    Pick a cell size from the size distribution of regions.
+
+    Uses the median extent (larger of width and height) of an evenly
+    spaced sample, so a typical object covers about one to four cells.
+
+    Args:
+        regions: Regions that will be inserted
+        sample: Maximum number of regions to look at
+
+    Returns:
+        Cell size (1.0 if there are no regions)
+    """
+    extents = _sample_extents(regions, sample)
+    if not extents:
+        return 1.0
+    return extents[len(extents) // 2]
+
+
+def create_spatial_grid(
+    regions: Sequence[SpaceRegion],
+    cell_size: Optional[float] = None,
+    spread: float = 8.0,
+    sample: int = 1024
+):
+    """
+    Create a grid tuned to the regions that will be inserted.
+
+    With an explicit cell_size a flat SpatialHashGrid is returned, as
+    before. Otherwise the cell size is the median extent of a sample of
+    the regions, and a HierarchicalSpatialHashGrid is used when the
+    largest sampled extent exceeds the median by more than `spread`
+    times (e.g. full-screen backgrounds over small panels).
+
+    Args:
+        regions: Regions that will be inserted
+        cell_size: Fixed cell size, or None to tune automatically
+        spread: Largest/median extent ratio that switches to a hierarchy
+        sample: Maximum number of regions to look at
+
+    Returns:
+        SpatialHashGrid or HierarchicalSpatialHashGrid
+    """
+    if cell_size is not None:
+        return SpatialHashGrid(cell_size)
+    extents = _sample_extents(regions, sample)
+    if not extents:
+        return SpatialHashGrid()
+    median = extents[len(extents) // 2]
+    if extents[-1] > median * spread:
+        return HierarchicalSpatialHashGrid(median)
+    return SpatialHashGrid(median)
+
+
+def _sample_extents(regions: Sequence[SpaceRegion], sample: int) -> List[float]:
+    """Sorted extents of an evenly spaced sample of regions."""
+    step = max(1, len(regions) // sample)
+    return sorted(max(r.width, r.height) for r in regions[::step])
+
+
+class _SpacetimeGrid:
+    """
+    Per-layer spatial hash whose cells are split into time buckets.
+
+    Objects covering more than _MAX_TIME_BUCKETS buckets are kept in a
+    single per-cell long bucket instead. A query probes whichever is
+    smaller: its bucket range or the buckets populated in each cell, so
+    its cost follows the neighbourhood rather than the timeline length.
+    """
+
+    _MAX_TIME_BUCKETS = 8
+
+    def __init__(self, cell_size: float, time_cell_size: float):
+        self.cell_size = cell_size
+        self.time_cell_size = time_cell_size
+        self._cells = SpatialHashGrid(cell_size)
+        # layer -> spatial cell -> time bucket (None for long objects) -> ids
+        self._layers: Dict[int, Dict[Tuple[int, int], Dict[Optional[int], Set[str]]]] = {}
+        # id -> (layer, spatial cells, first bucket, last bucket)
+        self._entries: Dict[str, Tuple[int, List[Tuple[int, int]], int, int]] = {}
+
+    @staticmethod
+    def auto_time_cell_size(objects: List[SpacetimeObject]) -> float:
+        """Pick the median padded duration as the time bucket width."""
+        durations = sorted(obj.time.padded_end - obj.time.start for obj in objects)
+        if not durations:
+            return 1.0
+        median = durations[len(durations) // 2]
+        return median if median > 0 else 1.0
+
+    def __contains__(self, obj_id: str) -> bool:
+        return obj_id in self._entries
+
+    def insert(
+        self, obj_id: str, layer: int, space: SpaceRegion, time: TimeWindow
+    ) -> None:
+        """Add an object's footprint."""
+        cells = self._cells._get_cell_coords(space)
+        first = math.floor(time.start / self.time_cell_size)
+        last = math.floor(time.padded_end / self.time_cell_size)
+        self._entries[obj_id] = (layer, cells, first, last)
+        layer_cells = self._layers.setdefault(layer, {})
+        for cell in cells:
+            by_bucket = layer_cells.setdefault(cell, {})
+            for bucket in self._buckets(first, last):
+                by_bucket.setdefault(bucket, set()).add(obj_id)
+
+    def remove(self, obj_id: str) -> bool:
+        """Remove an object's footprint, returning False if absent."""
+        entry = self._entries.pop(obj_id, None)
+        if entry is None:
+            return False
+        layer, cells, first, last = entry
+        layer_cells = self._layers[layer]
+        for cell in cells:
+            by_bucket = layer_cells[cell]
+            for bucket in self._buckets(first, last):
+                ids = by_bucket[bucket]
+                ids.discard(obj_id)
+                if not ids:
+                    del by_bucket[bucket]
+            if not by_bucket:
+                del layer_cells[cell]
+        return True
+
+    def query(
+        self,
+        layer: int,
+        space: SpaceRegion,
+        start: float,
+        end: Optional[float] = None
+    ) -> Set[str]:
+        """
+        Collect ids sharing a cell and a time bucket with a footprint.
+
+        Args:
+            layer: Layer to search
+            space: Region to search
+            start: Earliest time of interest
+            end: Latest time of interest (None for no limit)
+
+        Returns:
+            Candidate ids (a superset of the true overlaps)
+        """
+        layer_cells = self._layers.get(layer)
+        found: Set[str] = set()
+        if not layer_cells:
+            return found
+        first = math.floor(start / self.time_cell_size)
+        last = math.floor(end / self.time_cell_size) if end is not None else None
+        for cell in self._cells._get_cell_coords(space):
+            by_bucket = layer_cells.get(cell)
+            if not by_bucket:
+                continue
+            long_ids = by_bucket.get(None)
+            if long_ids:
+                found.update(long_ids)
+            if last is not None and last - first + 1 <= len(by_bucket):
+                for bucket in range(first, last + 1):
+                    ids = by_bucket.get(bucket)
+                    if ids:
+                        found.update(ids)
+            else:
+                for bucket, ids in by_bucket.items():
+                    if (bucket is not None and bucket >= first and
+                            (last is None or bucket <= last)):
+                        found.update(ids)
+        return found
+
+    def _buckets(self, first: int, last: int):
+        """Buckets an object with this bucket range is stored in."""
+        if last - first >= self._MAX_TIME_BUCKETS:
+            return (None,)
+        return range(first, last + 1)
+
+
+# A sweep row: (start, padded_end, space, motion) of one object
+_Row = Tuple[float, float, SpaceRegion, Optional[MotionPath]]
+
+
+def _row(obj: SpacetimeObject) -> _Row:
+    """Build the sweep row of an object."""
+    return (obj.time.start, obj.time.padded_end, obj.space, obj.motion)
+
+
+def _iter_sweep_rows(
+    rows: List[_Row], cell_size: Optional[float] = None, first_owned: int = 0
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield conflicting index pairs in start-sorted sweep rows.
+
+    Pairs come out as the sweep reaches their later row, i.e. in
+    non-decreasing start time of the later row.
+
+    Args:
+        rows: Rows of one layer, sorted by start time
+        cell_size: Cell size for the spatial hash grid (None picks the
+                   grid and cell size from the rows' sizes)
+        first_owned: Only report pairs whose later row is at or after
+                     this index; earlier rows are only swept for context
+
+    Yields:
+        (i, j) index pairs with i < j
+    """
+    grid = create_spatial_grid([row[2] for row in rows], cell_size)
+    # heap of (padded_end, index, cell bounds) for rows still in the grid
+    active: List[Tuple[float, int, Any]] = []
+
+    for j, (start, padded_end, space, motion) in enumerate(rows):
+        # Retire rows whose padded window closed before this one starts
+        while active and active[0][0] < start:
+            _, i, cells = heapq.heappop(active)
+            grid._remove_cells(i, cells)
+
+        # Every active row started no later than row j and is still open
+        # at its start, so the time windows overlap; only the exact
+        # spatial check remains. Moving rows are broad-phased by their
+        # swept box and then followed along their paths.
+        cells = grid._bounds(space)
+        if j >= first_owned:
+            for i in grid._query_cells(cells):
+                _, other_end, other_space, other_motion = rows[i]
+                if not other_space.intersects(space):
+                    continue
+                if motion is not None or other_motion is not None:
+                    end = min(padded_end, other_end)
+                    if first_contact(start, end, other_space, other_motion,
+                                     space, motion) is None:
+                        continue
+                yield i, j
+
+        grid._insert_cells(j, cells)
+        heapq.heappush(active, (padded_end, j, cells))
+
+
+def _sweep_rows(
+    rows: List[_Row], cell_size: Optional[float] = None, first_owned: int = 0
+) -> List[Tuple[int, int]]:
+    """List form of _iter_sweep_rows."""
+    return list(_iter_sweep_rows(rows, cell_size, first_owned))
+
+
+def _layer_stream(
+    sorted_objects: List[SpacetimeObject], cell_size: Optional[float] = None
+) -> Iterator[Tuple[float, SpacetimeObject, SpacetimeObject]]:
+    """
+    Yield (start of later object, object, object) for one layer's conflicts.
+
+    Args:
+        sorted_objects: Objects of one layer, sorted by start time
+        cell_size: Cell size for the spatial hash grid
+
+    Yields:
+        Conflicting pairs keyed by the later object's start time
+    """
+    rows = [_row(o) for o in sorted_objects]
+    for i, j in _iter_sweep_rows(rows, cell_size):
+        yield sorted_objects[j].time.start, sorted_objects[i], sorted_objects[j]
+
+
+def _sweep_shard(
+    rows: List[_Row], index: List[int], cell_size: Optional[float], first_owned: int
+) -> List[Tuple[int, int]]:
+    """
+    Sweep one time shard in a worker process.
+
+    Args:
+        rows: Carry-in rows followed by the shard's own rows
+        index: Layer-wide position of each row
+        cell_size: Cell size for the spatial hash grid
+        first_owned: Number of carry-in rows
+
+    Returns:
+        Conflicting pairs as layer-wide positions
+    """
+    return [(index[i], index[j])
+            for i, j in _sweep_rows(rows, cell_size, first_owned)]
+
+
 class ConflictDetector:
     """
     Detects spacetime conflicts using efficient algorithms.
 
-    Uses spatial hashing for O(n) average-case performance instead
-    of naive O(n²) pairwise checking.
+    Each layer is swept in start-time order. Objects enter a spatial
+    hash grid when they start and leave it once their padded end has
+    passed, so exact intersection checks only run on pairs that are
+    alive at the same time and share a grid cell.
+
+    With more than one worker, layers are swept in a process pool and
+    layers larger than shard_size are split into time shards. Each shard
+    also sweeps the earlier objects still open at its first start time
+    (carry-ins) but only reports pairs whose later object it owns, so
+    every pair is found exactly once. Reports are identical to, and in
+    the same order as, the serial mode.
     """
 
-    def __init__(self, spatial_cell_size: float = 1.0):
+    def __init__(
+        self,
+        spatial_cell_size: Optional[float] = None,
+        workers: Optional[int] = 1,
+        shard_size: int = 20000
+    ):
         """
         Initialize the conflict detector.
 
         Args:
-            spatial_cell_size: Cell size for spatial hash grid
+            spatial_cell_size: Cell size for spatial hash grid (None tunes
+                               the grid to each layer's object sizes)
+            workers: Number of worker processes (1 runs serially,
+                     None uses every CPU)
+            shard_size: Maximum objects per time shard in parallel mode
         """
+        if shard_size < 1:
+            raise ValueError(f"shard_size must be positive, got {shard_size}")
         self.spatial_cell_size = spatial_cell_size
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.shard_size = shard_size
 
     def detect_conflicts(
         self, timeline: Timeline, check_layers: Optional[List[int]] = None
@@ -211,9 +827,102 @@ class ConflictDetector:
             ConflictReport with all detected conflicts
         """
         report = ConflictReport(total_objects=len(timeline.objects))
+        groups = self._layer_groups(timeline, check_layers)
+        for layer_conflicts in self._detect_groups(groups):
+            report.conflicts.extend(layer_conflicts)
+
+        report.total_conflicts = len(report.conflicts)
+        return report
+
+    def iter_conflicts(
+        self, timeline: Timeline, check_layers: Optional[List[int]] = None
+    ) -> Iterator[Conflict]:
+        """
+        Yield conflicts lazily as the sweep finds them.
+
+        Layers are swept side by side and merged, so conflicts come out
+        in non-decreasing start time of their later object across all
+        layers. Nothing beyond the current position of the sweep is
+        computed, and conflict details are computed on first access.
+
+        Args:
+            timeline: Timeline to check
+            check_layers: Optional list of layers to check (default: all)
+
+        Yields:
+            Conflicts, with obj1 starting no later than obj2
+        """
+        streams = [
+            _layer_stream(sorted(objects, key=lambda o: o.time.start), self.spatial_cell_size)
+            for objects in self._layer_groups(timeline, check_layers)
+        ]
+
+        for _, obj1, obj2 in heapq.merge(*streams, key=lambda item: item[0]):
+            yield self._create_conflict(obj1, obj2)
+
+    def any_conflict(
+        self, timeline: Timeline, check_layers: Optional[List[int]] = None
+    ) -> bool:
+        """
+        Check whether a timeline has any conflict, stopping at the first.
+
+        Args:
+            timeline: Timeline to check
+            check_layers: Optional list of layers to check (default: all)
+
+        Returns:
+            True if at least one conflict exists
+        """
+        return next(self.iter_conflicts(timeline, check_layers), None) is not None
+
+    def first_k(
+        self,
+        timeline: Timeline,
+        k: int,
+        min_severity: float = 0.0,
+        check_layers: Optional[List[int]] = None
+    ) -> List[Conflict]:
+        """
+        Get the earliest conflicts at or above a severity, stopping early.
+
+        Only conflicts that reach the severity filter have their
+        geometry computed.
+
+        Args:
+            timeline: Timeline to check
+            k: Maximum number of conflicts to return
+            min_severity: Minimum severity (0-1)
+            check_layers: Optional list of layers to check (default: all)
+
+        Returns:
+            Up to k conflicts, in the order of iter_conflicts
+        """
+        found: List[Conflict] = []
+        if k <= 0:
+            return found
+        for conflict in self.iter_conflicts(timeline, check_layers):
+            if min_severity > 0.0 and conflict.severity < min_severity:
+                continue
+            found.append(conflict)
+            if len(found) >= k:
+                break
+        return found
+
+    def _layer_groups(
+        self, timeline: Timeline, check_layers: Optional[List[int]] = None
+    ) -> List[List[SpacetimeObject]]:
+        """
+        Split a timeline into per-layer object lists worth checking.
 
+        Args:
+            timeline: Timeline to split
+            check_layers: Optional list of layers to keep
+
+        Returns:
+            Layer groups in order of first appearance
+        """
         if len(timeline.objects) < 2:
-            return report
+            return []
 
         # Filter by layers if specified
         objects_to_check = timeline.objects
@@ -222,20 +931,92 @@ class ConflictDetector:
                               if obj.layer in check_layers]
 
         if len(objects_to_check) < 2:
-            return report
+            return []
 
         # Group objects by layer to avoid cross-layer checks
         by_layer: Dict[int, List[SpacetimeObject]] = defaultdict(list)
         for obj in objects_to_check:
             by_layer[obj.layer].append(obj)
 
-        # Check each layer independently
-        for layer, layer_objects in by_layer.items():
-            layer_conflicts = self._detect_layer_conflicts(layer_objects)
-            report.conflicts.extend(layer_conflicts)
+        return list(by_layer.values())
 
-        report.total_conflicts = len(report.conflicts)
-        return report
+    def _detect_groups(
+        self, groups: List[List[SpacetimeObject]]
+    ) -> List[List[Conflict]]:
+        """
+        Detect conflicts in independent layer groups.
+
+        Args:
+            groups: Lists of objects, each on a single layer
+
+        Returns:
+            Conflicts for each group, in the same order
+        """
+        if self.workers <= 1:
+            return [self._detect_layer_conflicts(objects) for objects in groups]
+
+        sorted_groups = [sorted(objects, key=lambda o: o.time.start)
+                         for objects in groups]
+        group_pairs: List[List[Tuple[int, int]]] = [[] for _ in groups]
+
+        tasks = []
+        for g, sorted_objects in enumerate(sorted_groups):
+            for shard in self._plan_shards(sorted_objects):
+                tasks.append((g, shard))
+
+        if len(tasks) <= 1:
+            return [self._detect_layer_conflicts(objects) for objects in groups]
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as pool:
+            futures = [
+                (g, pool.submit(_sweep_shard, rows, index,
+                                self.spatial_cell_size, first_owned))
+                for g, (rows, index, first_owned) in tasks
+            ]
+            for g, future in futures:
+                group_pairs[g].extend(future.result())
+
+        results = []
+        for sorted_objects, pairs in zip(sorted_groups, group_pairs):
+            pairs.sort()
+            results.append([self._create_conflict(sorted_objects[i], sorted_objects[j])
+                            for i, j in pairs])
+        return results
+
+    def _plan_shards(
+        self, sorted_objects: List[SpacetimeObject]
+    ) -> List[Tuple[List[_Row], List[int], int]]:
+        """
+        Split a start-sorted layer into time shards.
+
+        Args:
+            sorted_objects: Objects on one layer, sorted by start time
+
+        Returns:
+            List of (rows, layer-wide index, carry-in count) per shard
+        """
+        n = len(sorted_objects)
+        if n < 2:
+            return []
+        rows = [_row(o) for o in sorted_objects]
+        if n <= self.shard_size:
+            return [(rows, list(range(n)), 0)]
+
+        shards = []
+        # heap of (padded_end, index) for objects before the shard boundary
+        open_before: List[Tuple[float, int]] = []
+        for lo in range(0, n, self.shard_size):
+            hi = min(lo + self.shard_size, n)
+            boundary = rows[lo][0]
+            while open_before and open_before[0][0] < boundary:
+                heapq.heappop(open_before)
+            carry = sorted(i for _, i in open_before)
+            index = carry + list(range(lo, hi))
+            shards.append(([rows[i] for i in index], index, len(carry)))
+            for i in range(lo, hi):
+                heapq.heappush(open_before, (rows[i][1], i))
+
+        return shards
 
     def _detect_layer_conflicts(
         self, objects: List[SpacetimeObject]
@@ -243,48 +1024,58 @@ class ConflictDetector:
         """
         Detect conflicts among objects on the same layer.
 
-        Uses temporal bucketing + spatial hashing for efficiency.
+        Sweeps objects in start-time order while maintaining the set of
+        objects whose padded time window is still open. Active objects
+        live in a spatial hash grid, so each newcomer is only compared
+        against active objects sharing a grid cell.
 
         Args:
             objects: List of objects on the same layer
 
         Returns:
-            List of detected conflicts
+            List of detected conflicts, ordered by the start time of
+            the first object and then of the second
         """
         if len(objects) < 2:
             return []
 
-        conflicts: List[Conflict] = []
-
-        # First, group by time overlap to reduce checks
-        # Sort objects by start time
         sorted_objects = sorted(objects, key=lambda o: o.time.start)
+        pairs = self._sweep_pairs(sorted_objects)
+        pairs.sort()
 
-        # Use sliding window to find temporally overlapping objects
-        for i, obj1 in enumerate(sorted_objects):
-            # Check subsequent objects while there's temporal overlap potential
-            for j in range(i + 1, len(sorted_objects)):
-                obj2 = sorted_objects[j]
-
-                # If obj2 starts after obj1 ends (with padding), no more overlaps
-                if obj2.time.start > obj1.time.padded_end:
-                    break
+        return [self._create_conflict(sorted_objects[i], sorted_objects[j])
+                for i, j in pairs]
 
-                # Check time overlap
-                if not obj1.time.overlaps(obj2.time):
-                    continue
+    def _sweep_pairs(
+        self, sorted_objects: List[SpacetimeObject]
+    ) -> List[Tuple[int, int]]:
+        """
+        Find conflicting index pairs in a start-sorted object list.
 
-                # Check spatial overlap using exact intersection
-                if obj1.space.intersects(obj2.space):
-                    conflict = self._create_conflict(obj1, obj2)
-                    conflicts.append(conflict)
+        Args:
+            sorted_objects: Objects on one layer, sorted by start time
 
-        return conflicts
+        Returns:
+            List of (i, j) index pairs with i < j
+        """
+        rows = [_row(o) for o in sorted_objects]
+        return _sweep_rows(rows, self.spatial_cell_size)
 
     def _create_conflict(
         self, obj1: SpacetimeObject, obj2: SpacetimeObject
     ) -> Conflict:
-        """Create a Conflict object with details."""
+        """Create a Conflict whose details are computed on first access."""
+        return LazyConflict(obj1, obj2, self)
+
+    def _measure(
+        self, obj1: SpacetimeObject, obj2: SpacetimeObject
+    ) -> Tuple[Optional[SpaceRegion], Optional[TimeWindow], float]:
+        """
+        Compute the overlap geometry and severity of a conflicting pair.
+
+        Returns:
+            (overlap_region, overlap_time, severity)
+        """
         # Calculate overlap region
         overlap_region = obj1.get_overlap_region(obj2)
         overlap_time = obj1.get_overlap_time(obj2)
@@ -295,22 +1086,12 @@ class ConflictDetector:
             space_overlap_ratio = overlap_region.area() / min(
                 obj1.space.area(), obj2.space.area()
             )
-            time_overlap_ratio = overlap_time.duration / min(
-                obj1.time.duration, obj2.time.duration
-            )
+            shortest = min(obj1.time.duration, obj2.time.duration)
+            # An instantaneous object overlaps completely
+            time_overlap_ratio = overlap_time.duration / shortest if shortest > 0 else 1.0
             severity = (space_overlap_ratio + time_overlap_ratio) / 2
 
-        # Generate suggestion
-        suggestion = self._generate_suggestion(obj1, obj2, severity)
-
-        return Conflict(
-            obj1=obj1,
-            obj2=obj2,
-            overlap_region=overlap_region,
-            overlap_time=overlap_time,
-            severity=severity,
-            suggestion=suggestion
-        )
+        return overlap_region, overlap_time, severity
 
     def _generate_suggestion(
         self, obj1: SpacetimeObject, obj2: SpacetimeObject, severity: float
@@ -343,6 +1124,10 @@ class ConflictDetector:
         """
         Detect conflicts in each segment of a sequence.
 
+        Segments are checked in isolation; use
+        detect_conflicts_across_sequence() to also catch conflicts
+        between overlapping segments.
+
         Args:
             sequence: TimelineSequence to check
 
@@ -350,12 +1135,156 @@ class ConflictDetector:
             Dictionary mapping segment names to ConflictReports
         """
         reports = {}
+        if self.workers <= 1:
+            for segment in sequence.segments:
+                report = self.detect_conflicts(segment.timeline)
+                reports[segment.name] = report
+            return reports
+
+        # Pool every segment's layers so the workers stay busy
+        groups: List[List[SpacetimeObject]] = []
+        spans = []
         for segment in sequence.segments:
-            report = self.detect_conflicts(segment.timeline)
+            segment_groups = self._layer_groups(segment.timeline)
+            spans.append((segment, len(groups), len(groups) + len(segment_groups)))
+            groups.extend(segment_groups)
+
+        results = self._detect_groups(groups)
+        for segment, lo, hi in spans:
+            report = ConflictReport(total_objects=len(segment.timeline.objects))
+            for layer_conflicts in results[lo:hi]:
+                report.conflicts.extend(layer_conflicts)
+            report.total_conflicts = len(report.conflicts)
             reports[segment.name] = report
 
         return reports
 
+    def detect_conflicts_across_sequence(
+        self,
+        sequence: TimelineSequence,
+        check_layers: Optional[List[int]] = None
+    ) -> ConflictReport:
+        """
+        Detect conflicts in a sequence, including between segments.
+
+        Each segment is checked on its own in local time. Then, for every
+        pair of segments whose spans overlap in global time, only the
+        objects of each segment that overlap the other segment's span
+        (found with the segments' time indexes) are swept together, and
+        only pairs from different segments are kept. Nothing is merged
+        or copied: conflicts hold SegmentObjectViews, so times, ids and
+        metadata are global as in TimelineSequence.merge_all().
+
+        Args:
+            sequence: TimelineSequence to check
+            check_layers: Optional list of layers to check (default: all)
+
+        Returns:
+            One ConflictReport for the whole sequence, ordered by layer
+            and then by the global start times of the pair
+        """
+        segments = sequence.segments
+        views: List[Dict[str, SegmentObjectView]] = [{} for _ in segments]
+
+        def view(k: int, obj: SpacetimeObject) -> SegmentObjectView:
+            found = views[k].get(obj.id)
+            if found is None:
+                segment = segments[k]
+                found = views[k][obj.id] = SegmentObjectView(
+                    obj, segment.name, segment.start_offset)
+            return found
+
+        report = ConflictReport(
+            total_objects=sum(len(segment.timeline.objects) for segment in segments)
+        )
+
+        # Inside each segment, pooling every segment's layers
+        groups: List[List[SpacetimeObject]] = []
+        owners: List[int] = []
+        for k, segment in enumerate(segments):
+            for group in self._layer_groups(segment.timeline, check_layers):
+                groups.append(group)
+                owners.append(k)
+        for k, layer_conflicts in zip(owners, self._detect_groups(groups)):
+            for conflict in layer_conflicts:
+                report.conflicts.append(self._create_conflict(
+                    view(k, conflict.obj1), view(k, conflict.obj2)))
+
+        # Across segments, only where their global spans overlap
+        spans = [self._segment_span(segment) for segment in segments]
+        order = sorted((k for k, span in enumerate(spans) if span is not None),
+                       key=lambda k: spans[k][0])
+        for n, a in enumerate(order):
+            for b in order[n + 1:]:
+                if spans[b][0] > spans[a][1]:
+                    break
+                for obj1, obj2 in self._boundary_pairs(
+                    segments, a, b, spans, check_layers
+                ):
+                    report.conflicts.append(
+                        self._create_conflict(view(*obj1), view(*obj2)))
+
+        report.conflicts.sort(key=lambda c: (c.obj1.layer, c.obj1.time.start,
+                                             c.obj2.time.start, c.obj1.id, c.obj2.id))
+        report.total_conflicts = len(report.conflicts)
+        return report
+
+    @staticmethod
+    def _segment_span(segment: TimelineSegment) -> Optional[Tuple[float, float]]:
+        """Global (start, padded end) covered by a segment's objects."""
+        objects = segment.timeline.objects
+        if not objects:
+            return None
+        offset = segment.start_offset
+        return (offset + min(obj.time.start for obj in objects),
+                offset + max(obj.time.padded_end for obj in objects))
+
+    def _boundary_pairs(
+        self,
+        segments: List[TimelineSegment],
+        a: int,
+        b: int,
+        spans: List[Optional[Tuple[float, float]]],
+        check_layers: Optional[List[int]]
+    ) -> Iterator[Tuple[Tuple[int, SpacetimeObject], Tuple[int, SpacetimeObject]]]:
+        """
+        Find conflicting pairs between two segments with overlapping spans.
+
+        Args:
+            segments: Segments of the sequence
+            a, b: Indexes of the two segments
+            spans: Global span of every segment
+            check_layers: Optional list of layers to check
+
+        Yields:
+            ((segment index, object), (segment index, object)) pairs in
+            local objects, the earlier-starting one first
+        """
+        # layer -> [(global start, segment index, object)]
+        by_layer: Dict[int, List[Tuple[float, int, SpacetimeObject]]] = defaultdict(list)
+        sides: Dict[int, Set[int]] = defaultdict(set)
+        for k, other in ((a, b), (b, a)):
+            offset = segments[k].start_offset
+            lo, hi = spans[other]
+            for obj in segments[k].timeline.get_objects_in_time_range(lo - offset, hi - offset):
+                if check_layers is not None and obj.layer not in check_layers:
+                    continue
+                by_layer[obj.layer].append((obj.time.start + offset, k, obj))
+                sides[obj.layer].add(k)
+
+        for layer, entries in by_layer.items():
+            if len(sides[layer]) < 2:
+                continue
+            entries.sort(key=lambda entry: entry[0])
+            rows = []
+            for start, k, obj in entries:
+                offset = segments[k].start_offset
+                motion = obj.motion.shifted(dt=offset) if obj.motion is not None else None
+                rows.append((start, obj.time.padded_end + offset, obj.space, motion))
+            for i, j in _iter_sweep_rows(rows, self.spatial_cell_size):
+                if entries[i][1] != entries[j][1]:
+                    yield entries[i][1:], entries[j][1:]
+
 
 class ConflictResolver:
     """
@@ -414,3 +1343,443 @@ class ConflictResolver:
             if layer != current_layer:
                 return layer
         return current_layer + 1
+
+
+@dataclass
+class ResolutionPlan:
+    """
+    A set of edits that resolves a batch of conflicts.
+
+    Attributes:
+        time_shifts: Object ID -> seconds to move the object later
+        space_shifts: Object ID -> (dx, dy) to move the object
+        layer_changes: Object ID -> new layer
+        unresolved: IDs of objects no strategy could place
+    """
+
+    time_shifts: Dict[str, float] = field(default_factory=dict)
+    space_shifts: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    layer_changes: Dict[str, int] = field(default_factory=dict)
+    unresolved: List[str] = field(default_factory=list)
+
+    @property
+    def changed_ids(self) -> Set[str]:
+        """IDs of every object the plan edits."""
+        return set(self.time_shifts) | set(self.space_shifts) | set(self.layer_changes)
+
+    def __len__(self) -> int:
+        return len(self.changed_ids)
+
+    def __repr__(self) -> str:
+        return (f"ResolutionPlan(time={len(self.time_shifts)}, "
+                f"space={len(self.space_shifts)}, layer={len(self.layer_changes)}, "
+                f"unresolved={len(self.unresolved)})")
+
+
+class BatchConflictResolver:
+    """
+    Resolves every conflict in a report with one set of edits.
+
+    Conflicting objects are visited in start-time order. An object that
+    no longer conflicts with the objects already placed keeps its slot;
+    otherwise the strategies are tried in order:
+
+    - 'layer': move to the first available layer where it fits, which
+      greedily colours the interval graph of each conflict cluster
+    - 'space': shift horizontally to the nearest free position that
+      stays within the bounds (the Manim frame by default)
+    - 'time': pack it into the earliest free gap at or after its start
+
+    Because every placement is checked against the objects placed so
+    far, applying the plan cannot create new conflicts among them, and
+    only the edited objects need re-checking afterwards. Moving objects
+    are placed by their swept bounding box, which is conservative.
+    """
+
+    STRATEGIES = ('layer', 'space', 'time')
+    # Default Manim frame: 128/9 x 8 units centered on the origin
+    FRAME = FrozenSpaceRegion(x=-64 / 9, y=-4.0, width=128 / 9, height=8.0)
+
+    def __init__(
+        self,
+        strategies: Tuple[str, ...] = STRATEGIES,
+        available_layers: Optional[List[int]] = None,
+        time_gap: float = 0.5,
+        space_gap: float = 0.5,
+        max_space_shift: float = 14.0,
+        spatial_cell_size: Optional[float] = None,
+        bounds: Optional[SpaceRegion] = FRAME
+    ):
+        """
+        Initialize the resolver.
+
+        Args:
+            strategies: Strategies to try, in order of preference
+            available_layers: Layers objects may move to ('layer' is
+                              skipped when None)
+            time_gap: Seconds left after a blocker before a shifted start
+            space_gap: Distance left between shifted objects
+            max_space_shift: Largest horizontal shift to consider
+            spatial_cell_size: Cell size for the spatial hash (None picks
+                               it from the timeline's object sizes)
+            bounds: Horizontal range 'space' shifts must stay within
+                    (None allows any position)
+
+        Raises:
+            ValueError: If a strategy is unknown or a gap is not positive
+        """
+        for strategy in strategies:
+            if strategy not in self.STRATEGIES:
+                raise ValueError(f"Unknown strategy '{strategy}'")
+        if time_gap <= 0 or space_gap <= 0:
+            raise ValueError("time_gap and space_gap must be positive")
+        self.strategies = tuple(strategies)
+        self.available_layers = available_layers
+        self.time_gap = time_gap
+        self.space_gap = space_gap
+        self.max_space_shift = max_space_shift
+        self.spatial_cell_size = spatial_cell_size
+        self.bounds = bounds
+        self._detector = ConflictDetector(spatial_cell_size)
+
+    def plan(self, report: ConflictReport, timeline: Timeline) -> ResolutionPlan:
+        """
+        Compute edits that resolve every conflict in a report.
+
+        Args:
+            report: Conflicts to resolve
+            timeline: Timeline the report was produced from
+
+        Returns:
+            ResolutionPlan (the timeline is not modified)
+        """
+        plan = ResolutionPlan()
+        pending = {}
+        for conflict in report.conflicts:
+            pending[conflict.obj1.id] = conflict.obj1
+            pending[conflict.obj2.id] = conflict.obj2
+        if not pending:
+            return plan
+
+        objects = timeline.objects
+        cell_size = self.spatial_cell_size
+        if cell_size is None:
+            cell_size = auto_cell_size([obj.space for obj in objects])
+        grid = _SpacetimeGrid(cell_size, _SpacetimeGrid.auto_time_cell_size(objects))
+        # id -> (space, time, layer) of every placed object
+        placed: Dict[str, Tuple[SpaceRegion, TimeWindow, int]] = {}
+        for obj in objects:
+            if obj.id not in pending:
+                placed[obj.id] = (obj.space, obj.time, obj.layer)
+                grid.insert(obj.id, obj.layer, obj.space, obj.time)
+
+        for obj in sorted(pending.values(), key=lambda o: (o.time.start, o.id)):
+            slot = (obj.space, obj.time, obj.layer)
+            if self._blockers(grid, placed, *slot):
+                for strategy in self.strategies:
+                    moved = getattr(self, f'_try_{strategy}')(grid, placed, *slot)
+                    if moved is not None:
+                        slot = moved
+                        break
+                else:
+                    plan.unresolved.append(obj.id)
+
+            space, time, layer = slot
+            if time is not obj.time:
+                plan.time_shifts[obj.id] = time.start - obj.time.start
+            if space is not obj.space:
+                plan.space_shifts[obj.id] = (space.x - obj.space.x, space.y - obj.space.y)
+            if layer != obj.layer:
+                plan.layer_changes[obj.id] = layer
+            placed[obj.id] = slot
+            grid.insert(obj.id, layer, space, time)
+
+        return plan
+
+    def apply(self, plan: ResolutionPlan, timeline: Timeline) -> ConflictReport:
+        """
+        Apply a plan in one batch and re-check only the edited objects.
+
+        Edited objects are replaced by new SpacetimeObjects; the originals
+        are left untouched and metadata is shared.
+
+        Args:
+            plan: Plan from plan()
+            timeline: Timeline to edit
+
+        Returns:
+            ConflictReport of conflicts still involving edited objects
+        """
+        edited = []
+        for obj_id in plan.changed_ids:
+            obj = timeline.get(obj_id)
+            if obj is None:
+                continue
+            shift = plan.time_shifts.get(obj_id, 0.0)
+            dx, dy = plan.space_shifts.get(obj_id, (0.0, 0.0))
+            edited.append(SpacetimeObject(
+                id=obj.id,
+                space=SpaceRegion(x=obj.space.x + dx, y=obj.space.y + dy,
+                                  width=obj.space.width, height=obj.space.height),
+                time=TimeWindow(start=obj.time.start + shift, end=obj.time.end + shift,
+                                padding=obj.time.padding),
+                layer=plan.layer_changes.get(obj_id, obj.layer),
+                metadata=obj.metadata,
+                motion=obj.motion.shifted(shift, dx, dy) if obj.motion is not None else None
+            ))
+        timeline.replace_many(edited)
+
+        report = ConflictReport(total_objects=len(timeline))
+        seen: Set[Tuple[str, str]] = set()
+        for obj in edited:
+            for other in timeline.get_objects_in_time_range(obj.time.start,
+                                                            obj.time.padded_end):
+                if other.id == obj.id or not obj.conflicts_with(other):
+                    continue
+                key = (obj.id, other.id) if obj.id <= other.id else (other.id, obj.id)
+                if key in seen:
+                    continue
+                seen.add(key)
+                first, second = sorted((obj, other), key=lambda o: (o.time.start, o.id))
+                report.conflicts.append(self._detector._create_conflict(first, second))
+
+        report.total_conflicts = len(report.conflicts)
+        return report
+
+    def resolve(self, report: ConflictReport, timeline: Timeline) -> ConflictReport:
+        """Plan and apply in one step (see plan() and apply())."""
+        return self.apply(self.plan(report, timeline), timeline)
+
+    def _blockers(
+        self,
+        grid: '_SpacetimeGrid',
+        placed: Dict[str, Tuple[SpaceRegion, TimeWindow, int]],
+        space: SpaceRegion,
+        time: TimeWindow,
+        layer: int
+    ) -> List[str]:
+        """IDs of placed objects that would conflict with a slot."""
+        blockers = []
+        for other_id in grid.query(layer, space, time.start, time.padded_end):
+            other_space, other_time, _ = placed[other_id]
+            if other_time.overlaps(time) and other_space.intersects(space):
+                blockers.append(other_id)
+        return blockers
+
+    def _try_layer(self, grid, placed, space, time, layer):
+        """Move to the first available layer where the slot is free."""
+        for candidate in self.available_layers or ():
+            if candidate != layer and not self._blockers(grid, placed, space, time, candidate):
+                return space, time, candidate
+        return None
+
+    def _try_space(self, grid, placed, space, time, layer):
+        """Shift horizontally to the free position nearest the original."""
+        reach = self.max_space_shift + space.width + self.space_gap
+        row = SpaceRegion(x=space.x - reach, y=space.y,
+                          width=space.width + 2 * reach, height=space.height)
+        busy = []
+        for other_id in self._blockers(grid, placed, row, time, layer):
+            other_space = placed[other_id][0]
+            busy.append((other_space.left, other_space.right))
+
+        candidates = [space.x]
+        for left, right in busy:
+            candidates.append(right + self.space_gap)
+            candidates.append(left - self.space_gap - space.width)
+        low, high = -math.inf, math.inf
+        if self.bounds is not None:
+            # Flush against either edge of the bounds
+            low, high = self.bounds.left, self.bounds.right - space.width
+            candidates.extend((low, high))
+        for x in sorted(candidates, key=lambda c: abs(c - space.x)):
+            if abs(x - space.x) > self.max_space_shift:
+                break
+            if not low <= x <= high:
+                continue
+            if all(x + space.width < left or right < x for left, right in busy):
+                return SpaceRegion(x=x, y=space.y, width=space.width,
+                                   height=space.height), time, layer
+        return None
+
+    def _try_time(self, grid, placed, space, time, layer):
+        """Pack into the earliest free gap at or after the current start."""
+        busy = []
+        for other_id in grid.query(layer, space, time.start):
+            other_space, other_time, _ = placed[other_id]
+            if other_time.padded_end >= time.start and other_space.intersects(space):
+                busy.append((other_time.start, other_time.padded_end))
+        busy.sort()
+
+        span = time.padded_end - time.start
+        start = time.start
+        for other_start, other_end in busy:
+            if other_end < start:
+                continue
+            if start + span < other_start:
+                break
+            start = max(start, other_end + self.time_gap)
+
+        return space, TimeWindow(start=start, end=start + time.duration,
+                                 padding=time.padding), layer
+
+
+class IncrementalConflictDetector:
+    """
+    Keeps a live ConflictReport in sync with a timeline.
+
+    The detector subscribes to the timeline's add, remove and update
+    events. Each layer keeps a spatial hash of time-bucketed cells, so a
+    change only re-checks objects that share a grid cell and a time
+    bucket with the old or new footprint of the changed object.
+
+    Objects edited in place must be reported with Timeline.touch().
+
+    Attributes:
+        timeline: Timeline being watched
+        check_layers: Layers to check, or None for all layers
+        spatial_cell_size: Cell size for the spatial hash
+        time_cell_size: Width of a time bucket in seconds
+    """
+
+    def __init__(
+        self,
+        timeline: Timeline,
+        spatial_cell_size: Optional[float] = None,
+        time_cell_size: Optional[float] = None,
+        check_layers: Optional[List[int]] = None
+    ):
+        """
+        Build the initial report and start watching the timeline.
+
+        Args:
+            timeline: Timeline to watch
+            spatial_cell_size: Cell size for the spatial hash (default:
+                               median extent of the initial objects)
+            time_cell_size: Time bucket width (default: median padded
+                            duration of the initial objects)
+            check_layers: Optional list of layers to check (default: all)
+        """
+        self.timeline = timeline
+        self.check_layers = set(check_layers) if check_layers is not None else None
+        self._detector = ConflictDetector(spatial_cell_size)
+
+        objects = [obj for obj in timeline.objects if self._tracks(obj)]
+        if spatial_cell_size is None:
+            spatial_cell_size = auto_cell_size([obj.space for obj in objects])
+        self.spatial_cell_size = spatial_cell_size
+        if time_cell_size is None:
+            time_cell_size = _SpacetimeGrid.auto_time_cell_size(objects)
+        self.time_cell_size = time_cell_size
+
+        self._grid = _SpacetimeGrid(spatial_cell_size, time_cell_size)
+        self._objects: Dict[str, SpacetimeObject] = {}
+        self._conflicts: Dict[Tuple[str, str], Conflict] = {}
+        self._partners: Dict[str, Set[str]] = defaultdict(set)
+        self._report = ConflictReport()
+        self._dirty = True
+
+        for obj in objects:
+            self._insert(obj)
+        initial = self._detector.detect_conflicts(
+            timeline, sorted(self.check_layers) if self.check_layers is not None else None
+        )
+        for conflict in initial.conflicts:
+            self._store(conflict)
+
+        timeline.subscribe(self._on_event)
+
+    @property
+    def report(self) -> ConflictReport:
+        """
+        The live conflict report.
+
+        The same ConflictReport instance is returned every time and is
+        refreshed on access after changes. Conflicts are ordered by
+        layer, then by the start times of the two objects.
+        """
+        if self._dirty:
+            conflicts = sorted(
+                self._conflicts.values(),
+                key=lambda c: (c.obj1.layer, c.obj1.time.start, c.obj2.time.start,
+                               c.obj1.id, c.obj2.id)
+            )
+            self._report.conflicts = conflicts
+            self._report.total_conflicts = len(conflicts)
+            self._dirty = False
+        self._report.total_objects = len(self.timeline)
+        return self._report
+
+    def conflicts_for(self, obj_id: str) -> List[Conflict]:
+        """
+        Get the current conflicts involving one object.
+
+        Args:
+            obj_id: Object ID
+
+        Returns:
+            Conflicts involving the object
+        """
+        return [self._conflicts[self._pair_key(obj_id, other)]
+                for other in self._partners.get(obj_id, ())]
+
+    def close(self) -> None:
+        """Stop watching the timeline."""
+        self.timeline.unsubscribe(self._on_event)
+
+    def _on_event(self, event: str, obj: SpacetimeObject) -> None:
+        """Apply a timeline event to the live report."""
+        self._discard(obj.id)
+        if event != 'remove' and self._tracks(obj):
+            self._insert(obj)
+            self._check(obj)
+
+    def _tracks(self, obj: SpacetimeObject) -> bool:
+        """Check whether an object's layer is being checked."""
+        return self.check_layers is None or obj.layer in self.check_layers
+
+    def _insert(self, obj: SpacetimeObject) -> None:
+        """Add an object to the grid."""
+        self._objects[obj.id] = obj
+        self._grid.insert(obj.id, obj.layer, obj.space, obj.time)
+
+    def _discard(self, obj_id: str) -> None:
+        """Remove an object from the grid and drop its conflicts."""
+        if self._objects.pop(obj_id, None) is None:
+            return
+        self._grid.remove(obj_id)
+
+        for other in self._partners.pop(obj_id, ()):
+            del self._conflicts[self._pair_key(obj_id, other)]
+            partners = self._partners[other]
+            partners.discard(obj_id)
+            if not partners:
+                del self._partners[other]
+            self._dirty = True
+
+    def _check(self, obj: SpacetimeObject) -> None:
+        """Find and store the conflicts of a newly inserted object."""
+        candidates = self._grid.query(obj.layer, obj.space,
+                                      obj.time.start, obj.time.padded_end)
+        candidates.discard(obj.id)
+        for other_id in candidates:
+            other = self._objects[other_id]
+            if not obj.conflicts_with(other):
+                continue
+            if (other.time.start, other.id) <= (obj.time.start, obj.id):
+                self._store(self._detector._create_conflict(other, obj))
+            else:
+                self._store(self._detector._create_conflict(obj, other))
+
+    def _store(self, conflict: Conflict) -> None:
+        """Record a conflict under its pair key."""
+        id1, id2 = conflict.obj1.id, conflict.obj2.id
+        self._conflicts[self._pair_key(id1, id2)] = conflict
+        self._partners[id1].add(id2)
+        self._partners[id2].add(id1)
+        self._dirty = True
+
+    @staticmethod
+    def _pair_key(id1: str, id2: str) -> Tuple[str, str]:
+        """Order-independent key for a pair of ids."""
+        return (id1, id2) if id1 <= id2 else (id2, id1)
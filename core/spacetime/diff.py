@@ -0,0 +1,336 @@
+"""
+Snapshots and structural diffs of timelines.
+
+A snapshot records the state of every object of a Timeline or
+TimelineSequence by id. Diffing two snapshots reports added, removed,
+moved, resized, retimed and otherwise changed objects together with the
+time ranges they affect, so render tooling can re-render only those.
+"""
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple, Union, NamedTuple
+
+from .objects import SpacetimeObject
+from .timelines import Timeline, TimelineSequence
+
+
+class ObjectState(NamedTuple):
+    """
+    Immutable state of one object in global time.
+
+    Attributes:
+        space: (x, y, width, height)
+        time: (start, end, padding)
+        layer: Layer number
+        metadata: Hashable form of the metadata
+        motion: Keyframes, or None for static objects
+        segment: Segment name, or None for a plain timeline
+        digest: Hash of all the fields above
+    """
+
+    space: Tuple[float, float, float, float]
+    time: Tuple[float, float, float]
+    layer: int
+    metadata: Any
+    motion: Optional[Tuple]
+    segment: Optional[str]
+    digest: int
+
+
+def _freeze(value: Any) -> Any:
+    """Turn metadata values into hashable equivalents."""
+    if isinstance(value, dict) or hasattr(value, 'items'):
+        return tuple(sorted(((k, _freeze(v)) for k, v in value.items()), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_freeze(v) for v in value), key=repr))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _state(
+    obj: SpacetimeObject,
+    offset: float,
+    segment: Optional[str],
+    frozen: Dict[int, Any]
+) -> ObjectState:
+    """
+    Capture an object's state, shifted by a segment offset.
+
+    `frozen` memoizes frozen metadata by identity, since interned
+    metadata is shared by many objects.
+    """
+    space = (obj.space.x, obj.space.y, obj.space.width, obj.space.height)
+    time = (obj.time.start + offset, obj.time.end + offset, obj.time.padding)
+    motion = None
+    if obj.motion is not None:
+        motion = (obj.motion.width, obj.motion.height,
+                  tuple((t + offset, x, y) for t, x, y in obj.motion.keyframes))
+    metadata = frozen.get(id(obj.metadata))
+    if metadata is None:
+        metadata = frozen[id(obj.metadata)] = _freeze(obj.metadata)
+    digest = hash((space, time, obj.layer, metadata, motion))
+    return ObjectState(space, time, obj.layer, metadata, motion, segment, digest)
+
+
+class TimelineSnapshot:
+    """
+    Frozen states of the objects of a timeline or sequence.
+
+    Objects of a sequence are keyed like TimelineSequence.merge_all()
+    ("<segment>_<id>") and their times are global. Each segment's states
+    are kept separately together with the segment's timeline version, so
+    capture() can reuse the states of segments that did not change and
+    diff() can skip them without comparing objects.
+
+    Objects edited in place must be reported with Timeline.touch() to be
+    recaptured.
+
+    Attributes:
+        states: Object key -> ObjectState
+    """
+
+    def __init__(self, parts: List[Tuple[Tuple, Optional[str], Dict[str, ObjectState]]]):
+        # (segment fingerprint, segment name, states) per segment
+        self._parts = parts
+        self.states: Dict[str, ObjectState] = {}
+        for _, _, states in parts:
+            self.states.update(states)
+
+    @classmethod
+    def capture(
+        cls,
+        source: Union[Timeline, TimelineSequence],
+        previous: Optional['TimelineSnapshot'] = None
+    ) -> 'TimelineSnapshot':
+        """
+        Snapshot a timeline or sequence.
+
+        Args:
+            source: Timeline or TimelineSequence to capture
+            previous: Earlier snapshot whose unchanged segments are reused
+
+        Returns:
+            TimelineSnapshot
+        """
+        reusable = {}
+        if previous is not None:
+            reusable = {fingerprint: states for fingerprint, _, states in previous._parts}
+
+        if isinstance(source, TimelineSequence):
+            segments = [(seg.name, seg.timeline, seg.start_offset) for seg in source.segments]
+        else:
+            segments = [(None, source, 0.0)]
+
+        parts = []
+        # Metadata dicts stay alive during the capture, so ids are stable
+        frozen: Dict[int, Any] = {}
+        for name, timeline, offset in segments:
+            fingerprint = (id(timeline), timeline._version, offset, name)
+            states = reusable.get(fingerprint)
+            if states is None:
+                prefix = f"{name}_" if name is not None else ""
+                states = {prefix + obj.id: _state(obj, offset, name, frozen)
+                          for obj in timeline.objects}
+            parts.append((fingerprint, name, states))
+        return cls(parts)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.states
+
+    def __repr__(self) -> str:
+        return f"TimelineSnapshot(objects={len(self)}, segments={len(self._parts)})"
+
+
+@dataclass
+class ObjectChange:
+    """
+    How one object differs between two snapshots.
+
+    Attributes:
+        key: Object key (id, or "<segment>_<id>" in sequences)
+        kinds: What changed: 'added', 'removed', or any of 'moved',
+               'resized', 'retimed', 'layer', 'metadata', 'motion'
+        before: State in the old snapshot (None if added)
+        after: State in the new snapshot (None if removed)
+    """
+
+    key: str
+    kinds: Tuple[str, ...]
+    before: Optional[ObjectState] = None
+    after: Optional[ObjectState] = None
+
+    @property
+    def time_ranges(self) -> List[Tuple[float, float]]:
+        """Padded time ranges touched by the old and new states."""
+        ranges = []
+        for state in (self.before, self.after):
+            if state is not None:
+                start, end, padding = state.time
+                ranges.append((start - padding, end + padding))
+        return ranges
+
+
+@dataclass
+class TimelineDiff:
+    """
+    Structural difference between two snapshots.
+
+    Attributes:
+        changes: Object key -> ObjectChange, for changed objects only
+    """
+
+    changes: Dict[str, ObjectChange] = field(default_factory=dict)
+
+    def _keys(self, kind: str) -> List[str]:
+        return [key for key, change in self.changes.items() if kind in change.kinds]
+
+    @property
+    def added(self) -> List[str]:
+        """Keys of added objects."""
+        return self._keys('added')
+
+    @property
+    def removed(self) -> List[str]:
+        """Keys of removed objects."""
+        return self._keys('removed')
+
+    @property
+    def moved(self) -> List[str]:
+        """Keys of objects whose position or motion changed."""
+        return [key for key, change in self.changes.items()
+                if 'moved' in change.kinds or 'motion' in change.kinds]
+
+    @property
+    def retimed(self) -> List[str]:
+        """Keys of objects whose time window changed."""
+        return self._keys('retimed')
+
+    @property
+    def segments(self) -> List[str]:
+        """Names of the sequence segments holding changed objects."""
+        names = set()
+        for change in self.changes.values():
+            for state in (change.before, change.after):
+                if state is not None and state.segment is not None:
+                    names.add(state.segment)
+        return sorted(names)
+
+    def dirty_ranges(self, margin: float = 0.0) -> List[Tuple[float, float]]:
+        """
+        Time ranges that must be re-rendered, merged and sorted.
+
+        Each changed object contributes its padded window before and
+        after the change.
+
+        Args:
+            margin: Extra seconds added on both sides of every range
+
+        Returns:
+            Disjoint (start, end) ranges in increasing order
+        """
+        ranges = sorted((start - margin, end + margin)
+                        for change in self.changes.values()
+                        for start, end in change.time_ranges)
+        merged: List[Tuple[float, float]] = []
+        for start, end in ranges:
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the snapshots are identical."""
+        return not self.changes
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __repr__(self) -> str:
+        return (f"TimelineDiff(added={len(self.added)}, removed={len(self.removed)}, "
+                f"moved={len(self.moved)}, retimed={len(self.retimed)}, "
+                f"changed={len(self.changes)})")
+
+
+def _compare(before: ObjectState, after: ObjectState) -> Tuple[str, ...]:
+    """Names of the fields that differ between two states."""
+    kinds = []
+    if before.space[:2] != after.space[:2]:
+        kinds.append('moved')
+    if before.space[2:] != after.space[2:]:
+        kinds.append('resized')
+    if before.time != after.time:
+        kinds.append('retimed')
+    if before.layer != after.layer:
+        kinds.append('layer')
+    if before.metadata != after.metadata:
+        kinds.append('metadata')
+    if before.motion != after.motion:
+        kinds.append('motion')
+    return tuple(kinds)
+
+
+def diff_timelines(
+    old: Union[Timeline, TimelineSequence, TimelineSnapshot],
+    new: Union[Timeline, TimelineSequence, TimelineSnapshot]
+) -> TimelineDiff:
+    """
+    Diff two versions of a timeline or sequence.
+
+    Objects are matched by id (and segment name in sequences). Segments
+    unchanged between the snapshots are skipped outright; other objects
+    are compared by digest first, field by field only when it differs.
+
+    To diff a timeline against its own earlier state, pass a snapshot
+    taken before the edits (live timelines are snapshotted here).
+
+    Args:
+        old: Earlier version, or a snapshot of it
+        new: Later version, or a snapshot of it
+
+    Returns:
+        TimelineDiff
+    """
+    if not isinstance(old, TimelineSnapshot):
+        old = TimelineSnapshot.capture(old)
+    if not isinstance(new, TimelineSnapshot):
+        new = TimelineSnapshot.capture(new, previous=old)
+
+    # Segments whose states were reused are identical on both sides
+    shared = {id(states) for _, _, states in old._parts} & \
+             {id(states) for _, _, states in new._parts}
+    old_states: Dict[str, ObjectState] = {}
+    for _, _, states in old._parts:
+        if id(states) not in shared:
+            old_states.update(states)
+    new_states: Dict[str, ObjectState] = {}
+    for _, _, states in new._parts:
+        if id(states) not in shared:
+            new_states.update(states)
+
+    result = TimelineDiff()
+    for key, before in old_states.items():
+        after = new_states.get(key)
+        if after is None:
+            if key not in new.states:
+                result.changes[key] = ObjectChange(key, ('removed',), before=before)
+            continue
+        if after.digest == before.digest and after == before:
+            continue
+        kinds = _compare(before, after)
+        if kinds:
+            result.changes[key] = ObjectChange(key, kinds, before=before, after=after)
+    for key, after in new_states.items():
+        if key not in old_states and key not in old.states:
+            result.changes[key] = ObjectChange(key, ('added',), after=after)
+
+    return result
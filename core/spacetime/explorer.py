@@ -0,0 +1,411 @@
+"""
+Offline HTML explorer for spacetime timelines.
+
+Writes one self-contained HTML file (no network access needed) holding
+the timeline as a compact columnar JSON blob. The page renders a Gantt
+view per layer, a spatial snapshot at a scrubbed time and conflict
+highlights client-side, so a full episode can be reviewed in a browser.
+
+Each segment of a sequence is serialized on its own. Passing the same
+ExplorerCache to repeated exports re-serializes only the segments whose
+timeline changed since the previous export.
+"""
+import json
+from typing import List, Dict, Optional, Tuple, Union
+
+from .objects import SpacetimeObject
+from .timelines import Timeline, TimelineSegment, TimelineSequence, SegmentObjectView
+from .conflict_detection import ConflictDetector, ConflictReport
+
+
+class ExplorerCache:
+    """
+    Serialized segments reused across exports.
+
+    A segment is re-serialized when its timeline, start offset or the
+    precision changes. Objects edited in place must be reported with
+    Timeline.touch() to be picked up.
+
+    Attributes:
+        hits: Segments reused from the cache
+        misses: Segments serialized
+    """
+
+    def __init__(self):
+        # segment name -> (fingerprint, JSON text)
+        self._entries: Dict[str, Tuple[Tuple, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def segment_json(self, segment: TimelineSegment, precision: int = 3) -> str:
+        """
+        Get the JSON text of a segment, serializing it if it changed.
+
+        Args:
+            segment: Segment to serialize
+            precision: Decimal places kept for coordinates and times
+
+        Returns:
+            JSON object text (see serialize_segment)
+        """
+        timeline = segment.timeline
+        fingerprint = (id(timeline), timeline._version, segment.start_offset, precision)
+        entry = self._entries.get(segment.name)
+        if entry is not None and entry[0] == fingerprint:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        text = serialize_segment(segment, precision)
+        self._entries[segment.name] = (fingerprint, text)
+        return text
+
+    def clear(self) -> None:
+        """Drop every cached segment."""
+        self._entries.clear()
+
+
+def serialize_segment(segment: TimelineSegment, precision: int = 3) -> str:
+    """
+    Serialize a segment as columnar JSON.
+
+    Every field is one array with a row per object; times are local to
+    the segment and shifted client-side by its offset. Object types are
+    stored as indexes into a 'types' table. Moving objects keep their
+    swept box as x/y/w/h and their keyframes under 'motion'.
+
+    Args:
+        segment: Segment to serialize
+        precision: Decimal places kept for coordinates and times
+
+    Returns:
+        JSON object text, safe to embed in an HTML script element
+    """
+    objects = segment.timeline.objects
+    types: List[str] = []
+    type_index: Dict[str, int] = {}
+    type_column = []
+    for obj in objects:
+        obj_type = obj.object_type
+        k = type_index.get(obj_type)
+        if k is None:
+            k = type_index[obj_type] = len(types)
+            types.append(obj_type)
+        type_column.append(k)
+
+    def column(values) -> List[float]:
+        return [round(v, precision) for v in values]
+
+    motion = {}
+    for row, obj in enumerate(objects):
+        if obj.motion is not None:
+            path = obj.motion
+            motion[row] = [round(path.width, precision), round(path.height, precision),
+                           [[round(v, precision) for v in key] for key in path.keyframes]]
+
+    data = {
+        'name': segment.name,
+        'offset': segment.start_offset,
+        'ids': [obj.id for obj in objects],
+        'x': column(obj.space.x for obj in objects),
+        'y': column(obj.space.y for obj in objects),
+        'w': column(obj.space.width for obj in objects),
+        'h': column(obj.space.height for obj in objects),
+        'start': column(obj.time.start for obj in objects),
+        'end': column(obj.time.end for obj in objects),
+        'layer': [obj.layer for obj in objects],
+        'type': type_column,
+        'types': types,
+        'motion': motion,
+    }
+    return _script_safe(json.dumps(data, separators=(',', ':')))
+
+
+def export_explorer(
+    source: Union[Timeline, TimelineSequence],
+    output_path: str,
+    report: Optional[ConflictReport] = None,
+    title: Optional[str] = None,
+    cache: Optional[ExplorerCache] = None,
+    precision: int = 3
+) -> str:
+    """
+    Write an interactive HTML explorer for a timeline or sequence.
+
+    Args:
+        source: Timeline, or TimelineSequence (one serialized segment
+                per TimelineSegment)
+        output_path: HTML file to write
+        report: Conflicts to highlight (default: detected here, across
+                segment boundaries for sequences)
+        title: Page title (default: the source's name)
+        cache: Cache of serialized segments from earlier exports
+        precision: Decimal places kept for coordinates and times
+
+    Returns:
+        output_path
+    """
+    if isinstance(source, TimelineSequence):
+        segments = list(source.segments)
+        if report is None:
+            report = ConflictDetector().detect_conflicts_across_sequence(source)
+    else:
+        segments = [TimelineSegment(name=source.name or "timeline", timeline=source)]
+        if report is None:
+            report = ConflictDetector().detect_conflicts(source)
+    if cache is None:
+        cache = ExplorerCache()
+    if title is None:
+        title = source.name or "Spacetime explorer"
+
+    conflicts = _serialize_conflicts(report, segments, precision)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        head, tail = _TEMPLATE.split('__DATA__')
+        f.write(head.replace('__TITLE__', _escape_html(title)))
+        f.write('{"title":')
+        f.write(_script_safe(json.dumps(title)))
+        f.write(',"segments":[')
+        for k, segment in enumerate(segments):
+            if k:
+                f.write(',')
+            f.write(cache.segment_json(segment, precision))
+        f.write('],"conflicts":')
+        f.write(conflicts)
+        f.write('}')
+        f.write(tail)
+
+    return output_path
+
+
+def _serialize_conflicts(
+    report: ConflictReport, segments: List[TimelineSegment], precision: int
+) -> str:
+    """
+    Serialize conflicts as columns of (segment, row) references.
+
+    Conflicts may hold plain objects of a single timeline or
+    SegmentObjectViews (from merge_all() or a sequence-wide report).
+    Conflicts whose objects are not in the segments are skipped.
+    """
+    names = {segment.name: k for k, segment in enumerate(segments)}
+    rows: List[Optional[Dict[str, int]]] = [None] * len(segments)
+
+    def row_of(k: int, obj_id: str) -> Optional[int]:
+        if rows[k] is None:
+            rows[k] = {o.id: row for row, o in enumerate(segments[k].timeline.objects)}
+        return rows[k].get(obj_id)
+
+    def locate(obj: SpacetimeObject) -> Optional[Tuple[int, int]]:
+        if isinstance(obj, SegmentObjectView):
+            k = names.get(obj.metadata.get('segment'))
+            if k is not None:
+                row = row_of(k, obj.source.id)
+                if row is not None:
+                    return k, row
+        if len(segments) == 1:
+            # A single timeline, possibly a merged one holding the views
+            row = row_of(0, obj.id)
+            if row is not None:
+                return 0, row
+        return None
+
+    columns: Dict[str, list] = {'seg1': [], 'row1': [], 'seg2': [], 'row2': [], 'severity': []}
+    for conflict in report.conflicts:
+        first = locate(conflict.obj1)
+        second = locate(conflict.obj2)
+        if first is None or second is None:
+            continue
+        columns['seg1'].append(first[0])
+        columns['row1'].append(first[1])
+        columns['seg2'].append(second[0])
+        columns['row2'].append(second[1])
+        columns['severity'].append(round(conflict.severity, precision))
+    return _script_safe(json.dumps(columns, separators=(',', ':')))
+
+
+def _script_safe(text: str) -> str:
+    """Escape JSON text so it cannot close its script element."""
+    return text.replace('</', '<\\/')
+
+
+def _escape_html(text: str) -> str:
+    """Escape text for an HTML element body."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { font: 13px sans-serif; margin: 12px; background: #1e1e1e; color: #ddd; }
+h1 { font-size: 16px; margin: 0 0 8px; }
+#controls { display: flex; gap: 12px; align-items: center; margin-bottom: 8px; }
+#time { flex: 1; }
+#gantt, #snapshot { background: #111; border: 1px solid #333; display: block; }
+#panels { display: flex; gap: 12px; margin-top: 8px; }
+#conflicts { flex: 1; max-height: 420px; overflow: auto; border: 1px solid #333; }
+#conflicts table { border-collapse: collapse; width: 100%; }
+#conflicts td, #conflicts th { padding: 2px 6px; text-align: left; white-space: nowrap; }
+#conflicts tr.row:hover { background: #333; cursor: pointer; }
+</style>
+</head>
+<body>
+<h1>__TITLE__</h1>
+<div id="controls">
+  <span id="clock">0.00s</span>
+  <input id="time" type="range" min="0" max="1" step="0.01" value="0">
+  <span id="summary"></span>
+</div>
+<svg id="gantt" width="100%" height="200"></svg>
+<div id="panels">
+  <svg id="snapshot" width="640" height="360" viewBox="-7.5 -4.5 15 9"></svg>
+  <div id="conflicts"></div>
+</div>
+<script id="data" type="application/json">__DATA__</script>
+<script>
+(function () {
+  var data = JSON.parse(document.getElementById('data').textContent);
+  var SVG = 'http://www.w3.org/2000/svg';
+  var PALETTE = ['#4e79a7', '#f28e2b', '#59a14f', '#b07aa1', '#76b7b2',
+                 '#edc948', '#ff9da7', '#9c755f', '#bab0ac', '#e15759'];
+  function esc(text) {
+    return String(text).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+  }
+  function color(layer) { return PALETTE[((layer % 10) + 10) % 10]; }
+  function el(name, attrs) {
+    var node = document.createElementNS(SVG, name);
+    for (var key in attrs) node.setAttribute(key, attrs[key]);
+    return node;
+  }
+
+  // Flatten segments into global rows
+  var rows = [], duration = 0, layers = {};
+  data.segments.forEach(function (seg, s) {
+    for (var i = 0; i < seg.ids.length; i++) {
+      var row = {seg: s, id: seg.name + '/' + seg.ids[i], x: seg.x[i], y: seg.y[i],
+                 w: seg.w[i], h: seg.h[i], start: seg.start[i] + seg.offset,
+                 end: seg.end[i] + seg.offset, layer: seg.layer[i],
+                 type: seg.types[seg.type[i]], motion: seg.motion[i] || null,
+                 offset: seg.offset, conflicted: false};
+      rows.push(row);
+      layers[row.layer] = true;
+      if (row.end > duration) duration = row.end;
+    }
+    seg.base = rows.length - seg.ids.length;
+  });
+  var c = data.conflicts, conflicts = [];
+  for (var k = 0; k < c.severity.length; k++) {
+    var a = rows[data.segments[c.seg1[k]].base + c.row1[k]];
+    var b = rows[data.segments[c.seg2[k]].base + c.row2[k]];
+    a.conflicted = b.conflicted = true;
+    conflicts.push({a: a, b: b, severity: c.severity[k],
+                    time: Math.max(a.start, b.start)});
+  }
+  conflicts.sort(function (p, q) { return p.time - q.time; });
+  var layerList = Object.keys(layers).map(Number).sort(function (p, q) { return p - q; });
+  document.getElementById('summary').textContent =
+    rows.length + ' objects, ' + conflicts.length + ' conflicts, ' + duration.toFixed(2) + 's';
+
+  // Gantt: one band per layer, bars packed into a few lanes, one path per band
+  var gantt = document.getElementById('gantt');
+  var width = gantt.clientWidth || 1000, LANES = 6, LANE = 5, LABEL = 60;
+  var scale = (width - LABEL - 10) / (duration || 1);
+  var bandHeight = LANES * LANE + 8;
+  gantt.setAttribute('height', layerList.length * bandHeight + 20);
+  layerList.forEach(function (layer, band) {
+    var top = band * bandHeight + 4, laneEnds = [], d = [];
+    var members = rows.filter(function (r) { return r.layer === layer; })
+                      .sort(function (p, q) { return p.start - q.start; });
+    members.forEach(function (r) {
+      var lane = 0;
+      while (lane < LANES - 1 && laneEnds[lane] > r.start) lane++;
+      laneEnds[lane] = r.end;
+      var x = LABEL + r.start * scale, w = Math.max((r.end - r.start) * scale, 0.5);
+      d.push('M' + x.toFixed(1) + ' ' + (top + lane * LANE) + 'h' + w.toFixed(1) + 'v' + (LANE - 1) + 'h' + (-w).toFixed(1) + 'z');
+    });
+    var label = el('text', {x: 4, y: top + bandHeight / 2, fill: '#aaa', 'font-size': 11});
+    label.textContent = 'layer ' + layer;
+    gantt.appendChild(label);
+    gantt.appendChild(el('path', {d: d.join(''), fill: color(layer), 'fill-opacity': 0.7}));
+  });
+  var marks = [];
+  conflicts.forEach(function (p) {
+    var band = layerList.indexOf(p.a.layer);
+    marks.push('M' + (LABEL + p.time * scale).toFixed(1) + ' ' + (band * bandHeight + 2) + 'v' + (bandHeight - 4));
+  });
+  gantt.appendChild(el('path', {d: marks.join(''), stroke: '#e15759', 'stroke-width': 1}));
+  var cursor = el('line', {y1: 0, y2: layerList.length * bandHeight + 20, stroke: '#fff'});
+  gantt.appendChild(cursor);
+
+  // Spatial snapshot at the scrubbed time
+  var snapshot = document.getElementById('snapshot');
+  var scene = el('g', {transform: 'scale(1,-1)'});
+  snapshot.appendChild(el('rect', {x: -7, y: -4, width: 14, height: 8, fill: 'none', stroke: '#555', 'stroke-width': 0.03}));
+  snapshot.appendChild(scene);
+
+  function position(r, t) {
+    if (!r.motion) return [r.x, r.y, r.w, r.h];
+    var keys = r.motion[2], local = t - r.offset, i = 0;
+    while (i < keys.length - 1 && keys[i + 1][0] <= local) i++;
+    var k0 = keys[i], k1 = keys[Math.min(i + 1, keys.length - 1)];
+    var f = k1[0] > k0[0] ? Math.min(Math.max((local - k0[0]) / (k1[0] - k0[0]), 0), 1) : 0;
+    return [k0[1] + (k1[1] - k0[1]) * f, k0[2] + (k1[2] - k0[2]) * f, r.motion[0], r.motion[1]];
+  }
+
+  function show(t) {
+    document.getElementById('clock').textContent = t.toFixed(2) + 's';
+    cursor.setAttribute('x1', LABEL + t * scale);
+    cursor.setAttribute('x2', LABEL + t * scale);
+    while (scene.firstChild) scene.removeChild(scene.firstChild);
+    rows.filter(function (r) { return r.start <= t && t <= r.end; })
+        .sort(function (p, q) { return p.layer - q.layer; })
+        .forEach(function (r) {
+          var box = position(r, t);
+          var rect = el('rect', {x: box[0], y: box[1], width: box[2], height: box[3],
+                                 fill: color(r.layer), 'fill-opacity': 0.35,
+                                 stroke: r.conflicted ? '#e15759' : color(r.layer),
+                                 'stroke-width': r.conflicted ? 0.06 : 0.02});
+          var tip = el('title', {});
+          tip.textContent = r.id + ' (' + r.type + ', layer ' + r.layer + ') ' +
+                            r.start.toFixed(2) + '-' + r.end.toFixed(2) + 's';
+          rect.appendChild(tip);
+          scene.appendChild(rect);
+        });
+  }
+
+  var slider = document.getElementById('time');
+  slider.max = duration;
+  slider.addEventListener('input', function () { show(parseFloat(slider.value)); });
+  gantt.addEventListener('click', function (e) {
+    var box = gantt.getBoundingClientRect();
+    var t = Math.min(Math.max((e.clientX - box.left - LABEL) / scale, 0), duration);
+    slider.value = t;
+    show(t);
+  });
+
+  // Conflict list; clicking a row jumps to the conflict
+  var list = document.getElementById('conflicts');
+  var html = ['<table><tr><th>time</th><th>layer</th><th>objects</th><th>severity</th></tr>'];
+  conflicts.slice(0, 2000).forEach(function (p, i) {
+    html.push('<tr class="row" data-i="' + i + '"><td>' + p.time.toFixed(2) + 's</td><td>' +
+              p.a.layer + '</td><td>' + esc(p.a.id) + ' / ' + esc(p.b.id) + '</td><td>' +
+              p.severity.toFixed(2) + '</td></tr>');
+  });
+  if (conflicts.length > 2000) html.push('<tr><td colspan="4">... ' + (conflicts.length - 2000) + ' more</td></tr>');
+  list.innerHTML = html.join('') + '</table>';
+  list.addEventListener('click', function (e) {
+    var tr = e.target.closest('tr.row');
+    if (!tr) return;
+    var t = conflicts[+tr.getAttribute('data-i')].time;
+    slider.value = t;
+    show(t);
+  });
+
+  show(0);
+})();
+</script>
+</body>
+</html>
+"""
@@ -7,7 +7,8 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 from enum import Enum
 
-from .objects import SpaceRegion, SpacetimeObject, TimeWindow
+from .objects import SpaceRegion, SpacetimeObject, TimeWindow, intern_region, intern_metadata
+from .spatial_index import SpacetimeIndex
 
 
 class Position(Enum):
@@ -65,6 +66,57 @@ class Zone:
         Returns:
             SpacetimeObject positioned in the zone
         """
+        x, y, width, height, layer = self._placement(width, height, layer)
+        return SpacetimeObject(
+            id=id,
+            space=SpaceRegion(x=x, y=y, width=width, height=height),
+            time=TimeWindow(start=start_time, end=start_time + duration),
+            layer=layer,
+            metadata={'zone': self.name, **metadata}
+        )
+
+    def create_shared_object(
+        self,
+        id: str,
+        start_time: float,
+        duration: float,
+        width: Optional[float] = None,
+        height: Optional[float] = None,
+        layer: Optional[int] = None,
+        **metadata
+    ) -> SpacetimeObject:
+        """
+        Create an object like create_object, sharing its values.
+
+        The region is interned and the metadata shared between all objects
+        with identical values, so both are read-only. Meant for large
+        generated timelines whose objects are replaced rather than edited.
+
+        Args:
+            id: Object identifier
+            start_time: Start time
+            duration: Duration
+            width: Object width (defaults to zone width)
+            height: Object height (defaults to zone height)
+            layer: Layer number (defaults to zone default)
+            **metadata: Additional metadata
+
+        Returns:
+            SpacetimeObject with a FrozenSpaceRegion and read-only metadata
+        """
+        x, y, width, height, layer = self._placement(width, height, layer)
+        return SpacetimeObject(
+            id=id,
+            space=intern_region(x, y, width, height),
+            time=TimeWindow(start=start_time, end=start_time + duration),
+            layer=layer,
+            metadata=intern_metadata({'zone': self.name, **metadata})
+        )
+
+    def _placement(
+        self, width: Optional[float], height: Optional[float], layer: Optional[int]
+    ) -> Tuple[float, float, float, float, int]:
+        """Position, size and layer of a new object in this zone."""
         if width is None:
             width = self.region.width * 0.9  # 90% of zone width
         if height is None:
@@ -75,14 +127,7 @@ class Zone:
         # Center the object in the zone
         x = self.region.center[0] - width / 2
         y = self.region.center[1] - height / 2
-
-        return SpacetimeObject(
-            id=id,
-            space=SpaceRegion(x=x, y=y, width=width, height=height),
-            time=TimeWindow(start=start_time, end=start_time + duration),
-            layer=layer,
-            metadata={'zone': self.name, **metadata}
-        )
+        return x, y, width, height, layer
 
 
 @dataclass
@@ -114,16 +159,22 @@ class Layout:
         id: str,
         start_time: float,
         duration: float,
+        index: Optional[SpacetimeIndex] = None,
         **kwargs
     ) -> Optional[SpacetimeObject]:
         """
         Create an object in a specific zone.
 
+        With an index, an object that would conflict with indexed objects
+        is moved to the nearest free position inside the zone (it stays
+        centered if there is none), and is then added to the index.
+
         Args:
             zone_name: Name of the zone
             id: Object identifier
             start_time: Start time
             duration: Duration
+            index: Optional SpacetimeIndex of already placed objects
             **kwargs: Additional arguments passed to Zone.create_object
 
         Returns:
@@ -132,7 +183,25 @@ class Layout:
         zone = self.get_zone(zone_name)
         if zone is None:
             return None
-        return zone.create_object(id, start_time, duration, **kwargs)
+        obj = zone.create_object(id, start_time, duration, **kwargs)
+        if index is None:
+            return obj
+
+        if index.conflicts(obj):
+            slots = index.nearest_free_slots(
+                obj.space, obj.time.start, obj.time.end,
+                layer=obj.layer, within=zone.region, padding=obj.time.padding
+            )
+            if slots:
+                obj = SpacetimeObject(
+                    id=obj.id,
+                    space=slots[0],
+                    time=obj.time,
+                    layer=obj.layer,
+                    metadata=obj.metadata
+                )
+        index.insert(obj)
+        return obj
 
     @property
     def bounds(self) -> SpaceRegion:
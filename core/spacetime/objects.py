@@ -2,12 +2,22 @@
 Core spacetime objects - SpaceRegion, TimeWindow, SpacetimeObject
 
 These are the fundamental data structures for the spacetime layer.
+The value types are slotted (Python 3.10+) to keep large timelines
+compact, and frozen variants can be interned and shared between objects.
 """
-from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field, FrozenInstanceError
+from typing import Dict, Any, Callable, Optional, Mapping, Tuple, List, Sequence
+from types import MappingProxyType
+from collections import OrderedDict
+import bisect
+import math
+import sys
 
+# dataclass(slots=True) needs Python 3.10; older versions keep __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class SpaceRegion:
     """
     A region in 2D space with collision detection.
@@ -135,7 +145,7 @@ class SpaceRegion:
         return f"SpaceRegion(x={self.x:.2f}, y={self.y:.2f}, w={self.width:.2f}, h={self.height:.2f})"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TimeWindow:
     """
     A time interval with overlap detection.
@@ -210,10 +220,13 @@ class TimeWindow:
         if not self.overlaps(other):
             return None
 
-        return TimeWindow(
-            start=max(self.start, other.start),
-            end=min(self.end, other.end)
-        )
+        start = max(self.start, other.start)
+        end = min(self.end, other.end)
+        if end < start:
+            # Windows only touch through their padding
+            return None
+
+        return TimeWindow(start=start, end=end)
 
     def extended(self, extra_start: float = 0, extra_end: float = 0) -> 'TimeWindow':
         """
@@ -236,7 +249,329 @@ class TimeWindow:
         return f"TimeWindow({self.start:.2f}s - {self.end:.2f}s, padding={self.padding:.2f}s)"
 
 
-@dataclass
+class FrozenSpaceRegion(SpaceRegion):
+    """
+    Immutable, hashable SpaceRegion that can be shared between objects.
+
+    Compares equal to a SpaceRegion with the same coordinates.
+    Use intern_region() to get a shared instance.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, x: float, y: float, width: float, height: float):
+        object.__setattr__(self, 'x', x)
+        object.__setattr__(self, 'y', y)
+        object.__setattr__(self, 'width', width)
+        object.__setattr__(self, 'height', height)
+        self.__post_init__()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SpaceRegion):
+            return NotImplemented
+        return (self.x, self.y, self.width, self.height) == \
+            (other.x, other.y, other.width, other.height)
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y, self.width, self.height))
+
+    def __reduce__(self):
+        return (FrozenSpaceRegion, (self.x, self.y, self.width, self.height))
+
+
+class FrozenTimeWindow(TimeWindow):
+    """
+    Immutable, hashable TimeWindow that can be shared between objects.
+
+    Compares equal to a TimeWindow with the same bounds and padding.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, start: float, end: float, padding: float = 0.5):
+        object.__setattr__(self, 'start', start)
+        object.__setattr__(self, 'end', end)
+        object.__setattr__(self, 'padding', padding)
+        self.__post_init__()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TimeWindow):
+            return NotImplemented
+        return (self.start, self.end, self.padding) == \
+            (other.start, other.end, other.padding)
+
+    def __hash__(self) -> int:
+        return hash((self.start, self.end, self.padding))
+
+    def __reduce__(self):
+        return (FrozenTimeWindow, (self.start, self.end, self.padding))
+
+
+@dataclass(**_SLOTS)
+class MotionPath:
+    """
+    Piecewise-linear motion of a fixed-size rectangle.
+
+    Keyframes give the lower-left corner at points in time, on the same
+    clock as the owning object's TimeWindow. Between keyframes the
+    rectangle moves linearly; before the first and after the last one it
+    rests at that keyframe's position.
+
+    Attributes:
+        keyframes: (time, x, y) tuples in non-decreasing time order
+        width: Width of the moving rectangle
+        height: Height of the moving rectangle
+    """
+
+    keyframes: Tuple[Tuple[float, float, float], ...]
+    width: float
+    height: float
+
+    def __post_init__(self):
+        """Normalize keyframes and validate them."""
+        self.keyframes = tuple((float(t), float(x), float(y)) for t, x, y in self.keyframes)
+        if not self.keyframes:
+            raise ValueError("MotionPath needs at least one keyframe")
+        for (t0, _, _), (t1, _, _) in zip(self.keyframes, self.keyframes[1:]):
+            if t1 < t0:
+                raise ValueError(f"Keyframe times must be non-decreasing, got {t1} after {t0}")
+        if self.width <= 0 or self.height <= 0:
+            raise ValueError(f"Size must be positive, got {self.width}x{self.height}")
+
+    @classmethod
+    def linear(
+        cls, region: SpaceRegion, start: float, end: float, to_x: float, to_y: float
+    ) -> 'MotionPath':
+        """
+        Move a region's lower-left corner to (to_x, to_y) over [start, end].
+
+        Args:
+            region: Region at the start of the move
+            start: Move start time
+            end: Move end time
+            to_x: Target left coordinate
+            to_y: Target bottom coordinate
+
+        Returns:
+            New MotionPath
+        """
+        return cls(
+            keyframes=((start, region.x, region.y), (end, to_x, to_y)),
+            width=region.width,
+            height=region.height
+        )
+
+    def position_at(self, time: float) -> Tuple[float, float]:
+        """
+        Get the lower-left corner at a time.
+
+        Args:
+            time: Time point
+
+        Returns:
+            (x, y) position
+        """
+        keyframes = self.keyframes
+        i = bisect.bisect_right(keyframes, (time, math.inf, math.inf))
+        if i == 0:
+            return keyframes[0][1], keyframes[0][2]
+        if i == len(keyframes):
+            return keyframes[-1][1], keyframes[-1][2]
+        t0, x0, y0 = keyframes[i - 1]
+        t1, x1, y1 = keyframes[i]
+        u = (time - t0) / (t1 - t0)
+        return x0 + (x1 - x0) * u, y0 + (y1 - y0) * u
+
+    def region_at(self, time: float) -> SpaceRegion:
+        """Get the rectangle occupied at a time."""
+        x, y = self.position_at(time)
+        return SpaceRegion(x=x, y=y, width=self.width, height=self.height)
+
+    def breakpoints(self, start: float, end: float) -> List[float]:
+        """Keyframe times strictly inside (start, end)."""
+        return [t for t, _, _ in self.keyframes if start < t < end]
+
+    def bounds(self, start: float, end: float) -> SpaceRegion:
+        """
+        Get the swept bounding box over a time range.
+
+        Motion is linear between keyframes, so the positions at the range
+        ends and at the keyframes inside it bound the whole sweep.
+
+        Args:
+            start: Range start time
+            end: Range end time
+
+        Returns:
+            SpaceRegion covering every position in the range
+        """
+        points = [self.position_at(t) for t in [start, *self.breakpoints(start, end), end]]
+        left = min(x for x, _ in points)
+        bottom = min(y for _, y in points)
+        return SpaceRegion(
+            x=left,
+            y=bottom,
+            width=max(x for x, _ in points) - left + self.width,
+            height=max(y for _, y in points) - bottom + self.height
+        )
+
+    def shifted(self, dt: float = 0.0, dx: float = 0.0, dy: float = 0.0) -> 'MotionPath':
+        """
+        Create a new path shifted in time and space.
+
+        Args:
+            dt: Time shift
+            dx: Horizontal shift
+            dy: Vertical shift
+
+        Returns:
+            New MotionPath
+        """
+        return MotionPath(
+            keyframes=tuple((t + dt, x + dx, y + dy) for t, x, y in self.keyframes),
+            width=self.width,
+            height=self.height
+        )
+
+    def then_move(self, start: float, end: float, to_x: float, to_y: float) -> 'MotionPath':
+        """
+        Append a move, dropping keyframes after its start.
+
+        Args:
+            start: Move start time
+            end: Move end time
+            to_x: Target left coordinate
+            to_y: Target bottom coordinate
+
+        Returns:
+            New MotionPath
+        """
+        x, y = self.position_at(start)
+        kept = tuple(k for k in self.keyframes if k[0] <= start)
+        return MotionPath(
+            keyframes=kept + ((start, x, y), (end, to_x, to_y)),
+            width=self.width,
+            height=self.height
+        )
+
+
+def _linear_contact(
+    a0: SpaceRegion, a1: SpaceRegion, b0: SpaceRegion, b1: SpaceRegion
+) -> Optional[Tuple[float, float]]:
+    """
+    Range of u in [0, 1] over which two linearly moving boxes intersect.
+
+    Box a moves from a0 (u = 0) to a1 (u = 1) and box b from b0 to b1.
+    Every closed-overlap condition is linear in u, so the contact set
+    is an interval that can be computed exactly.
+
+    Returns:
+        (first, last) contact parameters, or None if the boxes never touch
+    """
+    lo, hi = 0.0, 1.0
+    # Each condition reads c + d * u >= 0
+    for c0, c1 in (
+        (b0.right - a0.left, b1.right - a1.left),
+        (a0.right - b0.left, a1.right - b1.left),
+        (b0.top - a0.bottom, b1.top - a1.bottom),
+        (a0.top - b0.bottom, a1.top - b1.bottom),
+    ):
+        d = c1 - c0
+        if d == 0:
+            if c0 < 0:
+                return None
+        elif d > 0:
+            lo = max(lo, -c0 / d)
+        else:
+            hi = min(hi, -c0 / d)
+        if lo > hi:
+            return None
+    return lo, hi
+
+
+def contact_span(
+    start: float,
+    end: float,
+    space1: SpaceRegion,
+    path1: Optional[MotionPath],
+    space2: SpaceRegion,
+    path2: Optional[MotionPath]
+) -> Optional[Tuple[float, float]]:
+    """
+    First interval in [start, end] during which two footprints intersect.
+
+    The range is cut at every keyframe of either path; within each slice
+    both footprints move linearly and are checked exactly. A static
+    footprint (path None) uses its space.
+
+    Args:
+        start: Range start time
+        end: Range end time
+        space1: Static region of the first object
+        path1: Motion of the first object, or None
+        space2: Static region of the second object
+        path2: Motion of the second object, or None
+
+    Returns:
+        (first, last) contact times within the first slice that has
+        contact, or None if the footprints never intersect
+    """
+    cuts = {start, end}
+    for path in (path1, path2):
+        if path is not None:
+            cuts.update(path.breakpoints(start, end))
+    cuts = sorted(cuts)
+    if len(cuts) == 1:
+        cuts.append(cuts[0])
+
+    def at(space: SpaceRegion, path: Optional[MotionPath], t: float) -> SpaceRegion:
+        return space if path is None else path.region_at(t)
+
+    a1 = at(space1, path1, cuts[0])
+    b1 = at(space2, path2, cuts[0])
+    for s, e in zip(cuts, cuts[1:]):
+        a0, b0 = a1, b1
+        a1 = at(space1, path1, e)
+        b1 = at(space2, path2, e)
+        span = _linear_contact(a0, a1, b0, b1)
+        if span is not None:
+            return s + (e - s) * span[0], s + (e - s) * span[1]
+    return None
+
+
+def first_contact(
+    start: float,
+    end: float,
+    space1: SpaceRegion,
+    path1: Optional[MotionPath],
+    space2: SpaceRegion,
+    path2: Optional[MotionPath]
+) -> Optional[float]:
+    """
+    Earliest time in [start, end] at which two footprints intersect.
+
+    See contact_span for the arguments.
+
+    Returns:
+        Contact time, or None if the footprints never intersect
+    """
+    span = contact_span(start, end, space1, path1, space2, path2)
+    return span[0] if span is not None else None
+
+
+@dataclass(**_SLOTS)
 class SpacetimeObject:
     """
     An object existing in both space and time.
@@ -244,12 +579,17 @@ class SpacetimeObject:
     This is the core abstraction for objects in a video scene.
     Each object has a spatial region, temporal window, and optional layer.
 
+    A moving object also has a MotionPath; its space is then the swept
+    bounding box of the path, which keeps broad-phase checks unchanged,
+    and exact checks follow the path (see first_contact).
+
     Attributes:
         id: Unique identifier for the object
         space: Spatial region the object occupies
         time: Time window the object exists in
         layer: Z-index layer (objects on same layer can conflict)
         metadata: Optional metadata (type, content, etc.)
+        motion: Optional motion path (None for static objects)
     """
 
     id: str
@@ -257,6 +597,63 @@ class SpacetimeObject:
     time: TimeWindow
     layer: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
+    motion: Optional[MotionPath] = None
+
+    @classmethod
+    def moving(
+        cls,
+        id: str,
+        motion: MotionPath,
+        time: TimeWindow,
+        layer: int = 0,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> 'SpacetimeObject':
+        """
+        Create a moving object whose space is its swept bounding box.
+
+        Args:
+            id: Object identifier
+            motion: Motion path
+            time: Time window
+            layer: Layer number
+            metadata: Optional metadata
+
+        Returns:
+            New SpacetimeObject
+        """
+        return cls(
+            id=id,
+            space=motion.bounds(time.start, time.end),
+            time=time,
+            layer=layer,
+            metadata=metadata if metadata is not None else {},
+            motion=motion
+        )
+
+    def region_at(self, time: float) -> SpaceRegion:
+        """Get the region occupied at a time."""
+        if self.motion is None:
+            return self.space
+        return self.motion.region_at(time)
+
+    def first_contact(self, other: 'SpacetimeObject') -> Optional[float]:
+        """
+        Get the earliest time both objects exist and intersect.
+
+        Args:
+            other: Another SpacetimeObject
+
+        Returns:
+            Contact time, or None (layers are not compared)
+        """
+        if not (self.time.overlaps(other.time) and self.space.intersects(other.space)):
+            return None
+        start = max(self.time.start, other.time.start)
+        if self.motion is None and other.motion is None:
+            return start
+        end = min(self.time.padded_end, other.time.padded_end)
+        return first_contact(start, end, self.space, self.motion,
+                             other.space, other.motion)
 
     @property
     def object_type(self) -> str:
@@ -269,7 +666,7 @@ class SpacetimeObject:
 
         Conflict occurs when:
         1. Time windows overlap
-        2. Space regions intersect
+        2. Space regions intersect (along their paths if moving)
         3. Objects are on the same layer
 
         Args:
@@ -278,9 +675,13 @@ class SpacetimeObject:
         Returns:
             True if objects conflict, False otherwise
         """
-        return (self.time.overlaps(other.time) and
+        if not (self.time.overlaps(other.time) and
                 self.space.intersects(other.space) and
-                self.layer == other.layer)
+                self.layer == other.layer):
+            return False
+        if self.motion is None and other.motion is None:
+            return True
+        return self.first_contact(other) is not None
 
     def get_overlap_region(self, other: 'SpacetimeObject') -> Optional[SpaceRegion]:
         """
@@ -289,16 +690,36 @@ class SpacetimeObject:
         Args:
             other: Another SpacetimeObject
 
+        Moving objects are compared where they are in the middle of
+        their first contact.
+
         Returns:
             SpaceRegion representing overlap, or None if no overlap
+            (including regions that only touch along an edge)
         """
         if not self.space.intersects(other.space):
             return None
 
-        overlap_left = max(self.space.left, other.space.left)
-        overlap_right = min(self.space.right, other.space.right)
-        overlap_bottom = max(self.space.bottom, other.space.bottom)
-        overlap_top = min(self.space.top, other.space.top)
+        a, b = self.space, other.space
+        if self.motion is not None or other.motion is not None:
+            if not self.time.overlaps(other.time):
+                return None
+            span = contact_span(
+                max(self.time.start, other.time.start),
+                min(self.time.padded_end, other.time.padded_end),
+                self.space, self.motion, other.space, other.motion
+            )
+            if span is None:
+                return None
+            middle = (span[0] + span[1]) / 2
+            a, b = self.region_at(middle), other.region_at(middle)
+
+        overlap_left = max(a.left, b.left)
+        overlap_right = min(a.right, b.right)
+        overlap_bottom = max(a.bottom, b.bottom)
+        overlap_top = min(a.top, b.top)
+        if overlap_right <= overlap_left or overlap_top <= overlap_bottom:
+            return None
 
         return SpaceRegion(
             x=overlap_left,
@@ -327,6 +748,95 @@ class SpacetimeObject:
                 f"time={self.time}, layer={self.layer})")
 
 
+# Interning of shared values
+
+# Entries kept per pool; the least recently used ones are evicted first
+INTERN_POOL_SIZE = 4096
+
+_region_pool: 'OrderedDict[Tuple, FrozenSpaceRegion]' = OrderedDict()
+_metadata_pool: 'OrderedDict[Tuple, Mapping[str, Any]]' = OrderedDict()
+
+
+def _pooled(pool: 'OrderedDict[Tuple, Any]', key: Tuple, make: Callable[[], Any]) -> Any:
+    """Get a pool entry, creating it and evicting old entries on a miss."""
+    value = pool.get(key)
+    if value is not None:
+        pool.move_to_end(key)
+        return value
+    value = pool[key] = make()
+    while len(pool) > INTERN_POOL_SIZE:
+        pool.popitem(last=False)
+    return value
+
+
+def intern_region(x: float, y: float, width: float, height: float) -> FrozenSpaceRegion:
+    """
+    Get a shared FrozenSpaceRegion for the given coordinates.
+
+    Objects created from the same zone with the same size end up sharing
+    one region instance. Coordinates are keyed by type and repr(), so
+    -0.0 and 0.0 (or 1 and 1.0) get separate instances.
+
+    Args:
+        x: Left coordinate
+        y: Bottom coordinate
+        width: Region width
+        height: Region height
+
+    Returns:
+        Interned FrozenSpaceRegion
+    """
+    key = (_typed(x), _typed(y), _typed(width), _typed(height))
+    return _pooled(_region_pool, key, lambda: FrozenSpaceRegion(x, y, width, height))
+
+
+def _typed(value: Any) -> Any:
+    """
+    Key of a value that also tells apart equal values of other types.
+
+    True == 1 == 1.0 and 0.0 == -0.0, so interning by plain equality
+    would hand back a different value; types are kept, through tuples
+    and frozensets, and floats are keyed by repr().
+    """
+    cls = type(value)
+    if cls is float:
+        return cls, repr(value)
+    if cls is tuple:
+        return cls, tuple(_typed(v) for v in value)
+    if cls is frozenset:
+        return cls, frozenset(_typed(v) for v in value)
+    return cls, value
+
+
+def intern_metadata(metadata: Dict[str, Any]) -> Mapping[str, Any]:
+    """
+    Get a shared, read-only metadata mapping with the given content.
+
+    Metadata with unhashable values (lists, dicts) cannot be shared and
+    is returned unchanged.
+
+    Args:
+        metadata: Metadata dictionary
+
+    Returns:
+        Shared read-only mapping, or the original dictionary
+    """
+    try:
+        key = tuple(sorted(((k, _typed(k), _typed(v)) for k, v in metadata.items()),
+                           key=lambda item: item[0]))
+        hash(key)
+    except TypeError:
+        return metadata
+
+    return _pooled(_metadata_pool, key, lambda: MappingProxyType(dict(metadata)))
+
+
+def clear_intern_pools() -> None:
+    """Forget all interned regions and metadata."""
+    _region_pool.clear()
+    _metadata_pool.clear()
+
+
 # Convenience functions for creating common objects
 
 def create_centered_object(
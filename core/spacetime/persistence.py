@@ -0,0 +1,558 @@
+"""
+Binary, memory-mapped timeline files.
+
+Stores a Timeline or TimelineSequence as fixed-width little-endian
+columns (regions, windows, layers and string references per segment)
+plus one string table for ids, names, metadata and motion paths. Each
+segment also stores its start-sorted time index, so a loaded timeline
+answers time queries straight from the mapped file.
+
+load_timeline() maps the file and returns MappedTimelines that build
+objects only when they are accessed, so opening a file with a million
+objects is immediate and queries only page in the rows they touch.
+
+Layout (all offsets absolute, columns 8-byte aligned):
+
+    header      magic, version, kind, segment count, string table offset
+    segments    one fixed-size record per segment
+    columns     per segment: x, y, width, height, start, end, padding,
+                layer, id, metadata and motion references, start order,
+                id order, sorted starts/ends/padded ends, and the two
+                subtree-maximum arrays of the time index
+    strings     count, offsets, UTF-8 data
+"""
+from array import array
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterable, Iterator, Sequence
+import json
+import mmap
+import struct
+import sys
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .columnar import TimelineArray
+from .objects import SpacetimeObject, SpaceRegion, TimeWindow, MotionPath, intern_metadata
+from .timelines import Timeline, TimelineSegment, TimelineSequence
+from .time_index import TimeIndex, _build_max_ends
+
+
+MAGIC = b'SPTLINE\x00'
+# 2: interval trees of partial tails fixed; version 1 files may miss objects
+VERSION = 2
+
+_HEADER = struct.Struct('<8sIIIIQ')      # magic, version, kind, segments, name, strings
+_SEGMENT = struct.Struct('<dddQQIIII')   # offset, duration, start, count, base,
+                                         # name, end root, padded root, reserved
+_KIND_TIMELINE = 0
+_KIND_SEQUENCE = 1
+_NONE = 0xFFFFFFFF
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'), default=str)
+_SCALAR_TYPES = frozenset((str, int, bool, type(None)))
+
+# (name, typecode) of the per-segment columns, in file order
+_COLUMNS = (
+    ('x', 'd'), ('y', 'd'), ('width', 'd'), ('height', 'd'),
+    ('start', 'd'), ('end', 'd'), ('padding', 'd'),
+    ('layer', 'q'),
+    ('id', 'I'), ('metadata', 'I'), ('motion', 'I'),
+    ('order', 'I'), ('id_order', 'I'),
+    ('sorted_start', 'd'), ('sorted_end', 'd'), ('sorted_padded_end', 'd'),
+    ('end_max', 'd'), ('padded_max', 'd'),
+)
+
+
+def _aligned(size: int) -> int:
+    """Round a byte size up to a multiple of 8."""
+    return (size + 7) & ~7
+
+
+class _StringTable:
+    """Deduplicating string table used while writing."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def ref(self, text: str) -> int:
+        k = self._index.get(text)
+        if k is None:
+            k = self._index[text] = len(self.strings)
+            self.strings.append(text)
+        return k
+
+    def to_bytes(self) -> bytes:
+        encoded = [s.encode('utf-8') for s in self.strings]
+        offsets = array('Q', [0])
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        return (struct.pack('<Q', len(encoded)) + _little(offsets).tobytes()
+                + b''.join(encoded))
+
+
+def _little(values: array) -> array:
+    """Convert an array to little-endian byte order."""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _metadata_key(metadata: Any) -> Optional[Tuple]:
+    """
+    Hashable key that tells metadata apart exactly as its JSON does.
+
+    Only flat metadata with string keys and str, int, bool, float or
+    None values gets a key. Value types are part of it, since True == 1
+    == 1.0, and floats are keyed by repr() to keep -0.0 and 0.0 apart.
+
+    Returns:
+        Key, or None when the metadata has to be encoded to compare
+    """
+    key = []
+    for name, value in metadata.items():
+        if type(name) is not str:
+            return None
+        cls = type(value)
+        if cls is float:
+            value = repr(value)
+        elif cls not in _SCALAR_TYPES:
+            return None
+        key.append((name, cls, value))
+    return tuple(key)
+
+
+def _segment_columns(
+    objects: Sequence[SpacetimeObject], strings: _StringTable
+) -> Tuple[Dict[str, array], int, int]:
+    """
+    Build the columns of one segment.
+
+    Returns:
+        (columns by name, end tree root level, padded tree root level)
+    """
+    n = len(objects)
+    meta_refs: Dict[int, int] = {}
+    meta_keys: Dict[Tuple, int] = {}
+
+    def metadata_ref(obj: SpacetimeObject) -> int:
+        k = meta_refs.get(id(obj.metadata))
+        if k is None:
+            key = _metadata_key(obj.metadata)
+            k = meta_keys.get(key) if key is not None else None
+            if k is None:
+                k = strings.ref(_ENCODER.encode(dict(obj.metadata)))
+                if key is not None:
+                    meta_keys[key] = k
+            meta_refs[id(obj.metadata)] = k
+        return k
+
+    def motion_ref(obj: SpacetimeObject) -> int:
+        if obj.motion is None:
+            return _NONE
+        path = obj.motion
+        return strings.ref(_ENCODER.encode(
+            {'w': path.width, 'h': path.height, 'k': path.keyframes}))
+
+    order = sorted(range(n), key=lambda i: objects[i].time.start)
+    ids = [obj.id for obj in objects]
+    sorted_ends = [objects[i].time.end for i in order]
+    sorted_padded = [objects[i].time.padded_end for i in order]
+    end_max, end_root = _build_max_ends(sorted_ends)
+    padded_max, padded_root = _build_max_ends(sorted_padded)
+
+    columns = {
+        'x': array('d', (o.space.x for o in objects)),
+        'y': array('d', (o.space.y for o in objects)),
+        'width': array('d', (o.space.width for o in objects)),
+        'height': array('d', (o.space.height for o in objects)),
+        'start': array('d', (o.time.start for o in objects)),
+        'end': array('d', (o.time.end for o in objects)),
+        'padding': array('d', (o.time.padding for o in objects)),
+        'layer': array('q', (o.layer for o in objects)),
+        'id': array('I', (strings.ref(obj_id) for obj_id in ids)),
+        'metadata': array('I', (metadata_ref(o) for o in objects)),
+        'motion': array('I', (motion_ref(o) for o in objects)),
+        'order': array('I', order),
+        'id_order': array('I', sorted(range(n), key=lambda i: ids[i])),
+        'sorted_start': array('d', (objects[i].time.start for i in order)),
+        'sorted_end': array('d', sorted_ends),
+        'sorted_padded_end': array('d', sorted_padded),
+        'end_max': array('d', end_max),
+        'padded_max': array('d', padded_max),
+    }
+    return columns, end_root, padded_root
+
+
+def save_timeline(source: Union[Timeline, TimelineSequence], path: str) -> int:
+    """
+    Write a timeline or sequence to a binary file.
+
+    Metadata is stored as JSON; values JSON cannot represent are stored
+    as their str().
+
+    Args:
+        source: Timeline or TimelineSequence to save
+        path: File to write
+
+    Returns:
+        Number of bytes written
+    """
+    if isinstance(source, TimelineSequence):
+        kind = _KIND_SEQUENCE
+        segments = [(seg.name, seg.timeline, seg.start_offset) for seg in source.segments]
+    else:
+        kind = _KIND_TIMELINE
+        segments = [(source.name or '', source, 0.0)]
+
+    strings = _StringTable()
+    name_ref = strings.ref(source.name or '')
+    built = []
+    for name, timeline, offset in segments:
+        objects = timeline.objects
+        columns, end_root, padded_root = _segment_columns(objects, strings)
+        built.append((name, timeline, offset, len(objects), columns, end_root, padded_root))
+
+    # Lay out the column blocks after the header and segment records
+    position = _HEADER.size + _SEGMENT.size * len(built)
+    position = _aligned(position)
+    records = []
+    for name, timeline, offset, n, columns, end_root, padded_root in built:
+        records.append(_SEGMENT.pack(
+            offset, timeline.duration, timeline.start_time if n else 0.0, n,
+            position, strings.ref(name), end_root, padded_root, 0
+        ))
+        for column, typecode in _COLUMNS:
+            position += _aligned(n * array(typecode).itemsize)
+    strings_offset = position
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, kind, len(built), name_ref, strings_offset))
+        for record in records:
+            f.write(record)
+        f.write(b'\0' * (_aligned(f.tell()) - f.tell()))
+        for *_, columns, _, _ in built:
+            for column, _ in _COLUMNS:
+                data = _little(columns[column]).tobytes()
+                f.write(data)
+                f.write(b'\0' * (_aligned(len(data)) - len(data)))
+        f.write(strings.to_bytes())
+        return f.tell()
+
+
+class _MappedFile:
+    """An open, memory-mapped timeline file and its string table."""
+
+    def __init__(self, path: str):
+        if sys.byteorder == 'big':
+            raise ValueError("Mapped timeline files need a little-endian host")
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mm)
+        magic, version, kind, count, name_ref, strings_offset = \
+            _HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a timeline file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported timeline file version {version}")
+        self.kind = kind
+        self.segment_count = count
+        (string_count,) = struct.unpack_from('<Q', self.mm, strings_offset)
+        offsets_at = strings_offset + 8
+        self._string_offsets = self.view[offsets_at:offsets_at + 8 * (string_count + 1)].cast('Q')
+        self._string_data = offsets_at + 8 * (string_count + 1)
+        self.name = self.string(name_ref)
+
+    def string(self, ref: int) -> str:
+        """Decode one string of the table."""
+        lo = self._string_data + self._string_offsets[ref]
+        hi = self._string_data + self._string_offsets[ref + 1]
+        return str(self.mm[lo:hi], 'utf-8')
+
+    def segment(self, k: int) -> Tuple[Any, ...]:
+        """Unpack the record of segment k."""
+        return _SEGMENT.unpack_from(self.mm, _HEADER.size + k * _SEGMENT.size)
+
+    def columns(self, base: int, n: int) -> Dict[str, memoryview]:
+        """Map the columns of a segment as typed memory views."""
+        columns = {}
+        position = base
+        for column, typecode in _COLUMNS:
+            size = n * array(typecode).itemsize
+            columns[column] = self.view[position:position + size].cast(typecode)
+            position += _aligned(size)
+        return columns
+
+
+class _LazyObjects(Sequence[SpacetimeObject]):
+    """Read-only sequence building a mapped timeline's objects on access."""
+
+    def __init__(self, timeline: 'MappedTimeline'):
+        self._timeline = timeline
+
+    def __len__(self) -> int:
+        return self._timeline._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._timeline.object_at(k) for k in range(*i.indices(len(self)))]
+        return self._timeline.object_at(i)
+
+    def __iter__(self) -> Iterator[SpacetimeObject]:
+        for k in range(len(self)):
+            yield self._timeline.object_at(k)
+
+
+class MappedTimeline(Timeline):
+    """
+    Read-mostly timeline backed by a memory-mapped file.
+
+    Objects are built from the mapped columns the first time they are
+    accessed and then cached. Lookups by id binary-search the stored id
+    order, and time queries run on the stored time index, so only the
+    touched rows are read. Like MergedTimeline, the first mutation
+    through the Timeline API materializes every object and turns the
+    timeline into an ordinary one.
+
+    Attributes:
+        name: Name of the timeline
+        objects: Objects in their saved order (builds all of them)
+    """
+
+    def __init__(self, name: Optional[str], mapped: _MappedFile, record: Tuple[Any, ...]):
+        super().__init__(name=name)
+        _, duration, start_time, count, base, _, end_root, padded_root, _ = record
+        self._mapped: Optional[_MappedFile] = mapped
+        self._count = count
+        self._saved_duration = duration
+        self._saved_start_time = start_time
+        self._columns = mapped.columns(base, count)
+        self._roots = (end_root, padded_root)
+        self._cache: Dict[int, SpacetimeObject] = {}
+        self._metadata_cache: Dict[int, Any] = {}
+        self._lazy = _LazyObjects(self)
+        self._mapped_index: Optional[TimeIndex] = None
+
+    @property
+    def is_materialized(self) -> bool:
+        """Whether the timeline has been turned into an ordinary one."""
+        return self._mapped is None
+
+    def object_at(self, i: int) -> SpacetimeObject:
+        """
+        Get the object saved at a position, building it on first access.
+
+        Args:
+            i: Position in saved order
+
+        Returns:
+            SpacetimeObject
+        """
+        if self._mapped is None:
+            return super().objects[i]
+        obj = self._cache.get(i)
+        if obj is not None:
+            return obj
+        if not 0 <= i < self._count:
+            raise IndexError(f"Object position {i} out of range")
+
+        c = self._columns
+        mapped = self._mapped
+        meta_ref = c['metadata'][i]
+        metadata = self._metadata_cache.get(meta_ref)
+        if metadata is None:
+            metadata = intern_metadata(json.loads(mapped.string(meta_ref)))
+            if not isinstance(metadata, dict):
+                # Shared read-only mapping; safe to hand to every row
+                self._metadata_cache[meta_ref] = metadata
+        motion = None
+        motion_ref = c['motion'][i]
+        if motion_ref != _NONE:
+            data = json.loads(mapped.string(motion_ref))
+            motion = MotionPath(keyframes=[tuple(k) for k in data['k']],
+                                width=data['w'], height=data['h'])
+
+        obj = SpacetimeObject(
+            id=mapped.string(c['id'][i]),
+            space=SpaceRegion(x=c['x'][i], y=c['y'][i],
+                              width=c['width'][i], height=c['height'][i]),
+            time=TimeWindow(start=c['start'][i], end=c['end'][i], padding=c['padding'][i]),
+            layer=c['layer'][i],
+            metadata=metadata,
+            motion=motion
+        )
+        self._cache[i] = obj
+        return obj
+
+    def _materialize(self) -> None:
+        """Build every object and turn into an ordinary timeline."""
+        if self._mapped is None:
+            return
+        objects = [self.object_at(i) for i in range(self._count)]
+        self._mapped = None
+        self._columns = {}
+        self._cache = {}
+        self._mapped_index = None
+        self._array = None
+        self._object_list = None
+        super().add_many(objects)
+
+    @property
+    def objects(self) -> List[SpacetimeObject]:
+        if self._mapped is None:
+            return super().objects
+        if self._object_list is None:
+            self._object_list = list(self._lazy)
+        return self._object_list
+
+    @property
+    def duration(self) -> float:
+        if self._mapped is None:
+            return super().duration
+        return self._saved_duration
+
+    @property
+    def start_time(self) -> float:
+        if self._mapped is None:
+            return super().start_time
+        return self._saved_start_time
+
+    @property
+    def time_index(self) -> TimeIndex:
+        if self._mapped is None:
+            return super().time_index
+        if self._mapped_index is None:
+            c = self._columns
+            end_root, padded_root = self._roots
+            self._mapped_index = TimeIndex.from_sorted(
+                self._lazy, c['order'], c['sorted_start'], c['sorted_end'],
+                c['sorted_padded_end'],
+                end_tree=(c['end_max'], end_root),
+                padded_tree=(c['padded_max'], padded_root)
+            )
+        return self._mapped_index
+
+    def get(self, obj_id: str) -> Optional[SpacetimeObject]:
+        if self._mapped is None:
+            return super().get(obj_id)
+        id_order = self._columns['id_order']
+        ids = self._columns['id']
+        string = self._mapped.string
+        lo, hi = 0, len(id_order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if string(ids[id_order[mid]]) < obj_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(id_order) and string(ids[id_order[lo]]) == obj_id:
+            return self.object_at(id_order[lo])
+        return None
+
+    def __contains__(self, obj_id: str) -> bool:
+        return self.get(obj_id) is not None
+
+    def __len__(self) -> int:
+        if self._mapped is None:
+            return super().__len__()
+        return self._count
+
+    def __iter__(self):
+        if self._mapped is None:
+            return super().__iter__()
+        return iter(self._lazy)
+
+    def to_array(self) -> TimelineArray:
+        """
+        Get the columnar view straight from the mapped columns.
+
+        The numeric columns are zero-copy read-only views of the file;
+        rows build their objects lazily.
+        """
+        if self._mapped is None or not NUMPY_AVAILABLE:
+            return super().to_array()
+        if self._array is None:
+            c = self._columns
+            string = self._mapped.string
+            self._array = TimelineArray(
+                ids=[string(ref) for ref in c['id']],
+                x=np.frombuffer(c['x'], dtype=np.float64),
+                y=np.frombuffer(c['y'], dtype=np.float64),
+                width=np.frombuffer(c['width'], dtype=np.float64),
+                height=np.frombuffer(c['height'], dtype=np.float64),
+                start=np.frombuffer(c['start'], dtype=np.float64),
+                end=np.frombuffer(c['end'], dtype=np.float64),
+                padding=np.frombuffer(c['padding'], dtype=np.float64),
+                layer=np.frombuffer(c['layer'], dtype=np.int64),
+                objects=self._lazy
+            )
+        return self._array
+
+    def add(self, obj: SpacetimeObject) -> None:
+        self._materialize()
+        super().add(obj)
+
+    def add_many(self, objects: Iterable[SpacetimeObject]) -> None:
+        self._materialize()
+        super().add_many(objects)
+
+    def remove(self, obj_id: str) -> bool:
+        self._materialize()
+        return super().remove(obj_id)
+
+    def remove_many(self, obj_ids: Iterable[str]) -> int:
+        self._materialize()
+        return super().remove_many(obj_ids)
+
+    def replace(self, obj: SpacetimeObject) -> Optional[SpacetimeObject]:
+        self._materialize()
+        return super().replace(obj)
+
+    def replace_many(self, objects: Iterable[SpacetimeObject]) -> List[SpacetimeObject]:
+        self._materialize()
+        return super().replace_many(objects)
+
+    def touch(self, obj_id: str) -> bool:
+        self._materialize()
+        return super().touch(obj_id)
+
+    def __repr__(self) -> str:
+        if self._mapped is None:
+            return super().__repr__()
+        return (f"MappedTimeline(name='{self.name}', objects={len(self)}, "
+                f"duration={self.duration:.2f}s)")
+
+
+def load_timeline(path: str) -> Union[MappedTimeline, TimelineSequence]:
+    """
+    Open a file written by save_timeline().
+
+    Nothing beyond the header and segment records is read until objects
+    are accessed; the file stays mapped while any loaded timeline lives.
+
+    Args:
+        path: File to open
+
+    Returns:
+        MappedTimeline, or a TimelineSequence of MappedTimeline segments
+
+    Raises:
+        ValueError: If the file is not a timeline file of this version
+    """
+    mapped = _MappedFile(path)
+    if mapped.kind == _KIND_TIMELINE:
+        return MappedTimeline(mapped.name or None, mapped, mapped.segment(0))
+
+    sequence = TimelineSequence(name=mapped.name)
+    for k in range(mapped.segment_count):
+        record = mapped.segment(k)
+        name = mapped.string(record[5])
+        sequence.add_segment(TimelineSegment(
+            name=name,
+            timeline=MappedTimeline(name, mapped, record),
+            start_offset=record[0]
+        ))
+    return sequence
@@ -0,0 +1,511 @@
+"""
+Spatiotemporal R-tree over spacetime objects.
+
+Indexes every object as a box in (x, y, t), spanning its region and its
+time window up to the padded end, so point, region and placement queries
+at a given time visit only the branches whose boxes reach the query
+instead of scanning the whole timeline.
+"""
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator, Any
+import math
+
+from .objects import SpacetimeObject, SpaceRegion, TimeWindow
+
+# (left, bottom, start, right, top, padded_end)
+_Box = Tuple[float, float, float, float, float, float]
+
+
+def _box(obj: SpacetimeObject) -> _Box:
+    """Index box of an object (moving objects use their swept bounds)."""
+    space = obj.space
+    return (space.left, space.bottom, obj.time.start,
+            space.right, space.top, obj.time.padded_end)
+
+
+def _union(a: _Box, b: _Box) -> _Box:
+    """Smallest box containing two boxes."""
+    return (min(a[0], b[0]), min(a[1], b[1]), min(a[2], b[2]),
+            max(a[3], b[3]), max(a[4], b[4]), max(a[5], b[5]))
+
+
+def _union_all(boxes: Iterable[_Box]) -> _Box:
+    """Smallest box containing several boxes."""
+    boxes = iter(boxes)
+    result = next(boxes)
+    for box in boxes:
+        result = _union(result, box)
+    return result
+
+
+def _volume(box: _Box) -> float:
+    """Volume of a box."""
+    return (box[3] - box[0]) * (box[4] - box[1]) * (box[5] - box[2])
+
+
+def _hits(a: _Box, b: _Box) -> bool:
+    """Whether two closed boxes intersect."""
+    return not (a[3] < b[0] or b[3] < a[0] or
+                a[4] < b[1] or b[4] < a[1] or
+                a[5] < b[2] or b[5] < a[2])
+
+
+class _Node:
+    """R-tree node; leaf items are object ids, inner items child nodes."""
+
+    __slots__ = ('leaf', 'boxes', 'items', 'box', 'parent')
+
+    def __init__(self, leaf: bool):
+        self.leaf = leaf
+        self.boxes: List[_Box] = []
+        self.items: List[Any] = []
+        self.box: Optional[_Box] = None
+        self.parent: Optional['_Node'] = None
+
+    def add(self, box: _Box, item: Any) -> None:
+        self.boxes.append(box)
+        self.items.append(item)
+        if not self.leaf:
+            item.parent = self
+        self.box = box if self.box is None else _union(self.box, box)
+
+
+class SpacetimeIndex:
+    """
+    R-tree over the (x, y, t) boxes of spacetime objects.
+
+    Built in bulk with Sort-Tile-Recursive packing and kept up to date
+    with insert() and remove(); follow() keeps it in sync with a
+    timeline's add, remove and update events. Time boxes reach the
+    padded end, so placement queries honour the same padding as
+    conflict detection.
+
+    Attributes:
+        max_entries: Maximum entries per node
+    """
+
+    def __init__(self, objects: Iterable[SpacetimeObject] = (), max_entries: int = 16):
+        """
+        Build the index.
+
+        Args:
+            objects: Initial objects (later ids replace earlier ones)
+            max_entries: Maximum entries per node
+
+        Raises:
+            ValueError: If max_entries is below 4
+        """
+        if max_entries < 4:
+            raise ValueError(f"max_entries must be at least 4, got {max_entries}")
+        self.max_entries = max_entries
+        self._objects: Dict[str, SpacetimeObject] = {}
+        self._leaf_of: Dict[str, _Node] = {}
+        self._timeline = None
+
+        for obj in objects:
+            self._objects[obj.id] = obj
+        self._root = self._pack([(_box(obj), obj.id) for obj in self._objects.values()])
+
+    @classmethod
+    def from_timeline(cls, timeline: 'Timeline', follow: bool = False) -> 'SpacetimeIndex':
+        """
+        Build an index over a timeline.
+
+        Args:
+            timeline: Timeline to index
+            follow: Keep the index in sync with later timeline changes
+
+        Returns:
+            SpacetimeIndex over the timeline's objects
+        """
+        index = cls(timeline.objects)
+        if follow:
+            index.follow(timeline)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def __contains__(self, obj_id: str) -> bool:
+        return obj_id in self._objects
+
+    # Updates
+
+    def insert(self, obj: SpacetimeObject) -> None:
+        """
+        Add an object, replacing any object with the same id.
+
+        Args:
+            obj: Object to index
+        """
+        if obj.id in self._objects:
+            self.remove(obj.id)
+        self._objects[obj.id] = obj
+        box = _box(obj)
+
+        # Descend by least enlargement, then least volume
+        node = self._root
+        while not node.leaf:
+            best = None
+            best_key = None
+            for child_box, child in zip(node.boxes, node.items):
+                volume = _volume(child_box)
+                key = (_volume(_union(child_box, box)) - volume, volume)
+                if best_key is None or key < best_key:
+                    best, best_key = child, key
+            node = best
+
+        node.add(box, obj.id)
+        self._leaf_of[obj.id] = node
+        self._grow(node, box)
+        if len(node.items) > self.max_entries:
+            self._split(node)
+
+    def remove(self, obj_id: str) -> bool:
+        """
+        Remove an object.
+
+        Args:
+            obj_id: Id of the object to remove
+
+        Returns:
+            True if the object was indexed
+        """
+        if self._objects.pop(obj_id, None) is None:
+            return False
+        node = self._leaf_of.pop(obj_id)
+        k = node.items.index(obj_id)
+        del node.items[k]
+        del node.boxes[k]
+
+        # Drop emptied nodes and tighten the boxes above
+        while node.parent is not None and not node.items:
+            parent = node.parent
+            k = parent.items.index(node)
+            del parent.items[k]
+            del parent.boxes[k]
+            node = parent
+        while node is not None:
+            node.box = _union_all(node.boxes) if node.boxes else None
+            parent = node.parent
+            if parent is not None:
+                parent.boxes[parent.items.index(node)] = node.box
+            node = parent
+        # Shorten the tree while the root has a single child; a root
+        # left without items becomes an empty leaf again
+        root = self._root
+        while not root.leaf and len(root.items) == 1:
+            root = root.items[0]
+        if not root.items:
+            root = _Node(True)
+        root.parent = None
+        self._root = root
+        return True
+
+    def follow(self, timeline: 'Timeline') -> None:
+        """
+        Keep the index in sync with a timeline's events.
+
+        Args:
+            timeline: Timeline whose add, remove and update events to apply
+        """
+        self.close()
+        self._timeline = timeline
+        timeline.subscribe(self._on_event)
+
+    def close(self) -> None:
+        """Stop following the timeline, if any."""
+        if self._timeline is not None:
+            self._timeline.unsubscribe(self._on_event)
+            self._timeline = None
+
+    def _on_event(self, event: str, obj: SpacetimeObject) -> None:
+        """Apply a timeline event."""
+        if event == 'remove':
+            self.remove(obj.id)
+        else:
+            self.insert(obj)
+
+    # Queries
+
+    def query_point(self, x: float, y: float, time: float) -> List[SpacetimeObject]:
+        """
+        Get objects covering a point at a time.
+
+        Matches TimeWindow.contains and closed region bounds; moving
+        objects are tested where they are at that time.
+
+        Args:
+            x, y: Point to test
+            time: Time point
+
+        Returns:
+            Covering objects, lowest layer first
+        """
+        found = []
+        for obj in self._search((x, y, time, x, y, time)):
+            if not obj.time.contains(time):
+                continue
+            region = obj.region_at(time) if obj.motion is not None else obj.space
+            if region.left <= x <= region.right and region.bottom <= y <= region.top:
+                found.append(obj)
+        found.sort(key=lambda o: o.layer)
+        return found
+
+    def query_region(
+        self,
+        region: SpaceRegion,
+        start: float,
+        end: Optional[float] = None,
+        layer: Optional[int] = None
+    ) -> List[SpacetimeObject]:
+        """
+        Get objects intersecting a region at a time or during a range.
+
+        With only `start`, objects active at that instant are returned
+        (moving objects tested where they are then); with `end`, objects
+        active at any point of [start, end] (moving objects by their
+        swept bounds).
+
+        Args:
+            region: Region to search, e.g. a Zone's region
+            start: Time point, or start of the range
+            end: End of the range
+            layer: Only return objects on this layer
+
+        Returns:
+            Matching objects, lowest layer first
+        """
+        stop = start if end is None else end
+        query = (region.left, region.bottom, start, region.right, region.top, stop)
+        found = []
+        for obj in self._search(query):
+            if layer is not None and obj.layer != layer:
+                continue
+            if obj.time.end < start or obj.time.start > stop:
+                continue
+            if end is None and obj.motion is not None:
+                if not obj.region_at(start).intersects(region):
+                    continue
+            elif not obj.space.intersects(region):
+                continue
+            found.append(obj)
+        found.sort(key=lambda o: o.layer)
+        return found
+
+    def conflicts(self, obj: SpacetimeObject) -> List[SpacetimeObject]:
+        """
+        Get indexed objects that conflict with an object.
+
+        Args:
+            obj: Object to check (need not be indexed)
+
+        Returns:
+            Conflicting objects, excluding any with the same id
+        """
+        box = _box(obj)
+        return [other for other in self._search(box)
+                if other.id != obj.id and obj.conflicts_with(other)]
+
+    def nearest_free_slots(
+        self,
+        region: SpaceRegion,
+        start: float,
+        end: float,
+        layer: int = 0,
+        k: int = 1,
+        within: Optional[SpaceRegion] = None,
+        gap: float = 0.1,
+        padding: float = 0.5
+    ) -> List[SpaceRegion]:
+        """
+        Find the k free positions nearest to a desired region.
+
+        A position is free if an object there, on the layer and during
+        [start, end] with the given padding, would conflict with no
+        indexed object. Candidates are the desired position, the edges
+        of `within`, and positions `gap` away from the edges of objects
+        that could block the region.
+
+        Args:
+            region: Desired region (its size is kept)
+            start, end: Time window of the object to place
+            layer: Layer of the object to place
+            k: Number of positions to return
+            within: Bounds the region must stay inside (default: none)
+            gap: Distance kept from blocking objects (must be positive,
+                 since touching regions intersect)
+            padding: Time padding of the object to place
+
+        Returns:
+            Up to k free regions, nearest first (the desired region
+            itself if it is free)
+
+        Raises:
+            ValueError: If gap is not positive
+        """
+        if gap <= 0:
+            raise ValueError(f"gap must be positive, got {gap}")
+        if k <= 0:
+            return []
+        width, height = region.width, region.height
+        window = TimeWindow(start=start, end=end, padding=padding)
+
+        def blockers_at(left: float, bottom: float, right: float, top: float):
+            box = (left, bottom, window.start, right, top, window.padded_end)
+            for obj in self._search(box):
+                if obj.layer == layer and obj.time.overlaps(window):
+                    yield obj
+
+        # Objects that could block any candidate inside the search area
+        if within is not None:
+            area = within
+        else:
+            area = SpaceRegion(x=region.x - width, y=region.y - height,
+                               width=3 * width, height=3 * height)
+            nearby = list(blockers_at(area.left, area.bottom, area.right, area.top))
+            if nearby:
+                left = min(o.space.left for o in nearby) - width - gap
+                bottom = min(o.space.bottom for o in nearby) - height - gap
+                right = max(o.space.right for o in nearby) + width + gap
+                top = max(o.space.top for o in nearby) + height + gap
+                area = SpaceRegion(x=left, y=bottom, width=right - left, height=top - bottom)
+        blockers = list(blockers_at(area.left, area.bottom, area.right, area.top))
+
+        xs = {region.x}
+        ys = {region.y}
+        if within is not None:
+            xs.update((within.left, within.right - width))
+            ys.update((within.bottom, within.top - height))
+        for obj in blockers:
+            xs.update((obj.space.right + gap, obj.space.left - width - gap))
+            ys.update((obj.space.top + gap, obj.space.bottom - height - gap))
+        if within is not None:
+            xs = {x for x in xs if within.left <= x <= within.right - width}
+            ys = {y for y in ys if within.bottom <= y <= within.top - height}
+
+        candidates = sorted(((x - region.x) ** 2 + (y - region.y) ** 2, x, y)
+                            for x in xs for y in ys)
+        found: List[SpaceRegion] = []
+        for _, x, y in candidates:
+            if next(blockers_at(x, y, x + width, y + height), None) is None:
+                found.append(SpaceRegion(x=x, y=y, width=width, height=height))
+                if len(found) >= k:
+                    break
+        return found
+
+    def _search(self, box: _Box) -> Iterator[SpacetimeObject]:
+        """Yield objects whose index box intersects a box."""
+        root = self._root
+        if root.box is None or not _hits(root.box, box):
+            return
+        objects = self._objects
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.leaf:
+                for child_box, obj_id in zip(node.boxes, node.items):
+                    if _hits(child_box, box):
+                        yield objects[obj_id]
+            else:
+                for child_box, child in zip(node.boxes, node.items):
+                    if _hits(child_box, box):
+                        stack.append(child)
+
+    # Tree maintenance
+
+    def _pack(self, entries: List[Tuple[_Box, Any]], leaf: bool = True) -> _Node:
+        """
+        Build a tree bottom-up with Sort-Tile-Recursive packing.
+
+        Args:
+            entries: (box, object id) pairs, or (box, node) pairs above
+                     the leaf level
+            leaf: Whether the entries are objects
+
+        Returns:
+            Root node
+        """
+        m = self.max_entries
+        if len(entries) <= m:
+            node = _Node(leaf)
+            for box, item in entries:
+                node.add(box, item)
+                if leaf:
+                    self._leaf_of[item] = node
+            return node
+
+        pages = math.ceil(len(entries) / m)
+        slices = math.ceil(pages ** (1 / 3))
+
+        def center(axis: int):
+            return lambda entry: entry[0][axis] + entry[0][axis + 3]
+
+        nodes = []
+        entries = sorted(entries, key=center(0))
+        x_size = math.ceil(len(entries) / slices)
+        for i in range(0, len(entries), x_size):
+            slab = sorted(entries[i:i + x_size], key=center(1))
+            y_size = math.ceil(len(slab) / slices)
+            for j in range(0, len(slab), y_size):
+                column = sorted(slab[j:j + y_size], key=center(2))
+                for lo in range(0, len(column), m):
+                    node = _Node(leaf)
+                    for box, item in column[lo:lo + m]:
+                        node.add(box, item)
+                        if leaf:
+                            self._leaf_of[item] = node
+                    nodes.append(node)
+
+        return self._pack([(node.box, node) for node in nodes], leaf=False)
+
+    def _grow(self, node: _Node, box: _Box) -> None:
+        """Extend the boxes above a node to cover a new box."""
+        while node.parent is not None:
+            parent = node.parent
+            k = parent.items.index(node)
+            parent.boxes[k] = node.box
+            parent.box = _union(parent.box, box)
+            node = parent
+
+    def _split(self, node: _Node) -> None:
+        """
+        Split an overflowing node in half along its best axis.
+
+        The axis whose halves (in center order) have the smallest total
+        volume is used. Splits propagate upwards; a split root grows
+        the tree by one level.
+        """
+        entries = list(zip(node.boxes, node.items))
+        half = len(entries) // 2
+        best = None
+        for axis in range(3):
+            ordered = sorted(entries, key=lambda e: e[0][axis] + e[0][axis + 3])
+            lower, upper = ordered[:half], ordered[half:]
+            cost = (_volume(_union_all(b for b, _ in lower)) +
+                    _volume(_union_all(b for b, _ in upper)))
+            if best is None or cost < best[0]:
+                best = (cost, lower, upper)
+        _, lower, upper = best
+
+        sibling = _Node(node.leaf)
+        node.boxes, node.items, node.box = [], [], None
+        for target, part in ((node, lower), (sibling, upper)):
+            for box, item in part:
+                target.add(box, item)
+                if node.leaf:
+                    self._leaf_of[item] = target
+
+        parent = node.parent
+        if parent is None:
+            root = _Node(False)
+            root.add(node.box, node)
+            root.add(sibling.box, sibling)
+            self._root = root
+            return
+        parent.boxes[parent.items.index(node)] = node.box
+        parent.add(sibling.box, sibling)
+        if len(parent.items) > self.max_entries:
+            self._split(parent)
+
+    def __repr__(self) -> str:
+        return f"SpacetimeIndex(objects={len(self)})"
@@ -0,0 +1,263 @@
+"""
+Interval index over spacetime object time windows.
+
+Answers "which objects are active at time t" and "which objects overlap
+this time range" in O(log n + k) instead of scanning every object.
+"""
+from typing import List, Optional, Sequence, Tuple, Iterable, Iterator
+import heapq
+
+from .objects import SpacetimeObject, TimeWindow
+
+
+def _build_max_ends(ends: List[float]) -> Tuple[List[float], int]:
+    """
+    Augment start-sorted intervals with subtree maximum end values.
+
+    The sorted array is treated as an implicit binary tree: leaves sit
+    at even indices and a node at level k has its children k - 1 levels
+    below at index -/+ 2^(k-1). Each node stores the maximum end of its
+    subtree so whole subtrees can be skipped during a query.
+
+    Args:
+        ends: Interval end values, in start-sorted order
+
+    Returns:
+        (max_ends, root_level)
+    """
+    n = len(ends)
+    max_ends = list(ends)
+    if n == 0:
+        return max_ends, 0
+
+    # Last leaf and the maximum end of the partial subtree holding it
+    last_i = (n - 1) & ~1
+    last = ends[last_i]
+
+    k = 1
+    while (1 << k) <= n:
+        x = 1 << (k - 1)
+        for i in range((x << 1) - 1, n, x << 2):
+            end_left = max_ends[i - x]
+            end_right = max_ends[i + x] if i + x < n else last
+            max_ends[i] = max(ends[i], end_left, end_right)
+
+        # Move last_i to its parent and carry the partial subtree maximum
+        last_i = last_i - x if (last_i >> k) & 1 else last_i + x
+        if last_i < n and max_ends[last_i] > last:
+            last = max_ends[last_i]
+        k += 1
+
+    return max_ends, k - 1
+
+
+class TimeIndex:
+    """
+    Static interval index over the time windows of a set of objects.
+
+    Objects are sorted by start time once; two augmented trees (one over
+    end times, one over padded end times) are built lazily on first use.
+    The index does not track changes to the objects - owners such as
+    Timeline rebuild it when their contents change.
+
+    Attributes:
+        objects: Indexed objects, in their original order
+    """
+
+    # Below this subtree level a linear scan beats further descent
+    _SCAN_LEVEL = 3
+
+    def __init__(self, objects: Sequence[SpacetimeObject]):
+        """
+        Build the index.
+
+        Args:
+            objects: Objects to index (order is preserved in results)
+        """
+        self.objects = list(objects)
+        order = sorted(range(len(self.objects)),
+                       key=lambda i: self.objects[i].time.start)
+        self._order = order
+        self._starts = [self.objects[i].time.start for i in order]
+        self._ends = [self.objects[i].time.end for i in order]
+        self._padded_ends = [self.objects[i].time.padded_end for i in order]
+        self._end_tree = None
+        self._padded_tree = None
+
+    @classmethod
+    def from_sorted(
+        cls,
+        objects: Sequence[SpacetimeObject],
+        order: Sequence[int],
+        starts: Sequence[float],
+        ends: Sequence[float],
+        padded_ends: Sequence[float],
+        end_tree: Optional[Tuple[Sequence[float], int]] = None,
+        padded_tree: Optional[Tuple[Sequence[float], int]] = None
+    ) -> 'TimeIndex':
+        """
+        Build an index from precomputed sorted columns without copying.
+
+        Used for timelines stored on disk: the columns may be memory
+        views, and objects any sequence that builds objects on access.
+
+        Args:
+            objects: Objects, indexable by original position
+            order: Original positions in start-sorted order
+            starts, ends, padded_ends: Values in start-sorted order
+            end_tree: Optional (max_ends, root_level) over ends
+            padded_tree: Optional (max_ends, root_level) over padded ends
+
+        Returns:
+            TimeIndex over the columns
+        """
+        index = cls.__new__(cls)
+        index.objects = objects
+        index._order = order
+        index._starts = starts
+        index._ends = ends
+        index._padded_ends = padded_ends
+        index._end_tree = end_tree
+        index._padded_tree = padded_tree
+        return index
+
+    def __len__(self) -> int:
+        return len(self.objects)
+
+    def at_time(self, time: float) -> List[SpacetimeObject]:
+        """
+        Get objects whose window contains a time point.
+
+        Matches TimeWindow.contains (closed interval, no padding).
+
+        Args:
+            time: Time point to query
+
+        Returns:
+            Active objects, in their original order
+        """
+        if self._end_tree is None:
+            self._end_tree = _build_max_ends(self._ends)
+        max_ends, root = self._end_tree
+        hits = self._query(self._ends, max_ends, root, time, time)
+        return self._collect(hits)
+
+    def in_range(self, start: float, end: float) -> List[SpacetimeObject]:
+        """
+        Get objects that overlap a time range.
+
+        Matches TimeWindow.overlaps against TimeWindow(start, end), i.e.
+        both the objects' and the range's padding are honoured.
+
+        Args:
+            start: Range start time
+            end: Range end time
+
+        Returns:
+            Overlapping objects, in their original order
+        """
+        window = TimeWindow(start=start, end=end)
+        if self._padded_tree is None:
+            self._padded_tree = _build_max_ends(self._padded_ends)
+        max_ends, root = self._padded_tree
+        hits = self._query(self._padded_ends, max_ends, root,
+                           window.start, window.padded_end)
+        return self._collect(hits)
+
+    def iter_active(
+        self, times: Iterable[float]
+    ) -> Iterator[Tuple[float, List[SpacetimeObject]]]:
+        """
+        Sweep the active set over non-decreasing time points.
+
+        Each object enters and leaves the active set once, so sampling
+        m time points costs O((n + m) log n) plus the size of the output.
+
+        Args:
+            times: Non-decreasing time points
+
+        Yields:
+            (time, active objects in their original order)
+
+        Raises:
+            ValueError: If the time points decrease
+        """
+        n = len(self._starts)
+        next_start = 0
+        active = {}
+        closing: List[Tuple[float, int]] = []  # heap of (end, position)
+        previous = None
+
+        for time in times:
+            if previous is not None and time < previous:
+                raise ValueError(
+                    f"Times must be non-decreasing, got {time} after {previous}"
+                )
+            previous = time
+
+            while next_start < n and self._starts[next_start] <= time:
+                position = self._order[next_start]
+                active[position] = self.objects[position]
+                heapq.heappush(closing, (self._ends[next_start], position))
+                next_start += 1
+
+            while closing and closing[0][0] < time:
+                _, position = heapq.heappop(closing)
+                del active[position]
+
+            yield time, [active[p] for p in sorted(active)]
+
+    def _query(
+        self,
+        ends: List[float],
+        max_ends: List[float],
+        root: int,
+        lo: float,
+        hi: float
+    ) -> List[int]:
+        """
+        Find sorted positions i with start[i] <= hi and ends[i] >= lo.
+
+        Args:
+            ends: End values the tree was built over
+            max_ends: Subtree maximum ends
+            root: Root level of the implicit tree
+            lo: Query low bound
+            hi: Query high bound
+
+        Returns:
+            Matching positions in start-sorted order
+        """
+        starts = self._starts
+        n = len(starts)
+        hits: List[int] = []
+        if n == 0:
+            return hits
+
+        # Stack of (node, level, left_done) for an iterative in-order walk
+        stack = [((1 << root) - 1, root, False)]
+        while stack:
+            x, k, left_done = stack.pop()
+            if k <= self._SCAN_LEVEL:
+                i = x >> k << k
+                stop = min(i + (1 << (k + 1)) - 1, n)
+                while i < stop and starts[i] <= hi:
+                    if ends[i] >= lo:
+                        hits.append(i)
+                    i += 1
+            elif not left_done:
+                stack.append((x, k, True))
+                y = x - (1 << (k - 1))
+                if y >= n or max_ends[y] >= lo:
+                    stack.append((y, k - 1, False))
+            elif x < n and starts[x] <= hi:
+                if ends[x] >= lo:
+                    hits.append(x)
+                stack.append((x + (1 << (k - 1)), k - 1, False))
+
+        return hits
+
+    def _collect(self, hits: List[int]) -> List[SpacetimeObject]:
+        """Map sorted positions back to objects in original order."""
+        order = self._order
+        return [self.objects[p] for p in sorted(order[i] for i in hits)]
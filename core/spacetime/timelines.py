@@ -4,40 +4,90 @@ Timeline management for spacetime objects.
 Timelines manage collections of spacetime objects and provide
 query capabilities for temporal organization.
 """
-from typing import List, Optional, Callable
+from typing import List, Dict, Optional, Callable, Iterable, Iterator, Tuple, Any
 from dataclasses import dataclass, field
+from collections import ChainMap
 
-from .objects import SpacetimeObject, TimeWindow
+from .objects import SpacetimeObject, SpaceRegion, TimeWindow, MotionPath
+from .time_index import TimeIndex
+from .columnar import TimelineArray
+
+# Marks a SegmentObjectView field that has not been set or derived yet;
+# None cannot, since None is a valid motion
+_UNSET = object()
 
 
-@dataclass
 class Timeline:
     """
     A timeline manages a collection of spacetime objects.
 
     Timelines provide methods for adding, removing, and querying objects.
+    Objects live in an insertion-ordered id -> object map, so lookups,
+    removals and replacements by id are O(1). Object ids must be unique
+    within a timeline.
+
+    Time queries go through a TimeIndex that is built lazily and rebuilt
+    after the timeline changes. Call touch() after editing an object in
+    place so indexes and subscribers see the change.
+
+    Listeners registered with subscribe() are called as
+    listener(event, obj) with event 'add', 'remove' or 'update'.
 
     Attributes:
         name: Optional name for the timeline
-        objects: List of spacetime objects on this timeline
+        objects: Objects on this timeline in insertion order (read-only)
     """
 
-    name: Optional[str] = None
-    objects: List[SpacetimeObject] = field(default_factory=list)
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        objects: Optional[Iterable[SpacetimeObject]] = None
+    ):
+        """
+        Initialize the timeline.
+
+        Args:
+            name: Optional name for the timeline
+            objects: Optional initial objects
+
+        Raises:
+            ValueError: If the initial objects contain duplicate ids
+        """
+        self.name = name
+        self._by_id: Dict[str, SpacetimeObject] = {}
+        self._object_list: Optional[List[SpacetimeObject]] = None
+        self._version = 0
+        self._time_index: Optional[TimeIndex] = None
+        self._index_version = -1
+        self._array: Optional[TimelineArray] = None
+        self._array_version = -1
+        self._duration_cache: Optional[Tuple[int, float]] = None
+        self._listeners: List[Callable[[str, SpacetimeObject], None]] = []
+        if objects is not None:
+            self.add_many(objects)
+
+    @property
+    def objects(self) -> List[SpacetimeObject]:
+        """Get the objects in insertion order (do not mutate the list)."""
+        if self._object_list is None:
+            self._object_list = list(self._by_id.values())
+        return self._object_list
 
     @property
     def duration(self) -> float:
         """Get the total duration of the timeline."""
-        if not self.objects:
-            return 0.0
-        return max(obj.time.end for obj in self.objects)
+        if self._duration_cache is None or self._duration_cache[0] != self._version:
+            duration = max((obj.time.end for obj in self._by_id.values()),
+                           default=0.0)
+            self._duration_cache = (self._version, duration)
+        return self._duration_cache[1]
 
     @property
     def start_time(self) -> float:
         """Get the earliest start time on the timeline."""
-        if not self.objects:
+        if not self._by_id:
             return 0.0
-        return min(obj.time.start for obj in self.objects)
+        return min(obj.time.start for obj in self._by_id.values())
 
     def add(self, obj: SpacetimeObject) -> None:
         """
@@ -45,8 +95,52 @@ class Timeline:
 
         Args:
             obj: SpacetimeObject to add
+
+        Raises:
+            ValueError: If an object with the same id is already present
+        """
+        if obj.id in self._by_id:
+            raise ValueError(
+                f"Duplicate object id '{obj.id}' on timeline '{self.name}'"
+            )
+        self._by_id[obj.id] = obj
+        if self._object_list is not None:
+            self._object_list.append(obj)
+        self._version += 1
+        if self._listeners:
+            self._notify('add', obj)
+
+    def add_many(self, objects: Iterable[SpacetimeObject]) -> None:
         """
-        self.objects.append(obj)
+        Add several objects at once.
+
+        The batch is validated before anything is inserted, so a
+        duplicate id leaves the timeline unchanged.
+
+        Args:
+            objects: Objects to add
+
+        Raises:
+            ValueError: If an id is duplicated within the batch or
+                already present on the timeline
+        """
+        batch: Dict[str, SpacetimeObject] = {}
+        for obj in objects:
+            if obj.id in batch or obj.id in self._by_id:
+                raise ValueError(
+                    f"Duplicate object id '{obj.id}' on timeline '{self.name}'"
+                )
+            batch[obj.id] = obj
+        if not batch:
+            return
+
+        self._by_id.update(batch)
+        if self._object_list is not None:
+            self._object_list.extend(batch.values())
+        self._version += 1
+        if self._listeners:
+            for obj in batch.values():
+                self._notify('add', obj)
 
     def remove(self, obj_id: str) -> bool:
         """
@@ -58,11 +152,127 @@ class Timeline:
         Returns:
             True if object was removed, False if not found
         """
-        for i, obj in enumerate(self.objects):
-            if obj.id == obj_id:
-                self.objects.pop(i)
-                return True
-        return False
+        obj = self._by_id.pop(obj_id, None)
+        if obj is None:
+            return False
+        self._changed()
+        if self._listeners:
+            self._notify('remove', obj)
+        return True
+
+    def remove_many(self, obj_ids: Iterable[str]) -> int:
+        """
+        Remove several objects by ID.
+
+        Args:
+            obj_ids: IDs of objects to remove (unknown IDs are ignored)
+
+        Returns:
+            Number of objects removed
+        """
+        removed = []
+        for obj_id in obj_ids:
+            obj = self._by_id.pop(obj_id, None)
+            if obj is not None:
+                removed.append(obj)
+        if removed:
+            self._changed()
+            if self._listeners:
+                for obj in removed:
+                    self._notify('remove', obj)
+        return len(removed)
+
+    def replace(self, obj: SpacetimeObject) -> Optional[SpacetimeObject]:
+        """
+        Replace the object that has the same ID, keeping its position.
+
+        Args:
+            obj: New version of the object
+
+        Returns:
+            The replaced object, or None if no object had that ID
+            (the timeline is left unchanged)
+        """
+        previous = self._by_id.get(obj.id)
+        if previous is None:
+            return None
+        self._by_id[obj.id] = obj
+        self._changed()
+        if self._listeners:
+            self._notify('update', obj)
+        return previous
+
+    def replace_many(self, objects: Iterable[SpacetimeObject]) -> List[SpacetimeObject]:
+        """
+        Replace several objects at once, keeping their positions.
+
+        Every ID is checked before anything changes, so the batch is
+        applied either completely or not at all.
+
+        Args:
+            objects: New versions of existing objects
+
+        Returns:
+            The replaced objects, in the same order
+
+        Raises:
+            KeyError: If an object's ID is not on the timeline
+        """
+        batch = list(objects)
+        for obj in batch:
+            if obj.id not in self._by_id:
+                raise KeyError(f"No object with id '{obj.id}' on timeline '{self.name}'")
+
+        previous = []
+        for obj in batch:
+            previous.append(self._by_id[obj.id])
+            self._by_id[obj.id] = obj
+        if batch:
+            self._changed()
+            if self._listeners:
+                for obj in batch:
+                    self._notify('update', obj)
+        return previous
+
+    def touch(self, obj_id: str) -> bool:
+        """
+        Record that an object was edited in place.
+
+        Invalidates cached indexes and notifies subscribers with an
+        'update' event.
+
+        Args:
+            obj_id: ID of the edited object
+
+        Returns:
+            True if the object exists, False otherwise
+        """
+        obj = self.get(obj_id)
+        if obj is None:
+            return False
+        self._version += 1
+        if self._listeners:
+            self._notify('update', obj)
+        return True
+
+    def subscribe(self, listener: Callable[[str, SpacetimeObject], None]) -> None:
+        """
+        Register a listener for add, remove and update events.
+
+        Args:
+            listener: Callable invoked as listener(event, obj)
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, SpacetimeObject], None]) -> None:
+        """Remove a previously registered listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, obj: SpacetimeObject) -> None:
+        """Call every listener with an event."""
+        for listener in list(self._listeners):
+            listener(event, obj)
 
     def get(self, obj_id: str) -> Optional[SpacetimeObject]:
         """
@@ -74,10 +284,16 @@ class Timeline:
         Returns:
             SpacetimeObject if found, None otherwise
         """
-        for obj in self.objects:
-            if obj.id == obj_id:
-                return obj
-        return None
+        return self._by_id.get(obj_id)
+
+    def __contains__(self, obj_id: str) -> bool:
+        """Check whether an object ID is on the timeline."""
+        return obj_id in self._by_id
+
+    def _changed(self) -> None:
+        """Record a mutation that invalidates the cached object list."""
+        self._object_list = None
+        self._version += 1
 
     def get_objects_at_time(self, time: float) -> List[SpacetimeObject]:
         """
@@ -89,7 +305,24 @@ class Timeline:
         Returns:
             List of SpacetimeObjects active at the given time
         """
-        return [obj for obj in self.objects if obj.time.contains(time)]
+        return self.time_index.at_time(time)
+
+    def iter_active(
+        self, times: Iterable[float]
+    ) -> Iterator[Tuple[float, List[SpacetimeObject]]]:
+        """
+        Iterate the active set over monotonically increasing times.
+
+        Cheaper than calling get_objects_at_time per frame because each
+        object enters and leaves the active set only once.
+
+        Args:
+            times: Non-decreasing time points
+
+        Yields:
+            (time, objects active at that time)
+        """
+        return self.time_index.iter_active(times)
 
     def get_objects_in_layer(self, layer: int) -> List[SpacetimeObject]:
         """
@@ -128,8 +361,36 @@ class Timeline:
         Returns:
             List of SpacetimeObjects active in the range
         """
-        window = TimeWindow(start=start, end=end)
-        return [obj for obj in self.objects if obj.time.overlaps(window)]
+        return self.time_index.in_range(start, end)
+
+    @property
+    def time_index(self) -> TimeIndex:
+        """Get the interval index, rebuilding it if the timeline changed."""
+        if self._time_index is None or self._index_version != self._version:
+            self._time_index = TimeIndex(self.objects)
+            self._index_version = self._version
+        return self._time_index
+
+    def to_array(self) -> TimelineArray:
+        """
+        Get the columnar view of the timeline.
+
+        The view is cached until the timeline changes and references the
+        timeline's objects rather than copying them.
+
+        Returns:
+            TimelineArray over the current objects
+        """
+        if self._array is None or self._array_version != self._version:
+            self._array = TimelineArray.from_objects(self.objects)
+            self._array_version = self._version
+        return self._array
+
+    def invalidate_index(self) -> None:
+        """Drop cached indexes after objects were edited in place."""
+        self._time_index = None
+        self._array = None
+        self._duration_cache = None
 
     def filter(self, predicate: Callable[[SpacetimeObject], bool]) -> 'Timeline':
         """
@@ -163,6 +424,9 @@ class Timeline:
 
         Returns:
             New Timeline containing objects from both timelines
+
+        Raises:
+            ValueError: If both timelines contain the same object id
         """
         merged_objects = self.objects + other.objects
         return Timeline(
@@ -177,16 +441,23 @@ class Timeline:
         Returns:
             New Timeline with same objects
         """
-        return Timeline(name=f"{self.name}_copy", objects=self.objects.copy())
+        return Timeline(name=f"{self.name}_copy", objects=self.objects)
 
     def __len__(self) -> int:
         """Get the number of objects on the timeline."""
-        return len(self.objects)
+        return len(self._by_id)
 
     def __iter__(self):
         """Iterate over objects on the timeline."""
         return iter(self.objects)
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Timeline):
+            return NotImplemented
+        return self.name == other.name and self.objects == other.objects
+
+    __hash__ = None
+
     def __repr__(self) -> str:
         return f"Timeline(name='{self.name}', objects={len(self.objects)}, duration={self.duration:.2f}s)"
 
@@ -271,36 +542,299 @@ class TimelineSequence:
         """Get all timelines from all segments."""
         return [seg.timeline for seg in self.segments]
 
-    def merge_all(self) -> Timeline:
+    def merge_all(self) -> 'MergedTimeline':
         """
         Merge all segment timelines into one.
 
-        Offsets are applied to object time windows.
+        Offsets are applied to object time windows. The result is a lazy
+        view: segment objects are wrapped rather than copied, and the view
+        only turns into an ordinary timeline when it is mutated.
 
         Returns:
             Single merged Timeline
         """
-        merged = Timeline(name=f"{self.name}_merged")
-        for segment in self.segments:
-            for obj in segment.timeline.objects:
-                # Create new object with adjusted time
-                adjusted_obj = SpacetimeObject(
-                    id=f"{segment.name}_{obj.id}",
-                    space=obj.space,
-                    time=TimeWindow(
-                        start=obj.time.start + segment.start_offset,
-                        end=obj.time.end + segment.start_offset,
-                        padding=obj.time.padding
-                    ),
-                    layer=obj.layer,
-                    metadata=obj.metadata.copy()
-                )
-                adjusted_obj.metadata['segment'] = segment.name
-                merged.add(adjusted_obj)
-        return merged
+        return MergedTimeline(name=f"{self.name}_merged", segments=self.segments)
 
     def __len__(self) -> int:
         return len(self.segments)
 
     def __repr__(self) -> str:
         return f"TimelineSequence(name='{self.name}', segments={len(self.segments)}, duration={self.duration:.2f}s)"
+
+
+class SegmentObjectView(SpacetimeObject):
+    """
+    A segment object seen in global time.
+
+    Reads go to the source object. The shifted TimeWindow and the metadata
+    overlay (which adds the 'segment' key) are created on first access.
+    Assigning an attribute stores the new value on the view only, so the
+    source timeline is never modified.
+    """
+
+    def __init__(self, source: SpacetimeObject, segment_name: str, offset: float):
+        self._source = source
+        self._segment_name = segment_name
+        self._offset = offset
+        self._id = f"{segment_name}_{source.id}"
+        self._space = _UNSET
+        self._time = _UNSET
+        self._layer = _UNSET
+        self._metadata = _UNSET
+        self._motion = _UNSET
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @id.setter
+    def id(self, value: str) -> None:
+        self._id = value
+
+    @property
+    def space(self) -> SpaceRegion:
+        if self._space is _UNSET:
+            return self._source.space
+        return self._space
+
+    @space.setter
+    def space(self, value: SpaceRegion) -> None:
+        self._space = value
+
+    @property
+    def time(self) -> TimeWindow:
+        if self._time is _UNSET:
+            source = self._source.time
+            self._time = TimeWindow(
+                start=source.start + self._offset,
+                end=source.end + self._offset,
+                padding=source.padding
+            )
+        return self._time
+
+    @time.setter
+    def time(self, value: TimeWindow) -> None:
+        self._time = value
+
+    @property
+    def layer(self) -> int:
+        if self._layer is _UNSET:
+            return self._source.layer
+        return self._layer
+
+    @layer.setter
+    def layer(self, value: int) -> None:
+        self._layer = value
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        if self._metadata is _UNSET:
+            # Writes land in the first map and never reach the source
+            self._metadata = ChainMap({'segment': self._segment_name},
+                                      self._source.metadata)
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]) -> None:
+        self._metadata = value
+
+    @property
+    def motion(self) -> Optional[MotionPath]:
+        if self._motion is _UNSET:
+            if self._source.motion is None:
+                return None
+            self._motion = self._source.motion.shifted(dt=self._offset)
+        return self._motion
+
+    @motion.setter
+    def motion(self, value: Optional[MotionPath]) -> None:
+        self._motion = value
+
+    @property
+    def source(self) -> SpacetimeObject:
+        """The wrapped segment-local object."""
+        return self._source
+
+
+class MergedTimeline(Timeline):
+    """
+    Lazy merged view over the segments of a TimelineSequence.
+
+    Objects are exposed as SegmentObjectViews that apply each segment's
+    start offset on access. The view follows later changes to the
+    segments until it is mutated through the Timeline API; at that point
+    it is materialized into an ordinary timeline holding the views.
+
+    Subscribers get the segments' add, remove and update events as views
+    until materialization, and the timeline's own events afterwards;
+    materializing emits none. Changes to segment offsets or to the
+    segment list are not events and are not forwarded.
+
+    Attributes:
+        name: Name of the merged timeline
+        objects: SegmentObjectViews in segment order (read-only)
+    """
+
+    def __init__(self, name: Optional[str], segments: List[TimelineSegment]):
+        super().__init__(name=name)
+        self._segments: Optional[List[TimelineSegment]] = segments
+        self._source_key: Optional[Tuple] = None
+        self._views: List[SegmentObjectView] = []
+        self._views_by_id: Optional[Dict[str, SegmentObjectView]] = None
+        self._forwarders: List[Tuple[Timeline, Callable[[str, SpacetimeObject], None]]] = []
+
+    @property
+    def is_materialized(self) -> bool:
+        """Whether the view has been turned into an ordinary timeline."""
+        return self._segments is None
+
+    def _current_key(self) -> Tuple:
+        """Fingerprint of the segments the view was built from."""
+        return tuple((id(seg.timeline), seg.timeline._version,
+                      seg.start_offset, seg.name) for seg in self._segments)
+
+    def _sync(self) -> None:
+        """Rebuild the views if any segment changed since the last access."""
+        key = self._current_key()
+        if key == self._source_key:
+            return
+        self._views = [
+            SegmentObjectView(obj, seg.name, seg.start_offset)
+            for seg in self._segments
+            for obj in seg.timeline.objects
+        ]
+        self._views_by_id = None
+        self._source_key = key
+        self._version += 1
+
+    def _materialize(self) -> None:
+        """Turn the view into an ordinary timeline before a mutation."""
+        if self._segments is None:
+            return
+        self._sync()
+        self._stop_forwarding()
+        views = self._views
+        self._segments = None
+        self._views = []
+        self._views_by_id = None
+        # Subscribers already know the views; adding them is not an event
+        listeners, self._listeners = self._listeners, []
+        try:
+            super().add_many(views)
+        finally:
+            self._listeners = listeners
+
+    def subscribe(self, listener: Callable[[str, SpacetimeObject], None]) -> None:
+        if self._segments is not None and not self._forwarders:
+            for seg in self._segments:
+                forward = self._forwarder(seg)
+                seg.timeline.subscribe(forward)
+                self._forwarders.append((seg.timeline, forward))
+        super().subscribe(listener)
+
+    def unsubscribe(self, listener: Callable[[str, SpacetimeObject], None]) -> None:
+        super().unsubscribe(listener)
+        if not self._listeners:
+            self._stop_forwarding()
+
+    def _forwarder(self, segment: TimelineSegment) -> Callable[[str, SpacetimeObject], None]:
+        """Listener that re-emits a segment's events as views."""
+        def forward(event: str, obj: SpacetimeObject) -> None:
+            if self._listeners:
+                self._notify(event, SegmentObjectView(obj, segment.name, segment.start_offset))
+        return forward
+
+    def _stop_forwarding(self) -> None:
+        """Unsubscribe the forwarders from the segment timelines."""
+        for timeline, forward in self._forwarders:
+            timeline.unsubscribe(forward)
+        self._forwarders = []
+
+    @property
+    def objects(self) -> List[SpacetimeObject]:
+        if self._segments is None:
+            return super().objects
+        self._sync()
+        return self._views
+
+    @property
+    def duration(self) -> float:
+        if self._segments is None:
+            return super().duration
+        return max((seg.start_offset + seg.timeline.duration
+                    for seg in self._segments if len(seg.timeline)),
+                   default=0.0)
+
+    @property
+    def start_time(self) -> float:
+        if self._segments is None:
+            return super().start_time
+        return min((seg.start_offset + seg.timeline.start_time
+                    for seg in self._segments if len(seg.timeline)),
+                   default=0.0)
+
+    @property
+    def time_index(self) -> TimeIndex:
+        if self._segments is not None:
+            self._sync()
+        return super().time_index
+
+    def get(self, obj_id: str) -> Optional[SpacetimeObject]:
+        if self._segments is None:
+            return super().get(obj_id)
+        self._sync()
+        if self._views_by_id is None:
+            self._views_by_id = {view.id: view for view in self._views}
+        return self._views_by_id.get(obj_id)
+
+    def __contains__(self, obj_id: str) -> bool:
+        return self.get(obj_id) is not None
+
+    def __len__(self) -> int:
+        if self._segments is None:
+            return super().__len__()
+        return sum(len(seg.timeline) for seg in self._segments)
+
+    def to_array(self) -> TimelineArray:
+        """
+        Get the columnar view, built from the segments' own arrays.
+
+        Segment offsets are applied as a vectorized shift of the start
+        and end columns.
+        """
+        if self._segments is None:
+            return super().to_array()
+        self._sync()
+        if self._array is None or self._array_version != self._version:
+            self._array = TimelineArray.concatenate(
+                [seg.timeline.to_array() for seg in self._segments],
+                time_offsets=[seg.start_offset for seg in self._segments],
+                ids=[view.id for view in self._views],
+                objects=self._views
+            )
+            self._array_version = self._version
+        return self._array
+
+    def add(self, obj: SpacetimeObject) -> None:
+        self._materialize()
+        super().add(obj)
+
+    def add_many(self, objects: Iterable[SpacetimeObject]) -> None:
+        self._materialize()
+        super().add_many(objects)
+
+    def remove(self, obj_id: str) -> bool:
+        self._materialize()
+        return super().remove(obj_id)
+
+    def remove_many(self, obj_ids: Iterable[str]) -> int:
+        self._materialize()
+        return super().remove_many(obj_ids)
+
+    def replace(self, obj: SpacetimeObject) -> Optional[SpacetimeObject]:
+        self._materialize()
+        return super().replace(obj)
+
+    def replace_many(self, objects: Iterable[SpacetimeObject]) -> List[SpacetimeObject]:
+        self._materialize()
+        return super().replace_many(objects)
@@ -4,13 +4,136 @@ Visualization tools for spacetime debugging.
 Provides gantt charts, heatmaps, and other visualizations for
 understanding spacetime object placement and conflicts.
 """
-from typing import List, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Sequence, Tuple
 from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+import math
 import os
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from .objects import SpacetimeObject, SpaceRegion, TimeWindow
 from .timelines import Timeline
 from .conflict_detection import ConflictReport
+from .explorer import export_explorer
+
+
+# Manim's default frame, as covered by LayoutTemplate.fullscreen()
+SCREEN = SpaceRegion(x=-7, y=-4, width=14, height=8)
+
+
+def _sample_points(low: float, high: float, resolution: int) -> List[float]:
+    """Sample positions of a heatmap axis, one per character."""
+    return [low + (i / resolution) * (high - low) for i in range(resolution)]
+
+
+def _layer_coverage(
+    objects: Sequence[SpacetimeObject],
+    xs: List[float],
+    ys: List[float]
+) -> Dict[int, Any]:
+    """
+    Count how many objects of each layer cover each sample point.
+
+    An object covers the contiguous run of sample points inside its
+    (closed) bounding box, found by bisection. With NumPy every layer is
+    rasterized at once through a 2D difference array; without it each
+    object only visits the points it covers.
+
+    Args:
+        objects: Objects to rasterize
+        xs: Increasing x sample positions
+        ys: Increasing y sample positions
+
+    Returns:
+        Layer -> counts indexed [y][x] (NumPy array or nested lists)
+    """
+    ny, nx = len(ys), len(xs)
+    if NUMPY_AVAILABLE:
+        by_layer: Dict[int, List[SpacetimeObject]] = {}
+        for obj in objects:
+            by_layer.setdefault(obj.layer, []).append(obj)
+
+        x_samples = np.asarray(xs)
+        y_samples = np.asarray(ys)
+        coverage = {}
+        for layer, layer_objects in by_layer.items():
+            bounds = np.array([(o.space.left, o.space.right, o.space.bottom, o.space.top)
+                               for o in layer_objects], dtype=np.float64).reshape(-1, 4)
+            x0 = np.searchsorted(x_samples, bounds[:, 0], side='left')
+            x1 = np.searchsorted(x_samples, bounds[:, 1], side='right')
+            y0 = np.searchsorted(y_samples, bounds[:, 2], side='left')
+            y1 = np.searchsorted(y_samples, bounds[:, 3], side='right')
+            keep = (x0 < x1) & (y0 < y1)
+            x0, x1, y0, y1 = x0[keep], x1[keep], y0[keep], y1[keep]
+
+            diff = np.zeros((ny + 1, nx + 1), dtype=np.int64)
+            np.add.at(diff, (y0, x0), 1)
+            np.add.at(diff, (y0, x1), -1)
+            np.add.at(diff, (y1, x0), -1)
+            np.add.at(diff, (y1, x1), 1)
+            coverage[layer] = diff.cumsum(axis=0).cumsum(axis=1)[:ny, :nx]
+        return coverage
+
+    coverage = {}
+    for obj in objects:
+        x0, x1 = bisect_left(xs, obj.space.left), bisect_right(xs, obj.space.right)
+        y0, y1 = bisect_left(ys, obj.space.bottom), bisect_right(ys, obj.space.top)
+        grid = coverage.get(obj.layer)
+        if grid is None:
+            grid = coverage[obj.layer] = [[0] * nx for _ in range(ny)]
+        for y in range(y0, y1):
+            row = grid[y]
+            for x in range(x0, x1):
+                row[x] += 1
+    return coverage
+
+
+def rasterize(
+    objects: Sequence[SpacetimeObject],
+    bounds: SpaceRegion,
+    resolution: int = 40
+) -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    Rasterize object bounding boxes into occupancy and top-layer grids.
+
+    Sample point (x, y) sits at bounds.left + x / resolution * width
+    (likewise for y), so row 0 is the bottom of the region.
+
+    Args:
+        objects: Objects to rasterize
+        bounds: Region to sample
+        resolution: Sample points per dimension
+
+    Returns:
+        (counts, top): number of objects covering each point, and the
+        highest covering layer (-1 where nothing covers the point)
+    """
+    xs = _sample_points(bounds.left, bounds.right, resolution)
+    ys = _sample_points(bounds.bottom, bounds.top, resolution)
+    coverage = _layer_coverage(objects, xs, ys)
+
+    if NUMPY_AVAILABLE:
+        counts = np.zeros((resolution, resolution), dtype=np.int64)
+        top = np.full((resolution, resolution), -1, dtype=np.int64)
+        for layer in sorted(coverage):
+            counts += coverage[layer]
+            top[coverage[layer] > 0] = layer
+        return counts.tolist(), top.tolist()
+
+    counts = [[0] * resolution for _ in range(resolution)]
+    top = [[-1] * resolution for _ in range(resolution)]
+    for layer in sorted(coverage):
+        for y, row in enumerate(coverage[layer]):
+            for x, count in enumerate(row):
+                if count:
+                    counts[y][x] += count
+                    top[y][x] = layer
+    return counts, top
 
 
 class SpaceTimeVisualizer:
@@ -20,89 +143,181 @@ class SpaceTimeVisualizer:
     Creates text-based and file-based visualizations.
     """
 
+    # Density glyphs for aggregated Gantt bands, from sparse to peak
+    DENSITY_CHARS = " ░▒▓█"
+
     @staticmethod
     def gantt_chart(
         timeline: Timeline,
         output_path: Optional[str] = None,
-        title: str = "Timeline Gantt Chart"
+        title: str = "Timeline Gantt Chart",
+        max_rows: Optional[int] = 200,
+        time_range: Optional[Tuple[float, float]] = None,
+        group_by: str = 'layer',
+        width: int = 80
     ) -> str:
         """
         Create a text-based Gantt chart visualization.
 
+        Shows one bar per object while they fit in max_rows; beyond that,
+        objects are aggregated into one density band per layer or type.
+
         Args:
             timeline: Timeline to visualize
             output_path: Optional file path to save the chart
             title: Chart title
+            max_rows: Most objects drawn individually (None: no limit)
+            time_range: Optional (start, end) window to zoom into
+            group_by: 'layer' or 'type', how density bands are grouped
+            width: Bar width in characters
 
         Returns:
             String representation of the Gantt chart
         """
-        if not timeline.objects:
-            chart = "# No objects on timeline"
-        else:
-            # Sort objects by start time
-            sorted_objs = sorted(timeline.objects, key=lambda o: o.time.start)
+        chart = "\n".join(SpaceTimeVisualizer.iter_gantt_lines(
+            timeline, title, max_rows, time_range, group_by, width
+        ))
 
-            # Calculate dimensions
-            total_duration = timeline.duration or max(o.time.end for o in sorted_objs)
-            chart_width = 80  # characters
-            chart_height = len(sorted_objs) * 2 + 4
+        # Save to file if path provided
+        if output_path:
+            with open(output_path, 'w') as f:
+                f.write(chart)
 
-            lines = []
-            lines.append(f"# {title}")
-            lines.append(f"# Total duration: {total_duration:.2f}s")
-            lines.append(f"# Objects: {len(sorted_objs)}")
-            lines.append("#")
+        return chart
 
-            # Time scale
-            lines.append("# " + SpaceTimeVisualizer._create_time_scale(total_duration, chart_width))
+    @staticmethod
+    def write_gantt_chart(
+        timeline: Timeline,
+        output_path: str,
+        title: str = "Timeline Gantt Chart",
+        max_rows: Optional[int] = 200,
+        time_range: Optional[Tuple[float, float]] = None,
+        group_by: str = 'layer',
+        width: int = 80
+    ) -> int:
+        """
+        Stream a Gantt chart to a file line by line.
 
-            for obj in sorted_objs:
-                # Object name
-                name = obj.id[:20]
-                lines.append(f"  {name:<20}")
+        Unlike gantt_chart, the chart is never held in memory, so full
+        detail (max_rows=None) is practical for very large timelines.
 
-                # Timeline bar
-                bar = SpaceTimeVisualizer._create_timeline_bar(obj, total_duration, chart_width)
-                lines.append(f"  {bar}")
+        Args:
+            timeline: Timeline to visualize
+            output_path: File path to write
+            title, max_rows, time_range, group_by, width: As in gantt_chart
 
-            chart = "\n".join(lines)
+        Returns:
+            Number of lines written
+        """
+        count = 0
+        with open(output_path, 'w') as f:
+            for line in SpaceTimeVisualizer.iter_gantt_lines(
+                timeline, title, max_rows, time_range, group_by, width
+            ):
+                if count:
+                    f.write("\n")
+                f.write(line)
+                count += 1
+        return count
 
-        # Save to file if path provided
-        if output_path:
-            with open(output_path, 'w') as f:
-                f.write(chart)
+    @staticmethod
+    def iter_gantt_lines(
+        timeline: Timeline,
+        title: str = "Timeline Gantt Chart",
+        max_rows: Optional[int] = 200,
+        time_range: Optional[Tuple[float, float]] = None,
+        group_by: str = 'layer',
+        width: int = 80
+    ) -> Iterator[str]:
+        """
+        Generate the lines of a Gantt chart (see gantt_chart).
 
-        return chart
+        Raises:
+            ValueError: If group_by is unknown or time_range is empty
+        """
+        if group_by not in ('layer', 'type'):
+            raise ValueError(f"group_by must be 'layer' or 'type', got '{group_by}'")
+
+        if time_range is None:
+            objects = timeline.objects
+            if not objects:
+                yield "# No objects on timeline"
+                return
+            window_start = 0.0
+            window_end = timeline.duration or max(o.time.end for o in objects)
+        else:
+            window_start, window_end = time_range
+            if window_end <= window_start:
+                raise ValueError(f"Empty time_range {time_range}")
+            objects = [o for o in timeline.get_objects_in_time_range(window_start, window_end)
+                       if o.time.end >= window_start and o.time.start <= window_end]
+            if not objects:
+                yield f"# No objects in [{window_start:.2f}s, {window_end:.2f}s]"
+                return
+        span = window_end - window_start
+
+        yield f"# {title}"
+        if time_range is None:
+            yield f"# Total duration: {span:.2f}s"
+        else:
+            yield f"# Window: [{window_start:.2f}s, {window_end:.2f}s]"
+        yield f"# Objects: {len(objects)}"
+
+        if max_rows is None or len(objects) <= max_rows:
+            yield "#"
+            yield "# " + SpaceTimeVisualizer._create_time_scale(span, width, window_start)
+            for obj in sorted(objects, key=lambda o: o.time.start):
+                # Object name and timeline bar
+                yield f"  {obj.id[:20]:<20}"
+                yield "  " + SpaceTimeVisualizer._create_timeline_bar(
+                    obj, span, width, window_start)
+            return
+
+        # Too many rows: one density band per group
+        groups: Dict[Any, List[SpacetimeObject]] = {}
+        for obj in objects:
+            key = obj.layer if group_by == 'layer' else obj.object_type
+            groups.setdefault(key, []).append(obj)
+
+        yield f"# Aggregated by {group_by} ({len(objects)} objects > {max_rows} rows)"
+        yield "#"
+        yield "# " + SpaceTimeVisualizer._create_time_scale(span, width, window_start)
+        for key in sorted(groups, key=lambda k: (str(type(k)), k)):
+            members = groups[key]
+            density = SpaceTimeVisualizer._density(members, span, width, window_start)
+            peak = max(density)
+            yield f"  {group_by} {key}: {len(members)} objects, peak {peak} concurrent"
+            yield "  " + SpaceTimeVisualizer._create_density_bar(density, peak)
+        yield "#"
+        yield f"# Density: {' '.join(SpaceTimeVisualizer.DENSITY_CHARS[1:])} (sparse to peak)"
 
     @staticmethod
-    def _create_time_scale(duration: float, width: int) -> str:
-        """Create time scale line."""
+    def _create_time_scale(duration: float, width: int, start: float = 0.0) -> str:
+        """Create time scale line with a label every 10 characters."""
         if duration == 0:
             return "-" * width
 
-        scale = []
-        for i in range(width):
-            time = (i / width) * duration
-            if i % 10 == 0:
-                scale.append(f"{time:.0f}s")
-            else:
-                scale.append(" ")
-        return "".join(scale)
+        scale = [" "] * width
+        for i in range(0, width, 10):
+            label = f"{start + (i / width) * duration:.0f}s"
+            scale[i:i + len(label)] = label[:width - i]
+        return "".join(scale[:width])
 
     @staticmethod
-    def _create_timeline_bar(obj: SpacetimeObject, total_duration: float, width: int) -> str:
+    def _create_timeline_bar(
+        obj: SpacetimeObject, total_duration: float, width: int, start: float = 0.0
+    ) -> str:
         """Create timeline bar for an object."""
         if total_duration == 0:
             return " " * width
 
-        # Convert time to position
-        start_pos = int((obj.time.start / total_duration) * width)
-        end_pos = int((obj.time.end / total_duration) * width)
+        # Convert time to position, clipped to the chart
+        start_pos = max(int(((obj.time.start - start) / total_duration) * width), 0)
+        end_pos = min(int(((obj.time.end - start) / total_duration) * width), width)
 
         # Create bar
         bar = [" "] * width
-        for i in range(start_pos, min(end_pos, width)):
+        for i in range(start_pos, end_pos):
             bar[i] = "█"
 
         # Add layer info
@@ -112,6 +327,38 @@ class SpaceTimeVisualizer:
 
         return "".join(bar)
 
+    @staticmethod
+    def _density(
+        objects: List[SpacetimeObject], total_duration: float, width: int, start: float
+    ) -> List[int]:
+        """Count the objects active in each column, via a difference array."""
+        diff = [0] * (width + 1)
+        scale = width / total_duration
+        for obj in objects:
+            first = max(int((obj.time.start - start) * scale), 0)
+            last = min(math.ceil((obj.time.end - start) * scale), width)
+            if last <= first:
+                last = min(first + 1, width)
+            if first < width:
+                diff[first] += 1
+                diff[last] -= 1
+        density = []
+        running = 0
+        for step in diff[:width]:
+            running += step
+            density.append(running)
+        return density
+
+    @staticmethod
+    def _create_density_bar(density: List[int], peak: int) -> str:
+        """Create a density band from per-column counts."""
+        chars = SpaceTimeVisualizer.DENSITY_CHARS
+        levels = len(chars) - 1
+        if peak == 0:
+            return " " * len(density)
+        return "".join(chars[min(math.ceil(count / peak * levels), levels)]
+                       for count in density)
+
     @staticmethod
     def space_heatmap(
         timeline: Timeline,
@@ -131,56 +378,9 @@ class SpaceTimeVisualizer:
         Returns:
             String representation of the heatmap
         """
-        # Get objects active at time
-        active_objs = [obj for obj in timeline.objects if obj.time.contains(time)]
-
-        if not active_objs:
-            heatmap = f"# No objects active at time {time:.2f}s"
-        else:
-            # Define space bounds
-            x_min = min(obj.space.left for obj in active_objs)
-            x_max = max(obj.space.right for obj in active_objs)
-            y_min = min(obj.space.bottom for obj in active_objs)
-            y_max = max(obj.space.top for obj in active_objs)
-
-            # Create grid
-            lines = []
-            lines.append(f"# Spatial heatmap at t={time:.2f}s")
-            lines.append(f"# Active objects: {len(active_objs)}")
-            lines.append(f"# X range: [{x_min:.1f}, {x_max:.1f}]")
-            lines.append(f"# Y range: [{y_min:.1f}, {y_max:.1f}]")
-            lines.append("#")
-
-            # Draw grid (top to bottom)
-            for y in range(resolution - 1, -1, -1):
-                row = []
-                y_pos = y_min + (y / resolution) * (y_max - y_min)
-
-                for x in range(resolution):
-                    x_pos = x_min + (x / resolution) * (x_max - x_min)
-
-                    # Check if any object covers this cell
-                    covered = False
-                    layer = -1
-                    for obj in active_objs:
-                        if (obj.space.left <= x_pos <= obj.space.right and
-                            obj.space.bottom <= y_pos <= obj.space.top):
-                            covered = True
-                            layer = max(layer, obj.layer)
-                            break
-
-                    if covered:
-                        row.append(str(layer % 10))
-                    else:
-                        row.append(".")
-
-                lines.append("  " + "".join(row))
-
-            # Legend
-            lines.append("#")
-            lines.append("# Legend: digits = layer numbers, . = empty space")
-
-            heatmap = "\n".join(lines)
+        heatmap = SpaceTimeVisualizer._render_heatmap(
+            timeline.get_objects_at_time(time), time, resolution
+        )
 
         # Save to file if path provided
         if output_path:
@@ -189,6 +389,132 @@ class SpaceTimeVisualizer:
 
         return heatmap
 
+    @staticmethod
+    def space_heatmaps(
+        timeline: Timeline,
+        times: Sequence[float],
+        output_path: Optional[str] = None,
+        resolution: int = 40
+    ) -> List[str]:
+        """
+        Create heatmaps for many time points in one sweep.
+
+        The active set is swept once over the sorted times instead of
+        being looked up per time point.
+
+        Args:
+            timeline: Timeline to visualize
+            times: Time points, in any order
+            output_path: Optional file path to save all heatmaps
+            resolution: Grid resolution (characters per dimension)
+
+        Returns:
+            Heatmaps in the order of `times`
+        """
+        order = sorted(range(len(times)), key=lambda k: times[k])
+        heatmaps = [""] * len(times)
+        sweep = timeline.iter_active(times[k] for k in order)
+        for k, (time, active_objs) in zip(order, sweep):
+            heatmaps[k] = SpaceTimeVisualizer._render_heatmap(active_objs, time, resolution)
+
+        if output_path:
+            with open(output_path, 'w') as f:
+                f.write("\n\n".join(heatmaps))
+
+        return heatmaps
+
+    @staticmethod
+    def _render_heatmap(
+        active_objs: List[SpacetimeObject], time: float, resolution: int
+    ) -> str:
+        """Render the heatmap of the objects active at a time."""
+        if not active_objs:
+            return f"# No objects active at time {time:.2f}s"
+
+        # Define space bounds
+        x_min = min(obj.space.left for obj in active_objs)
+        x_max = max(obj.space.right for obj in active_objs)
+        y_min = min(obj.space.bottom for obj in active_objs)
+        y_max = max(obj.space.top for obj in active_objs)
+        bounds = SpaceRegion(x=x_min, y=y_min, width=x_max - x_min, height=y_max - y_min)
+        counts, top = rasterize(active_objs, bounds, resolution)
+
+        lines = []
+        lines.append(f"# Spatial heatmap at t={time:.2f}s")
+        lines.append(f"# Active objects: {len(active_objs)}")
+        lines.append(f"# X range: [{x_min:.1f}, {x_max:.1f}]")
+        lines.append(f"# Y range: [{y_min:.1f}, {y_max:.1f}]")
+        lines.append("#")
+
+        # Draw grid (top to bottom), showing the highest covering layer
+        for count_row, top_row in zip(reversed(counts), reversed(top)):
+            lines.append("  " + "".join(
+                str(layer % 10) if count else "."
+                for count, layer in zip(count_row, top_row)
+            ))
+
+        # Legend
+        lines.append("#")
+        lines.append("# Legend: digits = layer numbers, . = empty space")
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def occupancy_over_time(
+        timeline: Timeline,
+        times: Optional[Sequence[float]] = None,
+        samples: int = 100,
+        bounds: SpaceRegion = SCREEN,
+        resolution: int = 64
+    ) -> Dict[str, Any]:
+        """
+        Measure screen coverage and overlap per layer over time.
+
+        Coverage is the fraction of the sampled region covered by at
+        least one object of the layer, overlap the fraction covered by
+        two or more. Time points are swept once, as in space_heatmaps.
+
+        Args:
+            timeline: Timeline to measure
+            times: Non-decreasing time points (default: `samples` evenly
+                   spaced points over the timeline)
+            samples: Number of time points when `times` is not given
+            bounds: Region to measure (default: the full screen)
+            resolution: Sample points per dimension
+
+        Returns:
+            {'times': [...], 'layers': {layer: {'coverage': [...],
+            'overlap': [...], 'objects': [...]}}}, with one entry per
+            time point in every list
+        """
+        if times is None:
+            duration = timeline.duration
+            times = [duration * k / max(samples - 1, 1) for k in range(samples)]
+        times = list(times)
+
+        xs = _sample_points(bounds.left, bounds.right, resolution)
+        ys = _sample_points(bounds.bottom, bounds.top, resolution)
+        cells = resolution * resolution
+        layers = sorted({obj.layer for obj in timeline.objects})
+        curves = {layer: {'coverage': [0.0] * len(times), 'overlap': [0.0] * len(times),
+                          'objects': [0] * len(times)}
+                  for layer in layers}
+
+        for k, (_, active_objs) in enumerate(timeline.iter_active(times)):
+            for obj in active_objs:
+                curves[obj.layer]['objects'][k] += 1
+            for layer, counts in _layer_coverage(active_objs, xs, ys).items():
+                if NUMPY_AVAILABLE:
+                    covered = int(np.count_nonzero(counts))
+                    overlapping = int(np.count_nonzero(counts > 1))
+                else:
+                    covered = sum(1 for row in counts for c in row if c)
+                    overlapping = sum(1 for row in counts for c in row if c > 1)
+                curves[layer]['coverage'][k] = covered / cells
+                curves[layer]['overlap'][k] = overlapping / cells
+
+        return {'times': times, 'layers': curves}
+
     @staticmethod
     def conflict_report_viz(
         report: ConflictReport,
@@ -310,7 +636,8 @@ class SpaceTimeVisualizer:
 def visualize_timeline(
     timeline: Timeline,
     output_dir: Optional[str] = None,
-    prefix: str = "timeline"
+    prefix: str = "timeline",
+    explorer: bool = False
 ) -> dict:
     """
     Create all visualizations for a timeline.
@@ -319,6 +646,8 @@ def visualize_timeline(
         timeline: Timeline to visualize
         output_dir: Directory to save visualizations (default: current dir)
         prefix: Prefix for output files
+        explorer: Also write the interactive HTML explorer (runs
+                  conflict detection over the whole timeline)
 
     Returns:
         Dictionary with visualization paths and content
@@ -349,4 +678,10 @@ def visualize_timeline(
             timeline, mid_time, heatmap_path
         )
 
+    # Interactive explorer
+    if explorer:
+        results['explorer'] = export_explorer(
+            timeline, os.path.join(output_dir, f"{prefix}_explorer.html")
+        )
+
     return results
@@ -41,14 +41,24 @@ def check_directory_structure():
         (base / "core" / "spacetime" / "__init__.py", "Spacetime layer"),
         (base / "core" / "spacetime" / "objects.py", "Spacetime objects"),
         (base / "core" / "spacetime" / "timelines.py", "Timeline management"),
+        (base / "core" / "spacetime" / "time_index.py", "Time interval index"),
+        (base / "core" / "spacetime" / "columnar.py", "Columnar timeline arrays"),
+        (base / "core" / "spacetime" / "spatial_index.py", "Spatiotemporal R-tree"),
         (base / "core" / "spacetime" / "conflict_detection.py", "Conflict detection"),
+        (base / "core" / "spacetime" / "diff.py", "Timeline diffs"),
+        (base / "core" / "spacetime" / "persistence.py", "Timeline persistence"),
         (base / "core" / "spacetime" / "layouts.py", "Layout system"),
         (base / "core" / "spacetime" / "visualization.py", "Visualization tools"),
+        (base / "core" / "spacetime" / "explorer.py", "HTML timeline explorer"),
         (base / "core" / "scheduler" / "__init__.py", "Scheduler layer"),
         (base / "core" / "scheduler" / "director.py", "Animation director"),
+        (base / "core" / "scheduler" / "plan_cache.py", "Plan cache"),
+        (base / "core" / "scheduler" / "registry.py", "Instruction registry"),
         (base / "core" / "scheduler" / "voiceover_sync.py", "Voiceover sync"),
         (base / "core" / "scheduler" / "bookmarks.py", "Bookmark manager"),
         (base / "core" / "scheduler" / "animation_plans.py", "Animation plans"),
+        (base / "core" / "scheduler" / "optimizer.py", "Plan optimizer"),
+        (base / "core" / "scheduler" / "schedule.py", "Compiled schedules"),
         (base / "core" / "implementation" / "__init__.py", "Implementation layer"),
         (base / "core" / "implementation" / "scenes.py", "Scene base classes"),
         (base / "core" / "implementation" / "mobjects" / "__init__.py", "Mobjects"),
@@ -95,6 +105,21 @@ def check_directory_structure():
         (base / "examples" / "c_program_execution" / "__init__.py", "C program example"),
     ]
 
+    for filepath, desc in checks:
+        if check_file_exists(filepath, desc):
+            passed += 1
+        else:
+            failed += 1
+
+    # Benchmarks
+    print("\n5. Benchmarks:")
+    checks = [
+        (base / "benchmarks" / "__init__.py", "Benchmarks module"),
+        (base / "benchmarks" / "generators.py", "Timeline generators"),
+        (base / "benchmarks" / "conflicts.py", "Conflict detection benchmark"),
+        (base / "benchmarks" / "memory.py", "Memory benchmark"),
+    ]
+
     for filepath, desc in checks:
         if check_file_exists(filepath, desc):
             passed += 1
@@ -102,7 +127,7 @@ def check_directory_structure():
             failed += 1
 
     # Documentation
-    print("\n5. Documentation:")
+    print("\n6. Documentation:")
     checks = [
         (base / "ARCHITECTURE.md", "Architecture documentation"),
     ]
@@ -0,0 +1,51 @@
+"""
+Shared builders for the tests.
+
+Timelines are random but seeded, small enough for brute-force checks
+against the pairwise SpacetimeObject methods.
+"""
+import random
+from itertools import combinations
+from typing import List, Set, Tuple
+
+from core.spacetime.objects import SpaceRegion, TimeWindow, SpacetimeObject, MotionPath
+from core.spacetime.timelines import Timeline
+
+
+def random_object(rng: random.Random, obj_id: str, layers: int = 3,
+                  moving: float = 0.2) -> SpacetimeObject:
+    """Create a random object on the Manim frame, sometimes moving."""
+    region = SpaceRegion(
+        x=rng.uniform(-7.0, 5.0),
+        y=rng.uniform(-4.0, 2.5),
+        width=rng.uniform(0.2, 2.0),
+        height=rng.uniform(0.2, 1.5)
+    )
+    start = rng.uniform(0.0, 30.0)
+    time = TimeWindow(start=start, end=start + rng.uniform(0.1, 4.0),
+                      padding=rng.choice([0.0, 0.5]))
+    layer = rng.randrange(layers)
+    metadata = {'type': rng.choice(['text', 'code', 'memory'])}
+    if rng.random() < moving:
+        motion = MotionPath.linear(region, time.start, time.end,
+                                   rng.uniform(-7.0, 5.0), rng.uniform(-4.0, 2.5))
+        return SpacetimeObject.moving(obj_id, motion, time, layer, metadata)
+    return SpacetimeObject(id=obj_id, space=region, time=time, layer=layer, metadata=metadata)
+
+
+def random_timeline(seed: int, count: int = 120, layers: int = 3,
+                    moving: float = 0.2) -> Timeline:
+    """Create a seeded random timeline."""
+    rng = random.Random(seed)
+    return Timeline(objects=[random_object(rng, f"obj_{i}", layers, moving)
+                             for i in range(count)])
+
+
+def brute_force_pairs(objects: List[SpacetimeObject]) -> Set[Tuple[str, str]]:
+    """Conflicting id pairs found by checking every pair."""
+    return {pair_key(a, b) for a, b in combinations(objects, 2) if a.conflicts_with(b)}
+
+
+def pair_key(a: SpacetimeObject, b: SpacetimeObject) -> Tuple[str, str]:
+    """Order-independent key of an object pair."""
+    return (a.id, b.id) if a.id <= b.id else (b.id, a.id)
@@ -0,0 +1,108 @@
+"""TimelineArray columns checked against the objects they were built from."""
+import random
+
+import numpy as np
+import pytest
+
+from core.spacetime.columnar import TimelineArray
+from core.spacetime.objects import SpaceRegion, TimeWindow
+from core.spacetime.time_index import TimeIndex
+from core.spacetime.timelines import TimelineSegment, TimelineSequence
+
+from .support import random_timeline
+
+
+def _fields(obj, offset=0.0):
+    return (obj.id, obj.space.x, obj.space.y, obj.space.width, obj.space.height,
+            obj.time.start + offset, obj.time.end + offset, obj.time.padding, obj.layer)
+
+
+def _rows(array):
+    return list(zip(array.ids, array.x.tolist(), array.y.tolist(),
+                    array.width.tolist(), array.height.tolist(),
+                    array.start.tolist(), array.end.tolist(),
+                    array.padding.tolist(), array.layer.tolist()))
+
+
+@pytest.mark.parametrize('count', [0, 1, 50])
+def test_columns_layout_and_dtypes(count):
+    array = random_timeline(count, count=count).to_array()
+    assert len(array) == count
+    for column in TimelineArray.COLUMNS:
+        values = getattr(array, column)
+        assert values.dtype == np.float64 and values.shape == (count,)
+        assert values.flags.c_contiguous
+    assert array.layer.dtype == np.int64 and array.layer.shape == (count,)
+    if count:
+        # The float columns are rows of one (7, n) block
+        assert all(getattr(array, c).base is array.x.base for c in TimelineArray.COLUMNS)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_round_trip_from_timeline(seed):
+    timeline = random_timeline(seed, count=60, moving=0.3)
+    array = timeline.to_array()
+    assert array is timeline.to_array()
+    assert _rows(array) == [_fields(obj) for obj in timeline.objects]
+    assert array.to_timeline().objects == timeline.objects
+    assert all(a is b for a, b in zip(array.to_objects(), timeline.objects))
+
+    # Derived rows build fresh objects from the columns
+    rows = np.arange(len(array))[::2]
+    derived = TimelineArray(array.ids, array.x, array.y, array.width, array.height,
+                            array.start, array.end, array.padding, array.layer,
+                            metadata=array.metadata).select(rows)
+    rebuilt = derived.to_timeline(name="copy")
+    originals = timeline.objects[::2]
+    assert [_fields(obj) for obj in rebuilt.objects] == [_fields(obj) for obj in originals]
+    assert [obj.metadata for obj in rebuilt.objects] == [obj.metadata for obj in originals]
+
+    timeline.remove(timeline.objects[0].id)
+    assert timeline.to_array() is not array and len(timeline.to_array()) == len(timeline)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_vectorized_predicates_match_objects(seed):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=80)
+    array = timeline.to_array()
+    for _ in range(10):
+        region = SpaceRegion(rng.uniform(-7, 5), rng.uniform(-4, 2.5),
+                             rng.uniform(0, 3), rng.uniform(0, 3))
+        start = rng.uniform(0, 34)
+        window = TimeWindow(start, start + rng.choice([0.0, 1.0]), rng.choice([0.0, 0.5]))
+        assert array.intersects(region).tolist() == \
+            [obj.space.intersects(region) for obj in timeline.objects]
+        assert array.overlaps(window).tolist() == \
+            [obj.time.overlaps(window) for obj in timeline.objects]
+        assert array.contains(start).tolist() == \
+            [obj.time.contains(start) for obj in timeline.objects]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_sorted_columns_index_matches_time_index(seed):
+    rng = random.Random(seed)
+    objects = random_timeline(seed, count=rng.choice([1, 7, 200])).objects
+    array = TimelineArray.from_objects(objects)
+    order = np.argsort(array.start, kind='stable')
+    columnar = TimeIndex.from_sorted(objects, order, array.start[order],
+                                     array.end[order], array.padded_end[order])
+    reference = TimeIndex(objects)
+    for _ in range(30):
+        t = rng.uniform(-1.0, 36.0)
+        assert columnar.at_time(t) == reference.at_time(t)
+        end = t + rng.choice([0.0, 0.5, 3.0])
+        assert columnar.in_range(t, end) == reference.in_range(t, end)
+
+
+def test_merged_array_shifts_segment_columns():
+    sequence = TimelineSequence(name="seq", segments=[
+        TimelineSegment(name=f"s{k}", timeline=random_timeline(k, count=20),
+                        start_offset=12.5 * k)
+        for k in range(3)
+    ])
+    array = sequence.merge_all().to_array()
+    assert _rows(array) == [
+        (f"{seg.name}_{obj.id}",) + _fields(obj, seg.start_offset)[1:]
+        for seg in sequence.segments for obj in seg.timeline.objects
+    ]
@@ -0,0 +1,130 @@
+"""Conflict detection checked against pairwise conflicts_with()."""
+import random
+
+import pytest
+
+from core.spacetime.conflict_detection import (
+    ConflictDetector, IncrementalConflictDetector, BatchConflictResolver
+)
+from core.spacetime.objects import SpaceRegion, TimeWindow
+
+from .support import random_object, random_timeline, brute_force_pairs, pair_key
+
+
+def _pairs(conflicts):
+    return {pair_key(c.obj1, c.obj2) for c in conflicts}
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_detect_conflicts_matches_brute_force(seed):
+    timeline = random_timeline(seed)
+    report = ConflictDetector().detect_conflicts(timeline)
+    assert _pairs(report.conflicts) == brute_force_pairs(timeline.objects)
+    assert len(report.conflicts) == len(_pairs(report.conflicts))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_iter_conflicts_matches_detect_conflicts(seed):
+    timeline = random_timeline(seed, layers=3)
+    detector = ConflictDetector()
+    streamed = list(detector.iter_conflicts(timeline))
+    assert _pairs(streamed) == _pairs(detector.detect_conflicts(timeline).conflicts)
+    for conflict in streamed:
+        assert conflict.obj1.layer == conflict.obj2.layer
+        assert conflict.obj1.conflicts_with(conflict.obj2)
+    starts = [max(c.obj1.time.start, c.obj2.time.start) for c in streamed]
+    assert starts == sorted(starts)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_any_conflict_and_first_k(seed):
+    timeline = random_timeline(seed, layers=3)
+    detector = ConflictDetector()
+    expected = brute_force_pairs(timeline.objects)
+    assert detector.any_conflict(timeline) == bool(expected)
+    first = detector.first_k(timeline, 5)
+    assert len(first) == min(5, len(expected))
+    assert _pairs(first) <= expected
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_detection_with_mixed_object_sizes(seed):
+    # Tiny cells next to huge backgrounds switch the sweep to a hierarchical grid
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=150, layers=2)
+    for obj in rng.sample(timeline.objects, 60):
+        size = rng.choice([1e-3, 0.02, 30.0, 500.0])
+        obj.space = SpaceRegion(obj.space.x, obj.space.y, size, size * rng.uniform(0.5, 1.0))
+        obj.motion = None
+        timeline.touch(obj.id)
+    report = ConflictDetector().detect_conflicts(timeline)
+    assert _pairs(report.conflicts) == brute_force_pairs(timeline.objects)
+
+
+def test_check_layers():
+    timeline = random_timeline(3, layers=3)
+    report = ConflictDetector().detect_conflicts(timeline, check_layers=[1])
+    layer_objects = [obj for obj in timeline.objects if obj.layer == 1]
+    assert _pairs(report.conflicts) == brute_force_pairs(layer_objects)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_sharded_detection_matches_serial(seed):
+    timeline = random_timeline(seed, count=300, layers=2)
+    serial = ConflictDetector().detect_conflicts(timeline)
+    sharded = ConflictDetector(workers=2, shard_size=40).detect_conflicts(timeline)
+    assert [pair_key(c.obj1, c.obj2) for c in sharded.conflicts] == \
+        [pair_key(c.obj1, c.obj2) for c in serial.conflicts]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_incremental_detection_follows_edits(seed):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=80)
+    incremental = IncrementalConflictDetector(timeline)
+    next_id = len(timeline)
+    for _ in range(60):
+        action = rng.random()
+        if action < 0.4:
+            timeline.add(random_object(rng, f"new_{next_id}"))
+            next_id += 1
+        elif action < 0.7 and len(timeline):
+            timeline.remove(rng.choice(timeline.objects).id)
+        elif len(timeline):
+            obj = rng.choice(timeline.objects)
+            start = rng.uniform(0.0, 30.0)
+            obj.time = TimeWindow(start=start, end=start + 2.0)
+            timeline.touch(obj.id)
+        assert _pairs(incremental.report.conflicts) == brute_force_pairs(timeline.objects)
+    incremental.close()
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_space_resolution_stays_on_frame(seed):
+    timeline = random_timeline(seed, count=150, layers=1, moving=0.0)
+    report = ConflictDetector().detect_conflicts(timeline)
+    resolver = BatchConflictResolver(strategies=('space',))
+    plan = resolver.plan(report, timeline)
+    frame = BatchConflictResolver.FRAME
+    for obj_id in plan.space_shifts:
+        obj = timeline.get(obj_id)
+        dx, _ = plan.space_shifts[obj_id]
+        assert obj.space.left + dx >= frame.left - 1e-9
+        assert obj.space.right + dx <= frame.right + 1e-9
+
+    resolver.apply(plan, timeline)
+    unresolved = set(plan.unresolved)
+    for conflict in ConflictDetector().detect_conflicts(timeline).conflicts:
+        assert {conflict.obj1.id, conflict.obj2.id} & unresolved
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_resolution_with_every_strategy_clears_conflicts(seed):
+    timeline = random_timeline(seed, count=150, layers=2)
+    report = ConflictDetector().detect_conflicts(timeline)
+    resolver = BatchConflictResolver(available_layers=[0, 1, 2], bounds=None)
+    plan = resolver.plan(report, timeline)
+    assert plan.unresolved == []
+    remaining = resolver.apply(plan, timeline)
+    assert remaining.conflicts == []
+    assert ConflictDetector().detect_conflicts(timeline).conflicts == []
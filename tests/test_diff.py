@@ -0,0 +1,124 @@
+"""Timeline diffs checked against a field-by-field comparison of copies."""
+import random
+
+import pytest
+
+from core.spacetime.diff import TimelineSnapshot, diff_timelines
+from core.spacetime.objects import SpaceRegion, TimeWindow, MotionPath
+from core.spacetime.timelines import TimelineSegment, TimelineSequence
+
+from .support import random_object, random_timeline
+
+
+def _fields(obj, offset=0.0):
+    motion = None
+    if obj.motion is not None:
+        motion = [(t + offset, x, y) for t, x, y in obj.motion.keyframes]
+    return {
+        'position': (obj.space.x, obj.space.y),
+        'size': (obj.space.width, obj.space.height),
+        'time': (obj.time.start + offset, obj.time.end + offset, obj.time.padding),
+        'layer': obj.layer,
+        'metadata': dict(obj.metadata),
+        'motion': motion,
+    }
+
+
+_KINDS = {'position': 'moved', 'size': 'resized', 'time': 'retimed',
+          'layer': 'layer', 'metadata': 'metadata', 'motion': 'motion'}
+
+
+def _record(source):
+    """Key -> fields of every object, keyed like TimelineSnapshot."""
+    if isinstance(source, TimelineSequence):
+        return {f"{seg.name}_{obj.id}": _fields(obj, seg.start_offset)
+                for seg in source.segments for obj in seg.timeline.objects}
+    return {obj.id: _fields(obj) for obj in source.objects}
+
+
+def _expected(before, after):
+    changes = {}
+    for key in before.keys() - after.keys():
+        changes[key] = ('removed',)
+    for key in after.keys() - before.keys():
+        changes[key] = ('added',)
+    for key in before.keys() & after.keys():
+        kinds = tuple(kind for name, kind in _KINDS.items() if before[key][name] != after[key][name])
+        if kinds:
+            changes[key] = kinds
+    return changes
+
+
+def _edit(rng, timeline, count, prefix):
+    """Apply random edits of every kind, reporting in-place ones with touch()."""
+    for i in range(count):
+        action = rng.random()
+        if action < 0.15 or not len(timeline):
+            timeline.add(random_object(rng, f"{prefix}{i}"))
+            continue
+        obj = rng.choice(timeline.objects)
+        if action < 0.3:
+            timeline.remove(obj.id)
+            continue
+        if action < 0.45:
+            obj.space = SpaceRegion(obj.space.x + 1.0, obj.space.y, obj.space.width, obj.space.height)
+        elif action < 0.55:
+            obj.space = SpaceRegion(obj.space.x, obj.space.y, obj.space.width * 2, obj.space.height)
+        elif action < 0.7:
+            obj.time = TimeWindow(obj.time.start + 0.5, obj.time.end + 0.5, obj.time.padding)
+        elif action < 0.8:
+            obj.layer += 1
+        elif action < 0.9:
+            obj.metadata = dict(obj.metadata, note=rng.choice(['a', 'b']))
+        else:
+            obj.motion = MotionPath.linear(obj.space, obj.time.start, obj.time.end, 0.0, 0.0)
+        timeline.touch(obj.id)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_timeline_diff_matches_field_comparison(seed):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=80)
+    before = _record(timeline)
+    snapshot = TimelineSnapshot.capture(timeline)
+    _edit(rng, timeline, 30, "new_")
+    diff = diff_timelines(snapshot, timeline)
+    assert {key: change.kinds for key, change in diff.changes.items()} == \
+        _expected(before, _record(timeline))
+    assert diff_timelines(timeline, timeline).is_empty
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_sequence_diff_matches_field_comparison(seed):
+    rng = random.Random(seed)
+    sequence = TimelineSequence(name="seq", segments=[
+        TimelineSegment(name=f"s{k}", timeline=random_timeline(seed * 10 + k, count=30),
+                        start_offset=40.0 * k)
+        for k in range(4)
+    ])
+    before = _record(sequence)
+    snapshot = TimelineSnapshot.capture(sequence)
+    edited = rng.sample(range(4), 2)
+    for k in edited:
+        _edit(rng, sequence.segments[k].timeline, 10, f"new{k}_")
+    sequence.segments[3].start_offset += 1.0
+
+    diff = diff_timelines(snapshot, sequence)
+    expected = _expected(before, _record(sequence))
+    assert {key: change.kinds for key, change in diff.changes.items()} == expected
+    assert diff.segments == sorted({key.split('_', 1)[0] for key in expected})
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_dirty_ranges_cover_every_change(seed):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=60)
+    snapshot = TimelineSnapshot.capture(timeline)
+    _edit(rng, timeline, 20, "new_")
+    diff = diff_timelines(snapshot, timeline)
+    ranges = diff.dirty_ranges(margin=0.25)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end < start
+    for change in diff.changes.values():
+        for start, end in change.time_ranges:
+            assert any(lo <= start - 0.25 and end + 0.25 <= hi for lo, hi in ranges)
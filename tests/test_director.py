@@ -0,0 +1,127 @@
+"""Concurrent execution checked against the plan it slices."""
+import random
+
+import pytest
+
+from core.implementation import scenes
+from core.implementation.scenes import LayeredScene
+from core.scheduler.director import AnimationPlan, AnimationInstruction, Director
+
+from .support import random_timeline
+
+
+def _random_plan(rng, count):
+    plan = AnimationPlan()
+    for i in range(count):
+        start = round(rng.uniform(0.0, 20.0), 1)
+        plan.add_animation(AnimationInstruction(
+            f"o{i}", 'show', start, rng.choice([0.0, 0.5, 1.0, 3.0]), {'layer': rng.randrange(3)}))
+    plan.sort_by_time()
+    return plan
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_time_slices_split_at_gaps(seed):
+    rng = random.Random(seed)
+    plan = _random_plan(rng, rng.choice([0, 1, 5, 40]))
+    slices = Director(None)._time_slices(plan)
+    assert [a for _, _, group in slices for a in group] == plan.animations
+    for start, end, group in slices:
+        assert start == group[0].start_time
+        assert end == max(a.end_time for a in group)
+        # No instant inside a slice is free of animation
+        reached = start
+        for a in group:
+            assert a.start_time <= reached or a is group[0]
+            reached = max(reached, a.end_time)
+    for (_, end, _), (start, _, _) in zip(slices, slices[1:]):
+        assert end <= start
+
+
+class _StubScene:
+    """Builds 'show' instructions; every other type only has a handler."""
+
+    def __init__(self):
+        self.log = []
+
+    def _build_show(self, instruction):
+        return instruction.object_id
+
+    def _handle_show(self, instruction):
+        raise AssertionError("shows must be built, not handled")
+
+    def _handle_default(self, instruction):
+        self.log.append(('handled', instruction.object_id, instruction.action_type))
+
+    def play_concurrent(self, entries, run_time):
+        self.log.append(('group', [name for _, name in entries], run_time))
+
+    def wait(self, duration):
+        self.log.append(('wait', duration))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_concurrent_mode_falls_back_to_handlers(seed):
+    timeline = random_timeline(seed, count=30, moving=0.5)
+    director = Director(timeline, concurrent=True)
+    plan = director.create_animation_plan()
+    scene = _StubScene()
+    director.execute(scene)
+
+    moves = sorted((a.object_id, a.action_type) for a in plan.animations
+                   if a.action_type != 'show')
+    assert moves
+    assert sorted(entry[1:] for entry in scene.log if entry[0] == 'handled') == moves
+    grouped = [name for entry in scene.log if entry[0] == 'group' for name in entry[1]]
+    assert sorted(grouped) == sorted(a.object_id for a in plan.animations
+                                     if a.action_type == 'show')
+    played = sum(entry[-1] for entry in scene.log if entry[0] in ('group', 'wait'))
+    assert played == pytest.approx(plan.total_duration)
+
+
+class _Mobject:
+    def __init__(self):
+        self.z_index = None
+
+    def move_to(self, point):
+        pass
+
+    def set_z_index(self, z_index):
+        self.z_index = z_index
+
+
+class _RecordingLayeredScene(LayeredScene):
+    def __init__(self, concurrent):
+        super().__init__(concurrent=concurrent)
+        self.played = []
+
+    def _create_mobject(self, obj_type, params):
+        return _Mobject()
+
+    def play(self, animation):
+        self.played.append(animation)
+
+    def play_concurrent(self, entries, run_time):
+        self.played.extend(animation for _, animation in entries)
+
+    def wait(self, duration):
+        pass
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+def test_only_concurrent_mode_orders_by_z_index(monkeypatch, concurrent):
+    monkeypatch.setattr(scenes, 'FadeIn', lambda mobject, run_time: mobject, raising=False)
+    timeline = random_timeline(3, count=20, moving=0.0)
+    scene = _RecordingLayeredScene(concurrent)
+    Director(timeline, concurrent=concurrent).execute(scene)
+    layers = {obj.id: obj.layer for obj in timeline.objects}
+
+    assert len(scene.played) == len(timeline)
+    for obj_id, mobject in scene.mobjects_map.items():
+        assert mobject.z_index == (layers[obj_id] if concurrent else None)
+    if not concurrent:
+        # Serial mode draws in play order, as before z-indexes were set
+        plan = Director(timeline).create_animation_plan()
+        order = [id(scene.mobjects_map[a.object_id]) for a in sorted(
+            plan.animations, key=lambda a: (a.start_time, a.parameters['layer']))]
+        assert [id(m) for m in scene.played] == order
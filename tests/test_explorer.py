@@ -0,0 +1,88 @@
+"""Explorer export: conflicts reach the page for every kind of source."""
+import json
+import re
+
+import pytest
+
+from core.spacetime.conflict_detection import ConflictDetector
+from core.spacetime.explorer import export_explorer, ExplorerCache
+from core.spacetime.objects import SpaceRegion, TimeWindow, SpacetimeObject
+from core.spacetime.timelines import Timeline, TimelineSegment, TimelineSequence
+from core.spacetime.visualization import visualize_timeline
+
+from .support import random_timeline
+
+
+def _page_data(path):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    match = re.search(r'<script id="data" type="application/json">(.*?)</script>', html, re.S)
+    return json.loads(match.group(1))
+
+
+def _box(obj_id, x, start):
+    return SpacetimeObject(id=obj_id, space=SpaceRegion(x, 0.0, 2.0, 1.0),
+                           time=TimeWindow(start=start, end=start + 2.0))
+
+
+def _sequence():
+    first = Timeline(name="intro", objects=[_box("a", 0.0, 0.0), _box("b", 1.0, 1.0)])
+    second = Timeline(name="body", objects=[_box("c", 5.0, 0.0), _box("d", 5.5, 0.5)])
+    return TimelineSequence(name="seq", segments=[
+        TimelineSegment(name="seg1", timeline=first, start_offset=0.0),
+        TimelineSegment(name="seg2", timeline=second, start_offset=10.0),
+    ])
+
+
+def _conflict_ids(data):
+    segments = data['segments']
+    columns = data['conflicts']
+    pairs = set()
+    for seg1, row1, seg2, row2 in zip(columns['seg1'], columns['row1'],
+                                      columns['seg2'], columns['row2']):
+        pairs.add(frozenset((segments[seg1]['ids'][row1], segments[seg2]['ids'][row2])))
+    return pairs
+
+
+def test_plain_timeline(tmp_path):
+    timeline = random_timeline(1, count=60)
+    report = ConflictDetector().detect_conflicts(timeline)
+    data = _page_data(export_explorer(timeline, str(tmp_path / "plain.html")))
+    assert _conflict_ids(data) == {frozenset((c.obj1.id, c.obj2.id)) for c in report.conflicts}
+
+
+def test_sequence(tmp_path):
+    data = _page_data(export_explorer(_sequence(), str(tmp_path / "seq.html")))
+    assert [segment['name'] for segment in data['segments']] == ["seg1", "seg2"]
+    assert _conflict_ids(data) == {frozenset(("a", "b")), frozenset(("c", "d"))}
+
+
+@pytest.mark.parametrize('materialize', [False, True])
+def test_merged_timeline(tmp_path, materialize):
+    merged = _sequence().merge_all()
+    if materialize:
+        merged.add(_box("extra", 20.0, 0.0))
+    report = ConflictDetector().detect_conflicts(merged)
+    assert len(report.conflicts) == 2
+    data = _page_data(export_explorer(merged, str(tmp_path / "merged.html")))
+    assert _conflict_ids(data) == {frozenset(("seg1_a", "seg1_b")), frozenset(("seg2_c", "seg2_d"))}
+
+
+def test_cache_reuses_unchanged_segments(tmp_path):
+    sequence = _sequence()
+    cache = ExplorerCache()
+    export_explorer(sequence, str(tmp_path / "one.html"), cache=cache)
+    sequence.segments[1].timeline.add(_box("e", 9.0, 0.0))
+    export_explorer(sequence, str(tmp_path / "two.html"), cache=cache)
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_visualize_timeline_explorer_is_opt_in(tmp_path):
+    timeline = random_timeline(2, count=20)
+    results = visualize_timeline(timeline, str(tmp_path), prefix="plain")
+    assert 'explorer' not in results
+    assert not (tmp_path / "plain_explorer.html").exists()
+
+    results = visualize_timeline(timeline, str(tmp_path), prefix="full", explorer=True)
+    assert results['explorer'] == str(tmp_path / "full_explorer.html")
+    assert _page_data(results['explorer'])['segments'][0]['ids']
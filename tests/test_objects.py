@@ -0,0 +1,102 @@
+"""Interned values and zone-created objects."""
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from core.spacetime import objects
+from core.spacetime.layouts import Zone
+from core.spacetime.objects import (
+    SpaceRegion, intern_metadata, intern_region, clear_intern_pools
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools():
+    clear_intern_pools()
+    yield
+    clear_intern_pools()
+
+
+def test_intern_metadata_shares_equal_content():
+    first = intern_metadata({'type': 'text', 'size': 2})
+    assert intern_metadata({'size': 2, 'type': 'text'}) is first
+    with pytest.raises(TypeError):
+        first['type'] = 'code'
+
+
+@pytest.mark.parametrize('values', [
+    (1, True), (True, 1), (1, 1.0), (1.0, 1), (0, False), (0.0, -0.0),
+    ((1, 2), (True, 2)), (frozenset([1]), frozenset([1.0])),
+])
+def test_intern_metadata_keeps_value_types(values):
+    first, second = values
+    assert repr(intern_metadata({'v': first})['v']) == repr(first)
+    assert repr(intern_metadata({'v': second})['v']) == repr(second)
+    assert repr(dict(intern_metadata({1: 'a'}))) == "{1: 'a'}"
+    assert repr(dict(intern_metadata({True: 'a'}))) == "{True: 'a'}"
+
+
+def test_intern_metadata_unhashable_is_returned_unchanged():
+    metadata = {'cells': [1, 2, 3]}
+    assert intern_metadata(metadata) is metadata
+
+
+def test_intern_region():
+    region = intern_region(1.0, 2.0, 3.0, 4.0)
+    assert intern_region(1.0, 2.0, 3.0, 4.0) is region
+    assert region == SpaceRegion(1.0, 2.0, 3.0, 4.0)
+
+
+@pytest.mark.parametrize('first, second', [(0.0, -0.0), (1, 1.0), (True, 1)])
+def test_intern_region_keeps_coordinate_types(first, second):
+    a = intern_region(first, 0.0, 1.0, 1.0)
+    b = intern_region(second, 0.0, 1.0, 1.0)
+    assert a is not b
+    assert (repr(a.x), repr(b.x)) == (repr(first), repr(second))
+    assert intern_region(second, 0.0, 1.0, 1.0) is b
+
+
+def test_intern_pools_evict_least_recently_used(monkeypatch):
+    monkeypatch.setattr(objects, 'INTERN_POOL_SIZE', 3)
+    regions = [intern_region(float(i), 0.0, 1.0, 1.0) for i in range(3)]
+    metadata = [intern_metadata({'i': i}) for i in range(3)]
+    # Touch the oldest entries so the second one is evicted next
+    assert intern_region(0.0, 0.0, 1.0, 1.0) is regions[0]
+    assert intern_metadata({'i': 0}) is metadata[0]
+    intern_region(3.0, 0.0, 1.0, 1.0)
+    intern_metadata({'i': 3})
+    assert len(objects._region_pool) == len(objects._metadata_pool) == 3
+    assert intern_region(0.0, 0.0, 1.0, 1.0) is regions[0]
+    assert intern_metadata({'i': 0}) is metadata[0]
+    assert intern_region(1.0, 0.0, 1.0, 1.0) is not regions[1]
+    assert intern_metadata({'i': 1}) is not metadata[1]
+    assert intern_region(1.0, 0.0, 1.0, 1.0) == regions[1]
+
+
+def _zone():
+    return Zone(name="code", region=SpaceRegion(-6.0, -3.0, 8.0, 6.0), default_layer=1)
+
+
+def test_create_object_is_private_and_mutable():
+    zone = _zone()
+    obj = zone.create_object("a", 0.0, 2.0, type='code', shared=True)
+    assert obj.metadata == {'zone': 'code', 'type': 'code', 'shared': True}
+    obj.metadata['type'] = 'text'
+    obj.space.x = 0.0
+    other = zone.create_object("b", 0.0, 2.0, type='code')
+    assert other.metadata['type'] == 'code'
+    assert other.space.x != 0.0
+    assert obj.layer == 1
+
+
+def test_create_shared_object_shares_read_only_values():
+    zone = _zone()
+    first = zone.create_shared_object("a", 0.0, 2.0, type='code')
+    second = zone.create_shared_object("b", 1.0, 2.0, type='code')
+    assert first.space is second.space
+    assert first.metadata is second.metadata
+    assert first.space == zone.create_object("c", 0.0, 2.0).space
+    with pytest.raises(TypeError):
+        first.metadata['type'] = 'text'
+    with pytest.raises(FrozenInstanceError):
+        first.space.x = 0.0
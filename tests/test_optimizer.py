@@ -0,0 +1,299 @@
+"""Optimizer passes checked against frame counts and brute-force end states."""
+import copy
+import random
+
+import pytest
+
+from core.scheduler.animation_plans import (
+    SerialAnimation, ParallelAnimation, fade_in, fade_out, transform, scale, wait, delay,
+    show, remove, serial, parallel
+)
+from core.scheduler.director import AnimationPlan, AnimationInstruction, Director
+from core.scheduler.optimizer import (
+    PlanOptimizer, CoalesceWaits, DropInvisible, MergeTransforms, BatchFades,
+    plan_frames, sequence_frames
+)
+from core.spacetime.objects import SpaceRegion, TimeWindow, SpacetimeObject, MotionPath
+from core.spacetime.timelines import Timeline
+
+FPS = 60.0
+
+
+def _random_plan(seed, objects=12):
+    rng = random.Random(seed)
+    plan = AnimationPlan()
+    for i in range(objects):
+        obj_id = f"o{i}"
+        layer = rng.randrange(2)
+        t = round(rng.uniform(0.0, 10.0), 3)
+        x, y = rng.uniform(-5, 5), rng.uniform(-3, 3)
+        # Some objects live for less than a frame
+        life = rng.choice([0.005, 0.01, 0.5, 1.0])
+        plan.add_animation(AnimationInstruction(
+            obj_id, 'show', t, life,
+            {'layer': layer, 'space': SpaceRegion(x - 0.5, y - 0.5, 1.0, 1.0)}))
+        t += life
+        vx, vy = rng.uniform(-1, 1), rng.uniform(-1, 1)
+        for _ in range(rng.randint(0, 4)):
+            duration = rng.choice([0.25, 0.5])
+            if rng.random() < 0.5:
+                # Keep the velocity, so the move can be folded into the last one
+                x, y = x + vx * duration, y + vy * duration
+            else:
+                x, y = rng.uniform(-5, 5), rng.uniform(-3, 3)
+            plan.add_animation(AnimationInstruction(
+                obj_id, 'move', t, duration, {'layer': layer, 'to': {'x': x, 'y': y}}))
+            t += duration
+        for _ in range(rng.randint(0, 2)):
+            plan.add_animation(AnimationInstruction(
+                obj_id, 'transform', t, 0.5, {'layer': layer, 'target': f"t{rng.randrange(5)}"}))
+            t += 0.5
+        if rng.random() < 0.7:
+            plan.add_animation(AnimationInstruction(obj_id, 'remove', t, 0.0, {'layer': layer}))
+    for layer in range(2):
+        for _ in range(8):
+            start = round(rng.uniform(0.0, 12.0), 2)
+            plan.add_animation(AnimationInstruction(
+                f"wait_{layer}", rng.choice(['wait', 'delay']), start,
+                rng.choice([0.25, 1.0]), {'layer': layer}))
+    plan.sort_by_time()
+    return plan
+
+
+def _snapshot(plan):
+    return [(a.object_id, a.action_type, a.start_time, a.duration, repr(a.parameters))
+            for a in plan.animations]
+
+
+def _union(intervals):
+    """Union of intervals as a flat [start, end, start, end, ...] list."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1e-9:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [bound for interval in merged for bound in interval]
+
+
+def _final_targets(animations):
+    """object -> (last transform target, last move target, removed) by replaying in order."""
+    state = {}
+    for anim in sorted(animations, key=lambda a: a.start_time):
+        target, to, removed = state.get(anim.object_id, (None, None, False))
+        if anim.action_type == 'transform':
+            target = anim.parameters.get('target')
+        elif anim.action_type == 'move':
+            to = anim.parameters['to']
+        elif anim.action_type == 'remove':
+            removed = True
+        state[anim.object_id] = (target, to, removed)
+    return state
+
+
+def _invisible(animations):
+    """Removed objects whose visibility, from first show to last end, lasts under a frame."""
+    ids = {a.object_id for a in animations if a.action_type == 'show'}
+    result = set()
+    for obj_id in ids:
+        own = [a for a in animations if a.object_id == obj_id]
+        if not any(a.action_type == 'remove' for a in own):
+            continue
+        start = min(a.start_time for a in own if a.action_type == 'show')
+        end = max(a.start_time if a.action_type == 'remove' else a.end_time for a in own)
+        if end - start < 1.0 / FPS - 1e-9:
+            result.add(obj_id)
+    return result
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_report_matches_frame_counts(seed):
+    plan = _random_plan(seed)
+    before = _snapshot(plan)
+    optimizer = PlanOptimizer(fps=FPS)
+    result, report = optimizer.optimize_plan(plan)
+    assert _snapshot(plan) == before
+    assert report is optimizer.last_report
+    assert report.frames_before == plan_frames(plan, FPS)
+    assert report.frames_after == plan_frames(result, FPS)
+    assert sum(report.by_pass().values()) == report.frames_saved >= 0
+    assert [a.start_time for a in result.animations] == \
+        sorted(a.start_time for a in result.animations)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_coalesced_waits_cover_the_same_time(seed):
+    plan = _random_plan(seed)
+    result, _ = PlanOptimizer([CoalesceWaits()], fps=FPS).optimize_plan(plan)
+    for layer in range(2):
+        def waits(p):
+            return [(a.start_time, a.end_time) for a in p.animations
+                    if a.action_type in ('wait', 'delay') and a.parameters['layer'] == layer]
+        kept = [bound for interval in sorted(waits(result)) for bound in interval]
+        assert kept == pytest.approx(_union(waits(plan)))
+    others = [a for a in plan.animations if a.action_type not in ('wait', 'delay')]
+    assert [a for a in result.animations if a.action_type not in ('wait', 'delay')] == others
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_drop_invisible_drops_exactly_invisible_objects(seed):
+    plan = _random_plan(seed)
+    result, report = PlanOptimizer([DropInvisible()], fps=FPS).optimize_plan(plan)
+    invisible = _invisible(plan.animations)
+    assert result.animations == [a for a in plan.animations if a.object_id not in invisible]
+    assert report.passes[0].removed == len(plan.animations) - len(result.animations)
+
+
+def test_drop_invisible_keeps_shows_that_are_never_removed():
+    timeline = Timeline(objects=[
+        SpacetimeObject(id="flash", space=SpaceRegion(0, 0, 1, 1), time=TimeWindow(1.0, 1.005),
+                        metadata={'type': 'code_display', 'code': 'x = 1'}),
+        SpacetimeObject(id="label", space=SpaceRegion(2, 0, 1, 1), time=TimeWindow(0.0, 2.0),
+                        metadata={'type': 'text'}),
+    ])
+    plan = Director(timeline).create_animation_plan()
+    result, report = PlanOptimizer([DropInvisible()], fps=FPS).optimize_plan(plan)
+    assert result.animations == plan.animations
+    assert report.passes[0].removed == 0
+
+    flashed = AnimationPlan()
+    flashed.add_animation(AnimationInstruction("flash", 'show', 1.0, 0.005))
+    flashed.add_animation(AnimationInstruction("flash", 'fade_out', 1.005, 0.0))
+    result, report = PlanOptimizer([DropInvisible()], fps=FPS).optimize_plan(flashed)
+    assert result.animations == [] and report.passes[0].removed == 2
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_merged_transforms_keep_end_state_and_timing(seed):
+    plan = _random_plan(seed)
+    result, _ = PlanOptimizer([MergeTransforms()], fps=FPS).optimize_plan(plan)
+    assert _final_targets(result.animations) == _final_targets(plan.animations)
+    assert result.total_duration == pytest.approx(plan.total_duration)
+    for obj_id in {a.object_id for a in plan.animations}:
+        for kind in ('move', 'transform'):
+            def busy(p):
+                return [(a.start_time, a.end_time) for a in p.animations
+                        if a.object_id == obj_id and a.action_type == kind]
+            assert _union(busy(result)) == pytest.approx(_union(busy(plan)))
+
+
+def _random_tree(rng, depth=4):
+    roll = rng.random()
+    if depth == 0 or roll < 0.35:
+        obj_id = f"o{rng.randrange(4)}"
+        return rng.choice([
+            lambda: fade_in(obj_id, rng.choice([0.005, 0.5])),
+            lambda: fade_out(obj_id, rng.choice([0.005, 0.5])),
+            lambda: show(obj_id, 'text', duration=rng.choice([0.005, 1.0])),
+            lambda: remove(obj_id),
+            lambda: transform(f"t{rng.randrange(3)}", f"t{rng.randrange(3)}", 0.5),
+            lambda: scale(obj_id, rng.choice([0.5, 2.0])),
+            lambda: wait(rng.choice([0.25, 1.0])),
+            lambda: delay(rng.choice([0.25, 1.0])),
+        ])()
+    children = [_random_tree(rng, depth - 1) for _ in range(rng.randint(1, 4))]
+    return (serial if roll < 0.75 else parallel)(*children)
+
+
+def _leaves(seq):
+    if isinstance(seq, (SerialAnimation, ParallelAnimation)):
+        return [leaf for child in seq.sequences for leaf in _leaves(child)]
+    return [seq]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_optimize_sequence_frames_and_duration(seed):
+    tree = _random_tree(random.Random(seed))
+    before = copy.deepcopy(tree)
+    result, report = PlanOptimizer(fps=FPS).optimize_sequence(tree)
+    assert tree == before
+    assert report.frames_before == sequence_frames(tree, FPS)
+    assert report.frames_after == sequence_frames(result, FPS)
+    assert sum(report.by_pass().values()) == report.frames_saved >= 0
+    assert result.duration <= tree.duration + 1e-9
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_time_preserving_passes_keep_sequence_duration(seed):
+    tree = _random_tree(random.Random(seed))
+    result, _ = PlanOptimizer([CoalesceWaits(), MergeTransforms()], fps=FPS).optimize_sequence(tree)
+    assert result.duration == pytest.approx(tree.duration)
+    # Scales of one object multiply; transforms keep their first source
+    def scale_product(seq):
+        product = {}
+        for leaf in _leaves(seq):
+            if hasattr(leaf, 'scale_factor'):
+                product[leaf.object_id] = product.get(leaf.object_id, 1.0) * leaf.scale_factor
+        return product
+    assert scale_product(result) == pytest.approx(scale_product(tree))
+
+
+@pytest.mark.parametrize('combine', ['then', 'and_'])
+def test_deep_chains(combine):
+    chain = fade_in("o0", 0.5)
+    for i in range(1, 5000):
+        chain = getattr(chain, combine)(wait(0.5) if i % 2 else fade_in(f"o{i}", 0.5))
+    frames = sequence_frames(chain, FPS)
+    assert frames == (5000 * 30 if combine == 'then' else 30)
+    result, report = PlanOptimizer(fps=FPS).optimize_sequence(chain)
+    assert report.frames_before == frames
+    assert report.frames_after == sequence_frames(result, FPS)
+    assert result.duration == pytest.approx(chain.duration)
+
+
+def test_batch_fades_play_fades_together():
+    tree = serial(fade_in("a", 0.5), fade_in("b", 1.0), fade_in("a", 0.5), wait(1.0))
+    result, report = PlanOptimizer([BatchFades()], fps=FPS).optimize_sequence(tree)
+    assert isinstance(result.sequences[0], ParallelAnimation)
+    assert result.duration == pytest.approx(2.5)
+    assert report.passes[0].merged == 1
+
+
+class _RecordingScene:
+    def __init__(self):
+        self.played = []
+
+    def _handle_default(self, instruction):
+        self.played.append((instruction.object_id, instruction.action_type,
+                            instruction.start_time, instruction.duration))
+
+    def wait(self, duration):
+        pass
+
+
+def _timeline():
+    objects = [
+        SpacetimeObject(id=f"o{i}", space=SpaceRegion(i, 0, 1, 1),
+                        time=TimeWindow(i * 0.5, i * 0.5 + (0.005 if i % 3 == 0 else 1.0)),
+                        metadata={'type': 'text'})
+        for i in range(9)
+    ]
+    # Moves along one line at one speed fold into a single move
+    for i in range(3):
+        motion = MotionPath(keyframes=((0.0, 0.0, i), (1.0, 1.0, i), (2.0, 2.0, i)),
+                            width=1.0, height=1.0)
+        objects.append(SpacetimeObject.moving(f"m{i}", motion, TimeWindow(0.0, 2.0), 0,
+                                              {'type': 'text'}))
+    return Timeline(objects=objects)
+
+
+def test_director_executes_the_plan_it_reports():
+    timeline = _timeline()
+    director = Director(timeline, optimizer=PlanOptimizer(fps=FPS))
+    plan = director.create_animation_plan()
+    report = director.last_optimization
+    assert report is director.optimizer.last_report
+    assert report.by_pass()['drop_invisible'] == 0
+    assert sum(stats.merged for stats in report.passes) > 0
+    assert plan_frames(plan, FPS) == report.frames_after
+    unoptimized = Director(timeline).create_animation_plan()
+    assert len(plan.animations) < len(unoptimized.animations)
+
+    breakdown = director.get_timing_breakdown()
+    assert breakdown['total_animations'] == len(plan.animations)
+    assert breakdown['total_duration'] == plan.total_duration
+
+    scene = _RecordingScene()
+    director.execute(scene)
+    assert sorted(scene.played) == sorted(
+        (a.object_id, a.action_type, a.start_time, a.duration) for a in plan.animations)
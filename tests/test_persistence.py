@@ -0,0 +1,92 @@
+"""Round trips through binary timeline files."""
+import math
+import random
+
+import pytest
+
+from core.spacetime.diff import diff_timelines
+from core.spacetime.objects import SpaceRegion, TimeWindow, SpacetimeObject
+from core.spacetime.persistence import save_timeline, load_timeline, MappedTimeline
+from core.spacetime.timelines import Timeline, TimelineSegment, TimelineSequence
+
+from .support import random_object, random_timeline
+
+
+def _same_object(a, b):
+    assert a.id == b.id
+    assert (a.space.x, a.space.y, a.space.width, a.space.height) == \
+        (b.space.x, b.space.y, b.space.width, b.space.height)
+    assert (a.time.start, a.time.end, a.time.padding) == (b.time.start, b.time.end, b.time.padding)
+    assert a.layer == b.layer
+    assert dict(a.metadata) == dict(b.metadata)
+    assert [type(v) for v in a.metadata.values()] == [type(b.metadata[k]) for k in a.metadata]
+    assert (a.motion is None) == (b.motion is None)
+    if a.motion is not None:
+        assert a.motion.keyframes == b.motion.keyframes
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_timeline_round_trip(tmp_path, seed):
+    timeline = random_timeline(seed, count=300)
+    timeline.name = "main"
+    path = str(tmp_path / "main.stl")
+    save_timeline(timeline, path)
+    loaded = load_timeline(path)
+
+    assert isinstance(loaded, MappedTimeline)
+    assert loaded.name == "main" and len(loaded) == len(timeline)
+    for obj in timeline.objects:
+        _same_object(obj, loaded.get(obj.id))
+    assert loaded.get("missing") is None
+    assert diff_timelines(timeline, loaded).is_empty
+    assert loaded.duration == timeline.duration
+
+    for t in [0.0, 3.3, 12.0, 29.9, 40.0]:
+        assert sorted(o.id for o in loaded.get_objects_at_time(t)) == \
+            sorted(o.id for o in timeline.objects if o.time.contains(t))
+
+
+def test_metadata_values_keep_their_types(tmp_path):
+    values = [1, True, 1.0, 0, False, 0.0, -0.0, None, "1", math.inf]
+    timeline = Timeline(objects=[
+        SpacetimeObject(id=f"o{i}", space=SpaceRegion(0, 0, 1, 1),
+                        time=TimeWindow(0, 1), metadata={'v': value})
+        for i, value in enumerate(values)
+    ])
+    path = str(tmp_path / "types.stl")
+    save_timeline(timeline, path)
+    loaded = load_timeline(path)
+    for i, value in enumerate(values):
+        stored = loaded.get(f"o{i}").metadata['v']
+        assert type(stored) is type(value)
+        assert repr(stored) == repr(value)
+
+
+def test_sequence_round_trip(tmp_path):
+    sequence = TimelineSequence(name="seq", segments=[
+        TimelineSegment(name="a", timeline=random_timeline(1, count=50), start_offset=0.0),
+        TimelineSegment(name="b", timeline=random_timeline(2, count=30), start_offset=25.0),
+        TimelineSegment(name="empty", timeline=Timeline(name="empty"), start_offset=60.0),
+    ])
+    path = str(tmp_path / "seq.stl")
+    save_timeline(sequence, path)
+    loaded = load_timeline(path)
+    assert isinstance(loaded, TimelineSequence)
+    assert [(s.name, s.start_offset) for s in loaded.segments] == \
+        [("a", 0.0), ("b", 25.0), ("empty", 60.0)]
+    assert diff_timelines(sequence, loaded).is_empty
+
+
+def test_mutation_materializes(tmp_path):
+    timeline = random_timeline(4, count=40)
+    path = str(tmp_path / "edit.stl")
+    save_timeline(timeline, path)
+    loaded = load_timeline(path)
+
+    extra = random_object(random.Random(0), "extra")
+    loaded.add(extra)
+    assert loaded.is_materialized
+    assert len(loaded) == len(timeline) + 1
+    assert loaded.remove(timeline.objects[0].id)
+    assert sorted(o.id for o in loaded.objects) == \
+        sorted([o.id for o in timeline.objects[1:]] + ["extra"])
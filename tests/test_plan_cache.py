@@ -0,0 +1,134 @@
+"""Plan cache hits, misses, isolation and keys."""
+import random
+
+import pytest
+
+from core.scheduler import plan_cache as plan_cache_module
+from core.scheduler.director import Director
+from core.scheduler.plan_cache import PlanCache
+from core.scheduler.registry import InstructionRegistry, default_registry, field_compiler
+from core.spacetime.objects import SpaceRegion, TimeWindow, SpacetimeObject, MotionPath
+from core.spacetime.timelines import Timeline
+
+
+def _timeline(seed=0, count=60):
+    rng = random.Random(seed)
+    objects = []
+    for i in range(count):
+        start = rng.uniform(0, 20)
+        region = SpaceRegion(rng.uniform(-6, 4), rng.uniform(-3, 2), 1.0, 1.0)
+        motion = None
+        if i % 7 == 0:
+            motion = MotionPath.linear(region, start, start + 1, rng.uniform(-6, 4), 0.0)
+        objects.append(SpacetimeObject(
+            id=f"o{i}", space=region, time=TimeWindow(start, start + 1.5), layer=i % 2,
+            metadata={'type': rng.choice(['text', 'code_display', 'memory_display']),
+                      'code': f"line {i}"},
+            motion=motion
+        ))
+    return Timeline(objects=objects)
+
+
+def _key(plan):
+    return [(a.object_id, a.action_type, a.start_time, a.duration,
+             sorted((k, repr(v)) for k, v in a.parameters.items()))
+            for a in plan.animations], plan.total_duration
+
+
+def _chart(obj_id='chart', **metadata):
+    return SpacetimeObject(id=obj_id, space=SpaceRegion(0, 0, 2, 1), time=TimeWindow(0, 2),
+                           metadata={'type': 'chart', **metadata})
+
+
+def test_cached_plan_matches_uncached():
+    timeline = _timeline()
+    cache = PlanCache()
+    director = Director(timeline, plan_cache=cache)
+    expected = _key(Director(timeline).create_animation_plan())
+    assert _key(director.create_animation_plan()) == expected
+    assert _key(director.create_animation_plan()) == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_edit_recompiles_only_changed_objects():
+    timeline = _timeline()
+    cache = PlanCache()
+    director = Director(timeline, plan_cache=cache)
+    director.create_animation_plan()
+    obj = timeline.objects[3]
+    timeline.replace(SpacetimeObject(id=obj.id, space=SpaceRegion(5, 2, 1, 1), time=obj.time,
+                                     layer=obj.layer, metadata=obj.metadata))
+    plan = director.create_animation_plan()
+    assert _key(plan) == _key(Director(timeline).create_animation_plan())
+    assert cache.compiled == len(timeline) + 1
+    assert cache.reused == len(timeline) - 1
+
+
+def test_returned_plans_are_private():
+    timeline = _timeline()
+    director = Director(timeline, plan_cache=PlanCache())
+    first = director.create_animation_plan()
+    expected = _key(first)
+    first.animations[0].duration = 99.0
+    first.animations[1].parameters['layer'] = 42
+    first.animations.pop()
+    assert _key(director.create_animation_plan()) == expected
+
+
+def test_disk_cache_survives_new_instances(tmp_path):
+    timeline = _timeline()
+    expected = _key(Director(timeline, plan_cache=PlanCache(str(tmp_path))).create_animation_plan())
+    cache = PlanCache(str(tmp_path))
+    assert _key(Director(timeline, plan_cache=cache).create_animation_plan()) == expected
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_plan_format_change_invalidates_disk_cache(tmp_path, monkeypatch):
+    timeline = _timeline()
+    Director(timeline, plan_cache=PlanCache(str(tmp_path))).create_animation_plan()
+    monkeypatch.setattr(plan_cache_module, 'PLAN_FORMAT', plan_cache_module.PLAN_FORMAT + 1)
+    cache = PlanCache(str(tmp_path))
+    Director(timeline, plan_cache=cache).create_animation_plan()
+    assert (cache.hits, cache.misses, cache.reused) == (0, 1, 0)
+
+
+def test_changed_director_code_invalidates_disk_cache(tmp_path):
+    class SlowMoves(Director):
+        def _motion_to_instructions(self, obj):
+            instructions = super()._motion_to_instructions(obj)
+            for instruction in instructions:
+                instruction.duration *= 2
+            return instructions
+
+    # Same name as before, as after editing Director between runs
+    SlowMoves.__module__ = Director.__module__
+    SlowMoves.__qualname__ = Director.__qualname__
+    timeline = _timeline()
+    Director(timeline, plan_cache=PlanCache(str(tmp_path))).create_animation_plan()
+    cache = PlanCache(str(tmp_path))
+    plan = SlowMoves(timeline, plan_cache=cache).create_animation_plan()
+    assert cache.misses == 1
+    assert _key(plan) == _key(SlowMoves(timeline).create_animation_plan())
+
+
+def test_plan_cache_does_not_mix_compilers():
+    timeline = Timeline(objects=[_chart(bars=2)])
+    cache = PlanCache()
+    plans = []
+    for fields in ([('bars', 3)], [('bars', 3), ('color', 'RED')]):
+        registry = InstructionRegistry(parent=default_registry)
+        registry.register_compiler('chart', field_compiler('show_chart', fields))
+        plan = Director(timeline, plan_cache=cache, registry=registry).create_animation_plan()
+        plans.append(plan.animations[0].parameters)
+    assert plans[0]['bars'] == 2 and 'color' not in plans[0]
+    assert plans[1]['color'] == 'RED'
+    assert cache.misses == 2
+
+
+@pytest.mark.parametrize('max_plans', [1, 2])
+def test_plans_are_evicted_in_lru_order(max_plans):
+    cache = PlanCache(max_plans=max_plans)
+    timelines = [_timeline(seed) for seed in range(3)]
+    for timeline in timelines:
+        Director(timeline, plan_cache=cache).create_animation_plan()
+    assert cache.stats()['plans'] == max_plans
@@ -0,0 +1,55 @@
+"""Instruction registry lookups and fingerprints."""
+from core.scheduler.registry import (
+    InstructionRegistry, default_registry, field_compiler, compile_show
+)
+
+
+def test_compiler_lookup_falls_back_to_parent_and_default():
+    registry = InstructionRegistry(parent=default_registry)
+    assert registry.compiler_for('chart') is compile_show
+    assert registry.compiler_for('code_display') is default_registry.compiler_for('code_display')
+
+    @registry.register_compiler('chart')
+    def compile_chart(obj, space):
+        return []
+
+    assert registry.compiler_for('chart') is compile_chart
+    assert default_registry.compiler_for('chart') is compile_show
+
+
+def test_handlers_fall_back_to_scene_methods():
+    class Scene:
+        def _handle_show(self, instruction):
+            return 'show'
+
+        def _handle_default(self, instruction):
+            return 'default'
+
+    registry = InstructionRegistry()
+    registry.register_handler('custom', lambda scene, instruction: 'custom')
+    scene = Scene()
+    bound = registry.bind_handlers(scene, ['show', 'custom', 'other'])
+    assert [bound[t](None) for t in ('show', 'custom', 'other')] == ['show', 'custom', 'default']
+    assert registry.bind_builders(scene, ['custom', 'show']) == {'custom': None, 'show': None}
+
+
+def test_fingerprint_tells_field_compilers_apart():
+    def fingerprint(fields):
+        registry = InstructionRegistry()
+        registry.register_compiler('chart', field_compiler('show_chart', fields))
+        return registry.fingerprint()
+
+    base = fingerprint([('bars', 3)])
+    assert fingerprint([('bars', 3)]) == base
+    assert fingerprint([('bars', 4)]) != base
+    assert fingerprint([('bars', 3), ('color', 'RED')]) != base
+    assert fingerprint([('lines', 3)]) != base
+
+
+def test_fingerprint_tells_lambdas_apart():
+    first = InstructionRegistry()
+    first.register_compiler('chart', lambda obj, space: [])
+    second = InstructionRegistry()
+    second.register_compiler('chart', lambda obj, space: compile_show(obj, space))
+    assert first.fingerprint() != second.fingerprint()
+
@@ -0,0 +1,187 @@
+"""Compiled schedules checked against a recursive walk of the tree."""
+import copy
+import pickle
+import random
+
+import pytest
+
+from core.scheduler.animation_plans import (
+    SerialAnimation, ParallelAnimation, DelayAnimation, fade_in, wait, delay, serial, parallel
+)
+
+
+def _random_tree(rng, depth=5):
+    roll = rng.random()
+    if depth == 0 or roll < 0.3:
+        return rng.choice([
+            lambda: fade_in(f"o{rng.randrange(10)}", round(rng.uniform(0.0, 2.0), 2)),
+            lambda: wait(round(rng.uniform(0.0, 1.0), 2)),
+            lambda: delay(round(rng.uniform(0.0, 1.0), 2)),
+        ])()
+    children = [_random_tree(rng, depth - 1) for _ in range(rng.randint(0, 4))]
+    return (serial if roll < 0.65 else parallel)(*children)
+
+
+def _reference(seq, start=0.0):
+    """(duration, [(leaf, start, end)]) by plain recursion."""
+    if isinstance(seq, SerialAnimation):
+        placed, time = [], start
+        for child in seq.sequences:
+            length, leaves = _reference(child, time)
+            placed.extend(leaves)
+            time += length
+        return time - start, placed
+    if isinstance(seq, ParallelAnimation):
+        placed, length = [], 0.0
+        for child in seq.sequences:
+            child_length, leaves = _reference(child, start)
+            placed.extend(leaves)
+            length = max(length, child_length)
+        return length, placed
+    return seq.duration, [(seq, start, start + seq.duration)]
+
+
+def _reference_list(seq):
+    if isinstance(seq, SerialAnimation):
+        return [entry for child in seq.sequences for entry in _reference_list(child)]
+    if isinstance(seq, ParallelAnimation):
+        return [{'type': 'parallel', 'animations': [_reference_list(c) for c in seq.sequences]}]
+    return seq.to_list()
+
+
+def _reference_branches(seq, start=0.0, path=()):
+    """[(path, start, duration, slack)] of every parallel branch, by recursion."""
+    branches = []
+    if isinstance(seq, SerialAnimation):
+        for i, child in enumerate(seq.sequences):
+            branches += _reference_branches(child, start, path + (i,))
+            start += _reference(child)[0]
+    elif isinstance(seq, ParallelAnimation):
+        total = _reference(seq)[0]
+        for i, child in enumerate(seq.sequences):
+            length = _reference(child)[0]
+            branches.append((path + (i,), start, length, total - length))
+            branches += _reference_branches(child, start, path + (i,))
+    return branches
+
+
+def _lengthen(leaf, amount):
+    if isinstance(leaf, DelayAnimation):
+        leaf.delay += amount
+    else:
+        leaf.duration += amount
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_schedule_matches_reference(seed):
+    tree = _random_tree(random.Random(seed))
+    duration, leaves = _reference(tree)
+    schedule = tree.compile()
+    assert schedule.duration == pytest.approx(duration)
+    assert tree.duration == pytest.approx(duration)
+    expected = {id(leaf): (start, end) for leaf, start, end in leaves}
+    assert len(schedule) == len(leaves)
+    for entry in schedule:
+        assert (entry.start, entry.end) == pytest.approx(expected[id(entry.animation)])
+    assert list(schedule.starts) == sorted(schedule.starts)
+    assert tree.to_list() == _reference_list(tree)
+    branches = sorted(_reference_branches(tree))
+    assert [b.path for b in sorted(schedule.branches)] == [b[0] for b in branches]
+    for branch, (_, start, length, slack) in zip(sorted(schedule.branches), branches):
+        assert (branch.start, branch.duration, branch.slack) == pytest.approx((start, length, slack))
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_queries_match_linear_scan(seed):
+    rng = random.Random(seed)
+    schedule = _random_tree(rng).compile()
+    entries = list(schedule)
+    for _ in range(20):
+        t = rng.uniform(-0.5, schedule.duration + 0.5)
+        assert schedule.at_time(t) == [e for e in entries if e.start <= t < e.end]
+        end = t + rng.uniform(0.0, 2.0)
+        assert schedule.in_range(t, end) == [
+            e for e in entries if e.start < end and (e.end > t or e.end == e.start >= t)]
+        assert schedule.starting_in(t, end) == [e for e in entries if t <= e.start < end]
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_slack_is_how_far_a_leaf_can_grow(seed):
+    tree = _random_tree(random.Random(seed))
+    schedule = tree.compile()
+    total = tree.duration
+    for entry in schedule:
+        # Growing by the slack keeps the end; any more moves it
+        _lengthen(entry.animation, entry.slack)
+        assert tree.duration == pytest.approx(total)
+        _lengthen(entry.animation, 0.25)
+        assert tree.duration == pytest.approx(total + 0.25)
+        _lengthen(entry.animation, -entry.slack - 0.25)
+        assert tree.duration == pytest.approx(total)
+    critical = {id(entry.animation) for entry in schedule.critical_path()}
+    assert critical == {id(entry.animation) for entry in schedule if entry.slack <= 1e-9}
+
+
+def test_duration_follows_edits():
+    inner = parallel(fade_in("a", 1.0), wait(0.5))
+    shared = serial(inner, fade_in("b", 1.0))
+    tree = parallel(shared, serial(delay(1.0), shared))
+    assert tree.duration == 3.0
+    inner.add(wait(2.0))
+    assert shared.duration == 3.0 and tree.duration == 4.0
+    shared.sequences[1].duration = 2.0
+    assert tree.duration == 5.0
+    tree.sequences = [inner]
+    assert tree.duration == 2.0
+
+
+def test_duration_follows_direct_list_edits():
+    s = serial(wait(1.0), wait(2.0))
+    assert s.duration == 3.0
+    s.sequences.pop()
+    assert s.duration == 1.0
+    s.sequences.append(wait(2.0))
+    s.sequences.append(wait(2.0))
+    assert s.duration == 5.0
+    s.sequences[0] = wait(4.0)
+    del s.sequences[1]
+    assert s.duration == 6.0
+    s.sequences[:] = [wait(0.5)]
+    s.sequences.extend([wait(0.5)])
+    s.sequences.insert(0, wait(1.0))
+    assert s.duration == 2.0
+    s.sequences += [wait(1.0)]
+    assert s.duration == 3.0
+    s.sequences.remove(s.sequences[0])
+    assert s.duration == 2.0
+    s.sequences.clear()
+    assert s.duration == 0.0
+
+    outer = parallel(s)
+    assert outer.duration == 0.0
+    s.sequences.append(wait(3.0))
+    assert outer.duration == 3.0
+    assert copy.deepcopy(outer).duration == 3.0
+    assert pickle.loads(pickle.dumps(outer)) == outer
+
+
+@pytest.mark.parametrize('combine', ['then', 'and_'])
+def test_deep_chains(combine):
+    chain = fade_in("o0", 0.5)
+    for i in range(1, 5000):
+        chain = getattr(chain, combine)(fade_in(f"o{i}", 0.5))
+    expected = 2500.0 if combine == 'then' else 0.5
+    assert chain.duration == expected
+    assert chain.compile().duration == expected
+    flat = chain.to_list()
+    if combine == 'then':
+        assert len(flat) == 5000
+    else:
+        depth = 0
+        while flat[0].get('type') == 'parallel':
+            flat = flat[0]['animations'][0]
+            depth += 1
+        assert depth == 4999
+        paths = sorted(branch.path for branch in chain.compile().branches)
+        assert len(paths) == 2 * 4999
+        assert max(paths, key=len) == (0,) * 4999 and paths[-1] == (1,)
@@ -0,0 +1,143 @@
+"""SpacetimeIndex and spatial hash grid queries checked against linear scans."""
+import random
+
+import pytest
+
+from core.spacetime.conflict_detection import (
+    SpatialHashGrid, HierarchicalSpatialHashGrid, create_spatial_grid
+)
+from core.spacetime.objects import SpaceRegion
+from core.spacetime.spatial_index import SpacetimeIndex
+
+from .support import random_object, random_timeline
+
+
+def _ids(objects):
+    return sorted(obj.id for obj in objects)
+
+
+def _covers(obj, x, y, time):
+    if not obj.time.contains(time):
+        return False
+    region = obj.region_at(time)
+    return region.left <= x <= region.right and region.bottom <= y <= region.top
+
+
+def _check_queries(index, objects, rng, rounds=40):
+    for _ in range(rounds):
+        x, y, t = rng.uniform(-7, 7), rng.uniform(-4, 4), rng.uniform(0, 34)
+        assert _ids(index.query_point(x, y, t)) == \
+            _ids(o for o in objects if _covers(o, x, y, t))
+
+        region = SpaceRegion(rng.uniform(-7, 5), rng.uniform(-4, 2), 2.0, 1.5)
+        start = rng.uniform(0, 30)
+        end = start + rng.uniform(0, 4)
+        assert _ids(index.query_region(region, start, end)) == _ids(
+            o for o in objects
+            if o.time.start <= end and o.time.end >= start and o.space.intersects(region))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_queries_match_linear_scan(seed):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=300)
+    index = SpacetimeIndex.from_timeline(timeline)
+    _check_queries(index, timeline.objects, rng)
+
+    for obj in timeline.objects[:30]:
+        assert _ids(index.conflicts(obj)) == _ids(
+            o for o in timeline.objects if o.id != obj.id and obj.conflicts_with(o))
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_remove_all_then_reinsert(seed):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=200)
+    index = SpacetimeIndex(timeline.objects, max_entries=4)
+    objects = list(timeline.objects)
+    rng.shuffle(objects)
+    for obj in objects:
+        assert index.remove(obj.id)
+    assert len(index) == 0
+    assert index.query_region(SpaceRegion(-8, -5, 16, 10), 0, 40) == []
+    assert not index.remove(objects[0].id)
+
+    for obj in objects:
+        index.insert(obj)
+    assert len(index) == len(objects)
+    _check_queries(index, objects, rng, rounds=20)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_random_updates(seed):
+    rng = random.Random(seed)
+    index = SpacetimeIndex(max_entries=4)
+    live = {}
+    for step in range(400):
+        if live and rng.random() < 0.45:
+            obj_id = rng.choice(sorted(live))
+            assert index.remove(obj_id)
+            del live[obj_id]
+        else:
+            obj = random_object(rng, f"obj_{rng.randrange(150)}")
+            index.insert(obj)
+            live[obj.id] = obj
+    assert len(index) == len(live)
+    _check_queries(index, list(live.values()), rng, rounds=20)
+
+
+def test_followed_timeline_cleared_and_refilled():
+    rng = random.Random(7)
+    timeline = random_timeline(7, count=150)
+    index = SpacetimeIndex.from_timeline(timeline, follow=True)
+    objects = list(timeline.objects)
+    timeline.remove_many([obj.id for obj in objects])
+    assert len(index) == 0
+
+    refill = [random_object(rng, f"again_{i}") for i in range(150)]
+    timeline.add_many(refill)
+    assert len(index) == len(timeline)
+    _check_queries(index, timeline.objects, rng, rounds=20)
+    index.close()
+
+    timeline.add(random_object(rng, "unfollowed"))
+    assert "unfollowed" not in index
+
+
+def _mixed_region(rng):
+    # Memory cells, panels and backgrounds far larger than the frame
+    size = rng.choice([1e-3, 0.05, 0.5, 2.0, 14.0, 300.0])
+    return SpaceRegion(rng.uniform(-10, 10) - size / 2, rng.uniform(-6, 6) - size / 2,
+                       size * rng.uniform(0.5, 1.0), size * rng.uniform(0.5, 1.0))
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_auto_sized_grid_finds_every_intersection(seed):
+    rng = random.Random(seed)
+    regions = {i: _mixed_region(rng) for i in range(300)}
+    grid = create_spatial_grid(list(regions.values()))
+    assert isinstance(grid, HierarchicalSpatialHashGrid)
+    for obj_id, region in regions.items():
+        grid.insert(obj_id, region)
+
+    for removed in (150, 0):
+        for _ in range(50):
+            probe = _mixed_region(rng)
+            expected = {i for i, r in regions.items() if r.intersects(probe)}
+            assert expected <= grid.get_potential_collisions(None, probe)
+        for obj_id in rng.sample(sorted(regions), removed):
+            grid.remove(obj_id, regions[obj_id])
+            del regions[obj_id]
+
+    for obj_id, region in regions.items():
+        grid.remove(obj_id, region)
+    assert not grid.get_potential_collisions(None, SpaceRegion(-1e4, -1e4, 2e4, 2e4))
+
+
+def test_uniform_regions_get_a_flat_grid():
+    rng = random.Random(0)
+    regions = [SpaceRegion(rng.uniform(-7, 5), rng.uniform(-4, 2), 1.0, 0.5) for _ in range(100)]
+    grid = create_spatial_grid(regions)
+    assert type(grid) is SpatialHashGrid and grid.cell_size == 1.0
+    assert type(create_spatial_grid(regions + [SpaceRegion(0, 0, 50, 50)], cell_size=2.0)) \
+        is SpatialHashGrid
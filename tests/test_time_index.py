@@ -0,0 +1,76 @@
+"""TimeIndex queries checked against TimeWindow.contains() and overlaps()."""
+import random
+
+import pytest
+
+from core.spacetime.objects import TimeWindow
+from core.spacetime.time_index import TimeIndex
+
+from .support import random_object, random_timeline
+
+
+def _query_times(rng, objects, count=40):
+    # Exact starts and ends probe the closed interval bounds
+    times = [rng.uniform(-1.0, 36.0) for _ in range(count)]
+    for obj in rng.sample(objects, min(10, len(objects))):
+        times += [obj.time.start, obj.time.end, obj.time.padded_end]
+    return times
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_at_time_matches_contains(seed):
+    rng = random.Random(seed)
+    objects = random_timeline(seed, count=rng.choice([0, 1, 7, 300])).objects
+    index = TimeIndex(objects)
+    for t in _query_times(rng, objects):
+        assert index.at_time(t) == [obj for obj in objects if obj.time.contains(t)]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_in_range_matches_overlaps(seed):
+    rng = random.Random(seed)
+    objects = random_timeline(seed, count=rng.choice([0, 1, 7, 300])).objects
+    index = TimeIndex(objects)
+    for start in _query_times(rng, objects):
+        end = start + rng.choice([0.0, 0.5, 3.0])
+        window = TimeWindow(start=start, end=end)
+        assert index.in_range(start, end) == [obj for obj in objects
+                                              if obj.time.overlaps(window)]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_iter_active_matches_contains(seed):
+    rng = random.Random(seed)
+    objects = random_timeline(seed, count=200).objects
+    times = sorted(_query_times(rng, objects, count=100))
+    swept = list(TimeIndex(objects).iter_active(times))
+    assert [t for t, _ in swept] == times
+    for t, active in swept:
+        assert active == [obj for obj in objects if obj.time.contains(t)]
+    with pytest.raises(ValueError):
+        list(TimeIndex(objects).iter_active([2.0, 1.0]))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_timeline_index_follows_edits(seed):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=80)
+    next_id = len(timeline)
+    for _ in range(40):
+        action = rng.random()
+        if action < 0.4:
+            timeline.add(random_object(rng, f"new_{next_id}"))
+            next_id += 1
+        elif action < 0.7 and len(timeline):
+            timeline.remove(rng.choice(timeline.objects).id)
+        elif len(timeline):
+            obj = rng.choice(timeline.objects)
+            start = rng.uniform(0.0, 30.0)
+            obj.time = TimeWindow(start=start, end=start + 1.0)
+            timeline.touch(obj.id)
+        t = rng.uniform(0.0, 34.0)
+        assert timeline.get_objects_at_time(t) == \
+            [obj for obj in timeline.objects if obj.time.contains(t)]
+        window = TimeWindow(start=t, end=t + 2.0)
+        assert timeline.get_objects_in_time_range(t, t + 2.0) == \
+            [obj for obj in timeline.objects if obj.time.overlaps(window)]
@@ -0,0 +1,228 @@
+"""Timelines, sequences and merged views vs. their segments."""
+import random
+
+import pytest
+
+from core.implementation.scenes import LayeredScene
+from core.spacetime.conflict_detection import IncrementalConflictDetector
+from core.spacetime.objects import SpaceRegion, TimeWindow, MotionPath, SpacetimeObject
+from core.spacetime.timelines import Timeline, TimelineSegment, TimelineSequence, SegmentObjectView
+
+from .support import random_object, random_timeline, brute_force_pairs, pair_key
+
+
+def _check(timeline, model):
+    assert [obj.id for obj in timeline.objects] == list(model)
+    assert all(a is b for a, b in zip(timeline.objects, model.values()))
+    assert len(timeline) == len(model)
+    assert timeline.duration == max((obj.time.end for obj in model.values()), default=0.0)
+    for obj_id in list(model)[:5] + ["missing"]:
+        assert (obj_id in timeline) == (obj_id in model)
+        assert timeline.get(obj_id) is model.get(obj_id)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_batch_edits_match_a_dict(seed):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=30)
+    model = {obj.id: obj for obj in timeline.objects}
+    events = []
+    timeline.subscribe(lambda event, obj: events.append((event, obj.id)))
+    for step in range(40):
+        expected = []
+        action = rng.random()
+        if action < 0.2:
+            obj = random_object(rng, f"add_{step}")
+            timeline.add(obj)
+            model[obj.id] = obj
+            expected = [('add', obj.id)]
+        elif action < 0.4:
+            batch = [random_object(rng, f"many_{step}_{k}") for k in range(rng.randrange(4))]
+            timeline.add_many(batch)
+            model.update((obj.id, obj) for obj in batch)
+            expected = [('add', obj.id) for obj in batch]
+        elif action < 0.6:
+            ids = rng.sample(sorted(model), min(3, len(model))) + ["missing"]
+            assert timeline.remove_many(ids) == len(ids) - 1
+            for obj_id in ids[:-1]:
+                del model[obj_id]
+            expected = [('remove', obj_id) for obj_id in ids[:-1]]
+        elif action < 0.7 and model:
+            obj_id = rng.choice(sorted(model))
+            assert timeline.remove(obj_id) and not timeline.remove(obj_id)
+            del model[obj_id]
+            expected = [('remove', obj_id)]
+        elif action < 0.85:
+            batch = [random_object(rng, obj_id) for obj_id in rng.sample(sorted(model), min(3, len(model)))]
+            previous = [model[obj.id] for obj in batch]
+            assert timeline.replace_many(batch) == previous
+            model.update((obj.id, obj) for obj in batch)
+            expected = [('update', obj.id) for obj in batch]
+        elif model:
+            obj = random_object(rng, rng.choice(sorted(model)))
+            assert timeline.replace(obj) is model[obj.id]
+            assert timeline.replace(random_object(rng, "missing")) is None
+            model[obj.id] = obj
+            expected = [('update', obj.id)]
+        assert events == expected
+        del events[:]
+        _check(timeline, model)
+
+
+def test_rejected_batches_leave_the_timeline_unchanged():
+    rng = random.Random(0)
+    timeline = random_timeline(0, count=10)
+    model = {obj.id: obj for obj in timeline.objects}
+    version = timeline._version
+    fresh = random_object(rng, "fresh")
+    with pytest.raises(ValueError, match="obj_3"):
+        timeline.add(random_object(rng, "obj_3"))
+    with pytest.raises(ValueError, match="fresh"):
+        timeline.add_many([fresh, random_object(rng, "fresh")])
+    with pytest.raises(ValueError, match="obj_0"):
+        timeline.add_many([fresh, random_object(rng, "obj_0")])
+    with pytest.raises(KeyError, match="fresh"):
+        timeline.replace_many([random_object(rng, "obj_1"), fresh])
+    assert timeline.remove_many(["fresh"]) == 0
+    assert timeline._version == version
+    _check(timeline, model)
+    with pytest.raises(ValueError):
+        Timeline(objects=[fresh, fresh])
+
+
+def test_in_place_edits_need_touch():
+    timeline = random_timeline(0, count=10)
+    obj = timeline.objects[0]
+    duration = timeline.duration
+    obj.time = TimeWindow(obj.time.start, duration + 5.0)
+    # Documented: caches only see in-place edits once they are touched
+    assert timeline.duration == duration
+    assert timeline.touch(obj.id) and not timeline.touch("missing")
+    assert timeline.duration == duration + 5.0
+    assert timeline.get_objects_at_time(duration + 4.0) == [obj]
+
+
+def _sequence():
+    return TimelineSequence(name="seq", segments=[
+        TimelineSegment(name="a", timeline=random_timeline(1, count=40), start_offset=0.0),
+        TimelineSegment(name="b", timeline=random_timeline(2, count=40, moving=0.5),
+                        start_offset=35.0),
+    ])
+
+
+@pytest.mark.parametrize('materialize', [False, True])
+def test_merged_views_match_shifted_segments(materialize):
+    sequence = _sequence()
+    merged = sequence.merge_all()
+    if materialize:
+        merged.add(SpacetimeObject(id="extra", space=SpaceRegion(0, 0, 1, 1),
+                                   time=TimeWindow(0, 1)))
+    expected = {}
+    for segment in sequence.segments:
+        for obj in segment.timeline.objects:
+            expected[f"{segment.name}_{obj.id}"] = (segment, obj)
+
+    views = [view for view in merged.objects if view.id != "extra"]
+    assert [view.id for view in views] == list(expected)
+    for view in views:
+        segment, obj = expected[view.id]
+        offset = segment.start_offset
+        assert (view.time.start, view.time.end) == (obj.time.start + offset, obj.time.end + offset)
+        assert view.space is obj.space and view.layer == obj.layer
+        assert view.metadata['segment'] == segment.name
+        if obj.motion is None:
+            assert view.motion is None
+        else:
+            for t in (obj.time.start, obj.time.end):
+                assert view.motion.position_at(t + offset) == obj.motion.position_at(t)
+
+
+def test_view_assignments_stick_and_leave_the_source_alone():
+    source = SpacetimeObject(
+        id="box", space=SpaceRegion(0, 0, 1, 1), time=TimeWindow(0, 2), layer=1,
+        metadata={'type': 'text'},
+        motion=MotionPath.linear(SpaceRegion(0, 0, 1, 1), 0.0, 2.0, 3.0, 0.0))
+    view = SegmentObjectView(source, "seg", 10.0)
+    assert view.motion.keyframes[0][0] == 10.0
+
+    view.motion = None
+    assert view.motion is None
+    view.space = SpaceRegion(5, 5, 1, 1)
+    view.layer = 0
+    view.time = TimeWindow(0, 1)
+    view.metadata['type'] = 'code'
+    assert (view.space.x, view.layer, view.time.end, view.metadata['type']) == (5, 0, 1, 'code')
+
+    assert source.motion is not None and source.motion.keyframes[0][0] == 0.0
+    assert (source.space.x, source.layer, source.time.end) == (0, 1, 2)
+    assert source.metadata == {'type': 'text'}
+
+
+def _edit(rng, timeline, prefix, count=20):
+    for i in range(count):
+        action = rng.random()
+        if action < 0.4 or not len(timeline):
+            timeline.add(random_object(rng, f"{prefix}{i}"))
+        elif action < 0.7:
+            timeline.remove(rng.choice(timeline.objects).id)
+        else:
+            obj = rng.choice(timeline.objects)
+            start = rng.uniform(0.0, 30.0)
+            obj.time = TimeWindow(start=start, end=start + 2.0)
+            timeline.touch(obj.id)
+
+
+def _live_pairs(detector):
+    return {pair_key(c.obj1, c.obj2) for c in detector.report.conflicts}
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_merged_subscribers_follow_segments_and_materialization(seed):
+    rng = random.Random(seed)
+    sequence = _sequence()
+    merged = sequence.merge_all()
+    events = []
+    merged.subscribe(lambda event, obj: events.append((event, obj.id)))
+    detector = IncrementalConflictDetector(merged)
+
+    for segment in sequence.segments:
+        _edit(rng, segment.timeline, f"seg_{segment.name}_")
+        assert _live_pairs(detector) == brute_force_pairs(merged.objects)
+    assert events and all(view_id[:2] in ("a_", "b_") for _, view_id in events)
+
+    del events[:]
+    merged.add(random_object(rng, "extra"))
+    assert merged.is_materialized and events == [('add', 'extra')]
+    assert _live_pairs(detector) == brute_force_pairs(merged.objects)
+
+    # Segments are detached from a materialized view
+    sequence.segments[0].timeline.add(random_object(rng, "late"))
+    assert len(events) == 1
+    _edit(rng, merged, "merged_")
+    assert _live_pairs(detector) == brute_force_pairs(merged.objects)
+    detector.close()
+
+
+def test_merged_unsubscribe_stops_forwarding():
+    sequence = _sequence()
+    merged = sequence.merge_all()
+    detector = IncrementalConflictDetector(merged)
+    detector.close()
+    assert not any(seg.timeline._listeners for seg in sequence.segments)
+
+
+def test_layered_scene_keeps_one_detector_per_timeline():
+    rng = random.Random(0)
+    scene = LayeredScene()
+    scene.timeline = _sequence().merge_all()
+    first = scene.check_conflicts()
+    detector = scene.conflict_detector
+    _edit(rng, scene.timeline, "nudge_")
+    assert scene.check_conflicts() is first and scene.conflict_detector is detector
+    assert {pair_key(c.obj1, c.obj2) for c in first.conflicts} == \
+        brute_force_pairs(scene.timeline.objects)
+
+    other = random_timeline(1, count=30)
+    scene.check_conflicts(other)
+    assert scene.conflict_detector is not detector
+    assert not scene.timeline._listeners
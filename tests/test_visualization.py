@@ -0,0 +1,185 @@
+"""Heatmaps, occupancy curves and Gantt charts checked against direct sampling."""
+import math
+import random
+
+import pytest
+
+from core.spacetime import visualization
+from core.spacetime.objects import SpaceRegion, TimeWindow, SpacetimeObject
+from core.spacetime.timelines import Timeline
+from core.spacetime.visualization import SpaceTimeVisualizer, rasterize, SCREEN
+
+from .support import random_timeline
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'pure'])
+def numpy_mode(request, monkeypatch):
+    if request.param and not visualization.NUMPY_AVAILABLE:
+        pytest.skip("numpy not installed")
+    monkeypatch.setattr(visualization, 'NUMPY_AVAILABLE', request.param)
+    return request.param
+
+
+def _sampled(objects, bounds, resolution):
+    """(counts, top) by testing every object at every sample point."""
+    xs = [bounds.left + i / resolution * bounds.width for i in range(resolution)]
+    ys = [bounds.bottom + i / resolution * bounds.height for i in range(resolution)]
+    counts = [[0] * resolution for _ in ys]
+    top = [[-1] * resolution for _ in ys]
+    for row, y in enumerate(ys):
+        for col, x in enumerate(xs):
+            for obj in objects:
+                if obj.space.left <= x <= obj.space.right and obj.space.bottom <= y <= obj.space.top:
+                    counts[row][col] += 1
+                    top[row][col] = max(top[row][col], obj.layer)
+    return counts, top
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_rasterize_matches_sampling(numpy_mode, seed):
+    objects = random_timeline(seed, count=40, layers=4).objects
+    for bounds in (SCREEN, SpaceRegion(-2.0, -1.0, 3.0, 2.0)):
+        assert rasterize(objects, bounds, 24) == _sampled(objects, bounds, 24)
+
+
+def _box(obj_id, x, layer):
+    return SpacetimeObject(id=obj_id, space=SpaceRegion(x, 0, 2, 2),
+                           time=TimeWindow(0, 1), layer=layer)
+
+
+def test_heatmap_shows_the_highest_covering_layer(numpy_mode):
+    # The first object covering a point used to decide its digit; now the
+    # highest layer does, whatever the insertion order
+    for layers in ((1, 3), (3, 1)):
+        timeline = Timeline(objects=[_box("a", 0, layers[0]), _box("b", 1, layers[1])])
+        rows = SpaceTimeVisualizer.space_heatmap(timeline, 0.5, resolution=3).splitlines()[5:8]
+        # Sample x = 0 only hits "a"; x = 1 and x = 2 hit both boxes
+        assert rows == [f"  {layers[0]}33"] * 3
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_batch_heatmaps_match_single_ones(numpy_mode, seed, tmp_path):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=60)
+    times = [rng.uniform(-1.0, 36.0) for _ in range(15)] + [timeline.objects[0].time.end]
+    path = tmp_path / "heatmaps.txt"
+    batch = SpaceTimeVisualizer.space_heatmaps(timeline, times, output_path=str(path), resolution=20)
+    assert batch == [SpaceTimeVisualizer.space_heatmap(timeline, t, resolution=20) for t in times]
+    assert path.read_text() == "\n\n".join(batch)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_occupancy_matches_sampling(numpy_mode, seed):
+    timeline = random_timeline(seed, count=50, layers=3)
+    curves = SpaceTimeVisualizer.occupancy_over_time(timeline, samples=12, resolution=16)
+    times = curves['times']
+    assert len(times) == 12 and times[0] == 0.0 and times[-1] == timeline.duration
+    assert sorted(curves['layers']) == sorted({obj.layer for obj in timeline.objects})
+    for k, t in enumerate(times):
+        active = timeline.get_objects_at_time(t)
+        for layer, curve in curves['layers'].items():
+            objects = [obj for obj in active if obj.layer == layer]
+            counts, _ = _sampled(objects, SCREEN, 16)
+            cells = [c for row in counts for c in row]
+            assert curve['objects'][k] == len(objects)
+            assert curve['coverage'][k] == sum(1 for c in cells if c) / 256
+            assert curve['overlap'][k] == sum(1 for c in cells if c > 1) / 256
+
+
+def _scale_labels(line, width):
+    """Column -> label of a time scale line (after its '# ' prefix)."""
+    scale = line[2:]
+    assert len(scale) == width
+    return {i: scale[i:].split(" ", 1)[0] for i in range(width)
+            if scale[i] != " " and (i == 0 or scale[i - 1] == " ")}
+
+
+@pytest.mark.parametrize('start, span, width', [(0.0, 30.0, 80), (12.0, 4.0, 40), (0.0, 999.0, 35)])
+def test_time_scale_labels_every_ten_columns(start, span, width):
+    line = "# " + SpaceTimeVisualizer._create_time_scale(span, width, start)
+    labels = _scale_labels(line, width)
+    # Each label starts at its own column; the last may be cut at the edge
+    assert sorted(labels) == list(range(0, width, 10))
+    for i, label in labels.items():
+        assert f"{start + i / width * span:.0f}s".startswith(label)
+
+
+def _overlapping(objects, low, high):
+    return [o for o in objects if o.time.end >= low and o.time.start <= high]
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_gantt_detail_rows(seed):
+    timeline = random_timeline(seed, count=25)
+    lines = SpaceTimeVisualizer.gantt_chart(timeline, width=60).splitlines()
+    span = timeline.duration
+    assert lines[:3] == ["# Timeline Gantt Chart", f"# Total duration: {span:.2f}s", "# Objects: 25"]
+    rows = lines[5:]
+    ordered = sorted(timeline.objects, key=lambda o: o.time.start)
+    assert [row.strip() for row in rows[::2]] == [obj.id for obj in ordered]
+    for obj, bar in zip(ordered, rows[1::2]):
+        first = int(obj.time.start / span * 60)
+        last = max(int(obj.time.end / span * 60), first + 1)
+        assert bar[2:] == " " * first + str(obj.layer) + "█" * (last - first - 1) + \
+            " " * (60 - last)
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('group_by', ['layer', 'type'])
+def test_gantt_density_bands(seed, group_by):
+    timeline = random_timeline(seed, count=120, layers=3)
+    width = 50
+    lines = SpaceTimeVisualizer.gantt_chart(timeline, max_rows=40, group_by=group_by,
+                                            width=width).splitlines()
+    assert lines[3] == f"# Aggregated by {group_by} (120 objects > 40 rows)"
+    span = timeline.duration
+    groups = {}
+    for obj in timeline.objects:
+        groups.setdefault(obj.layer if group_by == 'layer' else obj.object_type, []).append(obj)
+
+    bands = lines[6:-2]
+    assert len(bands) == 2 * len(groups)
+    for key, (header, band) in zip(sorted(groups), zip(bands[::2], bands[1::2])):
+        members = groups[key]
+        # Objects active anywhere in each column's slice of time
+        density = [len(_overlapping(members, span * c / width, span * (c + 1) / width))
+                   for c in range(width)]
+        peak = max(density)
+        assert header == f"  {group_by} {key}: {len(members)} objects, peak {peak} concurrent"
+        chars = SpaceTimeVisualizer.DENSITY_CHARS
+        assert band[2:] == "".join(chars[math.ceil(count / peak * 4)] for count in density)
+
+    assert len(SpaceTimeVisualizer.gantt_chart(timeline, max_rows=None).splitlines()) == 5 + 240
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_gantt_zoom_window(seed):
+    rng = random.Random(seed)
+    timeline = random_timeline(seed, count=80)
+    low = rng.uniform(0.0, 25.0)
+    high = low + rng.uniform(0.5, 6.0)
+    lines = SpaceTimeVisualizer.gantt_chart(timeline, time_range=(low, high), width=40).splitlines()
+    expected = sorted(_overlapping(timeline.objects, low, high), key=lambda o: o.time.start)
+    assert lines[1:3] == [f"# Window: [{low:.2f}s, {high:.2f}s]", f"# Objects: {len(expected)}"]
+    assert _scale_labels(lines[4], 40)[0] == f"{low:.0f}s"
+    assert [row.strip() for row in lines[5::2]] == [obj.id for obj in expected]
+    assert all(len(bar) == 42 for bar in lines[6::2])
+
+    assert SpaceTimeVisualizer.gantt_chart(timeline, time_range=(100.0, 101.0)) == \
+        "# No objects in [100.00s, 101.00s]"
+    with pytest.raises(ValueError):
+        SpaceTimeVisualizer.gantt_chart(timeline, time_range=(2.0, 2.0))
+    with pytest.raises(ValueError):
+        SpaceTimeVisualizer.gantt_chart(timeline, group_by='segment')
+
+
+@pytest.mark.parametrize('max_rows', [None, 10])
+def test_gantt_streams_the_same_chart(max_rows, tmp_path):
+    timeline = random_timeline(4, count=60)
+    path = tmp_path / "gantt.txt"
+    count = SpaceTimeVisualizer.write_gantt_chart(timeline, str(path), max_rows=max_rows,
+                                                  time_range=(5.0, 20.0))
+    chart = SpaceTimeVisualizer.gantt_chart(timeline, max_rows=max_rows, time_range=(5.0, 20.0))
+    assert path.read_text() == chart and count == len(chart.splitlines())
+    assert SpaceTimeVisualizer.write_gantt_chart(Timeline(), str(path)) == 1
+    assert path.read_text() == "# No objects on timeline"